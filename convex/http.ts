@@ -123,7 +123,9 @@ const corsPreflightHandler = httpAction(async () => {
 const apiPaths = [
 	"/api/profiles",
 	"/api/profiles/by-name",
+	"/api/profiles/by-names",
 	"/api/profiles/by-id",
+	"/api/profiles/by-ids",
 	"/api/profiles/available",
 	"/api/profiles/by-list-ids",
 	"/api/profiles/update-by-name",
@@ -154,12 +156,14 @@ const apiPaths = [
 	"/api/keywords",
 	"/api/keywords/delete",
 	"/api/message-templates",
+	"/api/message-templates/versioned",
 	"/api/instagram-accounts",
 	"/api/instagram-accounts/batch",
 	"/api/instagram-accounts/for-profile",
 	"/api/instagram-accounts/to-message",
 	"/api/instagram-accounts/update-status",
 	"/api/instagram-accounts/update-message",
+	"/api/instagram-accounts/bulk-update",
 	"/api/instagram-accounts/usernames",
 	"/api/instagram-accounts/profiles-with-assigned",
 	"/api/workflows",
@@ -172,6 +176,7 @@ const apiPaths = [
 	"/api/workflow-artifacts/upsert",
 	"/api/workflow-artifacts/set-imported",
 	"/api/workflow-artifacts/store-artifact",
+	"/api/workflow-artifacts/store-chunk",
 	"/api/workflow-artifacts/storage-url",
 ];
 
@@ -211,6 +216,23 @@ http.route({
 	}),
 });
 
+http.route({
+	path: "/api/profiles/by-names",
+	method: "POST",
+	handler: httpAction(async (ctx, request) => {
+		const authError = await requireAuth(request);
+		if (authError) return authError;
+		try {
+			const body = await parseBody(request);
+			const names = Array.isArray(body?.names) ? body.names.map((name: unknown) => String(name ?? "")) : [];
+			const profiles = await ctx.runQuery(internalApi.profiles.getByNamesInternal, { names });
+			return jsonResponse(profiles.map((profile: any) => mapProfileToPython(profile)));
+		} catch (err: any) {
+			return jsonResponse({ error: String(err?.message || err) }, 400);
+		}
+	}),
+});
+
 http.route({
 	path: "/api/profiles/by-id",
 	method: "GET",
@@ -230,6 +252,24 @@ http.route({
 	}),
 });
 
+http.route({
+	path: "/api/profiles/by-ids",
+	method: "POST",
+	handler: httpAction(async (ctx, request) => {
+		const authError = await requireAuth(request);
+		if (authError) return authError;
+		try {
+			const body = await parseBody(request);
+			const rawIds = body?.profileIds ?? body?.profile_ids;
+			const profileIds = Array.isArray(rawIds) ? rawIds.map((id: unknown) => String(id ?? "")) : [];
+			const profiles = await ctx.runQuery(internal.profiles.getByIdsInternal, { profileIds });
+			return jsonResponse(profiles.map((profile: any) => mapProfileToPython(profile, { includeCookies: true })));
+		} catch (err: any) {
+			return jsonResponse({ error: String(err?.message || err) }, 400);
+		}
+	}),
+});
+
 http.route({
 	path: "/api/profiles/available",
 	method: "POST",
@@ -837,6 +877,25 @@ http.route({
 	}),
 });
 
+http.route({
+	path: "/api/message-templates/versioned",
+	method: "GET",
+	handler: httpAction(async (ctx, request) => {
+		const authError = await requireAuth(request);
+		if (authError) return authError;
+		try {
+			const url = new URL(request.url);
+			const kind = url.searchParams.get("kind") || "";
+			const known = url.searchParams.get("knownUpdatedAt");
+			const knownUpdatedAt = known !== null && known !== "" && Number.isFinite(Number(known)) ? Number(known) : undefined;
+			const result = await ctx.runQuery(api.messageTemplates.getVersioned, { kind, knownUpdatedAt });
+			return jsonResponse(result);
+		} catch (err: any) {
+			return jsonResponse({ error: String(err?.message || err) }, 400);
+		}
+	}),
+});
+
 http.route({
 	path: "/api/message-templates",
 	method: "POST",
@@ -978,6 +1037,43 @@ http.route({
 	}),
 });
 
+http.route({
+	path: "/api/instagram-accounts/bulk-update",
+	method: "POST",
+	handler: httpAction(async (ctx, request) => {
+		const authError = await requireAuth(request);
+		if (authError) return authError;
+		try {
+			const body = await parseBody(request);
+			const statusUpdates = Array.isArray(body?.statusUpdates ?? body?.status_updates)
+				? (body?.statusUpdates ?? body?.status_updates)
+				: [];
+			const messageUpdates = Array.isArray(body?.messageUpdates ?? body?.message_updates)
+				? (body?.messageUpdates ?? body?.message_updates)
+				: [];
+			const result = await ctx.runMutation(internal.instagramAccounts.bulkUpdate, {
+				statusUpdates: statusUpdates.map((item: any) => ({
+					accountId: (item?.accountId ?? item?.account_id ?? item?.id) as any,
+					status: item?.status,
+					...(typeof item?.assigned_to !== "undefined" || typeof item?.assignedTo !== "undefined"
+						? { assignedTo: typeof item?.assigned_to !== "undefined" ? item.assigned_to : item.assignedTo }
+						: {}),
+				})),
+				messageUpdates: messageUpdates.map((item: any) => ({
+					userName: item?.userName ?? item?.user_name,
+					...(typeof item?.message === "boolean" ? { message: item.message } : {}),
+					...(typeof (item?.lastMessagedAt ?? item?.last_messaged_at) === "number"
+						? { lastMessagedAt: item?.lastMessagedAt ?? item?.last_messaged_at }
+						: {}),
+				})),
+			});
+			return jsonResponse(result);
+		} catch (err: any) {
+			return jsonResponse({ error: String(err?.message || err) }, 400);
+		}
+	}),
+});
+
 
 http.route({
 	path: "/api/instagram-accounts/usernames",
@@ -1232,6 +1328,25 @@ http.route({
 	}),
 });
 
+http.route({
+	path: "/api/workflow-artifacts/store-chunk",
+	method: "POST",
+	handler: httpAction(async (ctx, request) => {
+		const authError = await requireAuth(request);
+		if (authError) return authError;
+		try {
+			const body = await request.arrayBuffer();
+			if (body.byteLength === 0) return jsonResponse({ error: "chunk body is required" }, 400);
+			const storageId = await ctx.storage.store(
+				new Blob([body], { type: request.headers.get("Content-Type") || "application/gzip" }),
+			);
+			return jsonResponse({ storageId });
+		} catch (err: any) {
+			return jsonResponse({ error: String(err?.message || err) }, 400);
+		}
+	}),
+});
+
 http.route({
 	path: "/api/workflow-artifacts/storage-url",
 	method: "GET",
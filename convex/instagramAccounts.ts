@@ -123,6 +123,42 @@ export const getToMessage = internalQuery({
 	},
 });
 
+async function patchAccountStatus(
+	ctx: any,
+	args: { accountId: any; status: string; assignedTo?: any },
+) {
+	const status = String(args.status || "").trim();
+	if (!status) throw new Error("status is required");
+	const patch: Record<string, unknown> = { status };
+	if (status.toLowerCase() === "subscribed") {
+		patch.subscribedAt = Date.now();
+	}
+	if (typeof args.assignedTo !== "undefined") {
+		patch.assignedTo = args.assignedTo === null ? undefined : args.assignedTo;
+	} else if (status.toLowerCase() === "done") {
+		patch.assignedTo = undefined;
+	}
+	await ctx.db.patch(args.accountId, patch as any);
+}
+
+async function patchAccountMessage(
+	ctx: any,
+	existing: any,
+	args: { message?: boolean; lastMessagedAt?: number },
+) {
+	const nextMessage = args.message ?? true;
+	const patch: Record<string, unknown> = { message: nextMessage };
+	if (nextMessage) {
+		patch.lastMessagedAt = typeof args.lastMessagedAt === "number" ? args.lastMessagedAt : Date.now();
+	}
+	await ctx.db.patch(existing._id, patch as any);
+}
+
+function findByUserName(rows: any[], normalized: string) {
+	const lower = normalized.toLowerCase();
+	return rows.find((r) => r.userName === normalized) ?? rows.find((r) => String(r.userName || "").toLowerCase() === lower);
+}
+
 export const updateStatus = internalMutation({
 	args: {
 		accountId: v.id("instagramAccounts"),
@@ -130,18 +166,7 @@ export const updateStatus = internalMutation({
 		assignedTo: v.optional(v.union(v.null(), v.id("profiles"))),
 	},
 	handler: async (ctx, args) => {
-		const status = String(args.status || "").trim();
-		if (!status) throw new Error("status is required");
-		const patch: Record<string, unknown> = { status };
-		if (status.toLowerCase() === "subscribed") {
-			patch.subscribedAt = Date.now();
-		}
-		if (typeof args.assignedTo !== "undefined") {
-			patch.assignedTo = args.assignedTo === null ? undefined : args.assignedTo;
-		} else if (status.toLowerCase() === "done") {
-			patch.assignedTo = undefined;
-		}
-		await ctx.db.patch(args.accountId, patch as any);
+		await patchAccountStatus(ctx, args);
 		return await ctx.db.get(args.accountId);
 	},
 });
@@ -156,20 +181,54 @@ export const updateMessage = internalMutation({
 		const normalized = normalizeUserName(args.userName);
 		if (!normalized) return null;
 		const rows = await ctx.db.query("instagramAccounts").collect();
-		const lower = normalized.toLowerCase();
-		const existing =
-			rows.find((r) => r.userName === normalized) ?? rows.find((r) => String(r.userName || "").toLowerCase() === lower);
+		const existing = findByUserName(rows, normalized);
 		if (!existing) return null;
-		const nextMessage = args.message ?? true;
-		const patch: Record<string, unknown> = { message: nextMessage };
-		if (nextMessage) {
-			patch.lastMessagedAt = typeof args.lastMessagedAt === "number" ? args.lastMessagedAt : Date.now();
-		}
-		await ctx.db.patch(existing._id, patch as any);
+		await patchAccountMessage(ctx, existing, args);
 		return await ctx.db.get(existing._id);
 	},
 });
 
+export const bulkUpdate = internalMutation({
+	args: {
+		statusUpdates: v.array(
+			v.object({
+				accountId: v.id("instagramAccounts"),
+				status: v.string(),
+				assignedTo: v.optional(v.union(v.null(), v.id("profiles"))),
+			}),
+		),
+		messageUpdates: v.array(
+			v.object({
+				userName: v.string(),
+				message: v.optional(v.boolean()),
+				lastMessagedAt: v.optional(v.number()),
+			}),
+		),
+	},
+	handler: async (ctx, args) => {
+		for (const update of args.statusUpdates) {
+			await patchAccountStatus(ctx, update);
+		}
+		const missing: string[] = [];
+		let messageUpdated = 0;
+		if (args.messageUpdates.length > 0) {
+			// One scan serves the whole batch instead of one per username
+			const rows = await ctx.db.query("instagramAccounts").collect();
+			for (const update of args.messageUpdates) {
+				const normalized = normalizeUserName(update.userName);
+				const existing = normalized ? findByUserName(rows, normalized) : undefined;
+				if (!existing) {
+					missing.push(update.userName);
+					continue;
+				}
+				await patchAccountMessage(ctx, existing, update);
+				messageUpdated += 1;
+			}
+		}
+		return { statusUpdated: args.statusUpdates.length, messageUpdated, missing };
+	},
+});
+
 
 
 export const listUserNames = internalQuery({
@@ -1,18 +1,38 @@
 import { v } from "convex/values";
 import { mutation, query } from "./auth";
 
+function cleanTexts(texts: unknown): string[] {
+	if (!Array.isArray(texts)) return [];
+	return texts.map((t: any) => String(t)).filter((t: string) => t.trim());
+}
+
+async function findByKind(ctx: any, kind: string) {
+	const cleaned = String(kind || "").trim();
+	if (!cleaned) throw new Error("kind is required");
+	return await ctx.db
+		.query("messageTemplates")
+		.withIndex("by_kind", (q: any) => q.eq("kind", cleaned))
+		.first();
+}
+
 export const get = query({
 	args: { kind: v.string() },
 	handler: async (ctx, args) => {
-		const cleaned = String(args.kind || "").trim();
-		if (!cleaned) throw new Error("kind is required");
-		const row = await ctx.db
-			.query("messageTemplates")
-			.withIndex("by_kind", (q) => q.eq("kind", cleaned))
-			.first();
-		const texts = (row as any)?.texts;
-		if (!Array.isArray(texts)) return [];
-		return texts.map((t: any) => String(t)).filter((t: string) => t.trim());
+		const row = await findByKind(ctx, args.kind);
+		return cleanTexts((row as any)?.texts);
+	},
+});
+
+// Texts plus their updatedAt; texts are left out when the caller already holds that version.
+export const getVersioned = query({
+	args: { kind: v.string(), knownUpdatedAt: v.optional(v.number()) },
+	handler: async (ctx, args) => {
+		const row = await findByKind(ctx, args.kind);
+		const updatedAt = typeof (row as any)?.updatedAt === "number" ? (row as any).updatedAt : 0;
+		if (args.knownUpdatedAt !== undefined && args.knownUpdatedAt === updatedAt) {
+			return { updatedAt };
+		}
+		return { updatedAt, texts: cleanTexts((row as any)?.texts) };
 	},
 });
 
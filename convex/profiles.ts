@@ -81,6 +81,32 @@ async function getProfileByNameRow(ctx: any, name: string) {
 	return row ?? null;
 }
 
+async function getProfilesByNames(ctx: any, namesRaw: string[]) {
+	const seen = new Set<string>();
+	const rows: any[] = [];
+	for (const raw of namesRaw || []) {
+		const name = String(raw || "").trim();
+		if (!name || seen.has(name)) continue;
+		seen.add(name);
+		const row = await getProfileByNameRow(ctx, name);
+		if (row) rows.push(row);
+	}
+	return rows;
+}
+
+async function getProfilesByIds(ctx: any, idsRaw: string[]) {
+	const seen = new Set<string>();
+	const rows: any[] = [];
+	for (const raw of idsRaw || []) {
+		const id = ctx.db.normalizeId("profiles", String(raw || "").trim());
+		if (!id || seen.has(id)) continue;
+		seen.add(id);
+		const row = await ctx.db.get(id);
+		if (row) rows.push(row);
+	}
+	return rows;
+}
+
 async function getAvailableProfilesForLists(ctx: any, listIdsRaw: string[], cooldownMinutesRaw: number) {
 	const cleanIds = (listIdsRaw || []).map((v) => String(v || "").trim()).filter(Boolean);
 	if (cleanIds.length === 0) return [];
@@ -520,6 +546,20 @@ export const getByNameInternal = internalQuery({
 	},
 });
 
+export const getByNamesInternal = internalQuery({
+	args: { names: v.array(v.string()) },
+	handler: async (ctx, args) => {
+		return await getProfilesByNames(ctx, args.names);
+	},
+});
+
+export const getByIdsInternal = internalQuery({
+	args: { profileIds: v.array(v.string()) },
+	handler: async (ctx, args) => {
+		return await getProfilesByIds(ctx, args.profileIds);
+	},
+});
+
 export const getById = query({
 	args: { profileId: v.id("profiles") },
 	handler: async (ctx, args) => {
@@ -16,6 +16,7 @@ from convex_client import convex_mutation, convex_query, get_keywords, upsert_ke
 from scraping_tasks import (
     EXPORT_STORAGE_ID_KEYS,
     build_manifest_payload,
+    decode_storage_payload,
     extract_chunk_storage_ids,
     extract_users_from_payload,
     get_nested_storage_id,
@@ -209,7 +210,7 @@ def _fetch_storage_payload(storage_id: str, env: str) -> dict[str, Any]:
 
     resp = requests.get(url, timeout=60)
     resp.raise_for_status()
-    payload = resp.json()
+    payload = decode_storage_payload(resp.content)
     if not isinstance(payload, dict):
         raise HTTPException(status_code=400, detail=f"Invalid task file payload for {storage_id}")
     return payload
@@ -1,7 +1,10 @@
 """Helpers for scraping-task payloads and manifest/chunk storage."""
 
+import gzip
+import json
 from typing import Any
 
+GZIP_MAGIC = b"\x1f\x8b"
 USER_COLLECTION_KEYS = ("users", "rawUsers", "accounts")
 EXPORT_STORAGE_ID_KEYS = ("exportStorageId", "export_storage_id")
 CHUNK_COLLECTION_KEYS = (
@@ -38,6 +41,13 @@ def _append_unique_storage_id(storage_ids: list[str], seen: set[str], value: Any
     storage_ids.append(storage_id)
 
 
+def decode_storage_payload(content: bytes) -> Any:
+    """Parse a stored payload; workflow chunk uploads are gzip-compressed JSON."""
+    if content[:2] == GZIP_MAGIC:
+        content = gzip.decompress(content)
+    return json.loads(content)
+
+
 def get_nested_storage_id(payload: Any, keys: tuple[str, ...]) -> str | None:
     if not isinstance(payload, dict):
         return None
@@ -1,3 +1,5 @@
+import gzip
+import json
 import sys
 import unittest
 from pathlib import Path
@@ -8,6 +10,7 @@ if str(ROOT) not in sys.path:
 
 from scraping_tasks import (  # noqa: E402
     build_manifest_payload,
+    decode_storage_payload,
     extract_chunk_storage_ids,
     extract_users_from_payload,
     has_user_collection,
@@ -87,6 +90,13 @@ class ScrapingTaskHelpersTest(unittest.TestCase):
         self.assertTrue(has_user_collection({"rawUsers": []}))
         self.assertFalse(has_user_collection({"summary": {}}))
 
+    def test_decode_storage_payload_accepts_gzip_chunks_and_plain_json(self) -> None:
+        payload = {"users": [{"username": "alpha"}], "count": 1}
+        raw = json.dumps(payload).encode("utf-8")
+
+        self.assertEqual(decode_storage_payload(gzip.compress(raw)), payload)
+        self.assertEqual(decode_storage_payload(raw), payload)
+
 
 if __name__ == "__main__":
     unittest.main()
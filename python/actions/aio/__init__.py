@@ -0,0 +1,18 @@
+# Async (playwright.async_api) ports of the actions driven by the asyncio workflow engine
+from .approve import approve_follow_requests
+from .feed import scroll_feed
+from .follow import follow_usernames
+from .messaging import send_messages
+from .reels import scroll_reels
+from .stories import watch_stories
+from .unfollow import unfollow_usernames
+
+__all__ = [
+    'approve_follow_requests',
+    'follow_usernames',
+    'scroll_feed',
+    'scroll_reels',
+    'send_messages',
+    'unfollow_usernames',
+    'watch_stories',
+]
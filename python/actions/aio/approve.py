@@ -0,0 +1,145 @@
+import asyncio
+from typing import Callable, Optional, Tuple
+
+from python.actions.engagement.approve.db import mark_account_approved
+from python.database.accounts import AccountMutationQueue, InstagramAccountsClient
+
+from .common import random_delay
+
+
+async def approve_follow_requests(
+    page,
+    log: Callable[[str], None],
+    should_stop: Optional[Callable[[], bool]] = None,
+    approve_delay_range: Tuple[float, float] = (1.0, 2.0),
+    finish_delay_seconds: float = 3.0,
+    run_blocking=None,
+) -> None:
+    """Approve pending follow requests from the notifications panel of an open page."""
+    should_stop = should_stop or (lambda: False)
+    # The mutation queue talks to Convex and the outbox; its calls go through the blocking pool
+    run_blocking = run_blocking or asyncio.to_thread
+    client = await run_blocking(
+        lambda: AccountMutationQueue(
+            InstagramAccountsClient(),
+            on_missing=lambda username: log(f"Database update failed for @{username} (No match in DB?)"),
+        )
+    )
+    try:
+        log("Использую существующую сессию для подтверждения заявок.")
+        await _run_approve_follow_requests(page, client, log, should_stop, approve_delay_range, finish_delay_seconds, run_blocking)
+    finally:
+        # Send the queued account updates before the session returns
+        await run_blocking(client.close)
+
+
+async def _run_approve_follow_requests(page, client, log, should_stop, approve_delay_range, finish_delay_seconds, run_blocking) -> None:
+    try:
+        await _ensure_instagram_open(page)
+        delay_min, delay_max = approve_delay_range
+        if delay_max < delay_min:
+            delay_min, delay_max = delay_max, delay_min
+        if not await _open_notifications(page, log):
+            return
+        if not await _open_follow_requests_list(page, log):
+            log("Не удалось открыть список заявок, продолжаю поиск Confirm.")
+        confirm_buttons = await page.locator('div[role="button"]:has-text("Confirm")').all()
+        if confirm_buttons:
+            log(f"Найдено {len(confirm_buttons)} кнопок Confirm. Подтверждаю...")
+            for btn in confirm_buttons:
+                if should_stop():
+                    break
+                try:
+                    if not await btn.is_visible():
+                        continue
+                    username = await _extract_username(btn, log)
+                    if username:
+                        log(f"Found username: {username}")
+                    await btn.click()
+                    if username:
+                        await run_blocking(mark_account_approved, client, username, log)
+                    log("Подтверждена заявка")
+                    await random_delay(delay_min, delay_max)
+                except Exception as e:
+                    log(f"Ошибка при подтверждении: {e}")
+        else:
+            log("Кнопки Confirm не найдены.")
+        await _close_notifications(page, log)
+        log(f"Ожидание {finish_delay_seconds} секунды перед закрытием сессии...")
+        await random_delay(finish_delay_seconds, finish_delay_seconds)
+        log("Обработка уведомлений завершена.")
+    except Exception as e:
+        log(f"Ошибка в процессе подтверждения: {e}")
+
+
+async def _ensure_instagram_open(page) -> None:
+    try:
+        if page.url == "about:blank":
+            await page.goto("https://www.instagram.com", timeout=15000)
+    except Exception:
+        pass
+    await random_delay(2, 4)
+
+
+async def _open_notifications(page, log) -> bool:
+    log("Перехожу в уведомления...")
+    try:
+        await page.locator('svg[aria-label="Notifications"]').click()
+        await random_delay(3, 5)
+        return True
+    except Exception as e:
+        log(f"Не нашел кнопку уведомлений: {e}")
+    try:
+        await page.goto("https://www.instagram.com/accounts/activity/", timeout=15000)
+        await random_delay(2, 4)
+        return True
+    except Exception:
+        return False
+
+
+async def _open_follow_requests_list(page, log) -> bool:
+    log("Ищу 'Follow request' и открываю список заявок...")
+    for selector in ('text=Follow request', 'span:has-text("Follow request")'):
+        try:
+            el = page.locator(selector).first
+            if await el.is_visible():
+                await el.click()
+                await random_delay(2, 3)
+                return True
+        except Exception:
+            continue
+    return False
+
+
+async def _extract_username(confirm_button, log) -> Optional[str]:
+    try:
+        row = confirm_button.locator(
+            'xpath=ancestor::*[.//div[@role="button" and normalize-space()="Delete"] and .//a[@role="link" and starts-with(@href, "/")]][1]'
+        ).first
+        if not await row.is_visible():
+            log("Skipping row without Delete button (Suggested for you?)")
+            return None
+        link = row.locator('xpath=.//a[@role="link" and starts-with(@href, "/")][1]').first
+        href = await link.get_attribute("href") if await link.is_visible() else None
+        parts = [p for p in (href or "").strip().split("/") if p]
+        return parts[0] if parts else None
+    except Exception as e:
+        log(f"Extraction error: {e}")
+        return None
+
+
+async def _close_notifications(page, log) -> None:
+    log("Закрываю окно уведомлений...")
+    try:
+        close_btn = page.locator('div[aria-label="Close"][role="button"]').first
+        if await close_btn.is_visible():
+            await close_btn.click()
+            return
+    except Exception:
+        pass
+    log("Кнопка закрытия не найдена, кликаю уведомления для закрытия...")
+    try:
+        await page.locator('svg[aria-label="Notifications"]').click()
+        await random_delay(1, 2)
+    except Exception as e:
+        log(f"Не удалось закрыть уведомления кликом: {e}")
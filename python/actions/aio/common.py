@@ -0,0 +1,76 @@
+"""
+Async counterparts of python.actions.common for playwright.async_api pages
+"""
+import random
+
+from python.actions.common import _pick_spawn_coordinate, _viewport_bounds
+from python.core import pacing
+
+
+async def random_delay(min_seconds: float = 1.0, max_seconds: float = 3.0) -> None:
+    """Add a random delay to appear human-like without blocking the event loop"""
+    await pacing.async_sleep(random.uniform(min_seconds, max_seconds), pacing.current_token())
+
+
+async def safe_mouse_move(page, target_x: int | float, target_y: int | float, margin_x: int = 15, margin_y: int = 15, **kwargs):
+    """Move the mouse while keeping it off the window boundaries."""
+    try:
+        viewport = page.viewport_size
+        vw = viewport.get("width", 1366) if viewport else 1366
+        vh = viewport.get("height", 768) if viewport else 768
+        safe_x = max(margin_x, min(int(target_x), vw - margin_x))
+        safe_y = max(margin_y, min(int(target_y), vh - margin_y))
+        await page.mouse.move(safe_x, safe_y, **kwargs)
+    except Exception:
+        await page.mouse.move(int(target_x), int(target_y), **kwargs)
+
+
+async def seed_mouse_cursor(page, preferred_margin: int = 200, edge_margin: int = 15) -> tuple[int, int] | None:
+    """Seed the cursor to a randomized, viewport-safe starting point."""
+    try:
+        width, height = _viewport_bounds(page)
+        start_x = _pick_spawn_coordinate(width, preferred_margin=preferred_margin, edge_margin=edge_margin)
+        start_y = _pick_spawn_coordinate(height, preferred_margin=preferred_margin, edge_margin=edge_margin)
+        await safe_mouse_move(page, start_x, start_y, margin_x=edge_margin, margin_y=edge_margin, steps=1)
+        return start_x, start_y
+    except Exception:
+        return None
+
+
+async def sleep(seconds: float) -> None:
+    """Cancellable fixed wait for the current session token."""
+    await pacing.async_sleep(seconds, pacing.current_token())
+
+
+async def get_viewport_size(page) -> tuple[int, int]:
+    try:
+        viewport = getattr(page, 'viewport_size', None)
+        if viewport and viewport.get('width') and viewport.get('height'):
+            return int(viewport['width']), int(viewport['height'])
+    except Exception:
+        pass
+    try:
+        viewport_h = await page.evaluate('() => window.innerHeight') or 0
+        viewport_w = await page.evaluate('() => window.innerWidth') or 0
+        return int(viewport_w), int(viewport_h)
+    except Exception:
+        return 0, 0
+
+
+async def find_close_button(page):
+    """Async ``engagement.follow.common._find_close_button``."""
+    close_btn = (
+        await page.query_selector('button[aria-label="Close"]')
+        or await page.query_selector('[role="button"][aria-label*="Close"]')
+        or await page.query_selector('button[aria-label*="close" i]')
+    )
+    if close_btn:
+        return close_btn
+    close_svg = await page.query_selector('svg[aria-label="Close"]')
+    if not close_svg:
+        return None
+    return (
+        await close_svg.query_selector('xpath=ancestor-or-self::*[self::button or @role="button"][1]')
+        or await close_svg.query_selector('xpath=ancestor-or-self::*[self::div][1]')
+        or close_svg
+    )
@@ -0,0 +1,443 @@
+import asyncio
+import logging
+import random
+import time
+
+from python.actions.browsing.feed_scrolling.carousel import CAROUSEL_NEXT_BUTTON_XPATH
+from python.actions.browsing.feed_scrolling.likes import (
+    _CLICK_EDGE_MARGIN_BOTTOM,
+    _CLICK_EDGE_MARGIN_TOP,
+    _CLICK_EDGE_MARGIN_X,
+    _CLICK_SAFETY_ATTEMPTS,
+    _CLICK_SAFETY_MAX_STEP_RATIO,
+    _MIN_BOTTOM_GAP_FOR_CLICK,
+    _debug_mouse as _debug_like,
+)
+from python.actions.browsing.feed_scrolling.runtime import (
+    _chance_hit,
+    _debug_mouse,
+    _format_box,
+    _normalize_range,
+    _report_time_remaining,
+    _session_active,
+    _session_clock,
+    _should_end_session,
+)
+from python.actions.browsing.viewport import _pick_point
+from python.core.errors.retry import jitter
+from python.core.selectors import FOLLOW_BUTTON, HOME_BUTTON
+from python.core.storage.state_persistence import save_state
+
+from . import selectors
+from .common import random_delay, safe_mouse_move, sleep
+from .scrolling import ease_out_cubic, human_mouse_move, human_scroll, scroll_to_element, smooth_wheel
+from .stories import watch_stories
+
+logger = logging.getLogger(__name__)
+
+
+async def scroll_feed(
+    page,
+    duration_minutes: int,
+    actions_config: dict,
+    should_stop=None,
+    profile_name: str = 'unknown',
+    run_blocking=None,
+) -> dict:
+    stats = {'likes': 0, 'follows': 0}
+    clock = _session_clock(duration_minutes)
+    try:
+        await _navigate_home(page)
+        if _should_end_session(clock, should_stop):
+            return stats
+        await _watch_stories_if_enabled(page, actions_config, should_stop)
+        logger.info(f'Starting {duration_minutes} minute scroll session on Instagram...')
+        while _session_active(clock, should_stop):
+            _report_time_remaining(clock['end'])
+            await _save_session_progress(profile_name, clock['start'], duration_minutes, run_blocking)
+            if await _reload_stalled_page(page, clock):
+                continue
+            if not await _process_feed_iteration(page, actions_config, stats, should_stop):
+                continue
+            clock['last_action'] = time.time()
+    except Exception as exc:
+        logger.error(f'Error during scrolling: {type(exc).__name__} - {exc}')
+    logger.info(f'Scroll session complete: {stats}')
+    return stats
+
+
+async def _navigate_home(page) -> None:
+    try:
+        if page.url.rstrip('/') == 'https://www.instagram.com':
+            return
+        logger.info('Navigating to Home feed...')
+        if await _click_home_button(page):
+            await random_delay(jitter(3000) / 1000, jitter(5000) / 1000)
+            await _dismiss_notifications_modal(page)
+            return
+        await page.goto('https://www.instagram.com/', timeout=jitter(30000))
+    except Exception as exc:
+        logger.error(f'Navigation error: {type(exc).__name__} - {exc}')
+        try:
+            await page.goto('https://www.instagram.com/', timeout=jitter(30000))
+        except Exception:
+            pass
+
+
+async def _click_home_button(page) -> bool:
+    element = await selectors.find(HOME_BUTTON, page)
+    if not element:
+        return False
+    try:
+        await (await _home_click_target(element)).click()
+        return True
+    except Exception as exc:
+        logger.error(f'Home selector click failed: {type(exc).__name__}')
+        return False
+
+
+async def _home_click_target(element):
+    try:
+        if not await element.evaluate("el => el.tagName.toLowerCase() === 'svg'"):
+            return element
+        clickable = element.locator('xpath=ancestor::*[self::a or self::button or @role="link" or @role="button"][1]')
+        if await clickable.count() > 0:
+            return clickable.first
+    except Exception:
+        pass
+    return element
+
+
+async def _dismiss_notifications_modal(page) -> None:
+    try:
+        not_now = await page.query_selector('button:has-text("Not Now")')
+        if not_now:
+            await not_now.click()
+            await random_delay(1, 2)
+    except Exception:
+        pass
+
+
+async def _watch_stories_if_enabled(page, actions_config: dict, should_stop) -> None:
+    if not actions_config.get('watch_stories', True):
+        return
+    if should_stop and should_stop():
+        return
+    story_view_min, story_view_max = _normalize_range(
+        actions_config.get('stories_min_view_seconds', 2.0),
+        actions_config.get('stories_max_view_seconds', 5.0),
+        (2.0, 5.0),
+    )
+    await watch_stories(
+        page,
+        max_stories=actions_config.get('stories_max', 3),
+        min_view_s=story_view_min,
+        max_view_s=story_view_max,
+    )
+
+
+async def _save_session_progress(profile_name: str, start_time: float, duration_minutes: int, run_blocking=None) -> None:
+    elapsed = time.time() - start_time
+    total_duration = duration_minutes * 60
+    progress = int((elapsed / total_duration) * 100) if total_duration > 0 else 0
+    run_blocking = run_blocking or asyncio.to_thread
+    await run_blocking(save_state, profile_name, 'scroll_feed', min(progress, 99))
+
+
+async def _reload_stalled_page(page, clock: dict) -> bool:
+    if time.time() - clock['last_action'] < 180:
+        return False
+    logger.warning('No actions or posts processed in the last 3 minutes. Auto-reloading page...')
+    try:
+        await page.reload(timeout=15000)
+    except Exception as exc:
+        logger.error(f'Failed to reload page: {exc}')
+    clock['last_action'] = time.time()
+    await random_delay(3, 6)
+    return True
+
+
+async def _process_feed_iteration(page, actions_config: dict, stats: dict, should_stop) -> bool:
+    posts = await page.query_selector_all('article')
+    target_post = await _select_target_post(page, posts, actions_config) if posts else None
+    if not target_post or not await _focus_target_post(page, target_post, should_stop):
+        await human_scroll(page, should_stop=should_stop)
+        return False
+    await _view_post(actions_config)
+    if should_stop and should_stop():
+        return True
+    carousel_chance = actions_config.get('carousel_watch_chance', 0)
+    if carousel_chance > 0 and _chance_hit(carousel_chance):
+        await watch_carousel(page, target_post, max_slides=actions_config.get('carousel_max_slides', 3))
+    await _handle_like(page, target_post, actions_config, stats)
+    if _chance_hit(actions_config.get('follow_chance', 0)) and await perform_follow(page, target_post):
+        stats['follows'] += 1
+    return True
+
+
+async def _select_target_post(page, posts, actions_config: dict):
+    skip_count = 0
+    if _chance_hit(actions_config.get('skip_post_chance', 30)):
+        skip_count = random.randint(1, actions_config.get('skip_post_max', 2))
+    viewport_h = await _viewport_h(page) or 900
+    threshold_y = viewport_h * 0.52
+    candidates = []
+    for post in posts:
+        try:
+            box = await post.bounding_box()
+        except Exception:
+            continue
+        if box and box['y'] + (box['height'] / 2) > threshold_y:
+            candidates.append((box['y'], post))
+    if not candidates:
+        return None
+    candidates.sort(key=lambda item: item[0])
+    return candidates[min(max(0, int(skip_count)), len(candidates) - 1)][1]
+
+
+async def _viewport_h(page) -> int:
+    try:
+        return int(await page.evaluate('() => window.innerHeight') or 0)
+    except Exception:
+        return 0
+
+
+async def _focus_target_post(page, target_post, should_stop) -> bool:
+    target_y_ratio = random.uniform(0.45, 0.55)
+    _debug_mouse(
+        f'target selected: target_y_ratio={target_y_ratio:.3f} '
+        f'pre_scroll_box={_format_box(await _safe_box(target_post))} viewport_h={await _viewport_h(page)}'
+    )
+    return await scroll_to_element(
+        page,
+        target_post,
+        target_y_ratio=target_y_ratio,
+        ensure_full_visible=False,
+        should_stop=should_stop,
+    )
+
+
+async def _safe_box(element):
+    try:
+        return await element.bounding_box()
+    except Exception:
+        return None
+
+
+async def _view_post(actions_config: dict) -> None:
+    post_view_min, post_view_max = _normalize_range(
+        actions_config.get('post_view_min_seconds', 2.0),
+        actions_config.get('post_view_max_seconds', 5.0),
+        (2.0, 5.0),
+    )
+    view_time = random.uniform(post_view_min, post_view_max)
+    logger.info(f'Viewing feed post for {view_time:.1f}s')
+    await sleep(view_time)
+
+
+async def _handle_like(page, target_post, actions_config: dict, stats: dict) -> None:
+    like_chance = actions_config.get('like_chance', 0)
+    like_roll = random.random() * 100.0
+    _debug_mouse(f'like decision: roll={like_roll} chance={like_chance}')
+    if like_roll >= max(0.0, min(100.0, float(like_chance))):
+        return
+    if await perform_like(page, target_post):
+        stats['likes'] += 1
+
+
+async def watch_carousel(page, post_element, max_slides: int = 3) -> bool:
+    """Step through a few slides of a carousel post; True if at least one slide advanced."""
+    try:
+        dots = (
+            await post_element.query_selector_all('li[aria-label^="Go to slide"]')
+            or await post_element.query_selector_all('div._acnb')
+            or await post_element.query_selector_all('ul._acay li')
+            or []
+        )
+        next_probe = await post_element.query_selector(CAROUSEL_NEXT_BUTTON_XPATH)
+        total = len(dots)
+        if total <= 1 and next_probe is None:
+            logger.debug('No carousel indicators found')
+            return False
+        total = max(total, 2)
+        logger.info(f'Carousel detected with {total} slides')
+        for _ in range(max(1, min(max_slides, total)) - 1):
+            next_btn = await post_element.query_selector(CAROUSEL_NEXT_BUTTON_XPATH)
+            if next_btn:
+                await next_btn.click()
+            else:
+                await page.keyboard.press('ArrowRight')
+            await human_mouse_move(page)
+            await random_delay(0.6, 1.2)
+        return True
+    except Exception as exc:
+        logger.error(f'Error watching carousel: {exc}')
+        return False
+
+
+async def perform_follow(page, post_element) -> bool:
+    """Follow the user from a feed post."""
+    try:
+        btn = await selectors.find(FOLLOW_BUTTON, post_element)
+        if btn:
+            await btn.click()
+            logger.info('Followed user')
+            return True
+    except Exception as exc:
+        logger.error(f'Error following: {type(exc).__name__} - {exc}')
+    return False
+
+
+async def perform_like(page, post_element) -> bool:
+    """Like a feed post, skipping if already liked."""
+    try:
+        if await post_element.query_selector('svg[aria-label="Unlike"]'):
+            _debug_like('perform_like: already liked, skipping')
+            return False
+        clickable = await _find_like_button(post_element)
+        for _ in range(4):
+            if clickable:
+                clickable = await _ensure_click_safety_zone(page, post_element, clickable)
+            if clickable and await _is_in_viewport(page, clickable):
+                if await _mouse_click_element_center(page, clickable):
+                    logger.info('Liked post')
+                    return True
+                return False
+            if not await _micro_scroll_to_button(page, post_element):
+                return False
+            clickable = await _find_like_button(post_element)
+    except Exception as exc:
+        logger.error(f'Error liking post: {type(exc).__name__} - {exc}')
+    return False
+
+
+async def _find_like_button(post_element):
+    like_svg = (
+        await post_element.query_selector('svg[aria-label="Like"]')
+        or await post_element.query_selector('div[role="button"] svg[aria-label="Like"]')
+    )
+    if not like_svg:
+        return None
+    return await like_svg.query_selector('xpath=ancestor-or-self::*[@role="button" or self::button][1]')
+
+
+async def _effective_viewport(page) -> tuple[float, float]:
+    # Smallest of the JS inner size and Playwright's viewport, so clicks never aim into non-client areas
+    widths, heights = [], []
+    try:
+        widths.append(float(await page.evaluate('() => window.innerWidth') or 0))
+        heights.append(float(await page.evaluate('() => window.innerHeight') or 0))
+    except Exception:
+        pass
+    viewport = getattr(page, 'viewport_size', None) or {}
+    widths.append(float(viewport.get('width') or 0))
+    heights.append(float(viewport.get('height') or 0))
+    widths = [value for value in widths if value > 0]
+    heights = [value for value in heights if value > 0]
+    return (min(widths) if widths else 1200.0), (min(heights) if heights else 900.0)
+
+
+async def _ensure_click_safety_zone(page, post_element, clickable):
+    """Nudge the feed up when the like button sits too close to the bottom edge."""
+    current = clickable
+    for attempt in range(_CLICK_SAFETY_ATTEMPTS):
+        box = await current.bounding_box() if current else None
+        if not box:
+            return None
+        _, eff_h = await _effective_viewport(page)
+        bottom_gap = eff_h - (box['y'] + box['height'])
+        if bottom_gap >= _MIN_BOTTOM_GAP_FOR_CLICK:
+            return current
+        max_step = max(80, int(eff_h * _CLICK_SAFETY_MAX_STEP_RATIO))
+        scroll_step = int(round(_MIN_BOTTOM_GAP_FOR_CLICK - bottom_gap + random.uniform(10.0, 20.0)))
+        scroll_step = max(22, min(scroll_step, max_step))
+        _debug_like(f'click-safety: attempt={attempt + 1} bottom_gap={bottom_gap:.1f} -> micro-scroll {scroll_step}px')
+        try:
+            await smooth_wheel(page, scroll_step, duration_s=random.uniform(0.18, 0.30), easing=ease_out_cubic)
+            await sleep(random.uniform(0.06, 0.14))
+        except Exception as exc:
+            _debug_like(f'click-safety: scroll exception={type(exc).__name__}: {exc}')
+            return current
+        current = await _find_like_button(post_element)
+        new_box = await current.bounding_box() if current else None
+        if not new_box:
+            continue
+        _, new_eff_h = await _effective_viewport(page)
+        if new_eff_h - (new_box['y'] + new_box['height']) < bottom_gap - 1.0:
+            _debug_like('click-safety: direction mismatch detected, reversing')
+            try:
+                await smooth_wheel(page, -int(round(scroll_step * 1.2)), duration_s=random.uniform(0.18, 0.30), easing=ease_out_cubic)
+                await sleep(random.uniform(0.06, 0.14))
+                current = await _find_like_button(post_element)
+            except Exception as exc:
+                _debug_like(f'click-safety: reverse exception={type(exc).__name__}: {exc}')
+                return current
+    return current
+
+
+async def _micro_scroll_to_button(page, post_element) -> bool:
+    """One small smooth scroll towards the like button; True once it is in view."""
+    clickable = await _find_like_button(post_element)
+    if clickable and await _is_in_viewport(page, clickable):
+        return True
+    if await post_element.query_selector('svg[aria-label="Unlike"]'):
+        return False
+    viewport_w, viewport_h = await _effective_viewport(page)
+    try:
+        await safe_mouse_move(page, *_pick_point(int(viewport_w), int(viewport_h)))
+        await sleep(random.uniform(0.05, 0.12))
+        scroll_amount = random.randint(max(90, int(viewport_h * 0.12)), max(120, int(viewport_h * 0.22)))
+        box = await clickable.bounding_box() if clickable else None
+        if box:
+            bottom_gap = viewport_h - (box['y'] + box['height'])
+            if bottom_gap < 18:
+                scroll_amount = int(round(max(0.0, 18.0 - bottom_gap) + random.uniform(12.0, 24.0)))
+                scroll_amount = max(20, min(scroll_amount, max(70, int(viewport_h * 0.40))))
+            elif box['y'] < 10:
+                scroll_amount = -int(round(max(0.0, 10.0 - box['y']) + random.uniform(10.0, 20.0)))
+                scroll_amount = min(-18, max(scroll_amount, -max(60, int(viewport_h * 0.30))))
+        duration = random.uniform(0.25, 0.40) + min(1.2, scroll_amount / 500) * random.uniform(0.12, 0.22)
+        await smooth_wheel(page, scroll_amount, duration_s=duration, easing=ease_out_cubic)
+        await sleep(random.uniform(0.1, 0.2))
+    except Exception as exc:
+        _debug_like(f'micro-scroll: exception={type(exc).__name__}: {exc}')
+    clickable = await _find_like_button(post_element)
+    return bool(clickable and await _is_in_viewport(page, clickable))
+
+
+async def _is_in_viewport(page, element, margin: int = 12) -> bool:
+    try:
+        box = await element.bounding_box() if element else None
+        if not box:
+            return False
+        viewport_w, viewport_h = await _effective_viewport(page)
+        return (
+            box['x'] >= margin
+            and box['y'] >= margin
+            and box['x'] + box['width'] <= viewport_w - margin
+            and box['y'] + box['height'] <= viewport_h - margin
+            and box['width'] > 0
+            and box['height'] > 0
+        )
+    except Exception:
+        return False
+
+
+async def _mouse_click_element_center(page, element) -> bool:
+    try:
+        box = await element.bounding_box() if element else None
+        if not box:
+            return False
+        raw_x = box['x'] + (box['width'] / 2) + random.uniform(-2.0, 2.0)
+        raw_y = box['y'] + (box['height'] / 2) + random.uniform(-2.0, 2.0)
+        eff_w, eff_h = await _effective_viewport(page)
+        safe_x = max(_CLICK_EDGE_MARGIN_X, min(float(raw_x), eff_w - _CLICK_EDGE_MARGIN_X))
+        safe_y = max(_CLICK_EDGE_MARGIN_TOP, min(float(raw_y), eff_h - _CLICK_EDGE_MARGIN_BOTTOM))
+        await safe_mouse_move(page, safe_x, safe_y, steps=random.randint(5, 10))
+        await sleep(random.uniform(0.05, 0.12))
+        await page.mouse.click(safe_x, safe_y, delay=random.randint(25, 65))
+        _debug_like(f'mouse-click executed at safe=({safe_x:.1f},{safe_y:.1f})')
+        return True
+    except Exception as exc:
+        _debug_like(f'mouse-click exception={type(exc).__name__}: {exc}')
+        return False
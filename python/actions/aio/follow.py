@@ -0,0 +1,366 @@
+import asyncio
+import random
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from python.actions.engagement.follow.filter import FOLLOWING_COUNT_SCRIPT
+from python.actions.engagement.follow.runtime import FollowRuntimeContext, _follow_context
+from python.actions.engagement.follow.search import call_on_success, clean_usernames
+from python.actions.engagement.follow.types import FollowInteractionsConfig
+from python.core.selectors import FOLLOW_BACK_BUTTON, FOLLOW_BUTTON, FOLLOWING_BUTTON, REQUESTED_BUTTON, SEARCH_BUTTON
+
+from . import selectors
+from .common import random_delay, sleep
+from .follow_interactions import pre_follow_interactions
+
+
+async def follow_usernames(
+    page,
+    usernames: Iterable[str],
+    log: Callable[[str], None],
+    should_stop: Optional[Callable[[], bool]] = None,
+    following_limit: Optional[int] = None,
+    on_success: Optional[Callable[[str], None]] = None,
+    on_skip: Optional[Callable[[str], None]] = None,
+    interactions_config: Optional[FollowInteractionsConfig] = None,
+    delay_range: Tuple[int, int] = (10, 20),
+    run_blocking=None,
+) -> None:
+    should_stop = should_stop or (lambda: False)
+    clean_usernames_list = clean_usernames(usernames)
+    if not clean_usernames_list:
+        log('Нет валидных юзернеймов для подписки.')
+        return
+    context = _follow_context(should_stop, following_limit, on_success, on_skip, interactions_config, delay_range)
+    # on_success/on_skip write account status; the runner's blocking pool keeps them off the event loop
+    run_blocking = run_blocking or asyncio.to_thread
+    log(f'Использую существующую сессию для подписки ({len(clean_usernames_list)} чел.)')
+    if not await _ensure_instagram_open(page, log):
+        return
+    for username in clean_usernames_list:
+        if context['should_stop']():
+            log('Остановка по запросу пользователя.')
+            break
+        await _follow_single_username(page, username, log, context, run_blocking)
+        await random_delay(*context['delay_range'])
+
+
+async def _ensure_instagram_open(page, log) -> bool:
+    try:
+        if page.url != 'about:blank':
+            return True
+        await page.goto('https://www.instagram.com', timeout=15000)
+        return True
+    except Exception:
+        log('Не удалось открыть Instagram перед началом подписки.')
+        return False
+
+
+async def _follow_single_username(page, username: str, log, context: FollowRuntimeContext, run_blocking) -> None:
+    try:
+        log(f'Открываю @{username}')
+        if not await open_profile_via_search_first(page, username, log):
+            await page.goto(f'https://www.instagram.com/{username}/', timeout=20000, wait_until='domcontentloaded')
+        await random_delay(1, 2)
+        if await should_skip_by_following(page, username, context['following_limit'], log):
+            if context['on_skip']:
+                await run_blocking(_call_on_skip, context['on_skip'], username, log)
+            return
+        await pre_follow_interactions(
+            page,
+            log,
+            highlights_range=context['highlights_range'],
+            likes_percentage=context['likes_percentage'],
+            scroll_percentage=context['scroll_percentage'],
+            should_stop=context['should_stop'],
+        )
+        if context['should_stop']():
+            log('Остановка по запросу пользователя.')
+            return
+        await _complete_follow_action(page, username, log, context, run_blocking)
+    except Exception as exc:
+        log(f'Ошибка при обработке @{username}: {exc}')
+        await random_delay(2, 5)
+
+
+def _call_on_skip(callback: Callable[[str], None], username: str, log) -> None:
+    try:
+        callback(username)
+    except Exception as callback_err:
+        log(f'Не удалось обновить статус пропуска @{username}: {callback_err}')
+
+
+async def _complete_follow_action(page, username: str, log, context: FollowRuntimeContext, run_blocking) -> None:
+    state, button = await find_follow_control(page)
+    if state in ('requested', 'following'):
+        log(f'Уже подписаны/запрошено для @{username} ({state}).')
+        await run_blocking(call_on_success, context['on_success'], username, log)
+        return
+    if not button:
+        log(f'Не нашел кнопку Follow для @{username}')
+        return
+    log(f'Нажимаю Follow на @{username}...')
+    await button.click()
+    await random_delay(1, 2)
+    state_after = await wait_for_follow_state(page, timeout_ms=8000)
+    if state_after in ('requested', 'following'):
+        log(f'Успешная подписка на @{username}')
+        await run_blocking(call_on_success, context['on_success'], username, log)
+        return
+    log(f'Статус не изменился после клика для @{username} ({state_after})')
+
+
+async def find_follow_control(page):
+    """``(state, element)`` for the profile's follow button; state is follow, requested, following or None."""
+    for state, selector in (
+        ('following', FOLLOWING_BUTTON),
+        ('requested', REQUESTED_BUTTON),
+        ('follow', FOLLOW_BACK_BUTTON),
+        ('follow', FOLLOW_BUTTON),
+    ):
+        button = await selectors.find(selector, page)
+        if button:
+            return state, button
+    return None, None
+
+
+async def wait_for_follow_state(page, timeout_ms: int = 8000):
+    deadline = time.time() + (timeout_ms / 1000.0)
+    while time.time() < deadline:
+        try:
+            state, _ = await find_follow_control(page)
+            if state in ('requested', 'following'):
+                return state
+        except Exception:
+            pass
+        await sleep(0.5)
+    return None
+
+
+async def should_skip_by_following(page, username: str, limit: Optional[int], log: Callable[[str], None]) -> bool:
+    """True if the profile follows more accounts than ``limit`` (when limit > 0)."""
+    if limit is None:
+        return False
+    try:
+        limit_val = int(limit)
+    except Exception:
+        log(f'Некорректный лимит подписок: {limit}, пропускаю фильтр.')
+        return False
+    if limit_val <= 0:
+        return False
+    try:
+        await page.wait_for_selector('a[href*="/following"]', timeout=4000)
+    except Exception:
+        pass
+    try:
+        count = await page.evaluate(FOLLOWING_COUNT_SCRIPT)
+    except Exception as err:
+        log(f'Не удалось получить число подписок: {err}')
+        count = None
+    if count is None:
+        log('Не удалось определить число подписок, продолжаю без фильтра.')
+        return False
+    log(f'@{username}: подписок {count}, лимит {limit_val}.')
+    if count > limit_val:
+        log(f'Пропускаю @{username}: слишком много подписок ({count} > {limit_val}).')
+        return True
+    return False
+
+
+async def open_profile_via_search_first(page, username: str, log: Callable[[str], None]) -> bool:
+    username = (username or '').strip().lstrip('@')
+    if not username:
+        return False
+    try:
+        if page.url == 'about:blank':
+            await page.goto('https://www.instagram.com/', timeout=15000)
+            await random_delay(1.0, 2.0)
+    except Exception:
+        pass
+    try:
+        search_btn = await selectors.find(SEARCH_BUTTON, page)
+        if not search_btn:
+            return False
+        try:
+            await search_btn.scroll_into_view_if_needed()
+        except Exception:
+            pass
+        await search_btn.click()
+        await random_delay(0.6, 1.2)
+        search_input = await _pick_visible(
+            [
+                page.locator('input[aria-label="Search input"]'),
+                page.locator('input[placeholder="Search"]'),
+                page.locator('input[aria-label*="Search" i]'),
+                page.locator('input[type="text"]'),
+            ],
+            timeout_ms=4500,
+        )
+        if not search_input:
+            return False
+        await _clear_and_type_search(page, search_input, username)
+        dialog = await _search_dialog(page, search_input)
+        if not dialog:
+            return False
+        result = await _find_user_result_link(page, dialog, username, log)
+        if not result:
+            return False
+        await result.click()
+        return await _wait_for_profile_url(page, username)
+    except Exception as exc:
+        log(f'Поиск не сработал для @{username}: {exc}')
+        try:
+            await page.keyboard.press('Escape')
+        except Exception:
+            pass
+        return False
+
+
+async def _pick_visible(locator_candidates, timeout_ms: int = 3500):
+    deadline = time.time() + (timeout_ms / 1000.0)
+    while time.time() < deadline:
+        for locator in locator_candidates:
+            try:
+                candidate = locator.first
+                if await candidate.count() > 0 and await candidate.is_visible():
+                    return candidate
+            except Exception:
+                continue
+        await sleep(0.15)
+    return None
+
+
+async def _clear_and_type_search(page, search_input, username: str) -> None:
+    try:
+        await search_input.click()
+    except Exception:
+        pass
+    try:
+        await search_input.fill('')
+    except Exception:
+        try:
+            await page.keyboard.press('Control+A')
+            await page.keyboard.press('Backspace')
+        except Exception:
+            pass
+    await random_delay(0.15, 0.35)
+    try:
+        await search_input.type(username, delay=random.randint(80, 160))
+    except Exception:
+        await page.keyboard.type(username, delay=random.randint(80, 160))
+    await random_delay(0.8, 1.6)
+
+
+async def _search_dialog(page, search_input):
+    try:
+        dialog = page.locator('div[role="dialog"]').filter(has=search_input).first
+        if await dialog.count() > 0:
+            return dialog
+    except Exception:
+        pass
+    try:
+        return page.locator('div[role="dialog"]').last
+    except Exception:
+        return None
+
+
+async def _find_user_result_link(page, dialog, username: str, log: Callable[[str], None]):
+    username_lower = (username or '').strip().lstrip('@').lower()
+    if not username_lower:
+        return None
+    await sleep(1.5)
+    links = await _search_result_links(page, dialog, log)
+    if links:
+        for strategy in (_match_span_text, _match_link_headline, _match_direct_href, _match_list_href):
+            result = await strategy(page, dialog, links, username_lower, log)
+            if result:
+                return result
+    log(f'Профиль @{username} не найден в результатах поиска')
+    return None
+
+
+async def _search_result_links(page, dialog, log) -> List:
+    try:
+        links = await dialog.locator('a[role="link"]').all()
+        log(f'Найдено {len(links)} ссылок в диалоге поиска')
+        if links:
+            return links
+    except Exception as exc:
+        log(f'Ошибка поиска ссылок в диалоге: {exc}')
+    try:
+        links = await page.locator('a[role="link"]').all()
+        log(f'Найдено {len(links)} ссылок на странице')
+        return links
+    except Exception:
+        return []
+
+
+async def _match_span_text(page, dialog, links, username_lower: str, log):
+    for link in links:
+        try:
+            spans = await link.locator('span').all()
+        except Exception:
+            continue
+        for span in spans:
+            try:
+                span_text = (await span.inner_text() or '').strip().lstrip('@').lower()
+                if span_text == username_lower and await link.is_visible():
+                    log(f'Найден профиль по тексту span: {username_lower}')
+                    return link
+            except Exception:
+                continue
+    return None
+
+
+async def _match_link_headline(page, dialog, links, username_lower: str, log):
+    for link in links:
+        try:
+            lines = (await link.inner_text() or '').strip().splitlines()
+            head = (lines[0] if lines else '').strip().lstrip('@').lower()
+            if head == username_lower and await link.is_visible():
+                log(f'Найден профиль по первой строке: {username_lower}')
+                return link
+        except Exception:
+            continue
+    return None
+
+
+async def _match_direct_href(page, dialog, links, username_lower: str, log):
+    for scope, label in ((dialog, 'в диалоге'), (page, 'на странице')):
+        try:
+            direct = scope.locator(f'a[href="/{username_lower}/"]').first
+            if await direct.count() > 0 and await direct.is_visible():
+                log(f'Найден профиль по href {label}: {username_lower}')
+                return direct
+        except Exception:
+            continue
+    return None
+
+
+async def _match_list_href(page, dialog, links, username_lower: str, log):
+    for link in links:
+        try:
+            href = (await link.get_attribute('href') or '').strip().lower()
+            if href == f'/{username_lower}/' and await link.is_visible():
+                log(f'Найден профиль по href в списке: {username_lower}')
+                return link
+        except Exception:
+            continue
+    return None
+
+
+async def _wait_for_profile_url(page, username: str) -> bool:
+    username_lower = (username or '').strip().lstrip('@').lower()
+    if not username_lower:
+        return False
+    try:
+        await page.wait_for_load_state('domcontentloaded', timeout=15000)
+    except Exception:
+        pass
+    for pattern in (f'**/{username_lower}/', f'**/{username_lower}/*'):
+        try:
+            await page.wait_for_url(pattern, timeout=15000 if pattern.endswith('/') else 5000)
+            break
+        except Exception:
+            continue
+    return f'/{username_lower}/' in (page.url or '').lower()
@@ -0,0 +1,466 @@
+"""
+Async ports of the pre-follow profile interactions (highlights, post scrolling and likes)
+"""
+import random
+from typing import Callable, Set
+
+from python.actions.engagement.follow.filter import POSTS_COUNT_SCRIPT
+from python.actions.engagement.follow.highlights_runtime import (
+    HIGHLIGHT_READY_SCRIPT,
+    HIGHLIGHT_VISIBLE_SCRIPT,
+    _highlight_watch_delay_range,
+    _target_highlights,
+)
+from python.actions.engagement.follow.interactions import _count_from_percentages, _planned_highlights
+from python.actions.engagement.follow.posts_runtime import VISIBLE_ELEMENT_SCRIPT
+
+from .common import find_close_button, random_delay
+from .scrolling import human_scroll
+
+_POST_LINK_SELECTORS = (
+    "a[href*='/reel/']",
+    "a[href*='/p/']",
+    'article a',
+    "div[role='button'] a",
+    'article div a',
+    "[data-testid*='post'] a",
+    'a:has(video)',
+    "a[role='link']:has(svg[aria-label='Clip'])",
+    "a[role='link']:has(svg[aria-label='Video'])",
+)
+_HIGHLIGHT_SELECTORS = (
+    'xpath=//div[@role="button" and contains(@aria-label,"highlight")]',
+    'xpath=//a[contains(@aria-label,"highlight")]',
+    '[aria-label*="highlight"]',
+    'a[href*="/stories/highlights/"]',
+    'xpath=//a[contains(@href,"/highlights/")]',
+)
+
+
+async def pre_follow_interactions(
+    page,
+    log: Callable[[str], None],
+    highlights_range=(2, 4),
+    likes_percentage: int = 0,
+    scroll_percentage: int = 0,
+    should_stop: Callable[[], bool] | None = None,
+) -> None:
+    """Run lightweight interactions before follow."""
+    highlights_to_watch = _planned_highlights(highlights_range)
+    likes_to_put, scroll_count = await _interaction_counts(page, log, likes_percentage, scroll_percentage)
+    liked_posts: Set[str] = set()
+    actions = []
+    if highlights_to_watch > 0:
+        actions.append(('highlights', lambda: watch_highlights(page, log, highlights_to_watch=highlights_to_watch, should_stop=should_stop)))
+    else:
+        log('Пропускаю хайлайты (настроено 0).')
+    if likes_to_put > 0:
+        actions.append(
+            (
+                'scroll',
+                lambda: scroll_posts(
+                    page,
+                    log,
+                    scroll_count=scroll_count,
+                    like_between=True,
+                    like_probability=0.65,
+                    max_likes=likes_to_put,
+                    liked_posts=liked_posts,
+                    should_stop=should_stop,
+                ),
+            )
+        )
+    else:
+        actions.append(('scroll', lambda: scroll_posts(page, log, scroll_count=scroll_count, liked_posts=liked_posts, should_stop=should_stop)))
+        log('Пропускаю лайки (настроено 0).')
+    random.shuffle(actions)
+    for name, action in actions:
+        if should_stop and should_stop():
+            log('Остановка по запросу пользователя.')
+            break
+        await action()
+        if name == 'scroll':
+            await random_delay(1.0, 2.0)
+
+
+async def _interaction_counts(page, log, likes_percentage: int, scroll_percentage: int) -> tuple[int, int]:
+    scroll_count = random.randint(2, 5)
+    if likes_percentage <= 0 and scroll_percentage <= 0:
+        return 0, scroll_count
+    try:
+        await page.wait_for_selector(
+            'span:has-text("posts"), div:has-text("posts"), a:has-text("posts"), '
+            'span:has-text("публикац"), div:has-text("публикац"), a:has-text("публикац")',
+            timeout=4000,
+        )
+    except Exception:
+        pass
+    try:
+        total_posts = await page.evaluate(POSTS_COUNT_SCRIPT)
+    except Exception as err:
+        log(f'Не удалось получить число постов: {err}')
+        total_posts = None
+    if not total_posts:
+        log('Не удалось определить число постов для процентного расчета. Использую случайные значения.')
+        return 0, scroll_count
+    effective_posts = min(total_posts, 10)
+    log(f'Найдено постов: {total_posts}')
+    if effective_posts < total_posts:
+        log(f'Для расчётов использую максимум: {effective_posts}')
+    return _count_from_percentages(log, effective_posts, likes_percentage, scroll_percentage, scroll_count)
+
+
+async def scroll_posts(
+    page,
+    log: Callable[[str], None],
+    scroll_count: int | None = None,
+    like_between: bool = False,
+    like_probability: float = 0.6,
+    max_likes: int | None = None,
+    liked_posts: Set[str] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> None:
+    try:
+        log('Просматриваю посты профиля...')
+        planned_scrolls = scroll_count if scroll_count is not None else random.randint(2, 5)
+        likes_used = 0
+        seen = liked_posts if liked_posts is not None else set()
+        for index in range(planned_scrolls):
+            if _stop_requested(should_stop, log):
+                return
+            await human_scroll(page, should_stop=should_stop)
+            if _stop_requested(should_stop, log):
+                return
+            log(f'Прокрутка {index + 1}/{planned_scrolls} (human-like)')
+            await random_delay(1.0, 2.5)
+            if not like_between or (max_likes is not None and likes_used >= max_likes):
+                continue
+            if random.random() >= like_probability:
+                continue
+            before = len(seen)
+            await like_some_posts(page, log, max_posts=1, liked_posts=seen, should_stop=should_stop)
+            likes_used += max(0, len(seen) - before)
+        await _return_to_page_top(page, log)
+    except Exception as err:
+        log(f'Пропускаю пролистывание постов: {err}')
+
+
+def _stop_requested(should_stop, log) -> bool:
+    if should_stop and should_stop():
+        log('Остановка по запросу пользователя.')
+        return True
+    return False
+
+
+async def _return_to_page_top(page, log) -> None:
+    await page.mouse.wheel(0, -800)
+    log('Возвращаюсь немного вверх')
+    await random_delay(0.5, 1.0)
+    current_scroll = await _scroll_position(page)
+    while current_scroll > 0:
+        await page.mouse.wheel(0, -min(current_scroll, random.randint(400, 800)))
+        await random_delay(0.2, 0.6)
+        next_scroll = await _scroll_position(page)
+        if next_scroll == current_scroll:
+            break
+        current_scroll = next_scroll
+    try:
+        if await _scroll_position(page) > 10:
+            await page.evaluate("() => window.scrollTo({ top: 0, behavior: 'smooth' })")
+            await random_delay(0.5, 1.0)
+    except Exception:
+        pass
+    log('Вернулся в начало страницы')
+    await random_delay(0.5, 1.0)
+
+
+async def _scroll_position(page) -> int:
+    try:
+        return await page.evaluate('() => window.scrollY') or 0
+    except Exception:
+        return 0
+
+
+async def like_some_posts(
+    page,
+    log: Callable[[str], None],
+    max_posts: int = 1,
+    liked_posts: Set[str] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> None:
+    if max_posts <= 0:
+        log('Пропускаю лайки (настроено 0).')
+        return
+    liked = liked_posts if liked_posts is not None else set()
+    try:
+        post_links = await _collect_post_links(page, log, max_posts, liked)
+        if not post_links:
+            log('Посты не найдены для лайка')
+            return
+        available_posts = [link for link in post_links if await _is_visible(page, link, VISIBLE_ELEMENT_SCRIPT)]
+        if not available_posts:
+            log('Нет видимых постов для лайка')
+            return
+        selected_posts = random.sample(available_posts, min(max_posts, len(available_posts)))
+        log(f'Выбрано {len(selected_posts)} случайных постов из {len(available_posts)} видимых')
+        processed = 0
+        for link in selected_posts:
+            if _stop_requested(should_stop, log):
+                return
+            if await _like_single_post(page, link, log, liked):
+                processed += 1
+        log(f'Обработано {processed} постов')
+    except Exception as err:
+        log(f'Пропускаю лайки постов: {err}')
+
+
+async def _collect_post_links(page, log, max_posts: int, liked: Set[str]):
+    post_links = []
+    seen_hrefs = set(liked)
+    for selector in _POST_LINK_SELECTORS:
+        added = 0
+        for link in await page.query_selector_all(selector) or []:
+            href = await link.get_attribute('href') or ''
+            if not href or href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
+            post_links.append(link)
+            added += 1
+        if added:
+            log(f'Найдено {added} постов с селектором: {selector}')
+    return post_links[: max_posts * 4] if max_posts else post_links
+
+
+async def _is_visible(page, element, script: str) -> bool:
+    try:
+        return bool(await page.evaluate(script, element))
+    except Exception:
+        return False
+
+
+async def _like_single_post(page, link, log, liked: Set[str]) -> bool:
+    href = await link.get_attribute('href') or ''
+    if href and href in liked:
+        log('Пропускаю уже лайкнутый пост')
+        return False
+    if not await _is_visible(page, link, VISIBLE_ELEMENT_SCRIPT):
+        return False
+    try:
+        log('Открываю пост для лайка...')
+        await link.click()
+        await random_delay(1.5, 2.5)
+        did_like = await _click_like_button(page, log)
+        if did_like and href:
+            liked.add(href)
+        await _close_overlay(page, log, 'Пост')
+        await random_delay(1.0, 2.0)
+        return did_like
+    except Exception as err:
+        log(f'Пропускаю пост: {err}')
+        try:
+            await page.keyboard.press('Escape')
+        except Exception:
+            pass
+        await random_delay(0.5, 1.0)
+        return False
+
+
+async def _click_like_button(page, log) -> bool:
+    like_btn = None
+    for selector in (
+        'svg[aria-label="Like"]',
+        'button[aria-label="Like"]',
+        '[role="button"][aria-label*="Like"]',
+        'button[data-testid*="like"]',
+        '[aria-label*="like" i]',
+    ):
+        like_btn = await page.query_selector(selector)
+        if like_btn:
+            break
+    if not like_btn:
+        log('Кнопка лайка не найдена')
+        return False
+    if not await _is_visible(page, like_btn, VISIBLE_ELEMENT_SCRIPT):
+        log('Кнопка лайка не видна')
+        return False
+    await like_btn.click()
+    log('Лайк поставлен')
+    await random_delay(0.5, 1.0)
+    return True
+
+
+async def _close_overlay(page, log, subject: str) -> bool:
+    close_btn = await find_close_button(page)
+    if close_btn:
+        try:
+            await close_btn.click()
+            log(f'{subject} закрыт кнопкой')
+            return True
+        except Exception as close_err:
+            log(f'Не удалось закрыть кнопкой: {close_err}')
+    try:
+        await page.keyboard.press('Escape')
+        log(f'{subject} закрыт клавишей Escape')
+        return True
+    except Exception:
+        log(f'Не удалось закрыть {subject.lower()}')
+        return False
+
+
+async def watch_highlights(
+    page,
+    log: Callable[[str], None],
+    highlights_to_watch: int | None = None,
+    max_wait: float = 4.0,
+    should_stop: Callable[[], bool] | None = None,
+) -> None:
+    try:
+        if should_stop and should_stop():
+            return
+        target_highlights = _target_highlights(highlights_to_watch, log)
+        if target_highlights <= 0:
+            return
+        highlight_buttons = await _visible_highlight_buttons(page, log)
+        if not highlight_buttons:
+            return
+        if not await _open_random_highlight(page, log, highlight_buttons, max_wait, should_stop):
+            log('Не удалось открыть ни один хайлайт')
+            return
+        log('Хайлайт успешно открыт')
+        await random_delay(2.0, 4.0)
+        await _watch_opened_highlights(page, log, target_highlights, should_stop)
+        if await _close_overlay(page, log, 'Хайлайт'):
+            log('Жду восстановления страницы после хайлайта...')
+            await random_delay(3.0, 5.0)
+    except Exception as err:
+        log(f'Пропускаю хайлайты: {err}')
+
+
+async def _visible_highlight_buttons(page, log):
+    highlight_buttons = []
+    for selector in _HIGHLIGHT_SELECTORS:
+        highlight_buttons.extend(await page.query_selector_all(selector))
+    if not highlight_buttons:
+        log('Хайлайты не найдены')
+        return []
+    visible_buttons = [button for button in highlight_buttons if await _is_visible(page, button, HIGHLIGHT_VISIBLE_SCRIPT)]
+    if not visible_buttons:
+        log('Видимых хайлайтов не найдено')
+        return []
+    random.shuffle(visible_buttons)
+    return visible_buttons
+
+
+async def _open_random_highlight(page, log, highlight_buttons, max_wait: float, should_stop) -> bool:
+    log('Смотрю хайлайт...')
+    for button in highlight_buttons:
+        if should_stop and should_stop():
+            log('Остановка по запросу пользователя.')
+            return False
+        if await _open_highlight_with_retries(page, log, button, max_wait):
+            return True
+    return False
+
+
+async def _open_highlight_with_retries(page, log, button, max_wait: float) -> bool:
+    max_attempts = 8
+    for attempt in range(max_attempts):
+        try:
+            await _scroll_highlight_into_view(page, button)
+            await page.wait_for_function(HIGHLIGHT_READY_SCRIPT, arg=button, timeout=2000)
+            await random_delay(0.3, 0.8)
+            if not await _click_highlight(page, log, button):
+                continue
+            await random_delay(1.5, max_wait)
+            if await _highlight_opened(page):
+                return True
+            log('Хайлайт не открылся, пробую ещё...')
+            await random_delay(0.6, 1.2)
+        except Exception as exc:
+            if attempt == max_attempts - 1:
+                log(f'Пропускаю кнопку хайлайта: {exc}')
+            await random_delay(0.5, 1.0)
+    return False
+
+
+async def _scroll_highlight_into_view(page, button) -> None:
+    try:
+        await page.evaluate(
+            "(element) => element.scrollIntoView({ behavior: 'instant', block: 'center', inline: 'center' });",
+            button,
+        )
+    except Exception:
+        pass
+
+
+async def _click_highlight(page, log, button) -> bool:
+    await _scroll_highlight_into_view(page, button)
+    await random_delay(0.2, 0.5)
+    for click in (
+        lambda: button.click(),
+        lambda: button.click(force=True),
+        lambda: page.evaluate('(element) => element.click()', button),
+    ):
+        try:
+            await click()
+            return True
+        except Exception:
+            continue
+    log('Не удалось кликнуть по хайлайту JS')
+    return False
+
+
+async def _highlight_opened(page) -> bool:
+    return bool(
+        await page.query_selector('[aria-label="Next"], svg[aria-label="Next"], [aria-label="Close"]')
+        or await page.query_selector('[role="dialog"] [aria-label="Close"]')
+        or await page.query_selector('video')
+        or 'stories/highlights' in (page.url or '')
+    )
+
+
+async def _watch_opened_highlights(page, log, target_highlights: int, should_stop) -> None:
+    log('Смотрю хайлайты...')
+    watched = 0
+    while watched < target_highlights:
+        if should_stop and should_stop():
+            log('Остановка по запросу пользователя.')
+            break
+        await random_delay(*_highlight_watch_delay_range())
+        watched += 1
+        if watched >= target_highlights:
+            break
+        if not await _advance_highlight(page, log, watched + 1, target_highlights):
+            break
+    log(f'Просмотрено {watched} хайлайтов')
+
+
+async def _advance_highlight(page, log, index: int, total: int) -> bool:
+    next_btn = await _find_story_nav(page, 'Next')
+    if next_btn:
+        try:
+            await next_btn.click()
+            log(f'Переход к следующему хайлайту ({index}/{total})')
+            await random_delay(1.0, 2.0)
+            return True
+        except Exception as exc:
+            log(f'Не удалось перейти к следующему хайлайту: {exc}')
+    try:
+        await page.keyboard.press('ArrowRight')
+        log(f'Переход стрелкой вправо ({index}/{total})')
+        await random_delay(1.0, 2.0)
+        return True
+    except Exception as exc:
+        log(f"Кнопка 'Далее' не найдена и клавиша не сработала: {exc}")
+        return False
+
+
+async def _find_story_nav(page, label: str):
+    try:
+        for svg in await page.query_selector_all(f'svg[aria-label*="{label}" i]'):
+            btn = await svg.query_selector('xpath=ancestor-or-self::*[@role="button"][1]')
+            if btn:
+                return btn
+    except Exception:
+        return None
+    return None
@@ -0,0 +1,233 @@
+import asyncio
+import random
+from typing import Callable, Dict, List, Optional
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from python.actions.messaging.db import mark_sent
+from python.actions.messaging.runtime import _behavior_config, _mark_followed_target
+from python.core.errors.retry import async_retry_with_backoff
+from python.database.accounts import AccountMutationQueue, InstagramAccountsClient
+
+from .common import random_delay
+
+_MESSAGE_BUTTON_SELECTORS = (
+    'header div[role="button"]:text-is("Message")',
+    'header button:text-is("Message")',
+    'section div[role="button"]:text-is("Message")',
+    'section button:text-is("Message")',
+    'div[role="button"]:text-is("Message")',
+    'button:text-is("Message")',
+)
+_MESSAGE_BOX_SELECTORS = (
+    'div[role="textbox"][contenteditable="true"]',
+    'div[aria-label="Message"][contenteditable="true"]',
+    'div[aria-placeholder="Message..."][contenteditable="true"]',
+    '[data-lexical-editor="true"]',
+)
+
+
+async def send_messages(
+    page,
+    targets: List[Dict],
+    message_texts: List[str],
+    log: Callable[[str], None],
+    should_stop: Optional[Callable[[], bool]] = None,
+    behavior_config: Optional[Dict] = None,
+    run_blocking=None,
+) -> int:
+    """Send one of ``message_texts`` to each target (dicts with 'user_name' and 'id') from an open page."""
+    should_stop = should_stop or (lambda: False)
+    if not targets:
+        log("Нет пользователей для рассылки сообщений.")
+        return 0
+    # The mutation queue talks to Convex and the outbox; its calls go through the blocking pool
+    run_blocking = run_blocking or asyncio.to_thread
+    client = await run_blocking(lambda: AccountMutationQueue(InstagramAccountsClient()))
+    try:
+        log("Использую существующую сессию для рассылки сообщений.")
+        return await _run_messaging_flow(page, targets, message_texts, log, should_stop, client, behavior_config or {}, run_blocking)
+    finally:
+        # Send the queued account updates before the session returns
+        await run_blocking(client.close)
+
+
+async def _run_messaging_flow(page, targets, message_texts, log, should_stop, client, behavior_config: Dict, run_blocking) -> int:
+    processed_count = 0
+    behavior = _behavior_config(behavior_config)
+    if not message_texts:
+        log('Нет текстов сообщений для рассылки.')
+        return 0
+    try:
+        try:
+            if page.url == 'about:blank':
+                await page.goto('https://www.instagram.com', timeout=15000)
+        except Exception:
+            pass
+        await random_delay(2, 4)
+        for target in targets:
+            if should_stop():
+                break
+            if await _process_target(page, target, message_texts, log, client, behavior, run_blocking):
+                processed_count += 1
+        log(f'Рассылка завершена. Отправлено: {processed_count}')
+    except Exception as exc:
+        log(f'Критическая ошибка браузера: {exc}')
+    await _close_message_popup(page, log)
+    return processed_count
+
+
+async def _process_target(page, target: Dict, message_texts: List[str], log, client, behavior: Dict, run_blocking) -> bool:
+    username = target.get('user_name')
+    if not username:
+        return False
+    log(f'Обработка сообщения для: {username}')
+    try:
+        if not await _navigate_to_profile(page, username, log):
+            return False
+        await random_delay(*behavior['navigation_delay_range'])
+        if not await _ensure_message_composer(page, target, log, client, behavior, run_blocking):
+            log(f'Не удалось найти кнопку Message для {username}, пропускаю')
+            return False
+        await random_delay(*behavior['composer_delay_range'])
+        sent = await _compose_and_send(page, target, message_texts, log, client, behavior, run_blocking)
+        await random_delay(*behavior['between_targets_delay_range'])
+        return sent
+    except Exception as exc:
+        log(f'Ошибка в процессе отправки для {username}: {exc}')
+        return False
+
+
+async def _navigate_to_profile(page, username: str, log) -> bool:
+    try:
+        # Increased timeouts for very slow proxies
+        await page.goto(f"https://www.instagram.com/{username}/", timeout=45000)
+        await page.wait_for_load_state("networkidle", timeout=30000)
+        log(f"Перешёл на профиль: {username}")
+        return True
+    except Exception as e:
+        log(f"Ошибка перехода на профиль {username}: {e}")
+        return False
+
+
+async def _ensure_message_composer(page, target: Dict, log, client, behavior: Dict, run_blocking) -> bool:
+    if await _click_message_button(page, log):
+        return True
+    if not behavior['follow_if_missing']:
+        return False
+    log(f"Кнопка Message не найдена для {target.get('user_name')}, пробую Follow...")
+    if not await _click_follow_button(page, log):
+        return False
+    await run_blocking(_mark_followed_target, client, target, log)
+    await random_delay(*behavior['navigation_delay_range'])
+    return await _click_message_button(page, log)
+
+
+@async_retry_with_backoff(exceptions=(PlaywrightTimeoutError, Exception), max_retries=3, initial_delay=1.5)
+async def _click_message_button(page, log) -> bool:
+    """Click the profile header's Message button (not the sidebar Messages nav)."""
+    for selector in _MESSAGE_BUTTON_SELECTORS:
+        try:
+            btn = page.locator(selector).first
+            if not await btn.is_visible():
+                continue
+            await btn.click()
+            log("Нажал кнопку Message")
+            await random_delay(2, 4)
+            return True
+        except Exception:
+            continue
+    return False
+
+
+async def _click_follow_button(page, log) -> bool:
+    for selector in ('button:has-text("Follow")', 'div[role="button"]:has-text("Follow")'):
+        try:
+            btn = page.locator(selector).first
+            if await btn.is_visible() and (await btn.inner_text()).strip().lower() == "follow":
+                await btn.click()
+                log("Нажал кнопку Follow")
+                await random_delay(3, 5)
+                return True
+        except Exception:
+            continue
+    return False
+
+
+@async_retry_with_backoff(exceptions=(PlaywrightTimeoutError, Exception), max_retries=3, initial_delay=1.5)
+async def _find_message_box(page, log):
+    for selector in _MESSAGE_BOX_SELECTORS:
+        try:
+            msg_box = page.locator(selector).first
+            if not await msg_box.is_visible():
+                continue
+            log(f"Найдено поле ввода сообщения: {selector}")
+            return msg_box
+        except Exception:
+            continue
+    raise Exception("Message box not found after retries")
+
+
+@async_retry_with_backoff(exceptions=(PlaywrightTimeoutError, Exception), max_retries=3, initial_delay=1.5)
+async def _find_send_button(page):
+    for selector in ('div[role="button"]:has-text("Send")', 'button:has-text("Send")'):
+        send_btn = page.locator(selector).first
+        if await send_btn.is_visible():
+            return send_btn
+    raise Exception("Send button not found after retries")
+
+
+async def _compose_and_send(page, target: Dict, message_texts: List[str], log, client, behavior: Dict, run_blocking) -> bool:
+    username = target.get('user_name')
+    try:
+        msg_box = await _find_message_box(page, log)
+        await msg_box.click()
+        await random_delay(0.5, 1)
+        selected_message = random.choice(message_texts)
+        log(f'Набираю сообщение: {str(selected_message)[:80]}')
+        final_text = selected_message
+        for macro, value in (
+            ('{userName}', target.get('user_name', '')),
+            ('{fullName}', target.get('full_name', '')),
+            ('{matchedName}', target.get('matched_name', '')),
+        ):
+            final_text = final_text.replace(macro, str(value) if value else '')
+        await msg_box.type(final_text, delay=random.randint(*behavior['typing_delay_range_ms']))
+        await random_delay(*behavior['composer_delay_range'])
+        await _send_current_message(page)
+        log(f'Отправил сообщение для {username}')
+        await run_blocking(mark_sent, client, username, log)
+        return True
+    except Exception as exc:
+        log(f'Не удалось отправить сообщение {username}: {str(exc)[:50]}')
+        return False
+
+
+async def _send_current_message(page) -> None:
+    try:
+        send_btn = await _find_send_button(page)
+        await send_btn.click(timeout=3000)
+        return
+    except Exception:
+        pass
+    await random_delay(0.8, 1.2)
+    await page.keyboard.press('Enter')
+
+
+async def _close_message_popup(page, log) -> None:
+    try:
+        close_svg = await page.query_selector('svg[aria-label="Close"]')
+        if close_svg:
+            close_btn = await close_svg.query_selector(
+                'xpath=ancestor-or-self::*[self::button or @role="button"][1]'
+            ) or await close_svg.query_selector('xpath=ancestor-or-self::*[self::div][1]')
+            await (close_btn or close_svg).click()
+            log('Закрыл окно сообщений')
+        else:
+            await page.keyboard.press('Escape')
+        await random_delay(0.5, 1.0)
+    except Exception:
+        try:
+            await page.keyboard.press('Escape')
+        except Exception:
+            pass
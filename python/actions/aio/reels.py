@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import random
+import time
+
+from python.actions.browsing.reels_scrolling.likes import ACTIVE_LIKE_BUTTON_SCRIPT, REELS_LIKE_BUTTON_XPATH
+from python.actions.browsing.reels_scrolling.runtime import (
+    FOLLOW_BUTTON_SCRIPT,
+    NEXT_REEL_BUTTON_XPATH,
+    _advance_delay,
+    _chance_hit,
+    _log_time_remaining,
+    _session_active,
+    _session_clock,
+    _watch_time,
+)
+from python.core import pacing
+from python.core.storage.state_persistence import save_state
+
+from .common import random_delay, safe_mouse_move
+
+logger = logging.getLogger(__name__)
+
+
+async def scroll_reels(
+    page,
+    duration_minutes: int,
+    actions_config: dict,
+    should_stop=None,
+    profile_name: str = 'unknown',
+    run_blocking=None,
+) -> dict:
+    stats = {'likes': 0, 'follows': 0}
+    clock = _session_clock(duration_minutes)
+    try:
+        await _navigate_reels(page)
+        logger.info(f'Starting {duration_minutes} minute REELS session...')
+        while _session_active(clock, should_stop):
+            _log_time_remaining(clock['end'])
+            await _save_session_progress(profile_name, clock['start'], duration_minutes, run_blocking)
+            if await _reload_stalled_page(page, clock):
+                continue
+            watched_reel = await _watch_reel(actions_config, should_stop)
+            clock['last_action'] = time.time()
+            if not watched_reel:
+                logger.info('Stop signal received during reel watch. Ending reels session.')
+                break
+            if should_stop and should_stop():
+                logger.info('Stop signal received. Ending reels session.')
+                break
+            await _execute_reel_actions(page, actions_config, should_stop, stats)
+            if should_stop and should_stop():
+                logger.info('Stop signal received. Ending reels session.')
+                break
+            if not await _go_to_next_reel(page):
+                break
+            await random_delay(*_advance_delay(actions_config))
+    except Exception as exc:
+        logger.error(f'Error during reels scrolling: {exc}')
+    logger.info(f'Reels session complete: {stats}')
+    return stats
+
+
+async def _navigate_reels(page) -> None:
+    if 'instagram.com/reels' in page.url:
+        return
+    logger.info('Navigating to Reels tab via UI...')
+    try:
+        reels_link = await page.query_selector('a[href="/reels/"]')
+        if reels_link:
+            await _click_reels_link(page, reels_link)
+            return
+        logger.warning('Reels link not found in sidebar')
+    except Exception as exc:
+        logger.error(f'Navigation error, fallback to URL: {exc}')
+    await page.goto('https://www.instagram.com/reels/', timeout=30000)
+    await random_delay(3, 5)
+
+
+async def _click_reels_link(page, reels_link) -> None:
+    box = await reels_link.bounding_box()
+    if not box:
+        logger.warning('Reels link visible but no bounding box')
+        await page.goto('https://www.instagram.com/reels/', timeout=30000)
+        return
+    target_x = box['x'] + (box['width'] / 2)
+    target_y = box['y'] + (box['height'] / 2)
+    await safe_mouse_move(page, target_x, target_y, steps=4)
+    await random_delay(0.2, 0.4)
+    await page.mouse.click(target_x, target_y)
+    await page.wait_for_url('**/reels/**', timeout=15000)
+    await random_delay(1, 2)
+
+
+async def _go_to_next_reel(page) -> bool:
+    try:
+        next_btn = page.locator(f'xpath={NEXT_REEL_BUTTON_XPATH}').first
+        if await next_btn.count() == 0 or not await next_btn.is_visible():
+            logger.warning("Semantic 'Next Reel' button not found.")
+            return False
+        box = await next_btn.bounding_box()
+        if not box:
+            return False
+        center_x = box['x'] + box['width'] / 2
+        center_y = box['y'] + box['height'] / 2
+        await safe_mouse_move(page, center_x, center_y, steps=5)
+        await random_delay(0.2, 0.5)
+        await page.mouse.click(center_x, center_y)
+        logger.info("Clicked 'Next Reel' arrow")
+        return True
+    except Exception as exc:
+        logger.error(f'Error navigating to next reel: {exc}')
+        return False
+
+
+async def _save_session_progress(profile_name: str, start_time: float, duration_minutes: int, run_blocking=None) -> None:
+    elapsed = time.time() - start_time
+    total_duration = duration_minutes * 60
+    progress = int((elapsed / total_duration) * 100) if total_duration > 0 else 0
+    # save_state is a SQLite write; the runner's blocking pool keeps it off the event loop
+    run_blocking = run_blocking or asyncio.to_thread
+    await run_blocking(save_state, profile_name, 'scroll_reels', min(progress, 99))
+
+
+async def _reload_stalled_page(page, clock: dict) -> bool:
+    if time.time() - clock['last_action'] < 180:
+        return False
+    logger.warning('No reels processed in the last 3 minutes. Auto-reloading page...')
+    try:
+        await page.reload(timeout=15000)
+    except Exception as exc:
+        logger.error(f'Failed to reload page: {exc}')
+    clock['last_action'] = time.time()
+    await random_delay(3, 6)
+    return True
+
+
+async def _watch_reel(actions_config: dict, should_stop) -> bool:
+    if not await pacing.async_sleep(_watch_time(actions_config), pacing.current_token()):
+        return False
+    return not (should_stop and should_stop())
+
+
+async def _execute_reel_actions(page, actions_config: dict, should_stop, stats: dict) -> None:
+    actions_to_perform = []
+    if _chance_hit(actions_config.get('like_chance', 0)):
+        actions_to_perform.append(('like', perform_like))
+    if _chance_hit(actions_config.get('follow_chance', 0)):
+        actions_to_perform.append(('follow', _perform_follow))
+    random.shuffle(actions_to_perform)
+    for action_name, action_func in actions_to_perform:
+        if should_stop and should_stop():
+            break
+        try:
+            if await action_func(page):
+                stats[action_name + 's'] += 1
+                await random_delay(1, 2)
+        except Exception as exc:
+            logger.error(f'Error executing {action_name} action on reel: {exc}')
+
+
+async def perform_like(page) -> bool:
+    """Like the current active reel."""
+    try:
+        btn_handle = await page.evaluate_handle(ACTIVE_LIKE_BUTTON_SCRIPT, REELS_LIKE_BUTTON_XPATH)
+        active_btn = btn_handle.as_element()
+        if not active_btn:
+            return False
+        heart_icon = await active_btn.query_selector('svg[aria-label="Like"], svg[aria-label="Unlike"]')
+        if not heart_icon:
+            logger.debug('Skipped liking: Reels like icon not found inside button')
+            return False
+        if await heart_icon.get_attribute('aria-label') == 'Unlike':
+            logger.debug('Skipped liking: Reel already liked')
+            return False
+        coordinates = await _button_coordinates(page, active_btn)
+        if not coordinates:
+            return False
+        x, y = coordinates
+        await safe_mouse_move(page, x, y, steps=random.randint(5, 10))
+        await random_delay(0.05, 0.12)
+        await page.mouse.click(x, y, delay=random.randint(25, 65))
+        logger.info('Liked reel')
+        return True
+    except Exception as exc:
+        logger.error(f'Error liking reel: {exc}')
+    return False
+
+
+async def _button_coordinates(page, active_btn):
+    box = await active_btn.bounding_box()
+    if not box:
+        return None
+    vp = page.viewport_size
+    x = box['x'] + box['width'] / 2
+    y = box['y'] + box['height'] / 2
+    if y < 0 or y > (vp['height'] if vp else 10000):
+        logger.debug(f'Skipped liking: Button y={y} is outside viewport')
+        return None
+    if not vp:
+        return x, y
+    return (
+        max(5.0, min(float(x), float(vp['width']) - 5.0)),
+        max(5.0, min(float(y), float(vp['height']) - 5.0)),
+    )
+
+
+async def _perform_follow(page) -> bool:
+    try:
+        btn_handle = await page.evaluate_handle(FOLLOW_BUTTON_SCRIPT)
+        target = btn_handle.as_element()
+        if not target:
+            logger.debug('No visible Follow button found for current reel')
+            return False
+        box = await target.bounding_box()
+        if not box:
+            return False
+        center_x = box['x'] + box['width'] / 2
+        center_y = box['y'] + box['height'] / 2
+        await safe_mouse_move(page, center_x, center_y, steps=random.randint(4, 8))
+        await random_delay(0.15, 0.35)
+        await page.mouse.click(center_x, center_y, delay=random.randint(20, 60))
+        logger.info('Followed user from reel')
+        return True
+    except Exception as exc:
+        logger.error(f'Error following from reel: {exc}')
+        return False
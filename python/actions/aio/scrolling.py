@@ -0,0 +1,147 @@
+"""
+Async counterparts of python.actions.browsing.scrolling and .mouse
+"""
+import logging
+import math
+import random
+from typing import Callable
+
+from playwright.async_api import Error as PlaywrightError
+
+from python.actions.browsing.mouse import _bezier_point, _clamped_point, _control_points, _movement_delay, _target_point
+from python.actions.browsing.scrolling import (
+    _ScrollStopped,
+    _scroll_delta,
+    _scroll_total,
+    ease_in_out_cubic,
+    ease_out_cubic,
+)
+from python.actions.browsing.viewport import _pick_point
+
+from .common import get_viewport_size, safe_mouse_move, sleep
+
+logger = logging.getLogger(__name__)
+
+
+async def smooth_wheel(
+    page,
+    total_delta: int,
+    duration_s: float,
+    easing: Callable[[float], float],
+    should_stop: Callable[[], bool] | None = None,
+) -> None:
+    if total_delta == 0:
+        return
+    duration_s = max(0.15, float(duration_s))
+    steps = max(6, min(34, int(abs(total_delta) / 55) + random.randint(3, 8)))
+    moved = 0
+    for index in range(1, steps + 1):
+        if should_stop and should_stop():
+            raise _ScrollStopped('scroll stopped')
+        target = total_delta * easing(index / steps)
+        step = int(round(target - moved))
+        if step:
+            await page.mouse.wheel(0, step)
+            moved += step
+        await sleep(max(0.01, duration_s / steps + random.uniform(-0.006, 0.012)))
+    remainder = total_delta - moved
+    if remainder:
+        await page.mouse.wheel(0, remainder)
+
+
+async def scroll_to_element(
+    page,
+    element,
+    target_y_ratio: float = 0.5,
+    ensure_full_visible: bool = True,
+    should_stop: Callable[[], bool] | None = None,
+) -> bool:
+    try:
+        viewport_w, viewport_h = await get_viewport_size(page)
+        viewport_w, viewport_h = max(viewport_w, 1200), max(viewport_h, 900)
+        box = await element.bounding_box() if element else None
+        if not box:
+            return False
+        delta = _scroll_delta(box, viewport_h, target_y_ratio, ensure_full_visible)
+        if abs(delta) <= 6:
+            return True
+        await _position_cursor(page, viewport_w, viewport_h, should_stop, (0.03, 0.10))
+        distance_factor = abs(delta) / max(1, viewport_h)
+        duration_s = random.uniform(0.20, 0.35) + min(2.0, max(0.6, distance_factor)) * random.uniform(0.25, 0.55)
+        await smooth_wheel(page, delta, duration_s=duration_s, easing=ease_out_cubic, should_stop=should_stop)
+        return True
+    except _ScrollStopped:
+        return False
+    except Exception as exc:
+        logger.error(f'Error in scroll_to_element: {exc}')
+        return False
+
+
+async def human_scroll(page, total_delta: int | None = None, should_stop: Callable[[], bool] | None = None) -> None:
+    try:
+        viewport_w, viewport_h = await get_viewport_size(page)
+        await _position_cursor(page, viewport_w, viewport_h, should_stop, (0.05, 0.15))
+        total = _scroll_total(total_delta, viewport_h)
+        duration_s = random.uniform(0.18, 0.32) + min(2.2, abs(total) / 700) * random.uniform(0.22, 0.55)
+        await smooth_wheel(page, int(total), duration_s=duration_s, easing=ease_in_out_cubic, should_stop=should_stop)
+        await _apply_scroll_correction(page, total)
+    except _ScrollStopped:
+        return
+    except Exception as exc:
+        logger.error(f'Error in human_scroll: {exc}')
+        await _scroll_fallback(page, total_delta)
+
+
+async def _position_cursor(page, viewport_w: int, viewport_h: int, should_stop, pause_range: tuple[float, float]) -> None:
+    x, y = _pick_point(viewport_w, viewport_h)
+    await safe_mouse_move(page, x, y)
+    await sleep(random.uniform(*pause_range))
+    if should_stop and should_stop():
+        raise _ScrollStopped('scroll stopped')
+
+
+async def _apply_scroll_correction(page, total: int) -> None:
+    if random.random() >= 0.22:
+        return
+    correction = random.randint(-max(22, int(abs(total) * 0.06)), max(22, int(abs(total) * 0.06)))
+    if not correction:
+        return
+    await page.mouse.wheel(0, correction)
+    await sleep(random.uniform(0.05, 0.12))
+
+
+async def _scroll_fallback(page, total_delta: int | None) -> None:
+    try:
+        fallback_delta = 400 if total_delta is None else total_delta
+        await page.evaluate(f"window.scrollBy({{top: {fallback_delta}, behavior: 'smooth'}})")
+        await sleep(0.5)
+    except Exception:
+        pass
+
+
+async def human_mouse_move(page, target_x: int | None = None, target_y: int | None = None) -> None:
+    try:
+        viewport_w, viewport_h = await get_viewport_size(page)
+        start_x, start_y = _pick_point(viewport_w, viewport_h)
+        end_x, end_y = _target_point(viewport_w, viewport_h, target_x, target_y)
+        distance = math.sqrt((end_x - start_x) ** 2 + (end_y - start_y) ** 2)
+        if distance < 10:
+            return
+        cp1, cp2 = _control_points(start_x, start_y, end_x, end_y, distance)
+        steps = max(12, min(40, int(distance / 15)))
+        for index in range(steps + 1):
+            t = index / steps
+            point = _bezier_point(ease_in_out_cubic(t), (start_x, start_y), cp1, cp2, (end_x, end_y))
+            await safe_mouse_move(page, *_clamped_point(viewport_w, viewport_h, point))
+            await sleep(_movement_delay(t))
+            if random.random() < 0.03:
+                await sleep(random.uniform(0.02, 0.06))
+        if random.random() < 0.25:
+            await sleep(random.uniform(0.04, 0.10))
+            correction = (end_x + random.randint(-6, 6), end_y + random.randint(-6, 6))
+            await safe_mouse_move(page, *_clamped_point(max(viewport_w, 4), max(viewport_h, 4), correction))
+    except PlaywrightError as exc:
+        logger.warning('Skipping human_mouse_move due to Playwright error: %s', exc)
+    except Exception:
+        logger.exception('Unexpected error in human_mouse_move')
+        raise
@@ -0,0 +1,90 @@
+"""
+Async counterpart of python.core.selector_engine for playwright.async_api pages
+"""
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from python.core.selector_engine import (
+    _ACTIONABLE_SCAN_LIMIT,
+    _apply_role_constraint,
+    _strategy_locator,
+    _strategy_order,
+    _text_fallback_query,
+)
+from python.core.snapshot_debugger import _sanitize_snapshot_name
+from python.core.storage.selector_cache import get_preferred_strategy, record_success
+
+logger = logging.getLogger(__name__)
+
+
+async def find(selector, page):
+    """Async ``SemanticSelector.find``: same strategy order and cache, awaited locator checks."""
+    # The strategy cache lives in the SQLite state store, so reads and writes stay off the loop
+    preferred = await asyncio.to_thread(get_preferred_strategy, selector.element_name)
+    try:
+        for strategy in _strategy_order(preferred):
+            locator = _strategy_locator(selector, page, strategy)
+            if strategy != 'role':
+                locator = _apply_role_constraint(selector, locator)
+            result = await _first_actionable(locator)
+            if not result:
+                continue
+            if strategy != preferred:
+                await asyncio.to_thread(record_success, selector.element_name, strategy)
+            return result
+        return await _text_fallback(selector, page)
+    except Exception as exc:
+        logger.warning(f'Selector search failed for {selector.element_name}: {exc}')
+        await save_debug_snapshot(page, f'selector_fail_{selector.element_name}')
+        return None
+
+
+async def _first_actionable(locator, *, limit: int = _ACTIONABLE_SCAN_LIMIT):
+    if not locator:
+        return None
+    try:
+        count = await locator.count()
+    except Exception:
+        return None
+    for index in range(min(count, limit)):
+        candidate = locator.nth(index)
+        try:
+            if await candidate.is_visible() and await candidate.is_enabled():
+                return candidate
+        except Exception:
+            continue
+    return None
+
+
+async def _text_fallback(selector, page):
+    if not selector.text:
+        return None
+    locator = page.locator(_text_fallback_query(selector)).filter(has_text=selector.text)
+    result = await _first_actionable(locator)
+    if result:
+        logger.info(f'Discovered {selector.element_name} via text fallback')
+    return result
+
+
+async def save_debug_snapshot(page, element_name: str, base_dir: str = 'data/debug') -> Optional[Path]:
+    """Async ``snapshot_debugger.save_debug_snapshot``."""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    snapshot_dir = Path(base_dir) / f'{_sanitize_snapshot_name(element_name)}_{timestamp}'
+    try:
+        await asyncio.to_thread(snapshot_dir.mkdir, parents=True, exist_ok=True)
+    except Exception as exc:
+        logger.error(f'Failed to save debug snapshot: {exc}')
+        return None
+    try:
+        html = await page.content()
+        await asyncio.to_thread((snapshot_dir / 'page.html').write_text, html, encoding='utf-8')
+    except Exception as exc:
+        logger.error(f'Failed to save HTML snapshot: {exc}')
+    try:
+        await page.screenshot(path=str(snapshot_dir / 'screenshot.png'))
+    except Exception as exc:
+        logger.error(f'Failed to save screenshot: {exc}')
+    return snapshot_dir
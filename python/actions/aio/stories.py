@@ -0,0 +1,200 @@
+import logging
+
+from python.actions.stories.controls import _story_control_xpath
+from python.actions.stories.tray import STORY_BUBBLE_SELECTORS
+from python.actions.stories.utils import label_looks_new
+
+from .common import random_delay
+
+
+logger = logging.getLogger(__name__)
+
+
+async def watch_stories(page, max_stories: int = 3, min_view_s: float = 2.0, max_view_s: float = 5.0, log=None) -> bool:
+    try:
+        log = log or logger.info
+        if max_view_s < min_view_s:
+            min_view_s, max_view_s = max_view_s, min_view_s
+        await _go_home(page, log=log)
+        bubble = await find_story_bubble(page, log=log)
+        if not bubble:
+            log("Stories: no bubbles detected in tray")
+            return False
+
+        if not await click_center(page, bubble):
+            log("Stories: bubble click failed")
+            return False
+
+        stories_watched = 0
+        await random_delay(0.8, 1.5)
+
+        advance_failures = 0
+        while stories_watched < max_stories:
+            await random_delay(min_view_s, max_view_s)
+            stories_watched += 1
+
+            if not await advance_story(page):
+                advance_failures += 1
+                if advance_failures >= 2:
+                    break
+            else:
+                advance_failures = 0
+
+            await random_delay(0.4, 0.9)
+
+        try:
+            if not await close_stories(page):
+                await page.keyboard.press("Escape")
+        except Exception:
+            pass
+
+        log(f"Stories: watched {stories_watched}")
+        return True
+
+    except Exception as e:
+        log(f"Stories: error {e}")
+        return False
+
+
+async def _go_home(page, log=None) -> bool:
+    log = log or (lambda s: None)
+    try:
+        if page.url == "about:blank":
+            await page.goto("https://www.instagram.com/", timeout=15000)
+            await random_delay(1.0, 2.0)
+            return True
+    except Exception:
+        pass
+
+    try:
+        if page.url.rstrip("/") == "https://www.instagram.com":
+            return True
+    except Exception:
+        pass
+
+    try:
+        log("Stories: opening Home")
+        svg = await page.query_selector('svg[aria-label="Home"]')
+        if svg:
+            btn = await svg.query_selector('xpath=ancestor-or-self::*[@role="link"][1]') or await svg.query_selector(
+                'xpath=ancestor-or-self::*[@role="button"][1]'
+            )
+            await (btn or svg).click()
+            await random_delay(1.5, 3.0)
+            return True
+    except Exception:
+        pass
+
+    try:
+        link = await page.query_selector('a[role="link"][href="/"]')
+        if link:
+            await link.click()
+            await random_delay(1.5, 3.0)
+            return True
+    except Exception:
+        pass
+
+    try:
+        await page.goto("https://www.instagram.com/", timeout=30000)
+        await random_delay(2.0, 4.0)
+        return True
+    except Exception:
+        log("Stories: failed to open Home")
+        return False
+
+
+async def find_story_bubble(page, log=None):
+    log = log or logger.info
+    candidates = []
+    for sel in STORY_BUBBLE_SELECTORS:
+        try:
+            for el in await page.query_selector_all(sel):
+                try:
+                    box = await el.bounding_box()
+                    if not box:
+                        continue
+                    if box["y"] < 280:
+                        candidates.append((box["y"], box["x"], await looks_new_story(el), el))
+                except Exception:
+                    continue
+        except Exception:
+            continue
+
+    if not candidates:
+        return None
+
+    unseen = [c for c in candidates if c[2]]
+    if not unseen:
+        log("Stories: no unseen bubbles found, skipping")
+        return None
+
+    unseen.sort(key=lambda t: (t[0], t[1]))
+    return unseen[0][3]
+
+
+async def looks_new_story(el) -> bool:
+    try:
+        label = await el.get_attribute("aria-label")
+        if not label:
+            ancestor = await el.query_selector('xpath=ancestor-or-self::*[@aria-label][1]')
+            label = await ancestor.get_attribute("aria-label") if ancestor else ""
+    except Exception:
+        label = ""
+    return label_looks_new((label or "").lower())
+
+
+async def click_center(page, element) -> bool:
+    try:
+        box = await element.bounding_box()
+        if not box:
+            return False
+        await page.mouse.click(box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
+        return True
+    except Exception:
+        try:
+            await element.click()
+            return True
+        except Exception:
+            return False
+
+
+async def find_story_nav(page, label: str):
+    try:
+        return await page.query_selector(f'xpath={_story_control_xpath(label)}')
+    except Exception:
+        return None
+
+
+async def advance_story(page) -> bool:
+    for _ in range(3):
+        try:
+            btn = await find_story_nav(page, 'Next')
+            if btn:
+                try:
+                    await btn.click()
+                    return True
+                except Exception:
+                    await random_delay(0.15, 0.35)
+                    continue
+            try:
+                await page.keyboard.press('ArrowRight')
+                return True
+            except Exception:
+                await random_delay(0.15, 0.35)
+                continue
+        except Exception:
+            await random_delay(0.15, 0.35)
+            continue
+    return False
+
+
+async def close_stories(page) -> bool:
+    for _ in range(3):
+        try:
+            btn = await find_story_nav(page, 'Close')
+            if btn and await click_center(page, btn):
+                return True
+        except Exception:
+            pass
+        await random_delay(0.2, 0.5)
+    return False
@@ -0,0 +1,217 @@
+import asyncio
+import random
+from typing import Callable, Iterable, Optional, Tuple
+
+from python.actions.engagement.unfollow.runtime import _normalize_delay_range
+
+from .common import random_delay, safe_mouse_move
+
+_SEARCH_INPUT = 'input[placeholder="Search"]'
+
+
+async def unfollow_usernames(
+    page,
+    usernames: Iterable[str],
+    log: Callable[[str], None],
+    should_stop: Optional[Callable[[], bool]] = None,
+    delay_range: Tuple[int, int] = (10, 30),
+    on_success: Optional[Callable[[str], None]] = None,
+    run_blocking=None,
+) -> None:
+    should_stop = should_stop or (lambda: False)
+    delay_range = _normalize_delay_range(delay_range)
+    targets = [username.strip() for username in usernames if username.strip()]
+    if not targets:
+        log('Нет юзернеймов для отписки.')
+        return
+    # on_success enqueues the account status write; keep it on the blocking pool
+    run_blocking = run_blocking or asyncio.to_thread
+    log('Использую существующую сессию для отписки...')
+    try:
+        if not await _ensure_instagram_open(page, log):
+            return
+        if not await _open_own_profile(page, log):
+            return
+        await random_delay(3, 5)
+        if not await _open_following_modal(page, log):
+            return
+        try:
+            for username in targets:
+                if should_stop():
+                    log('Остановка...')
+                    break
+                if await _unfollow_single_target(page, username, log) and on_success:
+                    try:
+                        await run_blocking(on_success, username)
+                    except Exception as exc:
+                        log(f'Ошибка при обработке {username}: {exc}')
+                if not await _clear_search(page, log, username):
+                    log(f'Не удалось сбросить поиск после {username}. Прерываю batch, чтобы не продолжать с устаревшим состоянием.')
+                    break
+                wait_time = random.randint(*delay_range)
+                log(f'Жду {wait_time}сек...')
+                await random_delay(wait_time, wait_time)
+        finally:
+            await _close_following_modal(page, log)
+    except Exception as exc:
+        log(f'Критическая ошибка сессии: {exc}')
+
+
+async def _ensure_instagram_open(page, log) -> bool:
+    try:
+        if 'instagram.com' in (page.url or ''):
+            return True
+        await page.goto('https://www.instagram.com', timeout=15000)
+        return True
+    except Exception as exc:
+        log(f'Не удалось открыть Instagram перед началом отписки: {exc}')
+        return False
+
+
+async def _open_own_profile(page, log) -> bool:
+    log('Ищу ссылку на свой профиль...')
+    if await _click_profile_avatar(page, log):
+        await page.wait_for_load_state('domcontentloaded')
+        return True
+    try:
+        await page.locator('a[role="link"] >> text=Profile').click(force=True, timeout=5000)
+        return True
+    except Exception as exc:
+        log(f'Не удалось перейти в профиль: {exc}')
+        return False
+
+
+async def _click_profile_avatar(page, log) -> bool:
+    try:
+        profile_pic = page.locator('a[role="link"]').filter(has_text='Profile').locator('img').first
+        await profile_pic.wait_for(state='visible', timeout=10000)
+        box = await profile_pic.bounding_box()
+        if box:
+            log('Двигаю курсор к аватару...')
+            await safe_mouse_move(page, box['x'] + box['width'] / 2, box['y'] + box['height'] / 2)
+            await random_delay(0.5, 1.5)
+        log('Кликаю на аватар...')
+        await profile_pic.click(force=True)
+        return True
+    except Exception as exc:
+        log(f'Не смог найти ссылку через аватар ({exc}). Пробую запасной вариант...')
+        return False
+
+
+async def _open_following_modal(page, log) -> bool:
+    log('Открываю список подписок...')
+    try:
+        await page.click('a[href*="/following/"]', timeout=5000)
+        await random_delay(2, 4)
+        if await page.wait_for_selector('div[role="dialog"]', timeout=5000):
+            return True
+        log('Модальное окно не появилось.')
+        return False
+    except Exception:
+        log("Не нашел кнопку 'Following'.")
+        return False
+
+
+async def _unfollow_single_target(page, username: str, log) -> bool:
+    log(f'Ищу {username}...')
+    try:
+        await page.fill(_SEARCH_INPUT, '')
+        await random_delay(0.5, 1.0)
+        await page.type(_SEARCH_INPUT, username, delay=100)
+    except Exception:
+        log('Не нашел поле поиска.')
+        return False
+    await random_delay(2, 4)
+    try:
+        normalized_username = username.strip().lstrip('@')
+        user_row = page.locator(
+            f'div[role="dialog"] a[href$="/{normalized_username}/"], div[role="dialog"] a[href$="/{normalized_username}"]'
+        ).first.locator('xpath=ancestor::div[.//button][1]')
+        unfollow_btn = user_row.locator('button').filter(has_text='Following').first
+        if await unfollow_btn.count() <= 0:
+            log(f"Не нашел кнопку 'Following' для {username}. Возможно уже отписан.")
+            return False
+        log(f'Нашел кнопку Following для {username}. Кликаю...')
+        await unfollow_btn.click()
+        await random_delay(1, 2)
+        if await _confirm_unfollow(page, username, log):
+            return True
+        log(f'Подтверждение не появилось или ошибка клика для {username}')
+    except Exception as exc:
+        log(f'Ошибка при обработке {username}: {exc}')
+    return False
+
+
+async def _confirm_unfollow(page, username: str, log) -> bool:
+    try:
+        confirm_btn = page.locator('button').filter(has_text='Unfollow').last
+        await confirm_btn.wait_for(state='visible', timeout=5000)
+        log('Подтверждаю отписку...')
+        await confirm_btn.click()
+        log(f'Отписался от {username}')
+        return True
+    except Exception:
+        return False
+
+
+async def _clear_search(page, log, username: str) -> bool:
+    previous_value = await _search_input_value(page)
+    try:
+        await page.fill(_SEARCH_INPUT, '')
+    except Exception as exc:
+        log(
+            f"Не удалось очистить поиск после {username}: {exc}. "
+            f'Текущее значение поиска: {previous_value!r}. Пробую запасную очистку.'
+        )
+        return await _clear_search_with_keyboard(page, log, username, previous_value)
+    current_value = await _search_input_value(page)
+    if current_value in ('', '<unavailable>'):
+        return True
+    log(
+        f"Поле поиска после {username} осталось заполненным значением {current_value!r} "
+        'после прямой очистки. Пробую запасную очистку.'
+    )
+    return await _clear_search_with_keyboard(page, log, username, current_value)
+
+
+async def _clear_search_with_keyboard(page, log, username: str, previous_value: str) -> bool:
+    try:
+        await page.locator(_SEARCH_INPUT).first.click(timeout=3000)
+        await page.keyboard.press('Control+A')
+        await page.keyboard.press('Backspace')
+    except Exception as exc:
+        current_value = await _search_input_value(page)
+        log(
+            f"Запасная очистка поиска после {username} не сработала: {exc}. "
+            f'Текущее значение поиска: {current_value!r} (было {previous_value!r}).'
+        )
+        return False
+    current_value = await _search_input_value(page)
+    if current_value in ('', '<unavailable>'):
+        log(f'Очистил поиск запасным способом после {username}.')
+        return True
+    log(
+        f"Запасная очистка поиска после {username} не очистила поле. "
+        f'Текущее значение поиска: {current_value!r} (было {previous_value!r}).'
+    )
+    return False
+
+
+async def _search_input_value(page) -> str:
+    try:
+        return await page.input_value(_SEARCH_INPUT, timeout=1000)
+    except Exception:
+        return '<unavailable>'
+
+
+async def _close_following_modal(page, log) -> None:
+    log("Closing 'Following' modal...")
+    try:
+        close_btn = page.locator('button').filter(has=page.locator('svg[aria-label="Close"]')).last
+        if await close_btn.count() > 0:
+            await close_btn.click()
+            log('Closed modal.')
+            return
+        log('Close button not visible.')
+    except Exception as exc:
+        log(f'Failed to close modal: {exc}')
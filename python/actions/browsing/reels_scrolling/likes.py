@@ -9,6 +9,45 @@ REELS_LIKE_BUTTON_XPATH = (
     "//div[@role='button' and "
     "descendant::*[local-name()='svg' and (@aria-label='Like' or @aria-label='Unlike')]]"
 )
+ACTIVE_LIKE_BUTTON_SCRIPT = """
+(buttonXPath) => {
+    const center = window.innerHeight / 2;
+    const snapshot = document.evaluate(buttonXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    let bestBtn = null;
+    let minDiff = Infinity;
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        const btn = snapshot.snapshotItem(i);
+        const heartIcon = btn.querySelector('svg[aria-label="Like"], svg[aria-label="Unlike"]');
+        if (!heartIcon) continue;
+        const rect = btn.getBoundingClientRect();
+        if (
+            rect.top < 0 ||
+            rect.bottom > window.innerHeight ||
+            rect.left < 0 ||
+            rect.right > window.innerWidth ||
+            rect.width === 0 ||
+            rect.height === 0
+        ) continue;
+        if (!(() => {
+            let curr = btn.parentElement;
+            for (let j = 0; j < 20; j++) {
+                if (!curr || curr.tagName === 'BODY') return false;
+                const style = window.getComputedStyle(curr);
+                const cRect = curr.getBoundingClientRect();
+                if (style.overflow === 'visible' && cRect.height > 200) return true;
+                curr = curr.parentElement;
+            }
+            return false;
+        })()) continue;
+        const diff = Math.abs((rect.top + rect.height / 2) - center);
+        if (diff < minDiff) {
+            minDiff = diff;
+            bestBtn = btn;
+        }
+    }
+    return bestBtn;
+}
+"""
 
 
 def perform_like(page) -> bool:
@@ -35,48 +74,7 @@ def perform_like(page) -> bool:
 
 
 def _active_like_button(page):
-    btn_handle = page.evaluate_handle(
-        """
-        (buttonXPath) => {
-            const center = window.innerHeight / 2;
-            const snapshot = document.evaluate(buttonXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
-            let bestBtn = null;
-            let minDiff = Infinity;
-            for (let i = 0; i < snapshot.snapshotLength; i++) {
-                const btn = snapshot.snapshotItem(i);
-                const heartIcon = btn.querySelector('svg[aria-label="Like"], svg[aria-label="Unlike"]');
-                if (!heartIcon) continue;
-                const rect = btn.getBoundingClientRect();
-                if (
-                    rect.top < 0 ||
-                    rect.bottom > window.innerHeight ||
-                    rect.left < 0 ||
-                    rect.right > window.innerWidth ||
-                    rect.width === 0 ||
-                    rect.height === 0
-                ) continue;
-                if (!(() => {
-                    let curr = btn.parentElement;
-                    for (let j = 0; j < 20; j++) {
-                        if (!curr || curr.tagName === 'BODY') return false;
-                        const style = window.getComputedStyle(curr);
-                        const cRect = curr.getBoundingClientRect();
-                        if (style.overflow === 'visible' && cRect.height > 200) return true;
-                        curr = curr.parentElement;
-                    }
-                    return false;
-                })()) continue;
-                const diff = Math.abs((rect.top + rect.height / 2) - center);
-                if (diff < minDiff) {
-                    minDiff = diff;
-                    bestBtn = btn;
-                }
-            }
-            return bestBtn;
-        }
-        """,
-        REELS_LIKE_BUTTON_XPATH,
-    )
+    btn_handle = page.evaluate_handle(ACTIVE_LIKE_BUTTON_SCRIPT, REELS_LIKE_BUTTON_XPATH)
     return btn_handle.as_element()
 
 
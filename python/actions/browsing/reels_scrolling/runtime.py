@@ -17,6 +17,31 @@ PREVIOUS_REEL_BUTTON_XPATH = (
     "//div[@role='button' and "
     "(contains(@aria-label, 'previous Reel') or contains(@aria-label, 'Previous Reel'))]"
 )
+FOLLOW_BUTTON_SCRIPT = """
+() => {
+    const candidates = Array.from(document.querySelectorAll('button, div[role="button"]'));
+    const viewportHeight = window.innerHeight;
+    const viewportWidth = window.innerWidth;
+    let best = null;
+    let bestDistance = Infinity;
+    for (const candidate of candidates) {
+        if (candidate.closest('[role="dialog"]')) continue;
+        const text = (candidate.textContent || '').trim();
+        if (text !== 'Follow') continue;
+        const rect = candidate.getBoundingClientRect();
+        if (!rect || rect.width <= 0 || rect.height <= 0) continue;
+        if (rect.top < 0 || rect.bottom > viewportHeight) continue;
+        if (rect.left < 0 || rect.right > viewportWidth) continue;
+        const centerY = rect.top + rect.height / 2;
+        const distance = Math.abs(centerY - viewportHeight / 2);
+        if (distance < bestDistance) {
+            best = candidate;
+            bestDistance = distance;
+        }
+    }
+    return best;
+}
+"""
 
 
 def _find_reels_navigation_button(page, button_xpath: str):
@@ -80,33 +105,7 @@ def _click_reels_link(page, reels_link) -> None:
 
 def _perform_follow(page) -> bool:
     try:
-        btn_handle = page.evaluate_handle(
-            """
-            () => {
-                const candidates = Array.from(document.querySelectorAll('button, div[role="button"]'));
-                const viewportHeight = window.innerHeight;
-                const viewportWidth = window.innerWidth;
-                let best = null;
-                let bestDistance = Infinity;
-                for (const candidate of candidates) {
-                    if (candidate.closest('[role="dialog"]')) continue;
-                    const text = (candidate.textContent || '').trim();
-                    if (text !== 'Follow') continue;
-                    const rect = candidate.getBoundingClientRect();
-                    if (!rect || rect.width <= 0 || rect.height <= 0) continue;
-                    if (rect.top < 0 || rect.bottom > viewportHeight) continue;
-                    if (rect.left < 0 || rect.right > viewportWidth) continue;
-                    const centerY = rect.top + rect.height / 2;
-                    const distance = Math.abs(centerY - viewportHeight / 2);
-                    if (distance < bestDistance) {
-                        best = candidate;
-                        bestDistance = distance;
-                    }
-                }
-                return best;
-            }
-            """
-        )
+        btn_handle = page.evaluate_handle(FOLLOW_BUTTON_SCRIPT)
         target = btn_handle.as_element()
         if not target:
             logger.debug('No visible Follow button found for current reel')
@@ -1,13 +1,14 @@
 """
 Instagram automation functions using Playwright/Camoufox
 """
-import time
 import random
 
+from python.core import pacing
+
 
 def random_delay(min_seconds: float = 1.0, max_seconds: float = 3.0):
     """Add a random delay to appear human-like"""
-    time.sleep(random.uniform(min_seconds, max_seconds))
+    pacing.sleep(random.uniform(min_seconds, max_seconds), pacing.current_token())
 
 
 def _viewport_bounds(page, default_width: int = 1280, default_height: int = 720) -> tuple[int, int]:
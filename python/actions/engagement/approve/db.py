@@ -1,13 +1,17 @@
 from typing import Callable
 
+from python.database.accounts import AccountMutationQueue
+
 
 def mark_account_approved(client, username: str, log: Callable[[str], None]) -> None:
     try:
         res = client.update_account_message(username, True)
-        if res:
+        if isinstance(client, AccountMutationQueue):
+            # Sent on the next flush, which reports usernames with no matching account
+            log(f"Queued message update for @{username}")
+        elif res:
             log(f"Updated message for @{username}")
         else:
             log(f"Database update failed for @{username} (No match in DB?)")
     except Exception as e:
         log(f"API Error updating message for @{username}: {e}")
-
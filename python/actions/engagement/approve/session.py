@@ -1,7 +1,7 @@
 from typing import Callable, Optional, Tuple
 
 from python.browser.setup import create_browser_context
-from python.database.accounts import InstagramAccountsClient
+from python.database.accounts import AccountMutationQueue, InstagramAccountsClient
 
 from python.actions.engagement.approve.flow import run_approve_follow_requests
 
@@ -21,7 +21,10 @@ def approve_follow_requests(
     If `page` is provided, it uses the existing browser page and does NOT close it.
     """
     should_stop = should_stop or (lambda: False)
-    client = InstagramAccountsClient()
+    client = AccountMutationQueue(
+        InstagramAccountsClient(),
+        on_missing=lambda username: log(f"Database update failed for @{username} (No match in DB?)"),
+    )
 
     def _run_approve_logic(current_page):
         run_approve_follow_requests(
@@ -33,16 +36,20 @@ def approve_follow_requests(
             finish_delay_seconds=finish_delay_seconds,
         )
 
-    if page:
-        log(f"Использую существующую сессию для подтверждения заявок.")
-        _run_approve_logic(page)
-        return
+    try:
+        if page:
+            log(f"Использую существующую сессию для подтверждения заявок.")
+            _run_approve_logic(page)
+            return
 
-    log(f"[Approve] Запуск браузера для профиля: {profile_name}")
+        log(f"[Approve] Запуск браузера для профиля: {profile_name}")
 
-    with create_browser_context(
-        profile_name=profile_name,
-        proxy_string=proxy_string,
-        user_agent=user_agent,
-    ) as (_context, page):
-        _run_approve_logic(page)
+        with create_browser_context(
+            profile_name=profile_name,
+            proxy_string=proxy_string,
+            user_agent=user_agent,
+        ) as (_context, page):
+            _run_approve_logic(page)
+    finally:
+        # Send the queued account updates before the session returns
+        client.close()
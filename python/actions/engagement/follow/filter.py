@@ -1,6 +1,129 @@
 from typing import Callable, Optional
 
 
+FOLLOWING_COUNT_SCRIPT = """
+() => {
+    const parseCount = (str) => {
+        if (!str) return null;
+        str = str.toLowerCase().replace(/,/g, '').replace(/\\s/g, '');
+        let multiplier = 1;
+        if (str.includes('k')) {
+            multiplier = 1000;
+            str = str.replace('k', '');
+        } else if (str.includes('m')) {
+            multiplier = 1000000;
+            str = str.replace('m', '');
+        }
+        const val = parseFloat(str);
+        return isNaN(val) ? null : Math.round(val * multiplier);
+    };
+
+    const candidates = Array.from(
+        document.querySelectorAll(
+            'a[href$="/following/"], a[href$="/following"], a[href*="/following"]'
+        )
+    );
+
+    const extractNumber = (el) => {
+        if (!el) return null;
+        const texts = [];
+        texts.push(el.innerText || "");
+        texts.push(el.textContent || "");
+        texts.push(el.getAttribute("aria-label") || "");
+        const span = el.querySelector("span");
+        if (span) {
+            texts.push(span.innerText || "");
+            texts.push(span.textContent || "");
+        }
+        const combined = texts.join(" ").trim();
+        if (!combined) return null;
+        const match = combined.match(/([\\d.,]+\\s*[kmb]?)/i);
+        if (!match) return null;
+        return parseCount(match[1]);
+    };
+
+    for (const el of candidates) {
+        const num = extractNumber(el);
+        if (num !== null) return num;
+    }
+
+    const all = Array.from(document.querySelectorAll('a, span, div, li'));
+    for (const el of all) {
+        const t = (el.innerText || el.textContent || '').toLowerCase().trim();
+        if (!t) continue;
+        const m = t.match(/([\\d.,kmb]+)[\\s\\n]+(following|подписки|подписок)/i);
+        if (m) {
+            const num = parseCount(m[1]);
+            if (num !== null) return num;
+        }
+    }
+    return null;
+}
+"""
+
+POSTS_COUNT_SCRIPT = """
+() => {
+    const parseCount = (str) => {
+        if (!str) return null;
+        str = str.toLowerCase().replace(/,/g, '').replace(/\\s/g, '');
+        let multiplier = 1;
+        if (str.includes('k')) {
+            multiplier = 1000;
+            str = str.replace('k', '');
+        } else if (str.includes('m')) {
+            multiplier = 1000000;
+            str = str.replace('m', '');
+        }
+        const val = parseFloat(str);
+        return isNaN(val) ? null : Math.round(val * multiplier);
+    };
+
+    // Strategy 1: Specific structure seen in modern React layout
+    // Look for elements containing "posts" or "публикаций" with a number prefix
+    const keywords = ["posts", "post", "публикаций", "публикации", "публикация"];
+    const candidates = Array.from(document.querySelectorAll('span, div, li, a'));
+    
+    for (const el of candidates) {
+        // Get direct text or innerText
+        const text = (el.innerText || el.textContent || "").toLowerCase().trim();
+        if (!text) continue;
+        
+        // Check if it ends with one of the keywords
+        const hasKeyword = keywords.some(k => text.includes(k));
+        if (!hasKeyword) continue;
+
+        // Strict regex: Number followed by keyword (e.g. "19 posts", "1,234 posts", "10k posts")
+        // Allow optional newline or space
+        const match = text.match(/([\\d.,kmb]+)[\\s\\n]+(posts|post|публикаций|публикации|публикация)/i);
+        if (match) {
+            const num = parseCount(match[1]);
+            if (num !== null) return num;
+        }
+    }
+    
+    // Strategy 2: Legacy <ul><li> list (often 3 items: posts, followers, following)
+    const uls = document.querySelectorAll("ul");
+    for (const ul of uls) {
+        // Instagram stats are often a list of 3 items
+        if (ul.children.length === 3) {
+             const firstLi = ul.children[0];
+             // Sometimes the text is "19 posts" with newline
+             const text = firstLi.innerText.toLowerCase();
+             if (text.includes('post') || text.includes('публикац')) {
+                 const match = text.match(/([\\d.,kmb]+)/);
+                 if (match) {
+                     const num = parseCount(match[1]);
+                     if (num !== null) return num;
+                 }
+             }
+        }
+    }
+
+    return null;
+}
+"""
+
+
 def get_following_count(page, log: Callable[[str], None]) -> Optional[int]:
     """
     Try to extract the "following" count from an Instagram profile page.
@@ -11,67 +134,7 @@ def get_following_count(page, log: Callable[[str], None]) -> Optional[int]:
             page.wait_for_selector('a[href*="/following"]', timeout=4000)
         except Exception:
             pass
-        return page.evaluate(
-            """
-            () => {
-                const parseCount = (str) => {
-                    if (!str) return null;
-                    str = str.toLowerCase().replace(/,/g, '').replace(/\\s/g, '');
-                    let multiplier = 1;
-                    if (str.includes('k')) {
-                        multiplier = 1000;
-                        str = str.replace('k', '');
-                    } else if (str.includes('m')) {
-                        multiplier = 1000000;
-                        str = str.replace('m', '');
-                    }
-                    const val = parseFloat(str);
-                    return isNaN(val) ? null : Math.round(val * multiplier);
-                };
-
-                const candidates = Array.from(
-                    document.querySelectorAll(
-                        'a[href$="/following/"], a[href$="/following"], a[href*="/following"]'
-                    )
-                );
-
-                const extractNumber = (el) => {
-                    if (!el) return null;
-                    const texts = [];
-                    texts.push(el.innerText || "");
-                    texts.push(el.textContent || "");
-                    texts.push(el.getAttribute("aria-label") || "");
-                    const span = el.querySelector("span");
-                    if (span) {
-                        texts.push(span.innerText || "");
-                        texts.push(span.textContent || "");
-                    }
-                    const combined = texts.join(" ").trim();
-                    if (!combined) return null;
-                    const match = combined.match(/([\\d.,]+\\s*[kmb]?)/i);
-                    if (!match) return null;
-                    return parseCount(match[1]);
-                };
-
-                for (const el of candidates) {
-                    const num = extractNumber(el);
-                    if (num !== null) return num;
-                }
-
-                const all = Array.from(document.querySelectorAll('a, span, div, li'));
-                for (const el of all) {
-                    const t = (el.innerText || el.textContent || '').toLowerCase().trim();
-                    if (!t) continue;
-                    const m = t.match(/([\\d.,kmb]+)[\\s\\n]+(following|подписки|подписок)/i);
-                    if (m) {
-                        const num = parseCount(m[1]);
-                        if (num !== null) return num;
-                    }
-                }
-                return null;
-            }
-            """
-        )
+        return page.evaluate(FOLLOWING_COUNT_SCRIPT)
     except Exception as err:
         log(f"Не удалось получить число подписок: {err}")
         return None
@@ -82,69 +145,7 @@ def get_posts_count(page, log: Callable[[str], None]) -> Optional[int]:
     Try to extract the "posts" count from an Instagram profile page.
     """
     try:
-        return page.evaluate(
-            """
-            () => {
-                const parseCount = (str) => {
-                    if (!str) return null;
-                    str = str.toLowerCase().replace(/,/g, '').replace(/\\s/g, '');
-                    let multiplier = 1;
-                    if (str.includes('k')) {
-                        multiplier = 1000;
-                        str = str.replace('k', '');
-                    } else if (str.includes('m')) {
-                        multiplier = 1000000;
-                        str = str.replace('m', '');
-                    }
-                    const val = parseFloat(str);
-                    return isNaN(val) ? null : Math.round(val * multiplier);
-                };
-
-                // Strategy 1: Specific structure seen in modern React layout
-                // Look for elements containing "posts" or "публикаций" with a number prefix
-                const keywords = ["posts", "post", "публикаций", "публикации", "публикация"];
-                const candidates = Array.from(document.querySelectorAll('span, div, li, a'));
-                
-                for (const el of candidates) {
-                    // Get direct text or innerText
-                    const text = (el.innerText || el.textContent || "").toLowerCase().trim();
-                    if (!text) continue;
-                    
-                    // Check if it ends with one of the keywords
-                    const hasKeyword = keywords.some(k => text.includes(k));
-                    if (!hasKeyword) continue;
-
-                    // Strict regex: Number followed by keyword (e.g. "19 posts", "1,234 posts", "10k posts")
-                    // Allow optional newline or space
-                    const match = text.match(/([\\d.,kmb]+)[\\s\\n]+(posts|post|публикаций|публикации|публикация)/i);
-                    if (match) {
-                        const num = parseCount(match[1]);
-                        if (num !== null) return num;
-                    }
-                }
-                
-                // Strategy 2: Legacy <ul><li> list (often 3 items: posts, followers, following)
-                const uls = document.querySelectorAll("ul");
-                for (const ul of uls) {
-                    // Instagram stats are often a list of 3 items
-                    if (ul.children.length === 3) {
-                         const firstLi = ul.children[0];
-                         // Sometimes the text is "19 posts" with newline
-                         const text = firstLi.innerText.toLowerCase();
-                         if (text.includes('post') || text.includes('публикац')) {
-                             const match = text.match(/([\\d.,kmb]+)/);
-                             if (match) {
-                                 const num = parseCount(match[1]);
-                                 if (num !== null) return num;
-                             }
-                         }
-                    }
-                }
-
-                return null;
-            }
-            """
-        )
+        return page.evaluate(POSTS_COUNT_SCRIPT)
     except Exception as err:
         log(f"Не удалось получить число постов: {err}")
         return None
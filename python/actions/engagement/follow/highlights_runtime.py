@@ -5,6 +5,38 @@ from python.actions.common import random_delay
 from python.actions.engagement.follow.common import _find_close_button, _safe
 
 
+HIGHLIGHT_READY_SCRIPT = """
+(element) => {
+    const rect = element.getBoundingClientRect();
+    const style = window.getComputedStyle(element);
+    const isVisible = style.display !== 'none' &&
+                    style.visibility !== 'hidden' &&
+                    style.opacity !== '0' &&
+                    rect.width > 0 &&
+                    rect.height > 0;
+    const isInViewport = rect.top >= 0 &&
+                       rect.left >= 0 &&
+                       rect.bottom <= (window.innerHeight || document.documentElement.clientHeight) &&
+                       rect.right <= (window.innerWidth || document.documentElement.clientWidth);
+    return isVisible && isInViewport;
+}
+"""
+
+
+HIGHLIGHT_VISIBLE_SCRIPT = """
+(element) => {
+    const rect = element.getBoundingClientRect();
+    const style = window.getComputedStyle(element);
+    return style.display !== 'none' &&
+           style.visibility !== 'hidden' &&
+           rect.width > 0 &&
+           rect.height > 0 &&
+           rect.top >= 0 &&
+           rect.top <= (window.innerHeight || document.documentElement.clientHeight);
+}
+"""
+
+
 def _find_story_nav(page, label: str):
     try:
         for svg in page.query_selector_all(f'svg[aria-label*="{label}" i]'):
@@ -78,18 +110,7 @@ def _visible_highlight_buttons(page, log):
 def _is_visible(page, button) -> bool:
     try:
         return page.evaluate(
-            """
-            (element) => {
-                const rect = element.getBoundingClientRect();
-                const style = window.getComputedStyle(element);
-                return style.display !== 'none' &&
-                       style.visibility !== 'hidden' &&
-                       rect.width > 0 &&
-                       rect.height > 0 &&
-                       rect.top >= 0 &&
-                       rect.top <= (window.innerHeight || document.documentElement.clientHeight);
-            }
-            """,
+            HIGHLIGHT_VISIBLE_SCRIPT,
             button,
         )
     except Exception:
@@ -130,22 +151,7 @@ def _open_highlight_with_retries(page, log, button, max_wait: float) -> bool:
 
 def _wait_for_highlight_button(page, button) -> None:
     page.wait_for_function(
-        """
-        (element) => {
-            const rect = element.getBoundingClientRect();
-            const style = window.getComputedStyle(element);
-            const isVisible = style.display !== 'none' &&
-                            style.visibility !== 'hidden' &&
-                            style.opacity !== '0' &&
-                            rect.width > 0 &&
-                            rect.height > 0;
-            const isInViewport = rect.top >= 0 &&
-                               rect.left >= 0 &&
-                               rect.bottom <= (window.innerHeight || document.documentElement.clientHeight) &&
-                               rect.right <= (window.innerWidth || document.documentElement.clientWidth);
-            return isVisible && isInViewport;
-        }
-        """,
+        HIGHLIGHT_READY_SCRIPT,
         arg=button,
         timeout=2000,
     )
@@ -6,6 +6,18 @@ from python.actions.common import random_delay
 from python.actions.engagement.follow.common import _find_close_button, _safe
 
 
+VISIBLE_ELEMENT_SCRIPT = """
+(element) => {
+    const rect = element.getBoundingClientRect();
+    const style = window.getComputedStyle(element);
+    return style.display !== 'none' &&
+           style.visibility !== 'hidden' &&
+           rect.width > 0 &&
+           rect.height > 0;
+}
+"""
+
+
 def scroll_posts(
     page,
     log: Callable[[str], None],
@@ -167,16 +179,7 @@ def _collect_selector_links(page, selector: str, seen_hrefs: Set[str], post_link
 def _is_visible(page, element) -> bool:
     try:
         return page.evaluate(
-            """
-            (element) => {
-                const rect = element.getBoundingClientRect();
-                const style = window.getComputedStyle(element);
-                return style.display !== 'none' &&
-                       style.visibility !== 'hidden' &&
-                       rect.width > 0 &&
-                       rect.height > 0;
-            }
-            """,
+            VISIBLE_ELEMENT_SCRIPT,
             element,
         )
     except Exception:
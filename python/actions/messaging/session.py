@@ -1,7 +1,7 @@
 from typing import Callable, Dict, List, Optional
 
 from python.browser.setup import create_browser_context
-from python.database.accounts import InstagramAccountsClient
+from python.database.accounts import AccountMutationQueue, InstagramAccountsClient
 
 from python.actions.messaging.flow import run_messaging_flow
 
@@ -29,7 +29,7 @@ def send_messages(
     if not targets:
         log("Нет пользователей для рассылки сообщений.")
         return
-    client = InstagramAccountsClient()
+    client = AccountMutationQueue(InstagramAccountsClient())
 
     def _run_messaging_logic(current_page):
         run_messaging_flow(
@@ -42,16 +42,20 @@ def send_messages(
             behavior_config=behavior_config or {},
         )
 
-    if page:
-        log(f"Использую существующую сессию для рассылки сообщений.")
-        _run_messaging_logic(page)
-        return
-
-    log(f"[Messages] Запуск браузера для профиля: {profile_name}")
-
-    with create_browser_context(
-        profile_name=profile_name,
-        proxy_string=proxy_string,
-        user_agent=user_agent,
-    ) as (_context, page):
-        _run_messaging_logic(page)
+    try:
+        if page:
+            log(f"Использую существующую сессию для рассылки сообщений.")
+            _run_messaging_logic(page)
+            return
+
+        log(f"[Messages] Запуск браузера для профиля: {profile_name}")
+
+        with create_browser_context(
+            profile_name=profile_name,
+            proxy_string=proxy_string,
+            user_agent=user_agent,
+        ) as (_context, page):
+            _run_messaging_logic(page)
+    finally:
+        # Send the queued account updates before the session returns
+        client.close()
@@ -5,18 +5,18 @@ from .utils import looks_new_story
 
 logger = logging.getLogger(__name__)
 
+STORY_BUBBLE_SELECTORS = (
+    'li._acaz [aria-label*="story" i]',
+    '[aria-label*="story" i]',
+    '[aria-label*="not seen" i]',
+    'div[role="button"][aria-label]',
+)
+
 
 def find_story_bubble(page, log=None):
     log = log or logger.info
-    selectors = [
-        'li._acaz [aria-label*="story" i]',
-        '[aria-label*="story" i]',
-        '[aria-label*="not seen" i]',
-        'div[role="button"][aria-label]',
-    ]
-
     candidates = []
-    for sel in selectors:
+    for sel in STORY_BUBBLE_SELECTORS:
         try:
             for el in page.query_selector_all(sel):
                 try:
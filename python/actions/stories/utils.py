@@ -32,7 +32,10 @@ def extract_label(el) -> str:
 
 
 def looks_new_story(el) -> bool:
-    label = extract_label(el)
+    return label_looks_new(extract_label(el))
+
+
+def label_looks_new(label: str) -> bool:
     if not label:
         return False
     if "not seen" in label:
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+from camoufox.async_api import AsyncNewBrowser
+from camoufox.exceptions import InvalidProxy
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from python.browser.compat import compat as compat_module
+from python.browser.context import _assert_proxy_is_healthy, _build_launch_kwargs
+from python.core import pacing
+from python.core.errors.exceptions import AccountBannedException
+from python.core.errors.retry import async_retry_with_backoff, jitter
+
+
+@asynccontextmanager
+async def create_async_browser_context(
+    playwright,
+    profile_name: str,
+    proxy_string: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    base_dir: Optional[str] = None,
+    headless: bool = False,
+    block_images: bool = False,
+    os: Optional[str] = None,
+    fingerprint_seed: Optional[str] = None,
+    fingerprint_os: Optional[str] = None,
+    display: Optional[str] = None,
+):
+    """Async twin of ``create_browser_context`` that launches on a shared ``async_playwright`` driver."""
+    compat = compat_module()
+    await _wait_for_circuit_breaker(compat)
+    profile_path = compat.ensure_profile_path(profile_name, base_dir=base_dir)
+    should_clean = compat._should_clean_today(profile_path)
+    _assert_proxy_is_healthy(compat, proxy_string)
+    launch_kwargs = await asyncio.to_thread(
+        _build_launch_kwargs,
+        compat,
+        profile_path,
+        proxy_string,
+        user_agent,
+        headless,
+        block_images,
+        os,
+        fingerprint_seed,
+        fingerprint_os,
+        display,
+    )
+    context = None
+    try:
+        context = await _launch_context(playwright, launch_kwargs)
+        page, monitor = await _initialize_page(compat, context, profile_name)
+        await _bootstrap_instagram_session(compat, page, monitor, proxy_string)
+        await _sync_session_state(compat, context, profile_name)
+        yield context, page
+    finally:
+        await _close_context(compat, context, profile_name)
+        if should_clean:
+            await asyncio.to_thread(_clean_cache, compat, profile_path)
+
+
+async def _wait_for_circuit_breaker(compat) -> None:
+    if not compat.proxy_circuit.is_open():
+        return
+    wait_time = max(0.0, compat.proxy_circuit.global_pause_until - time.time())
+    print(f'[!] Circuit breaker open. Waiting {wait_time:.1f}s...')
+    await pacing.async_sleep(wait_time, pacing.current_token())
+
+
+async def _launch_context(playwright, launch_kwargs: dict):
+    try:
+        return await AsyncNewBrowser(playwright, geoip=True, **launch_kwargs)
+    except InvalidProxy:
+        if not launch_kwargs.get('proxy'):
+            raise
+        print('[!] Proxy GeoIP check failed. Retrying with geoip=False...')
+        return await AsyncNewBrowser(playwright, geoip=False, **launch_kwargs)
+
+
+async def _initialize_page(compat, context, profile_name: str):
+    try:
+        cookies = await asyncio.to_thread(compat._load_profile_cookies, profile_name)
+        if cookies:
+            await context.add_cookies(cookies)
+            print(f'[*] Preloaded {len(cookies)} cookies from database for {profile_name}')
+    except Exception as exc:
+        compat.logger.warning('Cookie preload failed for %s: %s', profile_name, exc)
+
+    page = context.pages[0] if context.pages else await context.new_page()
+    monitor = compat.TrafficMonitor()
+    page.on('response', monitor.on_response)
+    # The aio action ports import the sync action packages, which import python.browser.setup
+    from python.actions.aio.common import seed_mouse_cursor
+
+    await seed_mouse_cursor(page)
+    return page, monitor
+
+
+@async_retry_with_backoff(exceptions=(PlaywrightTimeoutError,))
+async def safe_goto(page, url, timeout=None):
+    return await page.goto(url, timeout=timeout)
+
+
+async def _bootstrap_instagram_session(compat, page, monitor, proxy_string: Optional[str]) -> None:
+    try:
+        if page.url == 'about:blank':
+            await safe_goto(page, 'https://www.instagram.com', timeout=jitter(45000))
+            if monitor.should_pause():
+                wait_time = max(0.0, monitor.cooldown_until - time.time())
+                print(f'[!] Traffic monitor triggered cooldown. Waiting {wait_time:.1f}s...')
+                await pacing.async_sleep(wait_time, pacing.current_token())
+            await _raise_if_account_banned(page)
+        compat.mark_proxy_success(proxy_string)
+        compat.proxy_circuit.record_success()
+    except PlaywrightTimeoutError:
+        print('[!] Timeout navigating to Instagram')
+        compat.mark_proxy_failure(proxy_string)
+        compat.proxy_circuit.record_failure()
+    except AccountBannedException:
+        raise
+    except Exception as exc:
+        print(f'[!] Error navigating to Instagram: {exc}')
+        compat.mark_proxy_failure(proxy_string)
+        compat.proxy_circuit.record_failure()
+
+
+async def _raise_if_account_banned(page: Any) -> None:
+    try:
+        content = (await page.content()).lower()
+    except Exception:
+        return
+    if 'account has been disabled' in content or 'account suspended' in content:
+        raise AccountBannedException('Account appears to be banned/suspended')
+
+
+async def _sync_session_state(compat, context, profile_name: str) -> None:
+    try:
+        raw_cookies = await context.cookies()
+    except Exception:
+        return
+    explicit_logout = bool(getattr(context, 'explicit_logout', False) or getattr(context, '_explicit_logout', False))
+    await asyncio.to_thread(
+        compat.save_profile_session_cookies,
+        raw_cookies,
+        profile_name,
+        explicit_logout=explicit_logout,
+    )
+
+
+async def _close_context(compat, context, profile_name: str) -> None:
+    if context is None:
+        return
+    try:
+        await _sync_session_state(compat, context, profile_name)
+    except Exception:
+        pass
+    try:
+        await context.close()
+    except Exception:
+        return
+
+
+def _clean_cache(compat, profile_path: str) -> None:
+    try:
+        compat._clean_cache2(profile_path)
+    except Exception:
+        return
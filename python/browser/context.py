@@ -1,6 +1,6 @@
 import time
 from contextlib import contextmanager
-from typing import Optional
+from typing import Dict, Optional
 
 from camoufox.exceptions import InvalidProxy
 
@@ -21,8 +21,16 @@ def create_browser_context(
     fingerprint_seed: Optional[str] = None,
     fingerprint_os: Optional[str] = None,
     display: Optional[str] = None,
+    fingerprint_config: Optional[dict] = None,
+    timings: Optional[Dict[str, float]] = None,
 ):
+    """
+    ``fingerprint_config`` skips loading the on-disk fingerprint when the
+    caller prepared it already; ``timings`` receives ``launch_ms`` and
+    ``bootstrap_ms``.
+    """
     compat = compat_module()
+    timings = timings if timings is not None else {}
     _wait_for_circuit_breaker(compat)
     profile_path = compat.ensure_profile_path(profile_name, base_dir=base_dir)
     should_clean = compat._should_clean_today(profile_path)
@@ -38,20 +46,40 @@ def create_browser_context(
         fingerprint_seed,
         fingerprint_os,
         display,
+        fingerprint_config,
     )
     cm = None
     context = None
     try:
+        started = time.monotonic()
         cm, context = _enter_camoufox_context(compat, launch_kwargs)
+        launched = time.monotonic()
+        timings['launch_ms'] = round((launched - started) * 1000.0, 1)
         page, monitor = compat.initialize_browser_page(context, profile_name)
         compat.bootstrap_instagram_session(page, monitor, profile_name, proxy_string)
         _sync_session_state(compat, context, profile_name)
+        timings['bootstrap_ms'] = round((time.monotonic() - launched) * 1000.0, 1)
         yield context, page
     finally:
         _close_context_manager(compat, cm, context, profile_name)
         _schedule_cache_cleanup(compat, should_clean, profile_path)
 
 
+def prepare_fingerprint_config(
+    profile_name: str,
+    fingerprint_seed: Optional[str],
+    fingerprint_os: Optional[str] = None,
+    os: Optional[str] = None,
+    base_dir: Optional[str] = None,
+) -> Optional[dict]:
+    """Load (or generate and cache) the fingerprint ``create_browser_context`` would use."""
+    if not fingerprint_seed:
+        return None
+    compat = compat_module()
+    profile_path = compat.ensure_profile_path(profile_name, base_dir=base_dir)
+    return load_or_generate_fingerprint_config(profile_path, fingerprint_seed, fingerprint_os or os or 'windows')
+
+
 def _wait_for_circuit_breaker(compat) -> None:
     if not compat.proxy_circuit.is_open():
         return
@@ -77,10 +105,13 @@ def _build_launch_kwargs(
     fingerprint_seed: Optional[str],
     fingerprint_os: Optional[str],
     display: Optional[str],
+    prepared_config: Optional[dict] = None,
 ) -> dict:
     proxy_config = compat.build_proxy_config(proxy_string)
     target_os = fingerprint_os or os_name or 'windows'
-    cached_config = load_or_generate_fingerprint_config(profile_path, fingerprint_seed, target_os)
+    cached_config = prepared_config
+    if cached_config is None:
+        cached_config = load_or_generate_fingerprint_config(profile_path, fingerprint_seed, target_os)
     launch_kwargs = {
         'headless': headless,
         'user_data_dir': profile_path,
@@ -0,0 +1,240 @@
+"""
+Warm pool of browser contexts keyed by profile and launch config.
+
+Closing a pooled context parks it instead of shutting Camoufox down; the
+next ``start_browser`` for the same profile, proxy, fingerprint, headless
+mode and display gets the running browser back and skips process startup,
+cookie preload and the first navigation.
+
+Playwright's sync objects only work on the thread that created them, so an
+entry is only handed back to, reaped by and closed by its owner thread.
+Idle entries expire after ``BROWSER_POOL_IDLE_TTL_SECONDS`` (0 disables
+pooling). ``BROWSER_POOL_MAX_MEMORY_MB`` caps the resident memory of all
+idle browsers: parking evicts the owner's least recently used idle entries
+first, and a context that still does not fit is closed instead of parked.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TTL_SECONDS = 300.0
+DEFAULT_MAX_MEMORY_MB = 2048.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(name) or default))
+    except ValueError:
+        return default
+
+
+def pool_key(profile_name: str, proxy_string: Any, user_agent: Any, *, headless: bool, fingerprint_seed: Any, fingerprint_os: Any, display: Any) -> Tuple:
+    return (
+        str(profile_name),
+        str(proxy_string or ''),
+        str(user_agent or ''),
+        bool(headless),
+        str(fingerprint_seed or ''),
+        str(fingerprint_os or ''),
+        str(display or ''),
+    )
+
+
+class PooledBrowserContext:
+    """
+    A checked-out browser; ``__exit__`` parks it in the pool, ``close`` shuts it down.
+
+    It stands in for the ``create_browser_context`` manager the workflow keeps
+    in ``browser_state['_ctx_mgr']``.
+    """
+
+    def __init__(self, pool: 'BrowserContextPool', key: Tuple, ctx_mgr: Any, context: Any, page: Any):
+        self.pool = pool
+        self.key = key
+        self.owner = threading.get_ident()
+        self.ctx_mgr = ctx_mgr
+        self.context = context
+        self.page = page
+        self.idle_since = 0.0
+        self.memory_mb = 0.0
+        self.reuses = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self.context, self.page
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.pool.park(self)
+        else:
+            self.close()
+
+    def alive(self) -> bool:
+        if self.closed:
+            return False
+        is_closed = getattr(self.page, 'is_closed', None)
+        try:
+            return not (callable(is_closed) and is_closed())
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.ctx_mgr.__exit__(None, None, None)
+        except Exception as exc:
+            logger.warning('Closing pooled browser for %s failed: %s', self.key[0], exc)
+
+
+class BrowserContextPool:
+    def __init__(
+        self,
+        idle_ttl: Optional[float] = None,
+        max_memory_mb: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        memory_probe: Optional[Callable[[str], float]] = None,
+    ):
+        self.idle_ttl = _env_float('BROWSER_POOL_IDLE_TTL_SECONDS', DEFAULT_IDLE_TTL_SECONDS) if idle_ttl is None else idle_ttl
+        self.max_memory_mb = _env_float('BROWSER_POOL_MAX_MEMORY_MB', DEFAULT_MAX_MEMORY_MB) if max_memory_mb is None else max_memory_mb
+        self._clock = clock
+        self._memory_probe = memory_probe or browser_memory_mb
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple, PooledBrowserContext] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, key: Tuple, factory: Callable[[], Any]) -> PooledBrowserContext:
+        """Hand back this thread's idle browser for ``key`` or start one with ``factory``."""
+        self.reap()
+        owner = threading.get_ident()
+        with self._lock:
+            entry = self._idle.pop((owner, key), None)
+        if entry is not None and entry.alive():
+            entry.reuses += 1
+            with self._lock:
+                self.hits += 1
+            return entry
+        if entry is not None:
+            entry.close()
+        ctx_mgr = factory()
+        context, page = ctx_mgr.__enter__()
+        with self._lock:
+            self.misses += 1
+        return PooledBrowserContext(self, key, ctx_mgr, context, page)
+
+    def park(self, entry: PooledBrowserContext) -> None:
+        if entry.closed:
+            return
+        if self.idle_ttl <= 0 or entry.owner != threading.get_ident() or not entry.alive():
+            entry.close()
+            return
+        entry.idle_since = self._clock()
+        entry.memory_mb = self._memory_probe(entry.key[0])
+        with self._lock:
+            replaced = self._idle.pop((entry.owner, entry.key), None)
+            evicted = self._make_room(entry.owner, entry.memory_mb)
+            fits = evicted is not None
+            if fits:
+                self._idle[(entry.owner, entry.key)] = entry
+            self.evictions += len(evicted or [])
+        for stale in ([replaced] if replaced is not None else []) + list(evicted or []):
+            stale.close()
+        if not fits:
+            entry.close()
+        self.reap()
+
+    def reap(self) -> None:
+        """Close this thread's idle entries whose TTL has passed."""
+        owner = threading.get_ident()
+        now = self._clock()
+        with self._lock:
+            expired = [
+                slot for slot, entry in self._idle.items()
+                if slot[0] == owner and now - entry.idle_since >= self.idle_ttl
+            ]
+            entries = [self._idle.pop(slot) for slot in expired]
+        for entry in entries:
+            entry.close()
+
+    def close_idle(self) -> None:
+        """Close every idle browser owned by the calling thread."""
+        owner = threading.get_ident()
+        with self._lock:
+            slots = [slot for slot in self._idle if slot[0] == owner]
+            entries = [self._idle.pop(slot) for slot in slots]
+        for entry in entries:
+            entry.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'idle': len(self._idle),
+                'idle_memory_mb': round(sum(entry.memory_mb for entry in self._idle.values()), 1),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _make_room(self, owner: int, needed_mb: float) -> Optional[List[PooledBrowserContext]]:
+        """Pop ``owner``'s LRU idle entries until ``needed_mb`` fits; ``None`` if it cannot."""
+        if self.max_memory_mb <= 0:
+            return []
+        used = sum(entry.memory_mb for entry in self._idle.values())
+        if used + needed_mb <= self.max_memory_mb:
+            return []
+        own = sorted(
+            ((slot, entry) for slot, entry in self._idle.items() if slot[0] == owner),
+            key=lambda item: item[1].idle_since,
+        )
+        freed: List[Tuple[Tuple, PooledBrowserContext]] = []
+        for slot, entry in own:
+            if used + needed_mb <= self.max_memory_mb:
+                break
+            freed.append((slot, entry))
+            used -= entry.memory_mb
+        if used + needed_mb > self.max_memory_mb:
+            return None
+        return [self._idle.pop(slot) for slot, _ in freed]
+
+
+def browser_memory_mb(profile_name: str) -> float:
+    """Resident memory of this process's child browsers running on ``profile_name``'s profile dir."""
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return 0.0
+    processes: Dict[int, psutil.Process] = {}
+    for child in children:
+        try:
+            if not any(_is_profile_dir(part, profile_name) for part in child.cmdline()):
+                continue
+            processes[child.pid] = child
+            # Content processes do not repeat the profile path on their command line
+            for descendant in child.children(recursive=True):
+                processes[descendant.pid] = descendant
+        except psutil.Error:
+            continue
+    total = 0
+    for process in processes.values():
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def _is_profile_dir(arg: str, profile_name: str) -> bool:
+    path = os.path.normpath(str(arg))
+    return os.path.basename(path) == profile_name and os.path.basename(os.path.dirname(path)) == 'profiles'
+
+
+browser_pool = BrowserContextPool()
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
-import json
 import os
 import shutil
 import signal
 import socket
 import subprocess
+import sqlite3
 import tempfile
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterator, List, Optional
 
-try:
-    import fcntl  # type: ignore
-except Exception:  # pragma: no cover
-    fcntl = None
+from python.browser.novnc_gateway import NoVncGateway
+from python.core.storage.state_store import StateStore, migrate_display_registry
+
+
+def _state_dir() -> str:
+    state_dir = os.environ.get("DISPLAY_STATE_DIR", tempfile.gettempdir())
+    os.makedirs(state_dir, exist_ok=True)
+    return state_dir
+
+
+def _open_registry(state_path: Optional[str] = None) -> StateStore:
+    # The JSON registry from before the SQLite store is imported on first open
+    store = StateStore(state_path or os.path.join(_state_dir(), "anti_display_manager.sqlite3"))
+    migrate_display_registry(store, os.path.join(os.path.dirname(os.fspath(store.path)), "anti_display_manager.json"))
+    return store
 
 
 def _env_int(name: str, default: int) -> int:
@@ -142,6 +153,20 @@ class SessionInfo:
 
 
 class DisplayManager:
+    """
+    Hands out virtual displays (Xvnc + fluxbox + noVNC) from slots shared by
+    every process on the host through the registry file.
+
+    After ``start_pool()`` up to ``DISPLAY_POOL_SIZE`` displays are kept
+    running idle in this process: ``allocate`` claims one without waiting for
+    ports, ``release`` returns a healthy display to the pool, and a
+    background thread starts replacements for claimed ones.
+
+    Unless ``NOVNC_ON_DEMAND=0``, noVNC is not started with the display: a
+    ``NoVncGateway`` listener holds the VNC port and starts websockify when a
+    viewer connects.
+    """
+
     def __init__(self) -> None:
         self.owner_pid = os.getpid()
         self.display_start = _env_int("XVFB_DISPLAY_START", 100)
@@ -149,21 +174,22 @@ class DisplayManager:
         self.vnc_start = _env_int("VNC_PORT_START", 6081)
         self.vnc_end = _env_int("VNC_PORT_END", 6130)
         self.rfb_start = _env_int("RFB_PORT_START", 5901)
+        self.pool_size = max(0, _env_int("DISPLAY_POOL_SIZE", 2))
+        self.novnc_on_demand = os.environ.get("NOVNC_ON_DEMAND", "1").strip() not in {"0", "false", "False"}
+        self._novnc_gateway = NoVncGateway(self._spawn)
         self.enabled = self._compute_enabled()
         self._lock = Lock()
         self._runtime_sessions: Dict[str, Dict[str, Any]] = {}
-
-    @property
-    def lock_path(self) -> str:
-        state_dir = os.environ.get("DISPLAY_STATE_DIR", tempfile.gettempdir())
-        os.makedirs(state_dir, exist_ok=True)
-        return os.path.join(state_dir, "anti_display_manager.lock")
+        self._idle: List[Dict[str, Any]] = []
+        self._pool_active = False
+        self._pool_starting = 0
+        self._pool_wakeup = Event()
+        self._pool_thread: Optional[Thread] = None
+        self._store: Optional[StateStore] = None
 
     @property
     def state_path(self) -> str:
-        state_dir = os.environ.get("DISPLAY_STATE_DIR", tempfile.gettempdir())
-        os.makedirs(state_dir, exist_ok=True)
-        return os.path.join(state_dir, "anti_display_manager.json")
+        return os.path.join(_state_dir(), "anti_display_manager.sqlite3")
 
     def _compute_enabled(self) -> bool:
         explicit = os.environ.get("DISPLAY_MANAGER_ENABLED")
@@ -176,41 +202,26 @@ class DisplayManager:
         return True
 
     @contextmanager
-    def _global_lock(self):
-        with open(self.lock_path, "a+", encoding="utf-8") as fh:
-            if fcntl is not None:
-                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
-            try:
-                yield
-            finally:
-                if fcntl is not None:
-                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
-
-    def _load_registry(self) -> List[SessionInfo]:
-        try:
-            with open(self.state_path, "r", encoding="utf-8") as fh:
-                payload = json.load(fh)
-            sessions = payload.get("sessions") if isinstance(payload, dict) else []
-            if not isinstance(sessions, list):
-                return []
-            return [SessionInfo.from_registry_dict(x) for x in sessions if isinstance(x, dict)]
-        except Exception:
-            return []
+    def _registry(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction on the host-wide ``display_sessions`` table."""
+        if self._store is None:
+            self._store = _open_registry(self.state_path)
+        with self._store.transaction() as conn:
+            yield conn
 
-    def _save_registry(self, sessions: List[SessionInfo]) -> None:
-        payload = {"sessions": [s.to_registry_dict() for s in sessions]}
-        tmp_path = f"{self.state_path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as fh:
-            json.dump(payload, fh)
-        os.replace(tmp_path, self.state_path)
+    def _load_registry(self, conn: sqlite3.Connection) -> List[SessionInfo]:
+        return [SessionInfo.from_registry_dict(row) for row in self._store.display_sessions(conn)]
 
-    def _prune_stale_locked(self, sessions: List[SessionInfo]) -> List[SessionInfo]:
+    def _prune_stale_locked(self, conn: sqlite3.Connection) -> List[SessionInfo]:
         alive: List[SessionInfo] = []
-        for session in sessions:
+        stale: List[SessionInfo] = []
+        for session in self._load_registry(conn):
             if _pid_alive(session.owner_pid):
                 alive.append(session)
-                continue
-
+            else:
+                stale.append(session)
+        self._store.delete_display_sessions(conn, [session.key for session in stale])
+        for session in stale:
             for pid in (session.novnc_pid, session.xvnc_pid, session.fluxbox_pid, session.xvfb_pid):
                 _terminate_pid(pid)
         return alive
@@ -218,6 +229,9 @@ class DisplayManager:
     def _build_key(self, workflow_id: str, profile_name: str) -> str:
         return f"{workflow_id}:{profile_name}"
 
+    def _pool_key(self, slot: int) -> str:
+        return f"pool:{self.owner_pid}:{slot}"
+
     def _spawn(self, cmd: List[str]) -> subprocess.Popen[Any]:
         return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
@@ -246,11 +260,12 @@ class DisplayManager:
             "-AlwaysShared",
         ]
 
-    def _novnc_command(self, rfb_port: int, vnc_port: int) -> List[str]:
+    def _novnc_command(self, rfb_port: int, vnc_port: int, host: Optional[str] = None) -> List[str]:
+        listen = f"{host}:{vnc_port}" if host else str(vnc_port)
         novnc_proxy = "/usr/share/novnc/utils/novnc_proxy"
         if os.path.exists(novnc_proxy):
-            return [novnc_proxy, "--vnc", f"localhost:{rfb_port}", "--listen", str(vnc_port)]
-        return ["websockify", str(vnc_port), f"localhost:{rfb_port}", "--web=/usr/share/novnc"]
+            return [novnc_proxy, "--vnc", f"localhost:{rfb_port}", "--listen", listen]
+        return ["websockify", listen, f"localhost:{rfb_port}", "--web=/usr/share/novnc"]
 
     def _first_free_slot(self, sessions: List[SessionInfo]) -> Optional[int]:
         used = {s.slot for s in sessions}
@@ -278,64 +293,186 @@ class DisplayManager:
             if existing:
                 return existing["session"].to_public_dict()
 
-            with self._global_lock():
-                sessions = self._prune_stale_locked(self._load_registry())
-                slot = self._first_free_slot(sessions)
-                if slot is None:
-                    self._save_registry(sessions)
-                    raise RuntimeError("No available virtual display slots")
-
-                session = SessionInfo(
-                    key=key,
-                    workflow_id=workflow_id,
-                    profile_name=profile_name,
-                    slot=slot,
-                    display_num=self.display_start + slot,
-                    vnc_port=self.vnc_start + slot,
-                    rfb_port=self.rfb_start + slot,
-                    owner_pid=self.owner_pid,
-                    status="starting",
-                    started_at=time.time(),
-                )
-                sessions = [s for s in sessions if s.key != key]
-                sessions.append(session)
-                self._save_registry(sessions)
-
-            procs: Dict[str, subprocess.Popen[Any]] = {}
-            try:
-                display = f":{session.display_num}"
-                procs["xvnc"] = self._spawn(self._xvnc_command(display, session.rfb_port))
-                if not _wait_for_port(session.rfb_port, timeout_s=12.0):
-                    raise RuntimeError(f"Xvnc did not open port {session.rfb_port}")
-
-                procs["fluxbox"] = self._spawn(["fluxbox", "-display", display])
+            runtime = self._claim_idle_locked()
+            if runtime is not None:
+                session = runtime["session"]
+                self._rekey_session(session, key, workflow_id, profile_name, "active")
+                self._runtime_sessions[key] = runtime
+                self._wake_pool()
+                return session.to_public_dict()
 
+            session = self._reserve_slot(key, workflow_id, profile_name)
+            self._runtime_sessions[key] = self._start_session(session)
+            self._wake_pool()
+            return session.to_public_dict()
+
+    def _reserve_slot(self, key: Optional[str], workflow_id: str, profile_name: str) -> SessionInfo:
+        """Claim a free slot in the registry; ``key=None`` reserves it for the idle pool."""
+        with self._registry() as conn:
+            slot = self._first_free_slot(self._prune_stale_locked(conn))
+            if slot is None:
+                raise RuntimeError("No available virtual display slots")
+
+            key = key or self._pool_key(slot)
+            session = SessionInfo(
+                key=key,
+                workflow_id=workflow_id,
+                profile_name=profile_name,
+                slot=slot,
+                display_num=self.display_start + slot,
+                vnc_port=self.vnc_start + slot,
+                rfb_port=self.rfb_start + slot,
+                owner_pid=self.owner_pid,
+                status="starting",
+                started_at=time.time(),
+            )
+            self._store.put_display_session(conn, session.to_registry_dict())
+        return session
+
+    def _start_session(self, session: SessionInfo, status: str = "active") -> Dict[str, Any]:
+        """Spawn the processes for a reserved slot; the slot is freed again if that fails."""
+        procs: Dict[str, subprocess.Popen[Any]] = {}
+        try:
+            display = f":{session.display_num}"
+            procs["xvnc"] = self._spawn(self._xvnc_command(display, session.rfb_port))
+            if not _wait_for_port(session.rfb_port, timeout_s=12.0):
+                raise RuntimeError(f"Xvnc did not open port {session.rfb_port}")
+
+            procs["fluxbox"] = self._spawn(["fluxbox", "-display", display])
+
+            if self.novnc_on_demand:
+                rfb_port = session.rfb_port
+                # The gateway owns the public port; websockify only listens on loopback behind it
+                procs["novnc"] = self._novnc_gateway.listen(
+                    session.vnc_port,
+                    lambda port: self._novnc_command(rfb_port, port, host="127.0.0.1"),
+                    on_backend=lambda pid: self._record_novnc_pid(session, pid),
+                )
+            else:
                 procs["novnc"] = self._spawn(self._novnc_command(session.rfb_port, session.vnc_port))
                 if not _wait_for_port(session.vnc_port, timeout_s=12.0):
                     raise RuntimeError(f"noVNC did not open port {session.vnc_port}")
 
-                session.xvfb_pid = 0
-                session.fluxbox_pid = int(procs["fluxbox"].pid or 0)
-                session.xvnc_pid = int(procs["xvnc"].pid or 0)
-                session.novnc_pid = int(procs["novnc"].pid or 0)
-                session.status = "active"
-                session.started_at = time.time()
+            session.xvfb_pid = 0
+            session.fluxbox_pid = int(procs["fluxbox"].pid or 0)
+            session.xvnc_pid = int(procs["xvnc"].pid or 0)
+            session.novnc_pid = int(procs["novnc"].pid or 0)
+            session.status = status
+            session.started_at = time.time()
+            self._persist_session(session)
+            return {"session": session, "procs": procs}
+        except Exception:
+            self._stop_runtime_processes(procs)
+            self._forget_session(session.key)
+            raise
+
+    def _persist_session(self, session: SessionInfo, previous_key: Optional[str] = None) -> None:
+        with self._registry() as conn:
+            if previous_key and previous_key != session.key:
+                self._store.delete_display_sessions(conn, [previous_key])
+            self._store.put_display_session(conn, session.to_registry_dict())
+
+    def _record_novnc_pid(self, session: SessionInfo, pid: int) -> None:
+        """Keep ``novnc_pid`` on the websockify the gateway is running, so stale-owner cleanup can stop it."""
+        # Runs on gateway threads and from teardown under self._lock, so it must not take that lock
+        session.novnc_pid = int(pid or 0)
+        try:
+            with self._registry() as conn:
+                self._store.update_display_slot(conn, session.slot, self.owner_pid, novnc_pid=session.novnc_pid)
+        except Exception:
+            pass
+
+    def _forget_session(self, key: str) -> None:
+        with self._registry() as conn:
+            self._store.delete_display_sessions(conn, [key])
+
+    def _rekey_session(self, session: SessionInfo, key: str, workflow_id: str, profile_name: str, status: str) -> None:
+        previous_key = session.key
+        session.key = key
+        session.workflow_id = workflow_id
+        session.profile_name = profile_name
+        session.status = status
+        self._persist_session(session, previous_key)
+
+    def start_pool(self) -> None:
+        """Keep ``pool_size`` idle displays running until ``cleanup_all``."""
+        if not self.enabled or self.pool_size <= 0:
+            return
+        with self._lock:
+            if self._pool_active:
+                return
+            self._pool_active = True
+            self._pool_thread = Thread(target=self._pool_loop, name="display-pool", daemon=True)
+            self._pool_thread.start()
 
-                with self._global_lock():
-                    sessions = self._prune_stale_locked(self._load_registry())
-                    sessions = [s for s in sessions if s.key != key]
-                    sessions.append(session)
-                    self._save_registry(sessions)
+    def pool_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"idle": len(self._idle), "starting": self._pool_starting, "active": len(self._runtime_sessions)}
+
+    def _wake_pool(self) -> None:
+        if self._pool_active:
+            self._pool_wakeup.set()
+
+    def _claim_idle_locked(self) -> Optional[Dict[str, Any]]:
+        while self._idle:
+            runtime = self._idle.pop(0)
+            if self._runtime_healthy(runtime):
+                return runtime
+            self._stop_runtime_processes(runtime["procs"])
+            self._forget_session(runtime["session"].key)
+        return None
 
-                self._runtime_sessions[key] = {"session": session, "procs": procs}
-                return session.to_public_dict()
+    def _pool_loop(self) -> None:
+        while self._pool_active:
+            self._pool_wakeup.clear()
+            with self._lock:
+                wanted = self._pool_active and len(self._idle) + self._pool_starting < self.pool_size
+                if wanted:
+                    self._pool_starting += 1
+            if not wanted:
+                self._pool_wakeup.wait(5.0)
+                continue
+            runtime = None
+            try:
+                session = self._reserve_slot(None, "", "")
+                runtime = self._start_session(session, status="idle")
+            except Exception:
+                pass
+            with self._lock:
+                self._pool_starting -= 1
+                if runtime is not None and self._pool_active and len(self._idle) < self.pool_size:
+                    self._idle.append(runtime)
+                    continue
+            if runtime is not None:
+                # A released display refilled the pool while this one started
+                self._stop_runtime_processes(runtime["procs"])
+                self._forget_session(runtime["session"].key)
+            else:
+                # Out of slots or the X stack failed to start; retry later
+                self._pool_wakeup.wait(30.0)
+
+    def _runtime_healthy(self, runtime: Dict[str, Any]) -> bool:
+        procs = runtime["procs"]
+        return all(procs.get(name) is not None and procs[name].poll() is None for name in ("xvnc", "novnc"))
+
+    def _reset_runtime(self, runtime: Dict[str, Any]) -> bool:
+        """Make a released display ready for the next profile; ``False`` if it must be torn down."""
+        if not self._runtime_healthy(runtime):
+            return False
+        session = runtime["session"]
+        procs = runtime["procs"]
+        # Viewers of the previous profile must not see the next one
+        reset_novnc = getattr(procs["novnc"], "reset", None)
+        if callable(reset_novnc):
+            reset_novnc()
+        fluxbox = procs.get("fluxbox")
+        if fluxbox is None or fluxbox.poll() is not None:
+            try:
+                procs["fluxbox"] = self._spawn(["fluxbox", "-display", session.display])
             except Exception:
-                self._stop_runtime_processes(procs)
-                with self._global_lock():
-                    sessions = self._prune_stale_locked(self._load_registry())
-                    sessions = [s for s in sessions if s.key != key]
-                    self._save_registry(sessions)
-                raise
+                return False
+            session.fluxbox_pid = int(procs["fluxbox"].pid or 0)
+        return True
 
     def _stop_runtime_processes(self, procs: Dict[str, subprocess.Popen[Any]]) -> None:
         for name in ("novnc", "fluxbox", "xvnc", "xvfb"):
@@ -375,11 +512,19 @@ class DisplayManager:
             session: Optional[SessionInfo] = None
             if runtime:
                 session = runtime["session"]
+                public = session.to_public_dict()
+                if (
+                    self._pool_active
+                    and len(self._idle) < self.pool_size
+                    and self._reset_runtime(runtime)
+                ):
+                    self._rekey_session(session, self._pool_key(session.slot), "", "", "idle")
+                    self._idle.append(runtime)
+                    return public
                 self._stop_runtime_processes(runtime["procs"])
             else:
-                with self._global_lock():
-                    sessions = self._prune_stale_locked(self._load_registry())
-                    for s in sessions:
+                with self._registry() as conn:
+                    for s in self._prune_stale_locked(conn):
                         if s.key == key:
                             session = s
                             break
@@ -388,64 +533,37 @@ class DisplayManager:
                     for pid in (session.novnc_pid, session.xvnc_pid, session.fluxbox_pid, session.xvfb_pid):
                         _terminate_pid(pid)
 
-            with self._global_lock():
-                sessions = self._prune_stale_locked(self._load_registry())
-                sessions = [s for s in sessions if s.key != key]
-                self._save_registry(sessions)
+            self._forget_session(key)
 
             return session.to_public_dict() if session else None
 
     def cleanup_all(self) -> None:
         with self._lock:
+            self._pool_active = False
+            self._pool_wakeup.set()
+            idle, self._idle = self._idle, []
             keys = list(self._runtime_sessions.keys())
+        for runtime in idle:
+            self._stop_runtime_processes(runtime["procs"])
+            self._forget_session(runtime["session"].key)
         for key in keys:
             workflow_id, _, profile_name = key.partition(":")
             self.release(workflow_id, profile_name)
 
-        self.cleanup_owner_sessions(self.owner_pid, state_path=self.state_path, lock_path=self.lock_path)
+        self.cleanup_owner_sessions(self.owner_pid, state_path=self.state_path)
 
     @staticmethod
-    def cleanup_owner_sessions(owner_pid: Optional[int] = None, *, state_path: Optional[str] = None, lock_path: Optional[str] = None) -> None:
+    def cleanup_owner_sessions(owner_pid: Optional[int] = None, *, state_path: Optional[str] = None) -> None:
         pid = int(owner_pid or os.getpid())
-        state_dir = os.environ.get("DISPLAY_STATE_DIR", tempfile.gettempdir())
-        os.makedirs(state_dir, exist_ok=True)
-        state_file = state_path or os.path.join(state_dir, "anti_display_manager.json")
-        lock_file = lock_path or os.path.join(state_dir, "anti_display_manager.lock")
-        to_cleanup: List[SessionInfo] = []
-
-        with open(lock_file, "a+", encoding="utf-8") as fh:
-            if fcntl is not None:
-                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
-            try:
-                try:
-                    with open(state_file, "r", encoding="utf-8") as sfh:
-                        payload = json.load(sfh)
-                    entries = payload.get("sessions") if isinstance(payload, dict) else []
-                except Exception:
-                    entries = []
-
-                if not isinstance(entries, list):
-                    entries = []
-
-                keep: List[SessionInfo] = []
-                for entry in entries:
-                    if not isinstance(entry, dict):
-                        continue
-                    session = SessionInfo.from_registry_dict(entry)
-                    if session.owner_pid == pid:
-                        to_cleanup.append(session)
-                    else:
-                        keep.append(session)
-
-                tmp_path = f"{state_file}.tmp"
-                with open(tmp_path, "w", encoding="utf-8") as sfh:
-                    json.dump({"sessions": [s.to_registry_dict() for s in keep]}, sfh)
-                os.replace(tmp_path, state_file)
-            finally:
-                if fcntl is not None:
-                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+        store = _open_registry(state_path)
+        with store.transaction() as conn:
+            to_cleanup = [
+                SessionInfo.from_registry_dict(row)
+                for row in store.display_sessions(conn)
+                if int(row["owner_pid"] or 0) == pid
+            ]
+            store.delete_display_sessions(conn, [session.key for session in to_cleanup])
 
         for session in to_cleanup:
             for child_pid in (session.novnc_pid, session.xvnc_pid, session.fluxbox_pid, session.xvfb_pid):
                 _terminate_pid(child_pid)
-
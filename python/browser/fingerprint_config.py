@@ -1,7 +1,8 @@
-import json
 import os
 from typing import Optional
 
+from python.core.storage.state_store import get_state_store
+
 
 def _fingerprint_cache_path(profile_path: str, _seed: str, _os_name: str) -> str:
     return os.path.join(profile_path, '.fingerprint_cache.json')
@@ -9,22 +10,14 @@ def _fingerprint_cache_path(profile_path: str, _seed: str, _os_name: str) -> str
 
 def _load_cached_fingerprint(cache_path: str, seed: str, os_name: str) -> Optional[dict]:
     try:
-        if not os.path.exists(cache_path):
-            return None
-        with open(cache_path, 'r', encoding='utf-8') as file_obj:
-            data = json.load(file_obj)
-        if data.get('seed') != seed or data.get('os') != os_name:
-            return None
-        fingerprint = data.get('fingerprint')
-        return fingerprint if isinstance(fingerprint, dict) else None
+        return get_state_store().fingerprint(os.path.dirname(cache_path), seed, os_name)
     except Exception:
         return None
 
 
 def _save_fingerprint_cache(cache_path: str, seed: str, os_name: str, fp_dict: dict) -> None:
     try:
-        with open(cache_path, 'w', encoding='utf-8') as file_obj:
-            json.dump({'seed': seed, 'os': os_name, 'fingerprint': fp_dict}, file_obj, ensure_ascii=False, indent=2)
+        get_state_store().save_fingerprint(os.path.dirname(cache_path), seed, os_name, fp_dict)
     except Exception as exc:
         print(f'[!] Failed to save fingerprint cache: {exc}')
 
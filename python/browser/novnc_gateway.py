@@ -0,0 +1,291 @@
+"""
+On-demand noVNC for virtual displays.
+
+Instead of running websockify for every display, ``NoVncGateway`` holds the
+display's public VNC port itself. The first connection starts websockify on
+a free loopback port and every connection on the public port is relayed to
+it; once no viewer has been connected for ``NOVNC_IDLE_TIMEOUT_SECONDS``
+websockify is stopped again. ``LazyNoVnc`` is the per-display handle and
+looks enough like ``subprocess.Popen`` for ``DisplayManager`` to keep it in
+its process table.
+"""
+from __future__ import annotations
+
+import os
+import selectors
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_IDLE_TIMEOUT_SECONDS = 120.0
+BACKEND_START_TIMEOUT_SECONDS = 12.0
+_RELAY_CHUNK = 65536
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(name) or default))
+    except ValueError:
+        return default
+
+
+def _free_local_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _connect(port: int, deadline: float) -> Optional[socket.socket]:
+    while True:
+        try:
+            return socket.create_connection(("127.0.0.1", port), timeout=0.5)
+        except OSError:
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.1)
+
+
+class LazyNoVnc:
+    """Listener on one display's VNC port that runs websockify only while someone watches."""
+
+    def __init__(
+        self,
+        gateway: "NoVncGateway",
+        vnc_port: int,
+        command_factory: Callable[[int], List[str]],
+        on_backend: Optional[Callable[[int], None]] = None,
+    ):
+        self.gateway = gateway
+        self.vnc_port = int(vnc_port)
+        self._command_factory = command_factory
+        self._on_backend = on_backend
+        self._lock = threading.Lock()
+        self._backend: Any = None
+        self._backend_port = 0
+        self._clients: List[socket.socket] = []
+        self._last_active = time.monotonic()
+        self._closed = False
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.listener.bind(("", self.vnc_port))
+            self.listener.listen(16)
+            self.listener.setblocking(False)
+        except OSError:
+            self.listener.close()
+            raise
+
+    @property
+    def pid(self) -> int:
+        backend = self._backend
+        return int(getattr(backend, "pid", 0) or 0) if backend is not None and backend.poll() is None else 0
+
+    @property
+    def connections(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def poll(self) -> Optional[int]:
+        return 0 if self._closed else None
+
+    def terminate(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.gateway.unregister(self)
+        try:
+            self.listener.close()
+        except OSError:
+            pass
+        self.reset()
+
+    kill = terminate
+
+    def reset(self) -> None:
+        """Drop every viewer and stop websockify, e.g. before the display changes hands."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+            backend, self._backend = self._backend, None
+        for client in clients:
+            _close_quietly(client)
+        self._stop_backend(backend)
+
+    def accept(self) -> None:
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            client.setblocking(True)
+            with self._lock:
+                self._clients.append(client)
+            threading.Thread(
+                target=self._serve,
+                args=(client,),
+                name=f"novnc-relay-{self.vnc_port}",
+                daemon=True,
+            ).start()
+
+    def reap(self, idle_timeout: float) -> None:
+        with self._lock:
+            if self._backend is None or self._clients:
+                return
+            if time.monotonic() - self._last_active < idle_timeout:
+                return
+            backend, self._backend = self._backend, None
+        self._stop_backend(backend)
+
+    def _serve(self, client: socket.socket) -> None:
+        upstream = None
+        try:
+            port = self._ensure_backend()
+            if port:
+                upstream = _connect(port, time.monotonic() + BACKEND_START_TIMEOUT_SECONDS)
+            if upstream is not None:
+                _relay(client, upstream)
+        finally:
+            _close_quietly(client)
+            if upstream is not None:
+                _close_quietly(upstream)
+            with self._lock:
+                if client in self._clients:
+                    self._clients.remove(client)
+                self._last_active = time.monotonic()
+
+    def _ensure_backend(self) -> int:
+        with self._lock:
+            if self._closed:
+                return 0
+            if self._backend is not None and self._backend.poll() is None:
+                return self._backend_port
+            _stop_process(self._backend)
+            self._backend_port = _free_local_port()
+            try:
+                self._backend = self.gateway.spawn(self._command_factory(self._backend_port))
+            except Exception:
+                self._backend = None
+                return 0
+            port = self._backend_port
+        self._notify_backend(self.pid)
+        return port
+
+    def _stop_backend(self, backend: Any) -> None:
+        if backend is None:
+            return
+        _stop_process(backend)
+        self._notify_backend(0)
+
+    def _notify_backend(self, pid: int) -> None:
+        if self._on_backend is None:
+            return
+        try:
+            self._on_backend(pid)
+        except Exception:
+            pass
+
+
+class NoVncGateway:
+    """Accept loop and idle reaper shared by every ``LazyNoVnc`` of one process."""
+
+    def __init__(self, spawn: Callable[[List[str]], Any], idle_timeout: Optional[float] = None):
+        self.spawn = spawn
+        self.idle_timeout = (
+            _env_float("NOVNC_IDLE_TIMEOUT_SECONDS", DEFAULT_IDLE_TIMEOUT_SECONDS) if idle_timeout is None else idle_timeout
+        )
+        self._lock = threading.Lock()
+        self._endpoints: Dict[int, LazyNoVnc] = {}
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def listen(
+        self,
+        vnc_port: int,
+        command_factory: Callable[[int], List[str]],
+        on_backend: Optional[Callable[[int], None]] = None,
+    ) -> LazyNoVnc:
+        """Hold ``vnc_port``; ``on_backend`` gets the websockify pid when it starts and 0 when it stops."""
+        endpoint = LazyNoVnc(self, vnc_port, command_factory, on_backend)
+        with self._lock:
+            if self._selector is None:
+                self._selector = selectors.DefaultSelector()
+            self._selector.register(endpoint.listener, selectors.EVENT_READ, endpoint)
+            self._endpoints[endpoint.vnc_port] = endpoint
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="novnc-gateway", daemon=True)
+                self._thread.start()
+        return endpoint
+
+    def unregister(self, endpoint: LazyNoVnc) -> None:
+        with self._lock:
+            if self._endpoints.get(endpoint.vnc_port) is endpoint:
+                del self._endpoints[endpoint.vnc_port]
+            if self._selector is not None:
+                try:
+                    self._selector.unregister(endpoint.listener)
+                except (KeyError, ValueError):
+                    pass
+
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                selector = self._selector
+                if not self._endpoints or selector is None:
+                    self._thread = None
+                    return
+            try:
+                ready = selector.select(timeout=1.0)
+            except OSError:
+                ready = []
+            for key, _ in ready:
+                key.data.accept()
+            with self._lock:
+                endpoints = list(self._endpoints.values())
+            for endpoint in endpoints:
+                endpoint.reap(self.idle_timeout)
+
+
+def _relay(client: socket.socket, upstream: socket.socket) -> None:
+    peers = {client: upstream, upstream: client}
+    with selectors.DefaultSelector() as selector:
+        for sock in peers:
+            selector.register(sock, selectors.EVENT_READ)
+        while True:
+            try:
+                ready = selector.select()
+            except (OSError, ValueError):
+                return
+            for key, _ in ready:
+                try:
+                    data = key.fileobj.recv(_RELAY_CHUNK)
+                    if not data:
+                        return
+                    peers[key.fileobj].sendall(data)
+                except OSError:
+                    return
+
+
+def _close_quietly(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    try:
+        sock.close()
+    except OSError:
+        pass
+
+
+def _stop_process(proc: Any, timeout_s: float = 3.0) -> None:
+    if proc is None:
+        return
+    try:
+        proc.terminate()
+        proc.wait(timeout=timeout_s)
+    except Exception:
+        try:
+            proc.kill()
+        except Exception:
+            pass
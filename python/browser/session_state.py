@@ -79,7 +79,22 @@ def sync_profile_session_state(
     explicit_logout: bool = False,
 ) -> bool:
     try:
-        cookies = normalize_profile_cookies(context.cookies(), drop_invalid=True)
+        raw_cookies = context.cookies()
+    except Exception as exc:
+        _log_save_failure(profile_name, log, exc)
+        return False
+    return save_profile_session_cookies(raw_cookies, profile_name, log, explicit_logout=explicit_logout)
+
+
+def save_profile_session_cookies(
+    raw_cookies: Any,
+    profile_name: str,
+    log: Optional[Callable] = None,
+    *,
+    explicit_logout: bool = False,
+) -> bool:
+    try:
+        cookies = normalize_profile_cookies(raw_cookies, drop_invalid=True)
         session_id = extract_instagram_session_id(cookies)
         from python.database.profiles import ProfilesClient
 
@@ -115,8 +130,12 @@ def sync_profile_session_state(
                 log('Saved browser cookies and Instagram sessionid to database' if session_id else 'Saved browser cookies to database')
         return True
     except Exception as exc:
-        if log:
-            log(f'Failed saving browser cookies: {exc}')
-        else:
-            logger.warning('Failed saving browser cookies for %s: %s', profile_name, exc)
+        _log_save_failure(profile_name, log, exc)
         return False
+
+
+def _log_save_failure(profile_name: str, log: Optional[Callable], exc: Exception) -> None:
+    if log:
+        log(f'Failed saving browser cookies: {exc}')
+    else:
+        logger.warning('Failed saving browser cookies for %s: %s', profile_name, exc)
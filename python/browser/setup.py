@@ -6,7 +6,8 @@ from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from python.actions import common as actions
 from python.actions.browsing import scroll_feed, scroll_reels
-from python.browser.context import create_browser_context
+from python.browser.async_context import create_async_browser_context
+from python.browser.context import create_browser_context, prepare_fingerprint_config
 from python.browser.fingerprint_config import (
     _apply_cached_properties,
     _fingerprint_cache_path,
@@ -39,7 +40,11 @@ from python.browser.proxy import (
     proxy_circuit,
 )
 from python.browser.runtime import run_browser
-from python.browser.session_state import _load_profile_cookies, sync_profile_session_state
+from python.browser.session_state import (
+    _load_profile_cookies,
+    save_profile_session_cookies,
+    sync_profile_session_state,
+)
 from python.browser.traffic import TrafficMonitor
 from python.core.errors.exceptions import AccountBannedException, ProxyError
 from python.core.errors.retry import jitter, retry_with_backoff
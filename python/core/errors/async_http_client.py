@@ -0,0 +1,141 @@
+"""
+Asyncio counterpart of ``ResilientHttpClient`` built on ``httpx.AsyncClient``.
+
+Retry count, backoff, default timeout and the process-wide circuit breakers
+are the ones the sync client uses, so a route that trips under one client
+fails fast under the other. Backoff waits with ``asyncio.sleep`` and many
+requests share one connection pool without a thread each.
+"""
+import asyncio
+import logging
+from typing import Any, Optional
+
+import httpx
+
+from python.core.errors.http_client import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_CIRCUIT_THRESHOLD,
+    DEFAULT_CIRCUIT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    breaker_key,
+    circuit_breakers,
+    is_retryable_status,
+)
+from python.core.errors.retry import calculate_sleep_time
+from python.database.session import _pool_size
+
+logger = logging.getLogger(__name__)
+
+
+def httpx_timeout(timeout: Any) -> httpx.Timeout:
+    """Translate a ``requests``-style timeout (seconds or ``(connect, read)``) for httpx."""
+    if isinstance(timeout, httpx.Timeout):
+        return timeout
+    if isinstance(timeout, (tuple, list)):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class AsyncResilientHttpClient:
+    """
+    HTTP client with retry, exponential backoff, jitter, and circuit breaker, for asyncio.
+
+    The underlying ``httpx.AsyncClient`` is created on first use, inside the
+    running loop; close it with ``aclose`` or ``async with``.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        circuit_threshold: int = DEFAULT_CIRCUIT_THRESHOLD,
+        circuit_timeout: int = DEFAULT_CIRCUIT_TIMEOUT,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        client: Optional[httpx.AsyncClient] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.circuit_threshold = circuit_threshold
+        self.circuit_timeout = circuit_timeout
+        self.breakers = breakers if breakers is not None else circuit_breakers
+        self._client = client
+        self._owns_client = client is None
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        breaker = self.circuit_breaker_for(url)
+        is_probe = breaker.check_state()
+        try:
+            return await self._request_with_retries(breaker, method, url, **kwargs)
+        except BaseException:
+            if is_probe:
+                # Cancelled or otherwise without a verdict; let another caller probe
+                breaker.release_probe()
+            raise
+
+    def circuit_breaker_for(self, url: str) -> CircuitBreaker:
+        return self.breakers.get(
+            breaker_key(url),
+            threshold=self.circuit_threshold,
+            recovery_timeout=self.circuit_timeout,
+        )
+
+    async def _request_with_retries(self, breaker: CircuitBreaker, method: str, url: str, **kwargs) -> httpx.Response:
+        kwargs['timeout'] = httpx_timeout(kwargs.get('timeout', DEFAULT_TIMEOUT))
+        client = self._http()
+        last_exception = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.request(method, url, **kwargs)
+                if is_retryable_status(response.status_code):
+                    response.raise_for_status()
+                breaker.record_success()
+                return response
+            except httpx.HTTPError as e:
+                last_exception = e
+                logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}")
+                if attempt == self.max_retries:
+                    break
+                await asyncio.sleep(calculate_sleep_time(attempt, self.backoff_factor))
+
+        breaker.record_failure()
+        raise last_exception
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            size = _pool_size()
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+            )
+        return self._client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def aclose(self) -> None:
+        if not self._owns_client or self._client is None:
+            return
+        client, self._client = self._client, None
+        await client.aclose()
+
+    async def __aenter__(self) -> "AsyncResilientHttpClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
@@ -2,51 +2,148 @@ import time
 import random
 import requests
 import logging
-from typing import Optional, Any
+import threading
+from typing import Dict, Optional, Any
+from urllib.parse import urlsplit
 from requests.exceptions import RequestException, HTTPError, Timeout, ConnectionError
 from python.core.errors.retry import retry_with_backoff, calculate_sleep_time
+from python.database.session import get_shared_session
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Policy shared with AsyncResilientHttpClient
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_CIRCUIT_THRESHOLD = 5
+DEFAULT_CIRCUIT_TIMEOUT = 60
+DEFAULT_BACKOFF_FACTOR = 1.0
+DEFAULT_TIMEOUT = (10, 30)  # (connect, read)
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """5xx and 429 (Rate Limit) count as failures for retry and the breaker."""
+    return status_code >= 500 or status_code == 429
+
+
 class CircuitBreakerOpenError(Exception):
     """Raised when the circuit breaker is open."""
     pass
 
 class CircuitBreaker:
+    """
+    Failure counter for one backend route, safe to share between threads.
+
+    Once open, the first caller after ``recovery_timeout`` becomes the single
+    half-open probe; everyone else keeps failing fast until that probe
+    reports back.
+    """
+
     def __init__(self, threshold: int = 5, recovery_timeout: int = 60):
         self.threshold = threshold
         self.recovery_timeout = recovery_timeout
         self.failure_count = 0
         self.last_failure_time = 0
         self.is_open = False
+        self.trips = 0
+        self.rejections = 0
+        self.open_seconds = 0.0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
 
     def record_success(self):
         """Reset failure count on success."""
-        if self.is_open:
-            logger.info("Circuit breaker recovering - closing circuit.")
-        self.failure_count = 0
-        self.is_open = False
+        with self._lock:
+            if self.is_open:
+                logger.info("Circuit breaker recovering - closing circuit.")
+                self.open_seconds += time.time() - (self._opened_at or self.last_failure_time)
+            self.failure_count = 0
+            self.is_open = False
+            self._probe_in_flight = False
 
     def record_failure(self):
         """Record a failure and potentially open the circuit."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.threshold:
-            if not self.is_open:
-                logger.warning(f"Circuit breaker tripped! Open for {self.recovery_timeout}s.")
-            self.is_open = True
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+            probe_failed = self._probe_in_flight
+            self._probe_in_flight = False
 
-    def check_state(self):
-        """Check if request is allowed to proceed."""
-        if self.is_open:
+            if probe_failed or (not self.is_open and self.failure_count >= self.threshold):
+                logger.warning(f"Circuit breaker tripped! Open for {self.recovery_timeout}s.")
+                self.trips += 1
+                if not self.is_open:
+                    self._opened_at = self.last_failure_time
+                self.is_open = True
+
+    def release_probe(self):
+        """Give the half-open slot back when a probe ended without a verdict."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def check_state(self) -> bool:
+        """Check if request is allowed to proceed; returns ``True`` for the half-open probe."""
+        with self._lock:
+            if not self.is_open:
+                return False
             elapsed = time.time() - self.last_failure_time
-            if elapsed > self.recovery_timeout:
+            if elapsed > self.recovery_timeout and not self._probe_in_flight:
                 # Half-open state: allow one request to try
                 logger.info("Circuit breaker recovery timeout passed - attempting probe.")
-                return
-            raise CircuitBreakerOpenError(f"Circuit is open. Retry in {int(self.recovery_timeout - elapsed)}s")
+                self._probe_in_flight = True
+                return True
+            self.rejections += 1
+        raise CircuitBreakerOpenError(f"Circuit is open. Retry in {max(0, int(self.recovery_timeout - elapsed))}s")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_seconds = self.open_seconds
+            if self.is_open:
+                open_seconds += time.time() - (self._opened_at or self.last_failure_time)
+            if not self.is_open:
+                state = "closed"
+            elif self._probe_in_flight:
+                state = "half_open"
+            else:
+                state = "open"
+            return {
+                "state": state,
+                "failure_count": self.failure_count,
+                "trips": self.trips,
+                "rejections": self.rejections,
+                "open_seconds": round(open_seconds, 3),
+            }
+
+
+class CircuitBreakerRegistry:
+    """Breakers keyed by host plus route, shared by every client in the process."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, threshold: int = 5, recovery_timeout: int = 60) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(threshold=threshold, recovery_timeout=recovery_timeout)
+                self._breakers[key] = breaker
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.stats() for key, breaker in sorted(breakers.items())}
+
+
+def breaker_key(url: str) -> str:
+    """Host plus path of ``url``; query strings do not split a route."""
+    parsed = urlsplit(url)
+    return f"{parsed.netloc}{parsed.path or '/'}"
+
+
+circuit_breakers = CircuitBreakerRegistry()
+
 
 class ResilientHttpClient:
     """
@@ -55,39 +152,60 @@ class ResilientHttpClient:
     
     def __init__(
         self, 
-        max_retries: int = 3, 
-        circuit_threshold: int = 5, 
-        circuit_timeout: int = 60,
-        backoff_factor: float = 1.0
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        circuit_threshold: int = DEFAULT_CIRCUIT_THRESHOLD,
+        circuit_timeout: int = DEFAULT_CIRCUIT_TIMEOUT,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        session: Optional[requests.Session] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
     ):
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
-        self.circuit_breaker = CircuitBreaker(threshold=circuit_threshold, recovery_timeout=circuit_timeout)
-        self._session = requests.Session() # We manage our own session or could use shared one
+        self.circuit_threshold = circuit_threshold
+        self.circuit_timeout = circuit_timeout
+        self.breakers = breakers if breakers is not None else circuit_breakers
+        # Breakers and connections are shared process-wide, keyed by host/route
+        self._session = session if session is not None else get_shared_session()
 
     def request(self, method: str, url: str, **kwargs) -> requests.Response:
         """
         Execute HTTP request with resilience patterns.
         """
         # 1. Check Circuit Breaker
-        self.circuit_breaker.check_state()
-
+        breaker = self.circuit_breaker_for(url)
+        is_probe = breaker.check_state()
+        try:
+            return self._request_with_retries(breaker, method, url, **kwargs)
+        except BaseException:
+            if is_probe:
+                # The probe ended without a verdict (e.g. interrupted); let another caller try
+                breaker.release_probe()
+            raise
+
+    def circuit_breaker_for(self, url: str) -> CircuitBreaker:
+        return self.breakers.get(
+            breaker_key(url),
+            threshold=self.circuit_threshold,
+            recovery_timeout=self.circuit_timeout,
+        )
+
+    def _request_with_retries(self, breaker: CircuitBreaker, method: str, url: str, **kwargs) -> requests.Response:
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
             try:
                 # Calculate timeout if not provided
                 if 'timeout' not in kwargs:
-                    kwargs['timeout'] = (10, 30) # (connect, read)
+                    kwargs['timeout'] = DEFAULT_TIMEOUT
 
                 response = self._session.request(method, url, **kwargs)
                 
                 # Check for 5xx errors or 429 (Rate Limit) to treat as failures for retry
-                if response.status_code >= 500 or response.status_code == 429:
+                if is_retryable_status(response.status_code):
                     response.raise_for_status()
 
                 # Success!
-                self.circuit_breaker.record_success()
+                breaker.record_success()
                 return response
 
             except (RequestException, ConnectionError, Timeout, HTTPError) as e:
@@ -103,7 +221,7 @@ class ResilientHttpClient:
                 time.sleep(sleep_time)
         
         # If we get here, all retries failed
-        self.circuit_breaker.record_failure()
+        breaker.record_failure()
         raise last_exception
 
     def get(self, url: str, **kwargs) -> requests.Response:
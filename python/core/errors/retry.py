@@ -1,3 +1,4 @@
+import asyncio
 import random
 import time
 import functools
@@ -51,3 +52,25 @@ def retry_with_backoff(
                 raise last_exception
         return wrapper
     return decorator
+
+
+def async_retry_with_backoff(
+    max_retries: int = 3,
+    initial_delay: float = 1.0,
+    exceptions: Tuple[Type[Exception], ...] = (TimeoutError, ConnectionError),
+):
+    """Coroutine variant of :func:`retry_with_backoff` that waits without blocking the loop."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    if attempt >= max_retries:
+                        raise
+                    sleep_time = calculate_sleep_time(attempt, initial_delay)
+                    logger.warning(f"Retry {attempt + 1}/{max_retries} after {sleep_time:.1f}s: {e}")
+                    await asyncio.sleep(sleep_time)
+        return wrapper
+    return decorator
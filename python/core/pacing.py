@@ -0,0 +1,210 @@
+"""
+Process-wide pacing primitives.
+
+Runtime waits go through :func:`sleep` so an alternate clock (for example the
+virtual clock used by workflow simulation runs) can be installed without
+touching every call site.
+
+Waits that pass a :class:`CancellationToken` are parked on the shared
+:class:`TimerService` instead of ``time.sleep`` and return ``False`` as soon
+as the token is cancelled. Coroutines use :func:`async_sleep`, which parks on
+the running event loop instead.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Protocol, Tuple
+
+
+class CancellationToken:
+    """One-shot cancellation flag that wakes every wait registered on it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancellation; returns a function that unregisters it."""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+
+class TimerService:
+    """Single scheduler thread that releases parked waits at their deadlines."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, threading.Event]] = []
+        self._sequence = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def wait(self, seconds: float, token: Optional[CancellationToken] = None) -> bool:
+        """Block for ``seconds``; returns ``False`` if ``token`` was cancelled."""
+        if token is not None and token.cancelled:
+            return False
+        if seconds <= 0:
+            return True
+        event = threading.Event()
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + seconds, next(self._sequence), event))
+            self._ensure_thread()
+            self._cond.notify()
+        unregister = token.add_callback(lambda: self._wake(event)) if token is not None else None
+        try:
+            event.wait()
+        finally:
+            if unregister is not None:
+                unregister()
+        return not (token is not None and token.cancelled)
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(1 for _, _, event in self._heap if not event.is_set())
+
+    def _wake(self, event: threading.Event) -> None:
+        event.set()
+        with self._cond:
+            self._cond.notify()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='pacing-timer', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._heap and (self._heap[0][0] <= now or self._heap[0][2].is_set()):
+                    heapq.heappop(self._heap)[2].set()
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._cond.wait(timeout)
+
+
+class Clock(Protocol):
+    def time(self) -> float: ...
+
+    def monotonic(self) -> float: ...
+
+    def sleep(self, seconds: float, token: Optional[CancellationToken] = None) -> bool: ...
+
+
+class SystemClock:
+    """Wall-clock implementation backed by the :mod:`time` module."""
+
+    def __init__(self, timers: Optional[TimerService] = None) -> None:
+        self._timers = timers or TimerService()
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float, token: Optional[CancellationToken] = None) -> bool:
+        if token is not None:
+            return self._timers.wait(seconds, token)
+        if seconds > 0:
+            time.sleep(seconds)
+        return True
+
+
+_clock: Clock = SystemClock()
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar('pacing_cancellation_token', default=None)
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def now() -> float:
+    return _clock.time()
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
+
+
+def sleep(seconds: float, token: Optional[CancellationToken] = None) -> bool:
+    """Sleep on the installed clock; returns ``False`` if ``token`` cancelled the wait."""
+    return _clock.sleep(seconds, token)
+
+
+async def async_sleep(seconds: float, token: Optional[CancellationToken] = None) -> bool:
+    """Coroutine counterpart of :func:`sleep` that never blocks the event loop."""
+    if not isinstance(_clock, SystemClock):
+        completed = _clock.sleep(seconds, token)
+        await asyncio.sleep(0)
+        return completed
+    if token is not None and token.cancelled:
+        return False
+    if token is None or seconds <= 0:
+        await asyncio.sleep(max(0.0, seconds))
+        return True
+    loop = asyncio.get_running_loop()
+    woken = asyncio.Event()
+    unregister = token.add_callback(lambda: loop.call_soon_threadsafe(woken.set))
+    try:
+        await asyncio.wait_for(woken.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        return not token.cancelled
+    finally:
+        unregister()
+    return False
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token bound to the calling thread or task by :func:`cancellation_scope`, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Bind ``token`` to the calling thread or task for helpers that cannot take it as an argument."""
+    reset_token = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset_token)
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    """Install ``clock`` for the duration of the block."""
+    global _clock
+    previous = _clock
+    _clock = clock
+    try:
+        yield clock
+    finally:
+        _clock = previous
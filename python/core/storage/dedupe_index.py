@@ -0,0 +1,89 @@
+"""
+Incremental dedupe index for large scraped-record lists.
+
+The index keeps one 64-bit key hash and one record position per slot in two
+flat ``array`` buffers (open addressing, linear probing), so membership costs
+16 bytes per slot instead of a Python string per record. The full key is only
+recomputed from the stored record when two hashes match, which keeps lookups
+exact while the common path touches nothing but integers.
+"""
+import hashlib
+from array import array
+from typing import Any, Callable, Iterable, List, Optional
+
+EMPTY_SLOT = -1
+INITIAL_SLOTS = 1024
+
+
+def key_hash(key: str) -> int:
+    digest = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class DedupeIndex:
+    def __init__(self, key: Callable[[Any], str], records: Optional[Iterable[Any]] = None) -> None:
+        self.key = key
+        self.records: List[Any] = []
+        self._hashes = array('Q', bytes(8 * INITIAL_SLOTS))
+        self._positions = array('q', [EMPTY_SLOT]) * INITIAL_SLOTS
+        if records is not None:
+            self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, record: Any) -> bool:
+        key = self.key(record)
+        return bool(key) and self._find(key, key_hash(key)) is not None
+
+    def extend(self, records: Iterable[Any]) -> List[Any]:
+        """Append the records whose key is new, returning just those records."""
+        added: List[Any] = []
+        for record in records:
+            key = self.key(record)
+            if not key:
+                continue
+            hashed = key_hash(key)
+            slot = self._find(key, hashed)
+            if slot is not None:
+                continue
+            self._insert(hashed, len(self.records))
+            self.records.append(record)
+            added.append(record)
+        return added
+
+    def _find(self, key: str, hashed: int) -> Optional[int]:
+        mask = len(self._positions) - 1
+        slot = hashed & mask
+        while True:
+            position = self._positions[slot]
+            if position == EMPTY_SLOT:
+                return None
+            if self._hashes[slot] == hashed and self.key(self.records[position]) == key:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _insert(self, hashed: int, position: int) -> None:
+        if 2 * (len(self.records) + 1) > len(self._positions):
+            self._grow()
+        mask = len(self._positions) - 1
+        slot = hashed & mask
+        while self._positions[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        self._hashes[slot] = hashed
+        self._positions[slot] = position
+
+    def _grow(self) -> None:
+        hashes, positions = self._hashes, self._positions
+        size = 2 * len(positions)
+        self._hashes = array('Q', bytes(8 * size))
+        self._positions = array('q', [EMPTY_SLOT]) * size
+        mask = size - 1
+        for hashed, position in zip(hashes, positions):
+            if position == EMPTY_SLOT:
+                continue
+            slot = hashed & mask
+            while self._positions[slot] != EMPTY_SLOT:
+                slot = (slot + 1) & mask
+            self._hashes[slot] = hashed
+            self._positions[slot] = position
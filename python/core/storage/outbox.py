@@ -0,0 +1,209 @@
+"""
+Durable SQLite outbox for backend mutations.
+
+Mutations are written to a local SQLite table and applied by a background
+drainer. A failed apply is rescheduled with exponential backoff instead of
+blocking the caller, and rows left over when a process exits are applied by
+the next process that opens the same file and registers a handler for their
+kind.
+
+Rows that share an idempotency key collapse into one: enqueueing again
+replaces the payload, which gives last-write-wins semantics for status
+mutations. A per-row version keeps a drainer from deleting a row that was
+replaced while its previous payload was being applied, and a short claim
+lease keeps concurrent processes from applying the same row twice.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX_PATH = Path(__file__).resolve().parents[3] / 'data' / 'convex_outbox.sqlite3'
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 300.0
+CLAIM_LEASE_SECONDS = 60.0
+IDLE_POLL_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_until REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class MutationOutbox:
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        base_backoff_seconds: float = BASE_BACKOFF_SECONDS,
+        max_backoff_seconds: float = MAX_BACKOFF_SECONDS,
+    ) -> None:
+        self.path = Path(path)
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(_SCHEMA)
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+        self._handlers[kind] = handler
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], key: Optional[str] = None) -> None:
+        """Persist a mutation and wake the drainer; never raises for backend failures."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                INSERT INTO outbox (idempotency_key, kind, payload, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(idempotency_key) DO UPDATE SET
+                    kind = excluded.kind,
+                    payload = excluded.payload,
+                    version = outbox.version + 1,
+                    attempts = 0,
+                    next_attempt_at = excluded.next_attempt_at,
+                    last_error = NULL
+                """,
+                (key or f'{kind}:{uuid.uuid4().hex}', kind, json.dumps(payload, ensure_ascii=False), now, now),
+            )
+        self.start()
+        self._wake.set()
+
+    def pending(self, kind: Optional[str] = None) -> int:
+        with closing(self._connect()) as conn:
+            if kind is None:
+                return int(conn.execute('SELECT COUNT(*) FROM outbox').fetchone()[0])
+            return int(conn.execute('SELECT COUNT(*) FROM outbox WHERE kind = ?', (kind,)).fetchone()[0])
+
+    def drain(self) -> int:
+        """Apply every due row this process has a handler for; returns how many were applied."""
+        applied = 0
+        with self._drain_lock:
+            for row_id, kind, payload, version, attempts in self._due_rows():
+                if not self._claim(row_id, version):
+                    continue
+                try:
+                    self._handlers[kind](json.loads(payload))
+                except Exception as exc:
+                    self._reschedule(row_id, version, attempts + 1, exc)
+                    continue
+                self._complete(row_id, version)
+                applied += 1
+        return applied
+
+    def start(self) -> None:
+        """Start the background drainer, which first replays rows left by earlier processes."""
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='mutation-outbox', daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the drainer after one last pass; rows still failing stay on disk for the next start."""
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception as exc:
+                logger.warning('Mutation outbox drain failed for %s: %s', self.path, exc)
+            if self._stop.is_set():
+                return
+            self._wake.wait(self._next_wait())
+
+    def _next_wait(self) -> float:
+        kinds = list(self._handlers)
+        if not kinds:
+            return IDLE_POLL_SECONDS
+        placeholders = ','.join('?' for _ in kinds)
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f'SELECT MIN(MAX(next_attempt_at, claimed_until)) FROM outbox WHERE kind IN ({placeholders})',
+                kinds,
+            ).fetchone()
+        if row is None or row[0] is None:
+            return IDLE_POLL_SECONDS
+        return max(0.05, min(IDLE_POLL_SECONDS, float(row[0]) - time.time()))
+
+    def _due_rows(self):
+        kinds = list(self._handlers)
+        if not kinds:
+            return []
+        now = time.time()
+        placeholders = ','.join('?' for _ in kinds)
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                f"""
+                SELECT id, kind, payload, version, attempts FROM outbox
+                WHERE kind IN ({placeholders}) AND next_attempt_at <= ? AND claimed_until <= ?
+                ORDER BY id
+                """,
+                (*kinds, now, now),
+            ).fetchall()
+
+    def _claim(self, row_id: int, version: int) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'UPDATE outbox SET claimed_until = ? WHERE id = ? AND version = ? AND claimed_until <= ?',
+                (now + CLAIM_LEASE_SECONDS, row_id, version, now),
+            )
+            return cursor.rowcount == 1
+
+    def _complete(self, row_id: int, version: int) -> None:
+        with closing(self._connect()) as conn:
+            deleted = conn.execute('DELETE FROM outbox WHERE id = ? AND version = ?', (row_id, version)).rowcount
+            if not deleted:
+                # Replaced while in flight: release the claim so the newer payload is applied too.
+                conn.execute('UPDATE outbox SET claimed_until = 0 WHERE id = ?', (row_id,))
+
+    def _reschedule(self, row_id: int, version: int, attempts: int, exc: Exception) -> None:
+        delay = min(self.max_backoff_seconds, self.base_backoff_seconds * (2 ** (attempts - 1)))
+        logger.warning('Outbox mutation %s failed (attempt %s), retrying in %.0fs: %s', row_id, attempts, delay, exc)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                UPDATE outbox SET attempts = ?, next_attempt_at = ?, claimed_until = 0, last_error = ?
+                WHERE id = ? AND version = ?
+                """,
+                (attempts, time.time() + delay, str(exc)[:500], row_id, version),
+            )
+            conn.execute('UPDATE outbox SET claimed_until = 0 WHERE id = ?', (row_id,))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(os.fspath(self.path), timeout=10.0, isolation_level=None)
@@ -0,0 +1,233 @@
+"""
+Host-local profile lease registry shared by every runner process.
+
+A lease is a row in a small SQLite table naming the process that has a
+profile's browser open. Holders refresh a heartbeat in the background; a
+lease whose heartbeat is stale or whose process is gone counts as free.
+
+Waiters in the same process block on a condition that ``release`` notifies.
+Waiters in other processes watch ``PRAGMA data_version``, which changes on
+every commit from another connection, so a released profile is handed off
+within one short poll interval without touching the backend. The backend
+is only asked about profiles no local process has held recently (a lease
+on another host), and busy answers back off exponentially.
+"""
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Union
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_PATH = Path(__file__).resolve().parents[3] / 'data' / 'profile_leases.sqlite3'
+HEARTBEAT_INTERVAL_SECONDS = 10.0
+STALE_AFTER_SECONDS = 45.0
+LOCAL_HANDOFF_SECONDS = 120.0
+WATCH_INTERVAL_SECONDS = 0.02
+STALE_RECHECK_SECONDS = 1.0
+REMOTE_BACKOFF_SECONDS = 5.0
+MAX_REMOTE_BACKOFF_SECONDS = 120.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profile_leases (
+    profile TEXT PRIMARY KEY,
+    owner TEXT,
+    pid INTEGER,
+    host TEXT,
+    heartbeat_at REAL NOT NULL DEFAULT 0,
+    released_at REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+class ProfileLeaseRegistry:
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_LEASE_PATH,
+        *,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL_SECONDS,
+        stale_after: float = STALE_AFTER_SECONDS,
+    ) -> None:
+        self.path = Path(path)
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.owner = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self._held: Set[str] = set()
+        self._changed = threading.Condition()
+        self._remote: Dict[str, tuple] = {}
+        self._remote_lock = threading.Lock()
+        self._heartbeat: Optional[_LeaseHeartbeat] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(_SCHEMA)
+
+    def acquire(self, profile: str) -> bool:
+        """Take the lease unless another live local holder has it."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT owner, pid, heartbeat_at FROM profile_leases WHERE profile = ?',
+                (profile,),
+            ).fetchone()
+            if row is not None and row[0] not in (None, self.owner) and self._live(row[1], row[2], now):
+                conn.execute('ROLLBACK')
+                return False
+            conn.execute(
+                """
+                INSERT INTO profile_leases (profile, owner, pid, host, heartbeat_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(profile) DO UPDATE SET
+                    owner = excluded.owner, pid = excluded.pid, host = excluded.host,
+                    heartbeat_at = excluded.heartbeat_at
+                """,
+                (profile, self.owner, os.getpid(), socket.gethostname(), now),
+            )
+            conn.execute('COMMIT')
+        with self._changed:
+            self._held.add(profile)
+        self._ensure_heartbeat()
+        return True
+
+    def release(self, profile: str) -> None:
+        with self._changed:
+            self._held.discard(profile)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'UPDATE profile_leases SET owner = NULL, pid = NULL, released_at = ? WHERE profile = ? AND owner = ?',
+                (time.time(), profile, self.owner),
+            )
+        self._notify()
+
+    def holder(self, profile: str) -> Optional[int]:
+        """PID of the live local holder other than this registry, if any."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT owner, pid, heartbeat_at FROM profile_leases WHERE profile = ?',
+                (profile,),
+            ).fetchone()
+        if row is None or row[0] in (None, self.owner) or not self._live(row[1], row[2], time.time()):
+            return None
+        return int(row[1])
+
+    def released_locally(self, profile: str, within: float = LOCAL_HANDOFF_SECONDS) -> bool:
+        """Whether a process on this host released ``profile`` recently, so any backend busy flag is its own."""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT released_at FROM profile_leases WHERE profile = ?', (profile,)).fetchone()
+        return row is not None and time.time() - float(row[0] or 0) < within
+
+    def wait_until_free(
+        self,
+        profile: str,
+        timeout: float,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """Block until no other local process holds ``profile``; ``False`` on timeout or stop."""
+        should_stop = should_stop or (lambda: False)
+        deadline = time.monotonic() + timeout
+        with closing(self._connect()) as watcher:
+            version = _data_version(watcher)
+            while self.holder(profile) is not None:
+                recheck_at = time.monotonic() + STALE_RECHECK_SECONDS
+                while True:
+                    if should_stop() or time.monotonic() >= deadline:
+                        return False
+                    with self._changed:
+                        notified = self._changed.wait(WATCH_INTERVAL_SECONDS)
+                    current = _data_version(watcher)
+                    # Recheck on a local release, a commit from another process, or
+                    # periodically so a crashed holder's stale lease is noticed
+                    if notified or current != version or time.monotonic() >= recheck_at:
+                        version = current
+                        break
+        return True
+
+    def remote_busy(self, profile: str, probe: Callable[[], bool]) -> bool:
+        """Backend busy check for cross-host leases, answered from backoff state between probes."""
+        now = time.monotonic()
+        with self._remote_lock:
+            state = self._remote.get(profile)
+            if state is not None and now < state[0]:
+                return True
+        busy = bool(probe())
+        with self._remote_lock:
+            if busy:
+                previous = self._remote.get(profile, (0.0, 0.0))[1]
+                delay = min(MAX_REMOTE_BACKOFF_SECONDS, previous * 2 if previous else REMOTE_BACKOFF_SECONDS)
+                self._remote[profile] = (now + delay, delay)
+            else:
+                self._remote.pop(profile, None)
+        return busy
+
+    def close(self) -> None:
+        heartbeat, self._heartbeat = self._heartbeat, None
+        if heartbeat is not None:
+            heartbeat.stop()
+        with self._changed:
+            held = list(self._held)
+        for profile in held:
+            try:
+                self.release(profile)
+            except Exception as exc:
+                logger.warning('Failed to release profile lease %s: %s', profile, exc)
+
+    def beat(self) -> None:
+        with self._changed:
+            held = list(self._held)
+        if not held:
+            return
+        placeholders = ','.join('?' for _ in held)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                f'UPDATE profile_leases SET heartbeat_at = ? WHERE owner = ? AND profile IN ({placeholders})',
+                (time.time(), self.owner, *held),
+            )
+
+    def _live(self, pid: Optional[int], heartbeat_at: float, now: float) -> bool:
+        if now - float(heartbeat_at or 0) > self.stale_after:
+            return False
+        return bool(pid) and psutil.pid_exists(int(pid))
+
+    def _notify(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+    def _ensure_heartbeat(self) -> None:
+        with self._changed:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = _LeaseHeartbeat(self)
+        self._heartbeat.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(os.fspath(self.path), timeout=10.0, isolation_level=None)
+
+
+class _LeaseHeartbeat(threading.Thread):
+    def __init__(self, registry: ProfileLeaseRegistry) -> None:
+        super().__init__(name='profile-lease-heartbeat', daemon=True)
+        self.registry = registry
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.registry.heartbeat_interval):
+            try:
+                self.registry.beat()
+            except Exception as exc:
+                logger.warning('Profile lease heartbeat failed: %s', exc)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def _data_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute('PRAGMA data_version').fetchone()[0])
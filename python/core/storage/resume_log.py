@@ -0,0 +1,204 @@
+"""
+Append-only segmented resume log for long-running scrapes.
+
+One directory per workflow node::
+
+    header.json       small header rewritten atomically after every append
+    seg-000001.log    append-only record batches, one line per batch
+
+Each batch line is ``<crc32:08x> <json array>\\n``. The header records how many
+bytes of each segment are committed together with the caller's resume state
+(cursor, target index, ...), so bytes written past that offset by an
+interrupted append are ignored on replay and truncated by the next append.
+
+Segments are closed once they reach ``segment_bytes``. Closed segments carry a
+level and two neighbouring segments of the same level are merged into one of
+the next level, so a log of ``n`` bytes keeps ``O(log n)`` segment files while
+every byte is rewritten at most ``O(log n)`` times.
+"""
+import json
+import os
+import shutil
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Union
+
+from python.core.storage.atomic import atomic_write_json
+
+HEADER_FILE = 'header.json'
+LOG_VERSION = 1
+SEGMENT_BYTES = 8 * 1024 * 1024
+
+
+class ResumeLogError(Exception):
+    """Raised when a resume log is missing pieces or fails checksum verification."""
+
+
+class ResumeLog:
+    def __init__(self, path: Union[str, Path], *, segment_bytes: int = SEGMENT_BYTES) -> None:
+        self.path = Path(path)
+        self.segment_bytes = max(1, int(segment_bytes))
+        self.header = self._read_header()
+        self._remove_orphan_segments()
+
+    @classmethod
+    def create(cls, path: Union[str, Path], *, segment_bytes: int = SEGMENT_BYTES, **state: Any) -> 'ResumeLog':
+        """Start an empty log at ``path``, replacing whatever was there."""
+        target = Path(path)
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(target / HEADER_FILE, _empty_header(state))
+        return cls(target, segment_bytes=segment_bytes)
+
+    @staticmethod
+    def exists(path: Union[str, Path]) -> bool:
+        return (Path(path) / HEADER_FILE).is_file()
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        return dict(self.header.get('state') or {})
+
+    @property
+    def record_count(self) -> int:
+        return sum(int(segment['records']) for segment in self.header['segments'])
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.header['segments'])
+
+    def append(self, records: List[Any], **state: Any) -> None:
+        """Append ``records`` as one batch and commit ``state`` with it."""
+        segments = [dict(segment) for segment in self.header['segments']]
+        header = {**self.header, 'segments': segments, 'state': {**self.state, **state}}
+        if records:
+            if not segments or segments[-1]['bytes'] >= self.segment_bytes:
+                segments.append(_new_segment(header))
+            line = _encode_batch(records)
+            _append_line(self.path / segments[-1]['name'], segments[-1]['bytes'], line)
+            segments[-1]['bytes'] += len(line)
+            segments[-1]['batches'] += 1
+            segments[-1]['records'] += len(records)
+        self._commit(header)
+        if records and segments[-1]['bytes'] >= self.segment_bytes:
+            self._compact()
+
+    def iter_batches(self) -> Iterator[List[Any]]:
+        """Yield committed batches in append order, verifying every checksum."""
+        for segment in self.header['segments']:
+            yield from _read_segment(self.path / segment['name'], int(segment['bytes']))
+
+    def replay(self) -> List[Any]:
+        records: List[Any] = []
+        for batch in self.iter_batches():
+            records.extend(batch)
+        return records
+
+    def delete(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _compact(self) -> None:
+        while True:
+            segments = self.header['segments']
+            if len(segments) < 2 or segments[-2]['level'] != segments[-1]['level']:
+                return
+            self._merge_last_two()
+
+    def _merge_last_two(self) -> None:
+        segments = [dict(segment) for segment in self.header['segments']]
+        older, newer = segments[-2], segments[-1]
+        header = {**self.header, 'segments': segments[:-2]}
+        merged = _new_segment(header)
+        merged['level'] = older['level'] + 1
+        merged_path = self.path / merged['name']
+        with open(merged_path, 'wb') as fh:
+            for segment in (older, newer):
+                for batch in _read_segment(self.path / segment['name'], int(segment['bytes'])):
+                    line = _encode_batch(batch)
+                    fh.write(line)
+                    merged['bytes'] += len(line)
+                    merged['batches'] += 1
+                    merged['records'] += len(batch)
+            fh.flush()
+            os.fsync(fh.fileno())
+        header['segments'].append(merged)
+        self._commit(header)
+        for segment in (older, newer):
+            _unlink_quietly(self.path / segment['name'])
+
+    def _commit(self, header: Dict[str, Any]) -> None:
+        atomic_write_json(self.path / HEADER_FILE, header)
+        self.header = header
+
+    def _read_header(self) -> Dict[str, Any]:
+        try:
+            header = json.loads((self.path / HEADER_FILE).read_text(encoding='utf-8'))
+        except FileNotFoundError as exc:
+            raise ResumeLogError(f'Resume log header missing in {self.path}') from exc
+        except Exception as exc:
+            raise ResumeLogError(f'Resume log header unreadable in {self.path}: {exc}') from exc
+        if not isinstance(header, dict) or header.get('version') != LOG_VERSION or not isinstance(header.get('segments'), list):
+            raise ResumeLogError(f'Unsupported resume log header in {self.path}')
+        return header
+
+    def _remove_orphan_segments(self) -> None:
+        committed = {segment['name'] for segment in self.header['segments']}
+        for entry in self.path.glob('seg-*.log'):
+            if entry.name not in committed:
+                _unlink_quietly(entry)
+
+
+def _empty_header(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {'version': LOG_VERSION, 'nextSegment': 1, 'segments': [], 'state': dict(state)}
+
+
+def _new_segment(header: Dict[str, Any]) -> Dict[str, Any]:
+    number = int(header.get('nextSegment') or 1)
+    header['nextSegment'] = number + 1
+    return {'name': f'seg-{number:06d}.log', 'level': 0, 'bytes': 0, 'batches': 0, 'records': 0}
+
+
+def _encode_batch(records: List[Any]) -> bytes:
+    payload = json.dumps(records, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return b'%08x ' % zlib.crc32(payload) + payload + b'\n'
+
+
+def _append_line(path: Path, committed_bytes: int, line: bytes) -> None:
+    with open(path, 'ab') as fh:
+        if fh.seek(0, os.SEEK_END) != committed_bytes:
+            fh.truncate(committed_bytes)
+        fh.write(line)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _read_segment(path: Path, committed_bytes: int) -> Iterator[List[Any]]:
+    try:
+        with open(path, 'rb') as fh:
+            data = fh.read(committed_bytes)
+    except FileNotFoundError as exc:
+        raise ResumeLogError(f'Resume log segment missing: {path}') from exc
+    if len(data) != committed_bytes:
+        raise ResumeLogError(f'Resume log segment {path} is shorter than its committed length')
+    offset = 0
+    while offset < len(data):
+        end = data.find(b'\n', offset)
+        if end < 0:
+            raise ResumeLogError(f'Unterminated batch in {path} at offset {offset}')
+        line = data[offset:end]
+        checksum, _, payload = line.partition(b' ')
+        try:
+            valid = int(checksum, 16) == zlib.crc32(payload)
+        except ValueError:
+            valid = False
+        if not valid:
+            raise ResumeLogError(f'Checksum mismatch in {path} at offset {offset}')
+        batch = json.loads(payload)
+        yield batch if isinstance(batch, list) else []
+        offset = end + 1
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        return
@@ -1,28 +1,22 @@
-import json
-import time
-from pathlib import Path
 from typing import Optional
 
-from python.core.storage.atomic import atomic_write_json
+from python.core.storage.state_store import get_state_store
 
-CACHE_FILE = Path("data/selector_cache.json")
 
 def load_cache() -> dict:
-    if CACHE_FILE.exists():
-        try:
-            return json.loads(CACHE_FILE.read_text())
-        except Exception:
-            return {}
-    return {}
+    try:
+        return get_state_store().selector_strategies()
+    except Exception:
+        return {}
 
 def save_cache(cache: dict):
-    atomic_write_json(CACHE_FILE, cache)
+    get_state_store().replace_selector_strategies(cache)
 
 def record_success(element_name: str, strategy: str):
-    cache = load_cache()
-    cache[element_name] = {"strategy": strategy, "timestamp": time.time()}
-    save_cache(cache)
+    get_state_store().record_selector_strategy(element_name, strategy)
 
 def get_preferred_strategy(element_name: str) -> Optional[str]:
-    cache = load_cache()
-    return cache.get(element_name, {}).get("strategy")
+    try:
+        return get_state_store().selector_strategy(element_name)
+    except Exception:
+        return None
@@ -1,35 +1,20 @@
-from pathlib import Path
-import json
-import tempfile
-import os
-import time
 from typing import Optional
 
-from python.core.storage.atomic import atomic_write_json
+from python.core.storage.state_store import get_state_store
 
-# Adjust relative path if needed, or keep using absolute from root
-STATE_FILE = Path("data/session_state.json")
 
 def save_state(profile: str, action: str, progress: int):
-    state = {
-        "profile": profile,
-        "action": action,
-        "progress": progress,
-        "timestamp": time.time()
-    }
-    atomic_write_json(STATE_FILE, state)
+    get_state_store().save_session_progress(profile, action, progress)
 
-def load_state() -> Optional[dict]:
-    if STATE_FILE.exists():
-        try:
-            return json.loads(STATE_FILE.read_text(encoding='utf-8'))
-        except Exception:
-            return None
-    return None
+def load_state(profile: Optional[str] = None) -> Optional[dict]:
+    """Progress saved for ``profile``, or the most recent save of any profile."""
+    try:
+        return get_state_store().session_progress(profile)
+    except Exception:
+        return None
 
-def clear_state():
-    if STATE_FILE.exists():
-        try:
-            STATE_FILE.unlink()
-        except OSError:
-            pass
+def clear_state(profile: Optional[str] = None):
+    try:
+        get_state_store().clear_session_progress(profile)
+    except Exception:
+        pass
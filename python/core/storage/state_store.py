@@ -0,0 +1,354 @@
+"""
+Local state kept in one SQLite database instead of JSON files.
+
+Tables:
+
+    selector_strategies  preferred locator strategy per semantic element
+    session_progress     last scroll/browse progress per profile
+    fingerprints         generated Camoufox fingerprint per profile directory
+    display_sessions     virtual display slots claimed by runner processes
+
+The database runs in WAL mode and every write is a short ``BEGIN
+IMMEDIATE`` transaction touching only its own rows, so runner processes on
+one host no longer overwrite each other's whole-file rewrites. Connections
+are opened per operation, which keeps a store safe to share across threads.
+
+``get_state_store()`` opens ``data/state.sqlite3`` and imports the legacy
+``data/selector_cache.json`` and ``data/session_state.json`` once, renaming
+them to ``*.migrated``. The display registry and the per-profile
+``.fingerprint_cache.json`` files are imported by their owners
+(``migrate_display_registry`` and ``StateStore.fingerprint``).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parents[3] / 'data' / 'state.sqlite3'
+LEGACY_SELECTOR_CACHE = 'selector_cache.json'
+LEGACY_SESSION_STATE = 'session_state.json'
+MIGRATED_SUFFIX = '.migrated'
+
+DISPLAY_SESSION_FIELDS = (
+    'key',
+    'workflow_id',
+    'profile_name',
+    'slot',
+    'display_num',
+    'vnc_port',
+    'rfb_port',
+    'owner_pid',
+    'xvfb_pid',
+    'fluxbox_pid',
+    'xvnc_pid',
+    'novnc_pid',
+    'status',
+    'started_at',
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS selector_strategies (
+    element TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_progress (
+    profile TEXT PRIMARY KEY,
+    action TEXT NOT NULL,
+    progress INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    profile_path TEXT PRIMARY KEY,
+    seed TEXT NOT NULL,
+    os TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS display_sessions (
+    key TEXT PRIMARY KEY,
+    workflow_id TEXT NOT NULL,
+    profile_name TEXT NOT NULL,
+    slot INTEGER NOT NULL UNIQUE,
+    display_num INTEGER NOT NULL,
+    vnc_port INTEGER NOT NULL,
+    rfb_port INTEGER NOT NULL,
+    owner_pid INTEGER NOT NULL,
+    xvfb_pid INTEGER NOT NULL DEFAULT 0,
+    fluxbox_pid INTEGER NOT NULL DEFAULT 0,
+    xvnc_pid INTEGER NOT NULL DEFAULT 0,
+    novnc_pid INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class StateStore:
+    def __init__(self, path: Union[str, Path] = DEFAULT_STATE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """One write transaction; other writers wait for it instead of interleaving."""
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    # selector_strategies
+
+    def selector_strategies(self) -> Dict[str, Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT element, strategy, updated_at FROM selector_strategies').fetchall()
+        return {row[0]: {'strategy': row[1], 'timestamp': row[2]} for row in rows}
+
+    def selector_strategy(self, element: str) -> Optional[str]:
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT strategy FROM selector_strategies WHERE element = ?', (element,)).fetchone()
+        return row[0] if row else None
+
+    def record_selector_strategy(self, element: str, strategy: str, updated_at: Optional[float] = None) -> None:
+        with self.transaction() as conn:
+            _upsert_selector(conn, element, strategy, time.time() if updated_at is None else updated_at)
+
+    def replace_selector_strategies(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM selector_strategies')
+            for element, entry in (entries or {}).items():
+                if isinstance(entry, dict) and entry.get('strategy'):
+                    _upsert_selector(conn, element, entry['strategy'], float(entry.get('timestamp') or 0.0))
+
+    # session_progress
+
+    def save_session_progress(self, profile: str, action: str, progress: int) -> None:
+        with self.transaction() as conn:
+            _upsert_progress(conn, profile, action, progress, time.time())
+
+    def session_progress(self, profile: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Progress of ``profile``, or the most recently saved one when ``profile`` is ``None``."""
+        query = 'SELECT profile, action, progress, updated_at FROM session_progress'
+        with closing(self._connect()) as conn:
+            if profile is None:
+                row = conn.execute(f'{query} ORDER BY updated_at DESC, rowid DESC LIMIT 1').fetchone()
+            else:
+                row = conn.execute(f'{query} WHERE profile = ?', (profile,)).fetchone()
+        if row is None:
+            return None
+        return {'profile': row[0], 'action': row[1], 'progress': row[2], 'timestamp': row[3]}
+
+    def clear_session_progress(self, profile: Optional[str] = None) -> None:
+        with self.transaction() as conn:
+            if profile is None:
+                conn.execute('DELETE FROM session_progress')
+            else:
+                conn.execute('DELETE FROM session_progress WHERE profile = ?', (profile,))
+
+    # fingerprints
+
+    def fingerprint(self, profile_path: str, seed: str, os_name: str) -> Optional[dict]:
+        """Stored fingerprint for this seed and OS, importing the profile's legacy JSON cache if needed."""
+        key = _profile_key(profile_path)
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT seed, os, fingerprint FROM fingerprints WHERE profile_path = ?',
+                (key,),
+            ).fetchone()
+        if row is None:
+            row = self._import_legacy_fingerprint(profile_path)
+        if row is None or row[0] != seed or row[1] != os_name:
+            return None
+        try:
+            fingerprint = json.loads(row[2])
+        except ValueError:
+            return None
+        return fingerprint if isinstance(fingerprint, dict) else None
+
+    def save_fingerprint(self, profile_path: str, seed: str, os_name: str, fingerprint: dict) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO fingerprints (profile_path, seed, os, fingerprint, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(profile_path) DO UPDATE SET
+                    seed = excluded.seed, os = excluded.os,
+                    fingerprint = excluded.fingerprint, updated_at = excluded.updated_at
+                """,
+                (_profile_key(profile_path), seed, os_name, json.dumps(fingerprint, ensure_ascii=False), time.time()),
+            )
+
+    def _import_legacy_fingerprint(self, profile_path: str) -> Optional[tuple]:
+        # Left in place: the profile directory may be copied to a host without this database
+        legacy = _read_json(Path(profile_path) / '.fingerprint_cache.json')
+        if not isinstance(legacy, dict) or not isinstance(legacy.get('fingerprint'), dict):
+            return None
+        seed, os_name = str(legacy.get('seed') or ''), str(legacy.get('os') or '')
+        if not seed or not os_name:
+            return None
+        self.save_fingerprint(profile_path, seed, os_name, legacy['fingerprint'])
+        return seed, os_name, json.dumps(legacy['fingerprint'])
+
+    # display_sessions
+
+    def display_sessions(self, conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        rows = conn.execute(f'SELECT {", ".join(DISPLAY_SESSION_FIELDS)} FROM display_sessions').fetchall()
+        return [dict(zip(DISPLAY_SESSION_FIELDS, row)) for row in rows]
+
+    def put_display_session(self, conn: sqlite3.Connection, session: Dict[str, Any]) -> None:
+        values = [session.get(field) for field in DISPLAY_SESSION_FIELDS]
+        conn.execute('DELETE FROM display_sessions WHERE slot = ? AND key != ?', (session['slot'], session['key']))
+        conn.execute(
+            f'INSERT OR REPLACE INTO display_sessions ({", ".join(DISPLAY_SESSION_FIELDS)}) '
+            f'VALUES ({", ".join("?" for _ in DISPLAY_SESSION_FIELDS)})',
+            values,
+        )
+
+    def update_display_slot(self, conn: sqlite3.Connection, slot: int, owner_pid: int, **fields: Any) -> None:
+        """Update columns of ``owner_pid``'s row for ``slot``; a released slot is left alone."""
+        columns = [field for field in fields if field in DISPLAY_SESSION_FIELDS and field not in {'key', 'slot'}]
+        if not columns:
+            return
+        conn.execute(
+            f'UPDATE display_sessions SET {", ".join(f"{column} = ?" for column in columns)} '
+            'WHERE slot = ? AND owner_pid = ?',
+            [fields[column] for column in columns] + [slot, owner_pid],
+        )
+
+    def delete_display_sessions(self, conn: sqlite3.Connection, keys: Iterable[str]) -> None:
+        conn.executemany('DELETE FROM display_sessions WHERE key = ?', [(key,) for key in keys])
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(os.fspath(self.path), timeout=10.0, isolation_level=None)
+
+
+def _upsert_selector(conn: sqlite3.Connection, element: str, strategy: str, updated_at: float) -> None:
+    conn.execute(
+        """
+        INSERT INTO selector_strategies (element, strategy, updated_at) VALUES (?, ?, ?)
+        ON CONFLICT(element) DO UPDATE SET strategy = excluded.strategy, updated_at = excluded.updated_at
+        """,
+        (element, strategy, updated_at),
+    )
+
+
+def _upsert_progress(conn: sqlite3.Connection, profile: str, action: str, progress: int, updated_at: float) -> None:
+    conn.execute(
+        """
+        INSERT INTO session_progress (profile, action, progress, updated_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT(profile) DO UPDATE SET
+            action = excluded.action, progress = excluded.progress, updated_at = excluded.updated_at
+        """,
+        (profile, action, int(progress), updated_at),
+    )
+
+
+def _profile_key(profile_path: str) -> str:
+    return os.path.normcase(os.path.abspath(os.fspath(profile_path)))
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning('Ignoring unreadable legacy state file %s: %s', path, exc)
+        return None
+
+
+def _retire(path: Path) -> None:
+    try:
+        os.replace(path, path.with_name(path.name + MIGRATED_SUFFIX))
+    except OSError as exc:
+        logger.warning('Could not retire migrated state file %s: %s', path, exc)
+
+
+def migrate_legacy_files(
+    store: StateStore,
+    selector_cache: Union[str, Path, None] = None,
+    session_state: Union[str, Path, None] = None,
+) -> None:
+    """
+    Import the JSON selector cache and session state, keeping rows the store
+    already has. The files default to the ones next to the store's database.
+    """
+    selector_cache = Path(selector_cache or store.path.parent / LEGACY_SELECTOR_CACHE)
+    session_state = Path(session_state or store.path.parent / LEGACY_SESSION_STATE)
+    with store.transaction() as conn:
+        entries = _read_json(selector_cache) if selector_cache.exists() else None
+        if isinstance(entries, dict):
+            for element, entry in entries.items():
+                if isinstance(entry, dict) and entry.get('strategy'):
+                    conn.execute(
+                        'INSERT OR IGNORE INTO selector_strategies (element, strategy, updated_at) VALUES (?, ?, ?)',
+                        (element, entry['strategy'], float(entry.get('timestamp') or 0.0)),
+                    )
+        state = _read_json(session_state) if session_state.exists() else None
+        if isinstance(state, dict) and state.get('profile'):
+            conn.execute(
+                'INSERT OR IGNORE INTO session_progress (profile, action, progress, updated_at) VALUES (?, ?, ?, ?)',
+                (
+                    str(state['profile']),
+                    str(state.get('action') or ''),
+                    int(state.get('progress') or 0),
+                    float(state.get('timestamp') or 0.0),
+                ),
+            )
+    for path in (selector_cache, session_state):
+        if path.exists():
+            _retire(path)
+
+
+def migrate_display_registry(store: StateStore, registry_path: Union[str, Path]) -> None:
+    """Import the JSON ``DisplayManager`` registry into ``display_sessions``."""
+    registry_path = Path(registry_path)
+    if not registry_path.exists():
+        return
+    payload = _read_json(registry_path)
+    sessions = payload.get('sessions') if isinstance(payload, dict) else None
+    with store.transaction() as conn:
+        taken = {row['slot'] for row in store.display_sessions(conn)}
+        for entry in sessions if isinstance(sessions, list) else []:
+            if not isinstance(entry, dict) or int(entry.get('slot') or 0) in taken or not entry.get('key'):
+                continue
+            row = {field: entry.get(field) for field in DISPLAY_SESSION_FIELDS}
+            row['xvnc_pid'] = row['xvnc_pid'] or entry.get('x11vnc_pid')
+            for field in DISPLAY_SESSION_FIELDS:
+                if row[field] is None:
+                    row[field] = '' if field in {'workflow_id', 'profile_name', 'status'} else 0
+            store.put_display_session(conn, row)
+            taken.add(int(row['slot']))
+    _retire(registry_path)
+
+
+_default_store: Optional[StateStore] = None
+_default_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """The process-wide store at ``DEFAULT_STATE_PATH``, migrated from the JSON files on first use."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            store = StateStore(DEFAULT_STATE_PATH)
+            try:
+                migrate_legacy_files(store)
+            except Exception as exc:
+                logger.warning('Legacy state migration failed: %s', exc)
+            _default_store = store
+        return _default_store
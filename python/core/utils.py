@@ -18,6 +18,8 @@ def create_browser_context(
     fingerprint_seed: Optional[str] = None,
     fingerprint_os: Optional[str] = None,
     display: Optional[str] = None,
+    fingerprint_config: Optional[dict] = None,
+    timings: Optional[dict] = None,
 ):
     """
     Create a Camoufox browser context with standard configuration.
@@ -29,6 +31,8 @@ def create_browser_context(
         base_dir: Base directory for profiles (defaults to cwd)
         fingerprint_seed: Optional seed for deterministic fingerprint generation
         fingerprint_os: Optional OS for fingerprint generation
+        fingerprint_config: Fingerprint prepared ahead of launch, if any
+        timings: Optional dict that receives launch_ms and bootstrap_ms
     
     Yields:
         Tuple of (context, page)
@@ -42,6 +46,8 @@ def create_browser_context(
         fingerprint_seed=fingerprint_seed,
         fingerprint_os=fingerprint_os,
         display=display,
+        fingerprint_config=fingerprint_config,
+        timings=timings,
     ) as (context, page):
         yield context, page
 
@@ -1,5 +1,7 @@
 import time
-import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import quote
 
@@ -7,12 +9,61 @@ import requests
 
 from python.core.config import PROJECT_URL, SECRET_KEY
 from python.core.errors.http_client import ResilientHttpClient
+from python.core.storage.outbox import DEFAULT_OUTBOX_PATH, MutationOutbox
+from python.database.endpoints import (
+    ACCOUNTS_FOR_PROFILE,
+    ACCOUNTS_TO_MESSAGE,
+    BULK_UPDATE_ACCOUNTS,
+    PROFILE_BY_ID,
+    PROFILES_BY_IDS,
+    PROFILES_WITH_ASSIGNED,
+    UPDATE_ACCOUNT_MESSAGE,
+    UPDATE_ACCOUNT_STATUS,
+    Endpoint,
+)
+
+logger = logging.getLogger(__name__)
+
+_NOT_SET = "__NOT_SET__"
+MUTATION_BATCH_SIZE = 25
+MUTATION_FLUSH_INTERVAL_SECONDS = 5.0
+OUTBOX_STATUS_KIND = "account_mutations.status"
+OUTBOX_MESSAGE_KIND = "account_mutations.message"
+PROFILE_IDS_CHUNK_SIZE = 100
+PROFILE_FETCH_FALLBACK_WORKERS = 8
+PROFILE_IDLE_MAX_POLL_SECONDS = 60.0
 
 
 class InstagramAccountsError(Exception):
     """Raised when instagram_accounts API call fails."""
 
 
+def _status_update_payload(account_id: str, status: str, assigned_to: Any = _NOT_SET) -> Dict[str, Any]:
+    if status == "done" and assigned_to == _NOT_SET:
+        assigned_to = None
+    payload: Dict[str, Any] = {"id": account_id, "status": status}
+    if assigned_to != _NOT_SET:
+        payload["assigned_to"] = assigned_to
+    return payload
+
+
+def _message_update_payload(
+    user_name: str,
+    message: bool = True,
+    last_messaged_at: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    normalized = (user_name or "").strip()
+    if normalized.startswith("@"):
+        normalized = normalized[1:]
+    normalized = normalized.strip("/")
+    if not normalized:
+        return None
+    payload: Dict[str, Any] = {"user_name": normalized, "message": message}
+    if last_messaged_at is not None:
+        payload["last_messaged_at"] = int(last_messaged_at)
+    return payload
+
+
 class InstagramAccountsClient:
     """Client for managing instagram_accounts and related profile checks."""
 
@@ -22,6 +73,7 @@ class InstagramAccountsClient:
                 "Convex config missing. Set CONVEX_URL in environment."
             )
 
+        self.project_url = PROJECT_URL
         self.accounts_url = f"{PROJECT_URL}/api/instagram-accounts"
         self.profiles_url = f"{PROJECT_URL}/api/profiles"
         self.headers = {
@@ -32,6 +84,7 @@ class InstagramAccountsClient:
             self.headers["Authorization"] = f"Bearer {SECRET_KEY}"
         self.http_client = ResilientHttpClient()
         self.timeout = 20
+        self._bulk_profiles_supported = True
 
     def _request(
         self,
@@ -66,6 +119,15 @@ class InstagramAccountsClient:
         except Exception as exc:
             raise InstagramAccountsError(f"Request failed: {exc}")
 
+    def _call(self, endpoint: Endpoint, payload: Optional[Dict[str, Any]] = None):
+        kwargs = endpoint.request_kwargs(payload)
+        return self._request(
+            endpoint.method,
+            f"{self.project_url}{endpoint.path}",
+            data=kwargs.get("json"),
+            params=kwargs.get("params"),
+        )
+
     # ----- Accounts helpers -------------------------------------------------
     def get_accounts_for_profile(
         self, profile_id: str, status: str = "assigned"
@@ -75,7 +137,7 @@ class InstagramAccountsClient:
             "profileId": profile_id,
             "status": status,
         }
-        return self._request("GET", f"{self.accounts_url}/for-profile", params=params) or []
+        return self._call(ACCOUNTS_FOR_PROFILE, params) or []
 
     def get_accounts_to_message(
         self,
@@ -87,35 +149,19 @@ class InstagramAccountsClient:
             "profileId": profile_id,
             "cooldownHours": cooldown_hours,
         }
-        return self._request("GET", f"{self.accounts_url}/to-message", params=params) or []
+        return self._call(ACCOUNTS_TO_MESSAGE, params) or []
 
     def update_account_status(
         self,
         account_id: str,
         status: str = "subscribed",
-        assigned_to: Any = "__NOT_SET__",
+        assigned_to: Any = _NOT_SET,
     ):
         """
         Update account status (default -> 'subscribed').
         Optionally update assigned_to (e.g., set to None to unassign).
         """
-        if status == "done" and assigned_to == "__NOT_SET__":
-            assigned_to = None
-
-        payload = {"status": status}
-        if (status or "").lower() in ("subscribed"):
-            payload["subscribed_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        if assigned_to != "__NOT_SET__":
-            payload["assigned_to"] = assigned_to
-
-        result = self._request(
-            "POST",
-            f"{self.accounts_url}/update-status",
-            data={
-                **{"id": account_id, "status": payload.get("status")},
-                **({} if "assigned_to" not in payload else {"assigned_to": payload["assigned_to"]}),
-            },
-        )
+        result = self._call(UPDATE_ACCOUNT_STATUS, _status_update_payload(account_id, status, assigned_to))
         return result if isinstance(result, dict) else None
 
     def update_account_message(
@@ -127,28 +173,25 @@ class InstagramAccountsClient:
         """
         Update the message field for an account by username.
         """
-        normalized = (user_name or "").strip()
-        if normalized.startswith("@"):
-            normalized = normalized[1:]
-        normalized = normalized.strip("/")
-        if not normalized:
+        payload = _message_update_payload(user_name, message, last_messaged_at)
+        if payload is None:
             return None
 
-        result = self._request(
-            "POST",
-            f"{self.accounts_url}/update-message",
-            data={
-                "user_name": normalized,
-                "message": message,
-                **(
-                    {"last_messaged_at": int(last_messaged_at)}
-                    if last_messaged_at is not None
-                    else {}
-                ),
-            },
-        )
+        result = self._call(UPDATE_ACCOUNT_MESSAGE, payload)
         return result if isinstance(result, dict) else None
 
+    def bulk_update_accounts(
+        self,
+        status_updates: List[Dict[str, Any]],
+        message_updates: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Apply prepared status/message payloads in one request."""
+        result = self._call(
+            BULK_UPDATE_ACCOUNTS,
+            {"status_updates": status_updates, "message_updates": message_updates},
+        )
+        return result if isinstance(result, dict) else {}
+
     def get_profiles_with_assigned_accounts(self, status: Optional[str] = "assigned") -> List[Dict]:
         """
         Return list of profiles (full records) that have accounts assigned with given status.
@@ -157,22 +200,53 @@ class InstagramAccountsClient:
         params = {}
         if status is not None:
             params["status"] = status
-        return self._request("GET", f"{self.accounts_url}/profiles-with-assigned", params=params) or []
+        return self._call(PROFILES_WITH_ASSIGNED, params) or []
 
     # ----- Profile helpers --------------------------------------------------
     def _fetch_profiles_by_ids(self, profile_ids: List[str]) -> List[Dict]:
-        profiles = []
-        for pid in profile_ids or []:
-            try:
-                prof = self._request("GET", f"{self.profiles_url}/by-id", params={"profileId": pid})
+        return list(self.get_profiles_by_ids(profile_ids).values())
+
+    def get_profiles_by_ids(self, profile_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch profiles keyed by profile_id, one ``/by-ids`` request per chunk.
+        Unknown or failed ids are omitted. Against a backend without the bulk
+        route each chunk falls back to parallel ``/by-id`` requests.
+        """
+        clean_ids = list(dict.fromkeys(str(pid).strip() for pid in profile_ids or [] if str(pid or "").strip()))
+        profiles: Dict[str, Dict] = {}
+        for start in range(0, len(clean_ids), PROFILE_IDS_CHUNK_SIZE):
+            chunk = clean_ids[start:start + PROFILE_IDS_CHUNK_SIZE]
+            rows = self._fetch_profile_chunk(chunk) if self._bulk_profiles_supported else None
+            if rows is None:
+                rows = self._fetch_profiles_individually(chunk)
+            for prof in rows:
                 if isinstance(prof, dict) and prof.get("profile_id"):
-                    profiles.append(prof)
-            except Exception:
-                continue
+                    profiles[str(prof["profile_id"])] = prof
         return profiles
 
+    def _fetch_profile_chunk(self, profile_ids: List[str]) -> Optional[List[Dict]]:
+        try:
+            rows = self._call(PROFILES_BY_IDS, {"profile_ids": profile_ids})
+        except InstagramAccountsError as exc:
+            if "HTTP 404" in str(exc):
+                self._bulk_profiles_supported = False
+                return None
+            logger.warning("Bulk profile fetch failed for %s id(s): %s", len(profile_ids), exc)
+            return []
+        return rows if isinstance(rows, list) else []
+
+    def _fetch_profiles_individually(self, profile_ids: List[str]) -> List[Dict]:
+        def fetch(pid: str) -> Optional[Dict]:
+            try:
+                return self.get_profile(pid)
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(PROFILE_FETCH_FALLBACK_WORKERS, len(profile_ids)))) as pool:
+            return [prof for prof in pool.map(fetch, profile_ids) if prof]
+
     def get_profile(self, profile_id: str) -> Optional[Dict]:
-        profile = self._request("GET", f"{self.profiles_url}/by-id", params={"profileId": profile_id})
+        profile = self._call(PROFILE_BY_ID, {"profileId": profile_id})
         return profile if isinstance(profile, dict) else None
 
     def is_profile_busy(self, profile_id: str) -> bool:
@@ -191,22 +265,245 @@ class InstagramAccountsClient:
         should_stop: Optional[Callable[[], bool]] = None,
         poll_interval: float = 5.0,
         timeout: float = 300.0,
+        profile_name: Optional[str] = None,
+        leases: Optional[Any] = None,
     ) -> bool:
         """
-        Poll until profile becomes idle or timeout / stop requested.
+        Wait until profile becomes idle or timeout / stop requested.
         Returns True if profile became idle, False otherwise.
+
+        With a ``ProfileLeaseRegistry`` and ``profile_name`` a holder on this
+        host is awaited locally and handed off as soon as it releases; only a
+        holder elsewhere is polled on the backend, backing off between polls.
         """
         log = log or (lambda _: None)
         should_stop = should_stop or (lambda: False)
 
         start = time.monotonic()
+        if leases is not None and profile_name:
+            if not leases.wait_until_free(profile_name, timeout, should_stop=should_stop):
+                if not should_stop():
+                    log("Ожидание профиля истекло, продолжаю.")
+                return False
+            if leases.released_locally(profile_name):
+                return True
+
+        delay = poll_interval
         while time.monotonic() - start < timeout:
             if should_stop():
                 return False
             if not self.is_profile_busy(profile_id):
                 return True
             log(f"Профиль занят, жду освобождения... ({int(time.monotonic() - start)}s)")
-            time.sleep(poll_interval)
+            time.sleep(min(delay, max(0.0, timeout - (time.monotonic() - start))))
+            delay = min(delay * 2, PROFILE_IDLE_MAX_POLL_SECONDS)
 
         log("Ожидание профиля истекло, продолжаю.")
         return False
+
+
+class AccountMutationQueue:
+    """
+    Write-behind batcher for one profile session's account updates.
+
+    ``update_account_status``/``update_account_message`` queue the update and
+    return at once, so it can stand in for the client inside action loops;
+    everything else is delegated to the wrapped client. Queued updates are
+    coalesced per account and sent to ``/bulk-update`` once ``batch_size`` is
+    reached, every ``flush_interval`` seconds and on ``close``. A batch the
+    bulk endpoint rejects is replayed one update at a time, and updates that
+    still fail then are handed to the mutation outbox at ``outbox_path`` to be
+    retried with backoff. The outbox drainer starts with the queue, so updates
+    an earlier process left there are replayed as well. Usernames the backend
+    could not match are passed to ``on_missing``.
+    """
+
+    def __init__(
+        self,
+        client: InstagramAccountsClient,
+        *,
+        batch_size: int = MUTATION_BATCH_SIZE,
+        flush_interval: float = MUTATION_FLUSH_INTERVAL_SECONDS,
+        on_missing: Optional[Callable[[str], None]] = None,
+        outbox_path: Any = None,
+    ) -> None:
+        self.client = client
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.on_missing = on_missing
+        self.outbox_path = outbox_path or DEFAULT_OUTBOX_PATH
+        self._outbox: Optional[MutationOutbox] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        self._closed = False
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._start_outbox()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def __enter__(self) -> "AccountMutationQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def update_account_status(self, account_id: str, status: str = "subscribed", assigned_to: Any = _NOT_SET):
+        payload = _status_update_payload(account_id, status, assigned_to)
+        return self._enqueue(self._status, str(account_id), payload)
+
+    def update_account_message(self, user_name: str, message: bool = True, last_messaged_at: Optional[int] = None):
+        payload = _message_update_payload(user_name, message, last_messaged_at)
+        if payload is None:
+            return None
+        if message and last_messaged_at is None:
+            # Stamp now so a delayed flush does not shift the messaging cooldown
+            payload["last_messaged_at"] = int(time.time() * 1000)
+        return self._enqueue(self._messages, payload["user_name"].lower(), payload)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._status) + len(self._messages)
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                status_updates = list(self._status.values())
+                message_updates = list(self._messages.values())
+                self._status.clear()
+                self._messages.clear()
+            if not status_updates and not message_updates:
+                return
+            try:
+                result = self.client.bulk_update_accounts(status_updates, message_updates)
+            except Exception as exc:
+                logger.warning(
+                    "Bulk account update failed for %s update(s), applying one by one: %s",
+                    len(status_updates) + len(message_updates),
+                    exc,
+                )
+                self._apply_individually(status_updates, message_updates)
+                return
+            for user_name in result.get("missing") or []:
+                self._report_missing(user_name)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            flusher, self._flusher = self._flusher, None
+        self._stop.set()
+        if flusher is not None:
+            flusher.join(timeout=self.flush_interval + 1)
+        self.flush()
+        if self._outbox is not None:
+            # One last retry pass; whatever still fails stays on disk for the next queue
+            self._outbox.close()
+
+    def _enqueue(self, bucket: Dict[str, Dict[str, Any]], key: str, payload: Dict[str, Any]) -> Any:
+        with self._lock:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                bucket[key] = payload
+                full = len(self._status) + len(self._messages) >= self.batch_size
+                if self._flusher is None and self.flush_interval > 0:
+                    self._flusher = threading.Thread(target=self._run, name="account-mutations", daemon=True)
+                    self._flusher.start()
+        if closed:
+            # Late callers after close still get their write, synchronously
+            self._apply_individually(
+                [payload] if bucket is self._status else [],
+                [payload] if bucket is self._messages else [],
+                raise_errors=True,
+            )
+            return payload
+        if full:
+            self.flush()
+        return payload
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _apply_individually(
+        self,
+        status_updates: List[Dict[str, Any]],
+        message_updates: List[Dict[str, Any]],
+        raise_errors: bool = False,
+    ) -> None:
+        failed_status: List[Dict[str, Any]] = []
+        failed_messages: List[Dict[str, Any]] = []
+        for payload in status_updates:
+            try:
+                self._apply_status(payload)
+            except Exception as exc:
+                if raise_errors:
+                    raise
+                logger.warning("Account status update failed for %s: %s", payload["id"], exc)
+                failed_status.append(payload)
+        for payload in message_updates:
+            try:
+                self._apply_message(payload)
+            except Exception as exc:
+                if raise_errors:
+                    raise
+                logger.warning("Account message update failed for @%s: %s", payload["user_name"], exc)
+                failed_messages.append(payload)
+        if failed_status or failed_messages:
+            self._defer(failed_status, failed_messages)
+
+    def _apply_status(self, payload: Dict[str, Any]) -> None:
+        self.client.update_account_status(payload["id"], payload["status"], payload.get("assigned_to", _NOT_SET))
+
+    def _apply_message(self, payload: Dict[str, Any]) -> None:
+        result = self.client.update_account_message(payload["user_name"], payload["message"], payload.get("last_messaged_at"))
+        if not result:
+            self._report_missing(payload["user_name"])
+
+    def _defer(self, status_updates: List[Dict[str, Any]], message_updates: List[Dict[str, Any]]) -> None:
+        try:
+            outbox = self._ensure_outbox()
+            for payload in status_updates:
+                outbox.enqueue(OUTBOX_STATUS_KIND, payload, key=f"account-mutation-status:{payload['id']}")
+            for payload in message_updates:
+                outbox.enqueue(
+                    OUTBOX_MESSAGE_KIND,
+                    payload,
+                    key=f"account-mutation-message:{payload['user_name'].lower()}",
+                )
+        except Exception as exc:
+            logger.error(
+                "Could not keep %s failed account update(s) for retry: %s",
+                len(status_updates) + len(message_updates),
+                exc,
+            )
+
+    def _start_outbox(self) -> None:
+        try:
+            self._ensure_outbox().start()
+        except Exception as exc:
+            logger.warning("Account mutation outbox at %s is unavailable: %s", self.outbox_path, exc)
+
+    def _ensure_outbox(self) -> MutationOutbox:
+        with self._lock:
+            if self._outbox is None:
+                outbox = MutationOutbox(self.outbox_path)
+                outbox.register(OUTBOX_STATUS_KIND, self._apply_status)
+                outbox.register(OUTBOX_MESSAGE_KIND, self._apply_message)
+                self._outbox = outbox
+            return self._outbox
+
+    def _report_missing(self, user_name: str) -> None:
+        logger.warning("Account update skipped for @%s: no matching account", user_name)
+        if self.on_missing is None:
+            return
+        try:
+            self.on_missing(user_name)
+        except Exception:
+            pass
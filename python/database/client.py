@@ -1,5 +1,6 @@
 import requests
 from python.core.errors.http_client import ResilientHttpClient
+from python.database.endpoints import ACCOUNT_USERNAMES
 
 from python.core.config import (
     PROJECT_URL,
@@ -25,12 +26,12 @@ def fetch_usernames(
     if not PROJECT_URL or not API_KEY:
         raise ConvexError("Convex config missing. Set CONVEX_URL and CONVEX_API_KEY in environment.")
 
-    url = f"{PROJECT_URL}/api/instagram-accounts/usernames"
+    url = f"{PROJECT_URL}{ACCOUNT_USERNAMES.path}"
     params = {"limit": limit}
     headers = {"Authorization": f"Bearer {API_KEY}", "Accept": "application/json"}
 
     try:
-        resp = _http_client.get(url, params=params, headers=headers, timeout=20)
+        resp = _http_client.get(url, params=params, headers=headers, timeout=ACCOUNT_USERNAMES.timeout)
         if resp.status_code >= 400:
             raise ConvexError(f"HTTP {resp.status_code}: {resp.text}")
 
@@ -0,0 +1,120 @@
+"""
+Generic Convex HTTP clients generated from ``python.database.endpoints``.
+
+``ConvexClient`` blocks on ``ResilientHttpClient``; ``AsyncConvexClient`` is
+awaited on ``AsyncResilientHttpClient``, so asyncio callers can have many
+backend calls in flight without a thread per request. Both get one method
+per declared endpoint taking the payload as keyword arguments, e.g.
+``await api.profile_by_name(name="p1")``, share retry, breaker and timeout
+policy, and raise ``ConvexError`` when a call fails.
+"""
+from typing import Any, Dict, Optional, Tuple, Union
+
+from python.core.config import PROJECT_URL, SECRET_KEY
+from python.core.errors.http_client import ResilientHttpClient
+from python.database.client import ConvexError
+from python.database.endpoints import ENDPOINTS, Endpoint
+
+
+def _decode(response) -> Any:
+    if response.status_code >= 400:
+        raise ConvexError(f"HTTP {response.status_code}: {response.text}")
+    return response.json() if response.content else None
+
+
+class _ConvexClientBase:
+    def __init__(self, base_url: Optional[str] = None, secret_key: Optional[str] = None):
+        self.base_url = (base_url or PROJECT_URL or "").rstrip("/")
+        if not self.base_url:
+            raise ConvexError("Convex config missing. Set CONVEX_URL in environment.")
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        secret_key = SECRET_KEY if secret_key is None else secret_key
+        if secret_key:
+            self.headers["Authorization"] = f"Bearer {secret_key}"
+
+    def _prepare(self, endpoint: Union[Endpoint, str], payload: Dict[str, Any]) -> Tuple[Endpoint, str, Dict[str, Any]]:
+        if isinstance(endpoint, str):
+            endpoint = ENDPOINTS[endpoint]
+        kwargs = endpoint.request_kwargs(payload)
+        kwargs["headers"] = self.headers
+        kwargs["timeout"] = endpoint.timeout
+        return endpoint, f"{self.base_url}{endpoint.path}", kwargs
+
+
+class ConvexClient(_ConvexClientBase):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        http_client: Optional[ResilientHttpClient] = None,
+    ):
+        super().__init__(base_url, secret_key)
+        self.http_client = http_client or ResilientHttpClient()
+
+    def call(self, endpoint: Union[Endpoint, str], **payload) -> Any:
+        endpoint, url, kwargs = self._prepare(endpoint, payload)
+        try:
+            response = self.http_client.request(endpoint.method, url, **kwargs)
+        except Exception as exc:
+            raise ConvexError(f"Request failed: {exc}") from exc
+        return _decode(response)
+
+
+class AsyncConvexClient(_ConvexClientBase):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        http_client=None,
+    ):
+        super().__init__(base_url, secret_key)
+        if http_client is None:
+            # httpx is only needed by asyncio callers
+            from python.core.errors.async_http_client import AsyncResilientHttpClient
+
+            http_client = AsyncResilientHttpClient()
+        self.http_client = http_client
+
+    async def call(self, endpoint: Union[Endpoint, str], **payload) -> Any:
+        endpoint, url, kwargs = self._prepare(endpoint, payload)
+        try:
+            response = await self.http_client.request(endpoint.method, url, **kwargs)
+        except Exception as exc:
+            raise ConvexError(f"Request failed: {exc}") from exc
+        return _decode(response)
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncConvexClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+
+def _sync_method(endpoint: Endpoint):
+    def method(self, **payload):
+        return self.call(endpoint, **payload)
+
+    method.__name__ = method.__qualname__ = endpoint.name
+    method.__doc__ = f"{endpoint.method} {endpoint.path}"
+    return method
+
+
+def _async_method(endpoint: Endpoint):
+    async def method(self, **payload):
+        return await self.call(endpoint, **payload)
+
+    method.__name__ = method.__qualname__ = endpoint.name
+    method.__doc__ = f"{endpoint.method} {endpoint.path}"
+    return method
+
+
+for _endpoint in ENDPOINTS.values():
+    setattr(ConvexClient, _endpoint.name, _sync_method(_endpoint))
+    setattr(AsyncConvexClient, _endpoint.name, _async_method(_endpoint))
+del _endpoint
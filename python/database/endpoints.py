@@ -0,0 +1,103 @@
+"""
+Convex HTTP routes used by the Python clients, declared once.
+
+Each ``Endpoint`` names a route, its method, the payload fields it cannot do
+without and its timeout. ``ConvexClient`` and ``AsyncConvexClient`` in
+``python/database/convex_api.py`` get one method per declaration, and the
+domain clients (``InstagramAccountsClient``, ``ProfilesClient``,
+``fetch_usernames``) resolve their routes from the same table.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+ACCOUNTS = "/api/instagram-accounts"
+PROFILES = "/api/profiles"
+
+ACCOUNTS_TIMEOUT = 20
+PROFILES_TIMEOUT = (10, 60)
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    resource: str
+    route: str = ""
+    required: Tuple[str, ...] = ()
+    timeout: Any = ACCOUNTS_TIMEOUT
+
+    @property
+    def path(self) -> str:
+        return f"{self.resource}{self.route}"
+
+    def request_kwargs(self, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """``params`` for GET, ``json`` otherwise; raises ``TypeError`` for a missing required field."""
+        payload = dict(payload or {})
+        missing = [field for field in self.required if field not in payload]
+        if missing:
+            raise TypeError(f"{self.name}() payload is missing {', '.join(missing)}")
+        if self.method == "GET":
+            return {"params": payload or None}
+        return {"json": payload}
+
+
+ACCOUNT_USERNAMES = Endpoint("account_usernames", "GET", ACCOUNTS, "/usernames")
+ACCOUNTS_FOR_PROFILE = Endpoint("accounts_for_profile", "GET", ACCOUNTS, "/for-profile", ("profileId",))
+ACCOUNTS_TO_MESSAGE = Endpoint("accounts_to_message", "GET", ACCOUNTS, "/to-message", ("profileId",))
+UPDATE_ACCOUNT_STATUS = Endpoint("update_account_status", "POST", ACCOUNTS, "/update-status", ("id", "status"))
+UPDATE_ACCOUNT_MESSAGE = Endpoint("update_account_message", "POST", ACCOUNTS, "/update-message", ("user_name",))
+BULK_UPDATE_ACCOUNTS = Endpoint(
+    "bulk_update_accounts", "POST", ACCOUNTS, "/bulk-update", ("status_updates", "message_updates")
+)
+PROFILES_WITH_ASSIGNED = Endpoint("profiles_with_assigned_accounts", "GET", ACCOUNTS, "/profiles-with-assigned")
+
+LIST_PROFILES = Endpoint("list_profiles", "GET", PROFILES, timeout=PROFILES_TIMEOUT)
+CREATE_PROFILE = Endpoint("create_profile", "POST", PROFILES, timeout=PROFILES_TIMEOUT)
+AVAILABLE_PROFILES = Endpoint(
+    "available_profiles", "POST", PROFILES, "/available",
+    ("list_ids", "max_sessions", "cooldown_minutes"), PROFILES_TIMEOUT,
+)
+PROFILE_BY_NAME = Endpoint("profile_by_name", "GET", PROFILES, "/by-name", ("name",), PROFILES_TIMEOUT)
+PROFILES_BY_NAMES = Endpoint("profiles_by_names", "POST", PROFILES, "/by-names", ("names",), PROFILES_TIMEOUT)
+# The accounts client reads profiles by id with its own, shorter timeout
+PROFILE_BY_ID = Endpoint("profile_by_id", "GET", PROFILES, "/by-id", ("profileId",))
+PROFILES_BY_IDS = Endpoint("profiles_by_ids", "POST", PROFILES, "/by-ids", ("profile_ids",))
+UPDATE_PROFILE = Endpoint("update_profile", "POST", PROFILES, "/update-by-id", ("profile_id",), PROFILES_TIMEOUT)
+UPDATE_PROFILE_BY_NAME = Endpoint(
+    "update_profile_by_name", "POST", PROFILES, "/update-by-name", ("old_name", "name"), PROFILES_TIMEOUT
+)
+DELETE_PROFILE = Endpoint("delete_profile", "POST", PROFILES, "/delete-by-id", ("profile_id",), PROFILES_TIMEOUT)
+SYNC_PROFILE_STATUS = Endpoint(
+    "sync_profile_status", "POST", PROFILES, "/sync-status", ("name", "status", "using"), PROFILES_TIMEOUT
+)
+SET_PROFILE_LOGIN_TRUE = Endpoint("set_profile_login_true", "POST", PROFILES, "/set-login-true", ("name",), PROFILES_TIMEOUT)
+INCREMENT_DAILY_SCRAPING_USED = Endpoint(
+    "increment_daily_scraping_used", "POST", PROFILES, "/increment-daily-scraping-used",
+    ("name", "amount"), PROFILES_TIMEOUT,
+)
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    endpoint.name: endpoint
+    for endpoint in (
+        ACCOUNT_USERNAMES,
+        ACCOUNTS_FOR_PROFILE,
+        ACCOUNTS_TO_MESSAGE,
+        UPDATE_ACCOUNT_STATUS,
+        UPDATE_ACCOUNT_MESSAGE,
+        BULK_UPDATE_ACCOUNTS,
+        PROFILES_WITH_ASSIGNED,
+        LIST_PROFILES,
+        CREATE_PROFILE,
+        AVAILABLE_PROFILES,
+        PROFILE_BY_NAME,
+        PROFILES_BY_NAMES,
+        PROFILE_BY_ID,
+        PROFILES_BY_IDS,
+        UPDATE_PROFILE,
+        UPDATE_PROFILE_BY_NAME,
+        DELETE_PROFILE,
+        SYNC_PROFILE_STATUS,
+        SET_PROFILE_LOGIN_TRUE,
+        INCREMENT_DAILY_SCRAPING_USED,
+    )
+}
@@ -1,9 +1,16 @@
-from typing import Optional, Dict, Any, List
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
 from python.core.errors.http_client import ResilientHttpClient
 from python.core.config import PROJECT_URL, SECRET_KEY
 
+logger = logging.getLogger(__name__)
+
+TEMPLATE_RECHECK_SECONDS = 300.0
+
 
 class MessageTemplatesError(Exception):
     pass
@@ -57,8 +64,84 @@ class MessageTemplatesClient:
             return [str(t) for t in data if str(t).strip()]
         return []
 
+    def get_versioned_texts(self, kind: str, known_version: Optional[int] = None) -> Tuple[Optional[int], Optional[List[str]]]:
+        """
+        ``(updatedAt, texts)`` for ``kind``; texts are ``None`` when ``known_version`` is current.
+        A backend without the versioned route answers with the plain texts and no version.
+        """
+        url = f"{self.base_url}/versioned?kind={quote(kind)}"
+        if known_version is not None:
+            url = f"{url}&knownUpdatedAt={int(known_version)}"
+        try:
+            data = self._request("GET", url)
+        except MessageTemplatesError as exc:
+            if "HTTP 404" not in str(exc):
+                raise
+            return None, self.get_texts(kind)
+        if not isinstance(data, dict):
+            return None, []
+        version = data.get("updatedAt")
+        version = int(version) if isinstance(version, (int, float)) else None
+        if "texts" not in data:
+            return version, None
+        texts = data.get("texts")
+        return version, [str(t) for t in texts if str(t).strip()] if isinstance(texts, list) else []
+
     def upsert_texts(self, kind: str, texts: List[str]) -> Optional[Dict[str, Any]]:
         payload = {"kind": kind, "texts": texts}
         data = self._request("POST", self.base_url, data=payload)
         return data if isinstance(data, dict) else None
 
+
+
+class MessageTemplateCache:
+    """
+    Per-run template texts keyed by kind.
+
+    The first read of a kind fetches its texts; later reads are served from
+    memory, and once ``recheck_interval`` has passed a read asks the backend
+    whether the kind's ``updatedAt`` moved before fetching texts again. A
+    failed check keeps serving what was cached.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], MessageTemplatesClient],
+        recheck_interval: float = TEMPLATE_RECHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._client_factory = client_factory
+        self._client: Optional[MessageTemplatesClient] = None
+        self.recheck_interval = recheck_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._kind_locks: Dict[str, threading.Lock] = {}
+        # kind -> (version, texts, checked_at)
+        self._entries: Dict[str, Tuple[Optional[int], List[str], float]] = {}
+
+    def texts(self, kind: str) -> List[str]:
+        with self._lock:
+            kind_lock = self._kind_locks.setdefault(kind, threading.Lock())
+        with kind_lock:
+            entry = self._entries.get(kind)
+            if entry is not None and self._clock() - entry[2] < self.recheck_interval:
+                return list(entry[1])
+            try:
+                version, texts = self._client_instance().get_versioned_texts(
+                    kind, entry[0] if entry is not None else None
+                )
+            except Exception as exc:
+                if entry is None:
+                    raise
+                logger.warning("Message template check for %s failed, keeping cached texts: %s", kind, exc)
+                return list(entry[1])
+            if texts is None and entry is not None:
+                texts = entry[1]
+            self._entries[kind] = (version, list(texts or []), self._clock())
+            return list(texts or [])
+
+    def _client_instance(self) -> MessageTemplatesClient:
+        with self._lock:
+            if self._client is None:
+                self._client = self._client_factory()
+            return self._client
@@ -1,16 +1,119 @@
+import copy
 import requests
+import threading
+import time
 from datetime import datetime, timezone
 from datetime import timedelta
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional
 import logging
 from python.core.config import PROJECT_URL, SECRET_KEY
 from python.core.errors.http_client import ResilientHttpClient
+from python.database.endpoints import (
+    AVAILABLE_PROFILES,
+    CREATE_PROFILE,
+    DELETE_PROFILE,
+    INCREMENT_DAILY_SCRAPING_USED,
+    LIST_PROFILES,
+    PROFILE_BY_NAME,
+    PROFILES,
+    PROFILES_BY_NAMES,
+    SET_PROFILE_LOGIN_TRUE,
+    SYNC_PROFILE_STATUS,
+    UPDATE_PROFILE,
+    UPDATE_PROFILE_BY_NAME,
+    Endpoint,
+)
 
 logger = logging.getLogger(__name__)
 
+PROFILE_CACHE_TTL_SECONDS = 30.0
+
+
 class ProfilesError(Exception):
     """Raised when profiles API call fails."""
 
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class ProfileSnapshotCache:
+    """
+    Process-wide read-through cache of profile records keyed by name.
+
+    Concurrent misses for one name share a single fetch. Writes through
+    ``ProfilesClient`` invalidate the name, and a per-name generation keeps a
+    fetch that raced with a write from storing its now-stale result.
+    """
+
+    def __init__(self, ttl_seconds: float = PROFILE_CACHE_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple] = {}
+        self._generations: Dict[str, int] = {}
+        self._flights: Dict[str, _Flight] = {}
+
+    def get(self, name: str, loader: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] > self._clock():
+                return copy.deepcopy(entry[1])
+            flight = self._flights.get(name)
+            leader = flight is None
+            if leader:
+                flight = self._flights[name] = _Flight()
+                generation = self._generations.get(name, 0)
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+        try:
+            flight.result = loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(name) is flight:
+                    del self._flights[name]
+                if flight.error is None and isinstance(flight.result, dict) and self._generations.get(name, 0) == generation:
+                    self._entries[name] = (self._clock() + self.ttl_seconds, flight.result)
+            flight.done.set()
+        return copy.deepcopy(flight.result)
+
+    def put(self, name: str, profile: Dict) -> None:
+        with self._lock:
+            self._entries[name] = (self._clock() + self.ttl_seconds, copy.deepcopy(profile))
+
+    def invalidate(self, *names: Any) -> None:
+        with self._lock:
+            for name in names:
+                if not name:
+                    continue
+                name = str(name)
+                self._entries.pop(name, None)
+                # Later readers start a fresh fetch instead of joining one that may predate the write
+                self._flights.pop(name, None)
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in set(self._entries) | set(self._flights):
+                self._generations[name] = self._generations.get(name, 0) + 1
+            self._entries.clear()
+            self._flights.clear()
+
+
+profile_cache = ProfileSnapshotCache()
+
+
 class ProfilesClient:
     """Client for managing profiles via Convex API"""
 
@@ -20,7 +123,7 @@ class ProfilesClient:
                 "Convex config missing. Set CONVEX_URL in environment."
             )
 
-        self.base_url = f"{PROJECT_URL}/api/profiles"
+        self.base_url = f"{PROJECT_URL}{PROFILES}"
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
@@ -54,9 +157,13 @@ class ProfilesClient:
         except Exception as e:
             raise ProfilesError(f"Request failed: {e}")
 
+    def _call(self, endpoint: Endpoint, payload: Optional[Dict] = None):
+        kwargs = endpoint.request_kwargs(payload)
+        return self._make_request(endpoint.method, endpoint.route, data=kwargs.get("json"), params=kwargs.get("params"))
+
     def get_all_profiles(self) -> List[Dict]:
         """Fetch all profiles from database"""
-        return self._make_request("GET") or []
+        return self._call(LIST_PROFILES) or []
 
     def get_available_profiles(
         self, list_ids: List[str], max_sessions: int, cooldown_minutes: int
@@ -71,27 +178,47 @@ class ProfilesClient:
             "max_sessions": int(max_sessions),
             "cooldown_minutes": int(cooldown_minutes),
         }
-        return self._make_request("POST", "/available", data=payload) or []
+        return self._call(AVAILABLE_PROFILES, payload) or []
 
-    def get_profile_by_name(self, name: str) -> Optional[Dict]:
-        """Fetch a single profile by name."""
+    def get_profile_by_name(self, name: str, fresh: bool = False) -> Optional[Dict]:
+        """Fetch a single profile by name, served from ``profile_cache`` unless ``fresh``."""
+        if fresh:
+            profile_cache.invalidate(name)
         try:
-            resp = self._make_request("GET", "/by-name", params={"name": name})
-            return resp if isinstance(resp, dict) else None
+            return profile_cache.get(str(name), lambda: self._fetch_profile_by_name(name))
         except Exception:
             return None
 
+    def _fetch_profile_by_name(self, name: str) -> Optional[Dict]:
+        resp = self._call(PROFILE_BY_NAME, {"name": name})
+        return resp if isinstance(resp, dict) else None
+
+    def get_profiles_by_names(self, names: List[str]) -> List[Dict]:
+        """Fetch many profiles by name in a single request (missing names are omitted)."""
+        clean_names = list(dict.fromkeys(str(name).strip() for name in names or [] if str(name or "").strip()))
+        if not clean_names:
+            return []
+        resp = self._call(PROFILES_BY_NAMES, {"names": clean_names})
+        return [profile for profile in resp or [] if isinstance(profile, dict)]
+
     def create_profile(self, profile_data: Dict) -> Dict:
         """Create new profile in database"""
         db_data = dict(profile_data or {})
-        result = self._make_request("POST", data=db_data)
+        try:
+            result = self._call(CREATE_PROFILE, db_data)
+        finally:
+            profile_cache.invalidate(db_data.get("name"))
         return result if isinstance(result, dict) else None
 
     def update_profile(self, profile_id: str, profile_data: Dict) -> Dict:
         """Update existing profile in database"""
         db_data = dict(profile_data or {})
         db_data["profile_id"] = profile_id
-        result = self._make_request("POST", "/update-by-id", data=db_data)
+        try:
+            result = self._call(UPDATE_PROFILE, db_data)
+        finally:
+            # The cache is keyed by name, which an id-based update may not carry
+            profile_cache.clear()
         return result if isinstance(result, dict) else None
 
     def update_profile_by_name(self, old_name: str, profile_data: Dict) -> Dict:
@@ -99,7 +226,13 @@ class ProfilesClient:
         db_data["old_name"] = old_name
         if "name" not in db_data:
             db_data["name"] = old_name
-        result = self._make_request("POST", "/update-by-name", data=db_data)
+        try:
+            result = self._call(UPDATE_PROFILE_BY_NAME, db_data)
+        finally:
+            profile_cache.invalidate(old_name, db_data["name"])
+        if isinstance(result, dict) and result.get("name"):
+            # The endpoint answers with the same full record as /by-name
+            profile_cache.put(str(result["name"]), result)
         return result if isinstance(result, dict) else None
 
     def set_profile_session_id(self, name: str, session_id: str) -> bool:
@@ -117,29 +250,36 @@ class ProfilesClient:
     def delete_profile(self, profile_id: str) -> bool:
         """Delete profile from database"""
         try:
-            self._make_request("POST", "/delete-by-id", data={"profile_id": profile_id})
+            self._call(DELETE_PROFILE, {"profile_id": profile_id})
             return True
         except ProfilesError:
             return False
+        finally:
+            profile_cache.clear()
 
     def sync_profile_status(self, name: str, status: str, using: bool = False):
         """Update profile status and using flag"""
-        self._make_request("POST", "/sync-status", data={"name": name, "status": status, "using": using})
+        try:
+            self._call(SYNC_PROFILE_STATUS, {"name": name, "status": status, "using": using})
+        finally:
+            profile_cache.invalidate(name)
 
     def set_profile_login_true(self, name: str):
         """Set login field to True for a profile."""
-        self._make_request("POST", "/set-login-true", data={"name": name})
+        try:
+            self._call(SET_PROFILE_LOGIN_TRUE, {"name": name})
+        finally:
+            profile_cache.invalidate(name)
 
     def increment_daily_scraping_used(self, name: str, amount: int) -> bool:
         clean_name = str(name or "").strip()
         safe_amount = max(0, int(amount)) if isinstance(amount, (int, float)) else 0
         if not clean_name or safe_amount <= 0:
             return False
-        self._make_request(
-            "POST",
-            "/increment-daily-scraping-used",
-            data={"name": clean_name, "amount": safe_amount},
-        )
+        try:
+            self._call(INCREMENT_DAILY_SCRAPING_USED, {"name": clean_name, "amount": safe_amount})
+        finally:
+            profile_cache.invalidate(clean_name)
         return True
 
 
@@ -1,33 +1,62 @@
+"""
+Process-wide HTTP transport shared by every Convex client.
+
+One ``requests.Session`` holds a urllib3 pool per host, so repeated calls to
+the Convex site and to storage URLs reuse kept-alive connections instead of
+paying a TCP/TLS handshake each time. ``HTTP_POOL_SIZE`` sets both the number
+of host pools kept and the connections per host (default 20).
+
+The adapter only retries connection setup, and re-reads a GET whose pooled
+socket turned out to be stale. Status-based retries and backoff stay with
+``ResilientHttpClient`` and the callers so failures still reach their circuit
+breakers and non-idempotent POSTs are never replayed.
+"""
+import os
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from threading import Lock
 from typing import Optional
 
+DEFAULT_POOL_SIZE = 20
 
 _session: Optional[requests.Session] = None
 _lock = Lock()
 
 
+def _pool_size() -> int:
+    try:
+        return max(1, int(os.environ.get("HTTP_POOL_SIZE") or DEFAULT_POOL_SIZE))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+
+def create_pooled_session(pool_size: Optional[int] = None) -> requests.Session:
+    size = pool_size or _pool_size()
+    session = requests.Session()
+    retries = Retry(
+        total=2,
+        connect=2,
+        read=1,
+        status=0,
+        other=0,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retries,
+        pool_connections=size,
+        pool_maxsize=size,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def get_shared_session() -> requests.Session:
     global _session
     if _session is None:
         with _lock:
             if _session is None:
-                session = requests.Session()
-                retries = Retry(
-                    total=3,
-                    backoff_factor=1.5,
-                    status_forcelist=[429, 500, 502, 503, 504],
-                    allowed_methods=["GET", "POST", "PATCH", "DELETE"],
-                )
-                adapter = HTTPAdapter(
-                    max_retries=retries,
-                    pool_connections=20,
-                    pool_maxsize=20,
-                )
-                session.mount("https://", adapter)
-                session.mount("http://", adapter)
-                _session = session
+                _session = create_pooled_session()
     return _session
-
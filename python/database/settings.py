@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 import requests
 
 from python.core.config import PROJECT_URL, SECRET_KEY
+from python.database.session import get_shared_session
 
 
 class InstagramSettingsError(Exception):
@@ -36,13 +37,14 @@ class InstagramSettingsClient:
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
     ):
+        session = get_shared_session()
         try:
             if method.upper() == "GET":
-                resp = requests.get(url, headers=self.headers, params=params, timeout=self.timeout)
+                resp = session.get(url, headers=self.headers, params=params, timeout=self.timeout)
             elif method.upper() == "POST":
-                resp = requests.post(url, headers=self.headers, json=data, timeout=self.timeout)
+                resp = session.post(url, headers=self.headers, json=data, timeout=self.timeout)
             elif method.upper() == "PATCH":
-                resp = requests.patch(url, headers=self.headers, json=data, timeout=self.timeout)
+                resp = session.patch(url, headers=self.headers, json=data, timeout=self.timeout)
             else:
                 raise InstagramSettingsError(f"Unsupported HTTP method: {method}")
 
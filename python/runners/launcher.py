@@ -19,6 +19,7 @@ from python.core.logging import setup_logging
 from python.core.process.healthcheck import run_all_checks
 from python.browser.setup import parse_proxy_string
 from python.browser.display import DisplayManager
+from python.core.storage.outbox import DEFAULT_OUTBOX_PATH, MutationOutbox
 from python.database.profiles import ProfilesClient
 
 # Setup logging
@@ -32,6 +33,7 @@ _display_profile = None
 _display_workflow_id = "manual"
 _profile_name = None
 _profiles_client = None
+_outbox = None
 
 
 def emit_event(event_type: str, **data):
@@ -43,14 +45,30 @@ def emit_event(event_type: str, **data):
         pass
 
 
-def _sync_profile_status(status: str, using: bool):
+def _apply_profile_status(payload: dict):
     global _profiles_client
+    if _profiles_client is None:
+        _profiles_client = ProfilesClient()
+    _profiles_client.sync_profile_status(payload["name"], payload["status"], payload["using"])
+
+
+def _get_outbox():
+    global _outbox
+    if _outbox is None:
+        _outbox = MutationOutbox(DEFAULT_OUTBOX_PATH)
+        _outbox.register("profiles.sync_status", _apply_profile_status)
+    return _outbox
+
+
+def _sync_profile_status(status: str, using: bool):
     if not _profile_name:
         return
     try:
-        if _profiles_client is None:
-            _profiles_client = ProfilesClient()
-        _profiles_client.sync_profile_status(_profile_name, status, using)
+        _get_outbox().enqueue(
+            "profiles.sync_status",
+            {"name": _profile_name, "status": status, "using": using},
+            key=f"profile-status:{_profile_name}",
+        )
     except Exception as e:
         logger.warning(f"Profile status sync failed for {_profile_name}: {e}")
 
@@ -79,6 +97,8 @@ def _graceful_shutdown():
     _cleanup_done = True
     _sync_profile_status("idle", False)
     _release_display()
+    if _outbox is not None:
+        _outbox.close()
     logger.info("Graceful shutdown initiated...")
     # Context manager in run_browser handles browser cleanup
 
@@ -123,6 +143,10 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     _profile_name = args.name
+    try:
+        _get_outbox().start()
+    except Exception as e:
+        logger.warning(f"Mutation outbox unavailable: {e}")
 
     # Pre-flight Health Checks
     proxy_cfg = None
@@ -14,6 +14,9 @@ def process_account(runner, account) -> bool:
     allowed, message_targets = _preflight_account(runner, account, profile_data)
     if not allowed:
         return False
+    if not runner.profile_leases.acquire(profile_name):
+        compat.log(f'Пропуск @{profile_name}: профиль открыт другим процессом.')
+        return False
     compat.log(f'Запуск браузера для @{profile_name}...')
     compat.emit_event('profile_started', profile=profile_name)
     try:
@@ -21,6 +24,8 @@ def process_account(runner, account) -> bool:
         return _run_account_session(runner, account, profile_data, message_targets)
     except Exception as exc:
         return _handle_account_exception(runner, profile_name, exc)
+    finally:
+        runner.profile_leases.release(profile_name)
 
 
 def _load_profile_data(runner, profile_name: str) -> Optional[Dict[str, object]]:
@@ -63,7 +68,18 @@ def _preflight_account(
 def _is_busy_profile(runner, profile_data: Optional[Dict[str, object]]) -> bool:
     if not profile_data or not profile_data.get('profile_id'):
         return False
-    return bool(runner.accounts_client.is_profile_busy(profile_data.get('profile_id')))
+    profile_name = profile_data.get('name')
+    if profile_name:
+        if runner.profile_leases.holder(profile_name) is not None:
+            return True
+        # A process on this host closed it moments ago; the backend flag may still lag.
+        if runner.profile_leases.released_locally(profile_name):
+            return False
+    profile_id = profile_data.get('profile_id')
+    return runner.profile_leases.remote_busy(
+        str(profile_name or profile_id),
+        lambda: bool(runner.accounts_client.is_profile_busy(profile_id)),
+    )
 
 
 def _is_reopen_cooldown_active(runner, profile_data: Optional[Dict[str, object]]) -> bool:
@@ -79,18 +79,19 @@ def run_follow(runner, page, account, profile_data: Optional[Dict[str, Any]] = N
         if not usernames:
             compat.log('Нет целей для подписки.')
             return
-        compat.follow_usernames(
-            profile_name=account.username,
-            proxy_string=account.proxy or '',
-            usernames=usernames,
-            log=compat.log,
-            should_stop=lambda: not runner.running,
-            page=page,
-            interactions_config=_follow_interactions_config(runner.config),
-            following_limit=runner.config.following_limit,
-            on_success=_follow_success_callback(compat, runner, _account_map(accounts)),
-            on_skip=_follow_skip_callback(compat, runner, _account_map(accounts)),
-        )
+        with compat.AccountMutationQueue(runner.accounts_client) as updates:
+            compat.follow_usernames(
+                profile_name=account.username,
+                proxy_string=account.proxy or '',
+                usernames=usernames,
+                log=compat.log,
+                should_stop=lambda: not runner.running,
+                page=page,
+                interactions_config=_follow_interactions_config(runner.config),
+                following_limit=runner.config.following_limit,
+                on_success=_follow_success_callback(compat, updates, _account_map(accounts)),
+                on_skip=_follow_skip_callback(compat, updates, _account_map(accounts)),
+            )
     except Exception as exc:
         compat.log(f'Ошибка Follow: {exc}')
 
@@ -103,9 +104,9 @@ def _follow_interactions_config(config) -> FollowInteractionsConfig:
     }
 
 
-def _follow_success_callback(compat, runner, account_map: Dict[str, str]):
+def _follow_success_callback(compat, client, account_map: Dict[str, str]):
     return compat.create_status_callback(
-        runner.accounts_client,
+        client,
         account_map,
         compat.log,
         'subscribed',
@@ -113,9 +114,9 @@ def _follow_success_callback(compat, runner, account_map: Dict[str, str]):
     )
 
 
-def _follow_skip_callback(compat, runner, account_map: Dict[str, str]):
+def _follow_skip_callback(compat, client, account_map: Dict[str, str]):
     return compat.create_status_callback(
-        runner.accounts_client,
+        client,
         account_map,
         compat.log,
         'skipped',
@@ -137,22 +138,23 @@ def run_unfollow(runner, page, account, profile_data: Optional[Dict[str, Any]] =
         if not usernames:
             compat.log('Нет назначенных аккаунтов для отписки.')
             return
-        compat.unfollow_usernames(
-            profile_name=account.username,
-            proxy_string=account.proxy or '',
-            usernames=usernames,
-            log=compat.log,
-            should_stop=lambda: not runner.running,
-            delay_range=runner.config.unfollow_delay_range or (10, 30),
-            on_success=compat.create_status_callback(
-                runner.accounts_client,
-                _account_map(accounts),
-                compat.log,
-                'done',
-                clear_assigned=True,
-            ),
-            page=page,
-        )
+        with compat.AccountMutationQueue(runner.accounts_client) as updates:
+            compat.unfollow_usernames(
+                profile_name=account.username,
+                proxy_string=account.proxy or '',
+                usernames=usernames,
+                log=compat.log,
+                should_stop=lambda: not runner.running,
+                delay_range=runner.config.unfollow_delay_range or (10, 30),
+                on_success=compat.create_status_callback(
+                    updates,
+                    _account_map(accounts),
+                    compat.log,
+                    'done',
+                    clear_assigned=True,
+                ),
+                page=page,
+            )
     except Exception as exc:
         compat.log(f'Ошибка Unfollow: {exc}')
 
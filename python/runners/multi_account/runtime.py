@@ -24,6 +24,7 @@ class InstagramAutomationRunner:
         self.running = True
         self.accounts_client = compat.InstagramAccountsClient()
         self.profiles_client = compat.ProfilesClient()
+        self.profile_leases = compat.ProfileLeaseRegistry()
         self._profile_cache: Dict[str, Dict[str, Any]] = {}
         self._profile_cache_lock = Lock()
         configured = compat._parse_int(getattr(self.config, 'parallel_profiles', 1), 1)
@@ -96,6 +97,7 @@ def run_automation_session(runner: InstagramAutomationRunner) -> int:
         return 0 if runner.running else 1
     finally:
         _shutdown_executor(runner._executor, wait=True)
+        runner.profile_leases.close()
         compat.log('Автоматизация остановлена.')
         compat.emit_event('session_ended', status=status)
 
@@ -5,8 +5,6 @@ import sys
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 
-import requests
-
 
 def _project_root() -> str:
     here = os.path.abspath(os.path.dirname(__file__))
@@ -23,6 +21,7 @@ from python.actions.engagement.unfollow.session import unfollow_usernames
 from python.actions.messaging.session import send_messages
 from python.actions.stories import watch_stories
 from python.core.config import PROJECT_URL, SECRET_KEY
+from python.core.storage.profile_leases import ProfileLeaseRegistry
 from python.core.models import ScrollingConfig, ThreadsAccount
 from python.core.utils import (
     apply_count_limit,
@@ -31,9 +30,10 @@ from python.core.utils import (
     create_status_callback,
     get_action_enabled_map,
 )
-from python.database.accounts import InstagramAccountsClient
+from python.database.accounts import AccountMutationQueue, InstagramAccountsClient
 from python.database.messages import MessageTemplatesClient
 from python.database.profiles import ProfilesClient
+from python.database.session import get_shared_session
 from python.runners.multi_account.config import _build_config
 from python.runners.multi_account.entrypoint import main
 from python.runners.multi_account.runtime import InstagramAutomationRunner
@@ -114,7 +114,7 @@ def _fetch_profiles_for_lists(list_ids: List[str]) -> List[Dict[str, Any]]:
         }
         if SECRET_KEY:
             headers['Authorization'] = f'Bearer {SECRET_KEY}'
-        response = requests.post(
+        response = get_shared_session().post(
             f'{PROJECT_URL}/api/profiles/by-list-ids',
             json={'listIds': clean_ids},
             headers=headers,
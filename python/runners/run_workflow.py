@@ -1,9 +1,11 @@
+import gzip
 import json
 import os
 import random
+import shutil
 import sys
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import quote
 
 
@@ -14,6 +16,7 @@ def _project_root() -> str:
 
 sys.path.insert(0, _project_root())
 
+from python.actions import aio as async_actions
 from python.actions.browsing import scroll_feed, scroll_reels
 from python.actions.engagement.approve.session import approve_follow_requests
 from python.actions.engagement.follow.common import normalize_range
@@ -21,14 +24,20 @@ from python.actions.engagement.follow.session import follow_usernames
 from python.actions.engagement.unfollow.session import unfollow_usernames
 from python.actions.messaging.session import send_messages
 from python.actions.stories import watch_stories
+from python.browser.context_pool import browser_pool, pool_key as browser_pool_key
 from python.browser.display import DisplayManager
+from python.browser.setup import create_async_browser_context, prepare_fingerprint_config
 from python.core.config import PROJECT_URL, SECRET_KEY
 from python.core.models import ThreadsAccount
-from python.core.storage.atomic import atomic_write_json
+from python.core.storage.dedupe_index import DedupeIndex
+from python.core.storage.outbox import DEFAULT_OUTBOX_PATH, MutationOutbox
+from python.core.storage.profile_leases import DEFAULT_LEASE_PATH, ProfileLeaseRegistry
+from python.core.storage.resume_log import ResumeLog, ResumeLogError
 from python.core.utils import apply_count_limit, create_browser_context
 from python.database.accounts import InstagramAccountsClient
-from python.database.messages import MessageTemplatesClient
+from python.database.messages import MessageTemplateCache, MessageTemplatesClient
 from python.database.profiles import ProfilesClient
+from python.database.session import get_shared_session
 from python.runners.workflow.bootstrap import (
     _extract_start_browser_settings,
     _find_start_node,
@@ -50,6 +59,7 @@ from python.runners.workflow.parsing import (
     _profile_remaining_daily_scraping_capacity,
 )
 from python.runners.workflow.runtime import WorkflowRunner
+from python.runners.workflow.scraping_ledger import ScrapingCapacityLedger
 
 
 def _workflow_headers() -> Dict[str, str]:
@@ -66,9 +76,7 @@ def _convex_post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     if not PROJECT_URL:
         raise RuntimeError('Convex PROJECT_URL is not configured')
     try:
-        import requests
-
-        response = requests.post(
+        response = get_shared_session().post(
             f'{PROJECT_URL}{path}',
             json=payload,
             headers=_workflow_headers(),
@@ -83,13 +91,30 @@ def _convex_post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         raise RuntimeError(f'Convex request failed for {path}: {exc}') from exc
 
 
-def _convex_get_json(path: str) -> Any:
+def _convex_post_bytes(path: str, data: bytes, content_type: str) -> Dict[str, Any]:
     if not PROJECT_URL:
         raise RuntimeError('Convex PROJECT_URL is not configured')
     try:
-        import requests
+        response = get_shared_session().post(
+            f'{PROJECT_URL}{path}',
+            data=data,
+            headers={**_workflow_headers(), 'Content-Type': content_type},
+            timeout=60,
+        )
+        response.raise_for_status()
+        result = response.json()
+        if not isinstance(result, dict):
+            raise RuntimeError(f'Unexpected response shape for {path}')
+        return result
+    except Exception as exc:
+        raise RuntimeError(f'Convex request failed for {path}: {exc}') from exc
+
 
-        response = requests.get(
+def _convex_get_json(path: str) -> Any:
+    if not PROJECT_URL:
+        raise RuntimeError('Convex PROJECT_URL is not configured')
+    try:
+        response = get_shared_session().get(
             f'{PROJECT_URL}{path}',
             headers=_workflow_headers(),
             timeout=60,
@@ -100,13 +125,14 @@ def _convex_get_json(path: str) -> Any:
         raise RuntimeError(f'Convex request failed for {path}: {exc}') from exc
 
 
-def _build_scrape_export_payload(
+def _build_scrape_manifest_payload(
     workflow_id: str,
     node_id: str,
     profile_name: str,
     kind: str,
     targets: List[str],
-    users: List[Any],
+    chunk_refs: List[Dict[str, Any]],
+    count: int,
 ) -> Dict[str, Any]:
     return {
         'workflowId': workflow_id,
@@ -115,10 +141,11 @@ def _build_scrape_export_payload(
         'profileName': profile_name,
         'kind': kind,
         'targets': targets,
-        'users': users,
-        'count': len(users),
+        'chunkRefs': chunk_refs,
+        'chunkCount': len(chunk_refs),
+        'count': count,
         'scrapedAt': int(time.time() * 1000),
-        'storageKind': 'export',
+        'storageKind': 'manifest',
     }
 
 
@@ -140,16 +167,15 @@ def _scraped_user_key(user: Any) -> str:
     return str(user)
 
 
+def _create_scraped_users_index(
+    users: Optional[List[Any]] = None,
+    key: Optional[Callable[[Any], str]] = None,
+) -> DedupeIndex:
+    return DedupeIndex(key or _scraped_user_key, users)
+
+
 def _dedupe_scraped_users(users: List[Any]) -> List[Any]:
-    seen: set[str] = set()
-    out: List[Any] = []
-    for user in users:
-        key = _scraped_user_key(user)
-        if not key or key in seen:
-            continue
-        seen.add(key)
-        out.append(user)
-    return out
+    return _create_scraped_users_index(users).records
 
 
 def _extract_users_from_payload(payload: Any) -> List[Any]:
@@ -170,21 +196,57 @@ def _store_artifact_payload(payload: Dict[str, Any]) -> str:
     return storage_id
 
 
+def _store_artifact_chunk(users: List[Any]) -> Dict[str, Any]:
+    body = gzip.compress(
+        json.dumps({'users': users, 'count': len(users)}, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+        compresslevel=6,
+    )
+    result = _convex_post_bytes('/api/workflow-artifacts/store-chunk', body, 'application/gzip')
+    storage_id = str(result.get('storageId') or '').strip()
+    if not storage_id:
+        raise RuntimeError('Artifact chunk storage response did not include storageId')
+    return {'storageId': storage_id, 'count': len(users), 'bytes': len(body)}
+
+
 def _resume_snapshot_path(workflow_id: str, node_id: str) -> str:
     safe_workflow = ''.join(ch if ch.isalnum() else '_' for ch in str(workflow_id or 'workflow'))
     safe_node = ''.join(ch if ch.isalnum() else '_' for ch in str(node_id or 'node'))
-    return os.path.join(_project_root(), 'data', 'workflow_resume', f'{safe_workflow}_{safe_node}.json')
+    return os.path.join(_project_root(), 'data', 'workflow_resume', f'{safe_workflow}_{safe_node}.resume')
+
+
+def _mutation_outbox_path() -> str:
+    return os.fspath(DEFAULT_OUTBOX_PATH)
+
+
+def _profile_lease_path() -> str:
+    return os.fspath(DEFAULT_LEASE_PATH)
+
 
+def _scraping_ledger_dir() -> str:
+    return os.path.join(_project_root(), 'data', 'scraping_ledger')
 
-def _store_resume_snapshot(path: str, payload: Dict[str, Any]) -> str:
-    atomic_write_json(path, payload)
-    return path
+
+def _create_resume_log(path: str, **state: Any) -> ResumeLog:
+    return ResumeLog.create(path, **state)
+
+
+def _open_resume_log(path: Optional[str]) -> Optional[ResumeLog]:
+    cleaned = str(path or '').strip()
+    if not cleaned or not ResumeLog.exists(cleaned):
+        return None
+    try:
+        return ResumeLog(cleaned)
+    except ResumeLogError as exc:
+        raise RuntimeError(f'Failed to open resume log {cleaned}: {exc}') from exc
 
 
 def _delete_resume_snapshot(path: Optional[str]) -> None:
     cleaned = str(path or '').strip()
     if not cleaned:
         return
+    if os.path.isdir(cleaned):
+        shutil.rmtree(cleaned, ignore_errors=True)
+        return
     try:
         os.unlink(cleaned)
     except (FileNotFoundError, OSError):
@@ -196,6 +258,9 @@ def _load_users_from_resume_snapshot(path: str) -> List[Any]:
     if not cleaned or not os.path.exists(cleaned):
         return []
     try:
+        resume_log = _open_resume_log(cleaned)
+        if resume_log is not None:
+            return resume_log.replay()
         with open(cleaned, 'r', encoding='utf-8') as fh:
             payload = json.load(fh)
     except Exception as exc:
@@ -203,22 +268,35 @@ def _load_users_from_resume_snapshot(path: str) -> List[Any]:
     return _extract_users_from_payload(payload)
 
 
-def _load_users_from_storage(storage_id: str) -> List[Any]:
-    cleaned = str(storage_id or '').strip()
-    if not cleaned:
-        return []
-    url = _convex_get_json(f'/api/workflow-artifacts/storage-url?storageId={quote(cleaned)}')
+def _load_storage_payload(storage_id: str) -> Any:
+    url = _convex_get_json(f'/api/workflow-artifacts/storage-url?storageId={quote(storage_id)}')
     if not isinstance(url, str) or not url.strip():
-        return []
+        return None
     try:
-        import requests
-
-        response = requests.get(url, timeout=60)
+        response = get_shared_session().get(url, timeout=60)
         response.raise_for_status()
-        payload = response.json()
+        content = response.content
+        if content[:2] == b'\x1f\x8b':
+            content = gzip.decompress(content)
+        return json.loads(content)
     except Exception as exc:
-        raise RuntimeError(f'Failed to load artifact payload for {cleaned}: {exc}') from exc
-    return _extract_users_from_payload(payload)
+        raise RuntimeError(f'Failed to load artifact payload for {storage_id}: {exc}') from exc
+
+
+def _load_users_from_storage(storage_id: str) -> List[Any]:
+    cleaned = str(storage_id or '').strip()
+    if not cleaned:
+        return []
+    payload = _load_storage_payload(cleaned)
+    chunk_refs = payload.get('chunkRefs') if isinstance(payload, dict) else None
+    if not isinstance(chunk_refs, list):
+        return _extract_users_from_payload(payload)
+    users: List[Any] = []
+    for ref in chunk_refs:
+        chunk_storage_id = str((ref or {}).get('storageId') or '').strip() if isinstance(ref, dict) else ''
+        if chunk_storage_id:
+            users.extend(_extract_users_from_payload(_load_storage_payload(chunk_storage_id)))
+    return users
 
 
 def _fetch_profiles_for_lists(
@@ -236,16 +314,23 @@ def _fetch_profiles_for_lists(
     )
 
 
-def _choose_weighted(handles: List[str], weights_str: str) -> str:
+def _parse_branch_weights(weights_str: str, count: int) -> List[float]:
     weights = []
     try:
         parts = [part.strip() for part in str(weights_str or '').split(',') if part.strip()]
         weights = [max(0.0, float(part)) for part in parts]
     except Exception:
         weights = []
-    if len(weights) < len(handles):
-        weights = weights + [1.0] * (len(handles) - len(weights))
-    weights = weights[: len(handles)]
+    if len(weights) < count:
+        weights = weights + [1.0] * (count - len(weights))
+    return weights[:count]
+
+
+def _choose_weighted(handles: List[str], weights_str: str) -> str:
+    return _choose_weighted_values(handles, _parse_branch_weights(weights_str, len(handles)))
+
+
+def _choose_weighted_values(handles: List[str], weights: List[float]) -> str:
     total = sum(weights)
     if total <= 0:
         return random.choice(handles)
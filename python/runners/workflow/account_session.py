@@ -1,21 +1,25 @@
 import random
-import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
+from python.core import pacing
 from python.runners.workflow.compat import compat as compat_module
 
+PROFILE_LEASE_WAIT_SECONDS = 300.0
+
 
 def process_account(runner, account) -> bool:
     compat = compat_module()
     profile_name = account.username
     browser_state = _build_browser_state(account)
-    profile_data = _load_profile_data(runner, profile_name)
-    _hydrate_browser_identity(browser_state, profile_data)
     compat.emit_event('profile_started', profile=profile_name, workflow_id=runner.workflow_id)
+    if not _acquire_profile_lease(runner, profile_name):
+        return _skip_without_lease(runner, profile_name)
     try:
         _sync_profile_status(runner, profile_name, 'running', True)
-        _allocate_display(runner, profile_name, browser_state)
-        succeeded = _run_account_nodes(runner, account, browser_state, profile_data)
+        profile_data = _prepare_browser_startup(runner, profile_name, browser_state)
+        with pacing.cancellation_scope(runner.cancel_token):
+            succeeded = _run_account_nodes(runner, account, browser_state, profile_data)
         if runner.running:
             compat.emit_event(
                 'profile_completed',
@@ -30,6 +34,7 @@ def process_account(runner, account) -> bool:
     finally:
         _cleanup_browser_context(browser_state)
         _release_display(runner, profile_name)
+        _release_profile_lease(runner, profile_name)
 
 
 def _build_browser_state(account) -> Dict[str, Any]:
@@ -42,9 +47,51 @@ def _build_browser_state(account) -> Dict[str, Any]:
         'fingerprint_seed': None,
         'fingerprint_os_val': None,
         'display': None,
+        'fingerprint_config': None,
+        'startup_phases': None,
+        'startup_began': None,
     }
 
 
+def _prepare_browser_startup(runner, profile_name: str, browser_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run the independent pre-launch steps side by side: the display comes up
+    while the profile record is fetched and its fingerprint config is read
+    from disk. Phase durations are kept for the ``browser_startup`` event.
+    """
+    phases: Dict[str, float] = {}
+    browser_state['startup_began'] = pacing.monotonic()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='browser-startup') as pool:
+        display = pool.submit(_timed_phase, phases, 'display_ms', _allocate_display, runner, profile_name, browser_state)
+        profile_data = _timed_phase(phases, 'profile_ms', _load_profile_data, runner, profile_name)
+        _hydrate_browser_identity(browser_state, profile_data)
+        browser_state['fingerprint_config'] = _timed_phase(phases, 'fingerprint_ms', _prepare_fingerprint, browser_state)
+        display.result()
+    browser_state['startup_phases'] = phases
+    return profile_data
+
+
+def _timed_phase(phases: Dict[str, float], name: str, func, *args):
+    started = pacing.monotonic()
+    try:
+        return func(*args)
+    finally:
+        phases[name] = round((pacing.monotonic() - started) * 1000.0, 1)
+
+
+def _prepare_fingerprint(browser_state: Dict[str, Any]) -> Optional[dict]:
+    compat = compat_module()
+    try:
+        return compat.prepare_fingerprint_config(
+            browser_state['profile_name'],
+            browser_state.get('fingerprint_seed'),
+            browser_state.get('fingerprint_os_val'),
+        )
+    except Exception as exc:
+        compat.log(f'Fingerprint preload failed for @{browser_state["profile_name"]}: {exc}')
+        return None
+
+
 def _load_profile_data(runner, profile_name: str) -> Optional[Dict[str, Any]]:
     profile_data = runner._get_cached_profile(profile_name)
     if profile_data:
@@ -69,9 +116,43 @@ def _hydrate_browser_identity(browser_state: Dict[str, Any], profile_data: Optio
         browser_state['user_agent'] = None
 
 
+def _acquire_profile_lease(runner, profile_name: str) -> bool:
+    compat = compat_module()
+    try:
+        if runner.profile_leases.acquire(profile_name):
+            return True
+        compat.log(f'Профиль @{profile_name} открыт другим процессом, жду освобождения...')
+        if runner.profile_leases.wait_until_free(
+            profile_name,
+            PROFILE_LEASE_WAIT_SECONDS,
+            should_stop=lambda: not runner.running,
+        ):
+            return runner.profile_leases.acquire(profile_name)
+    except Exception as exc:
+        compat.log(f'Не удалось занять профиль @{profile_name} в локальном реестре: {exc}')
+    return False
+
+
+def _skip_without_lease(runner, profile_name: str) -> bool:
+    # Opening the profile without its lease would run two browsers on one profile directory
+    compat = compat_module()
+    status = 'skipped' if runner.running else 'cancelled'
+    if runner.running:
+        compat.log(f'Пропуск @{profile_name}: профиль занят другим процессом')
+    compat.emit_event('profile_completed', profile=profile_name, status=status, workflow_id=runner.workflow_id)
+    return False
+
+
+def _release_profile_lease(runner, profile_name: str) -> None:
+    try:
+        runner.profile_leases.release(profile_name)
+    except Exception:
+        pass
+
+
 def _sync_profile_status(runner, profile_name: str, status: str, running: bool) -> None:
     try:
-        runner.profiles_client.sync_profile_status(profile_name, status, running)
+        runner._enqueue_profile_status(profile_name, status, running)
     except Exception:
         pass
 
@@ -96,18 +177,14 @@ def _allocate_display(runner, profile_name: str, browser_state: Dict[str, Any])
 
 def _run_account_nodes(runner, account, browser_state: Dict[str, Any], profile_data: Optional[Dict[str, Any]]) -> bool:
     compat = compat_module()
-    start_node = compat._find_start_node(runner.nodes)
-    if not start_node:
-        compat.log('Не найден start node')
-        return False
-    current = compat._next_node(runner.edge_index, str(start_node.get('id')), '')
+    plan = runner.plan
+    current = plan.next_index(plan.start_index, '')
     loop_state: Dict[str, int] = {}
     completed_steps = 0
-    activity_nodes = [node for node in runner.nodes if node.get('type') == 'activity']
-    total_steps = max(1, len(activity_nodes))
+    total_steps = max(1, plan.activity_count)
     visited_steps = 0
     last_handle = ''
-    while runner.running and current:
+    while runner.running and current is not None:
         visited_steps += 1
         if visited_steps > 500:
             compat.log('Превышен лимит шагов workflow')
@@ -130,41 +207,33 @@ def _run_single_node(
     account,
     browser_state: Dict[str, Any],
     profile_data: Optional[Dict[str, Any]],
-    current: str,
+    current: int,
     loop_state: Dict[str, int],
     completed_steps: int,
     total_steps: int,
-) -> tuple[Optional[str], int, str]:
-    compat = compat_module()
-    node = runner.node_index.get(current)
-    if not node:
-        return None, completed_steps, ''
-    if node.get('type') == 'start':
-        next_node = compat._next_node(runner.edge_index, str(node.get('id')), '')
-        return next_node, completed_steps, ''
-    node_id = str(node.get('id'))
-    activity_id, label, config = _node_metadata(node)
+) -> tuple[Optional[int], int, str]:
+    plan = runner.plan
+    node = plan.nodes[current]
+    if node.node_type == 'start':
+        return plan.next_index(current, ''), completed_steps, ''
     progress = int(round(100.0 * min(1.0, float(completed_steps) / float(total_steps))))
-    _emit_task_started(runner, node_id, activity_id, label, browser_state['profile_name'], progress)
-    handle = runner._execute_activity(node_id, activity_id, config, browser_state, account, profile_data, loop_state)
-    next_completed_steps = completed_steps + (1 if node.get('type') == 'activity' else 0)
-    _emit_task_completed(runner, node_id, label, browser_state['profile_name'], handle, next_completed_steps, total_steps)
-    next_node = compat._next_node(runner.edge_index, node_id, str(handle or ''))
-    if runner.running and next_node:
-        time.sleep(random.randint(1, 3))
+    _emit_task_started(runner, node.node_id, node.activity_id, node.label, browser_state['profile_name'], progress)
+    handle = runner._execute_activity(
+        node,
+        browser_state,
+        account,
+        profile_data,
+        loop_state,
+    )
+    next_completed_steps = completed_steps + (1 if node.is_activity else 0)
+    _emit_task_completed(runner, node.node_id, node.label, browser_state['profile_name'], handle, next_completed_steps, total_steps)
+    next_node = plan.next_index(current, str(handle or ''))
+    if runner.running and next_node is not None:
+        pacing.sleep(random.randint(1, 3), runner.cancel_token)
     return next_node, next_completed_steps, str(handle or '')
 
 
-def _node_metadata(node: Dict[str, Any]) -> tuple[str, str, Dict[str, Any]]:
-    data = node.get('data') if isinstance(node.get('data'), dict) else {}
-    activity_id = str(data.get('activityId') or '')
-    label = str(data.get('label') or activity_id or node.get('id') or '')
-    config = data.get('config') if isinstance(data.get('config'), dict) else {}
-    return activity_id, label, config
-
-
 def _emit_task_started(runner, node_id: str, activity_id: str, label: str, profile_name: str, progress: int) -> None:
-    compat = compat_module()
     runner._update_node_state(
         node_id,
         activityId=activity_id,
@@ -172,16 +241,15 @@ def _emit_task_started(runner, node_id: str, activity_id: str, label: str, profi
         status='running',
         profile=profile_name,
         progress=progress,
-        updatedAt=int(time.time() * 1000),
+        updatedAt=int(pacing.now() * 1000),
     )
-    compat.emit_event(
+    runner._emit_with_node_states(
         'task_started',
         profile=profile_name,
         task=label,
         workflow_id=runner.workflow_id,
         node_id=node_id,
         progress=progress,
-        node_states=runner._sanitize_node_states(),
     )
 
 
@@ -198,7 +266,7 @@ def _emit_task_completed(
         node_id,
         status='failed' if str(handle or '') == 'failure' else 'completed',
         lastHandle=str(handle or ''),
-        updatedAt=int(time.time() * 1000),
+        updatedAt=int(pacing.now() * 1000),
     )
     runner._emit_node_state(
         'task_completed',
@@ -234,6 +302,11 @@ def _cleanup_browser_context(browser_state: Dict[str, Any]) -> None:
             ctx_mgr.__exit__(None, None, None)
     except Exception:
         pass
+    try:
+        # Browsers parked during this session are bound to this worker thread
+        compat_module().browser_pool.close_idle()
+    except Exception:
+        pass
 
 
 def _release_display(runner, profile_name: str) -> None:
@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from python.runners.workflow.compat import compat as compat_module
+
+RANDOM_BRANCH_HANDLES = ('path_a', 'path_b', 'path_c')
+
+
+@dataclass(frozen=True, slots=True)
+class DelayConfig:
+    min_seconds: int
+    max_seconds: int
+
+
+@dataclass(frozen=True, slots=True)
+class ConditionConfig:
+    check: str
+    percent: int
+
+
+@dataclass(frozen=True, slots=True)
+class LoopConfig:
+    iterations: int
+
+
+@dataclass(frozen=True, slots=True)
+class RandomBranchConfig:
+    weights: Tuple[float, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class PythonScriptConfig:
+    has_code: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ScrollConfig:
+    min_minutes: int
+    max_minutes: int
+    scroll_config: Dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class StoriesConfig:
+    max_stories: int
+    min_view_seconds: float
+    max_view_seconds: float
+
+
+@dataclass(frozen=True, slots=True)
+class FollowConfig:
+    count_range: Tuple[int, int]
+    delay_range: Tuple[int, int]
+    following_limit: int
+    interactions_config: Dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class UnfollowConfig:
+    count_range: Tuple[int, int]
+    delay_range: Tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class ApproveConfig:
+    delay_range: Tuple[float, float]
+    finish_delay_seconds: float
+
+
+@dataclass(frozen=True, slots=True)
+class SendDmConfig:
+    template_kind: str
+    behavior_config: Dict[str, Any]
+
+
+def compile_activity_config(activity_id: str, cfg: Dict[str, Any]) -> Optional[Any]:
+    builder = _BUILDERS.get(activity_id)
+    if builder is None:
+        return None
+    return builder(compat_module(), cfg)
+
+
+def headless_override(cfg: Dict[str, Any]) -> Optional[bool]:
+    if 'headlessMode' not in cfg:
+        return None
+    return bool(cfg.get('headlessMode'))
+
+
+def _delay(compat, cfg: Dict[str, Any]) -> DelayConfig:
+    min_seconds = max(1, compat._parse_int(cfg.get('minSeconds'), 30))
+    max_seconds = max(min_seconds, compat._parse_int(cfg.get('maxSeconds'), 120))
+    return DelayConfig(min_seconds=min_seconds, max_seconds=max_seconds)
+
+
+def _condition(compat, cfg: Dict[str, Any]) -> ConditionConfig:
+    check = str(cfg.get('check') or 'random').strip().lower()
+    value = str(cfg.get('value') or '').strip()
+    return ConditionConfig(check=check, percent=max(0, min(100, compat._parse_int(value, 50))))
+
+
+def _loop(compat, cfg: Dict[str, Any]) -> LoopConfig:
+    return LoopConfig(iterations=max(1, min(100, compat._parse_int(cfg.get('iterations'), 3))))
+
+
+def _random_branch(compat, cfg: Dict[str, Any]) -> RandomBranchConfig:
+    weights = compat._parse_branch_weights(str(cfg.get('weights') or ''), len(RANDOM_BRANCH_HANDLES))
+    return RandomBranchConfig(weights=tuple(weights))
+
+
+def _python_script(compat, cfg: Dict[str, Any]) -> PythonScriptConfig:
+    return PythonScriptConfig(has_code=bool(str(cfg.get('code') or '').strip()))
+
+
+def _browse_feed(compat, cfg: Dict[str, Any]) -> ScrollConfig:
+    min_minutes = compat._parse_int(cfg.get('feed_min_time_minutes'), 1)
+    max_minutes = compat._parse_int(cfg.get('feed_max_time_minutes'), 3)
+    min_minutes, max_minutes = compat.normalize_range((min_minutes, max_minutes), (1, 3))
+    return ScrollConfig(
+        min_minutes=min_minutes,
+        max_minutes=max_minutes,
+        scroll_config={
+            'like_chance': compat._parse_int(cfg.get('like_chance'), 10),
+            'comment_chance': 0,
+            'follow_chance': compat._parse_int(cfg.get('follow_chance'), 0),
+            'carousel_watch_chance': compat._parse_int(cfg.get('carousel_watch_chance'), 0),
+            'carousel_max_slides': compat._parse_int(cfg.get('carousel_max_slides'), 3),
+            'watch_stories': compat._parse_bool(cfg.get('watch_stories'), False),
+            'stories_max': compat._parse_int(cfg.get('stories_max'), 3),
+            'stories_min_view_seconds': compat._parse_float(cfg.get('stories_min_view_seconds'), 2.0),
+            'stories_max_view_seconds': compat._parse_float(cfg.get('stories_max_view_seconds'), 5.0),
+            'skip_post_chance': compat._parse_int(cfg.get('skip_post_chance'), 30),
+            'skip_post_max': compat._parse_int(cfg.get('skip_post_max'), 2),
+            'post_view_min_seconds': compat._parse_float(cfg.get('post_view_min_seconds'), 2.0),
+            'post_view_max_seconds': compat._parse_float(cfg.get('post_view_max_seconds'), 5.0),
+        },
+    )
+
+
+def _browse_reels(compat, cfg: Dict[str, Any]) -> ScrollConfig:
+    min_minutes = compat._parse_int(cfg.get('reels_min_time_minutes'), 1)
+    max_minutes = compat._parse_int(cfg.get('reels_max_time_minutes'), 3)
+    min_minutes, max_minutes = compat.normalize_range((min_minutes, max_minutes), (1, 3))
+    return ScrollConfig(
+        min_minutes=min_minutes,
+        max_minutes=max_minutes,
+        scroll_config={
+            'like_chance': compat._parse_int(cfg.get('reels_like_chance'), 10),
+            'comment_chance': 0,
+            'follow_chance': compat._parse_int(cfg.get('reels_follow_chance'), 0),
+            'reels_skip_chance': compat._parse_int(cfg.get('reels_skip_chance'), 30),
+            'reels_skip_min_time': compat._parse_float(cfg.get('reels_skip_min_time'), 0.8),
+            'reels_skip_max_time': compat._parse_float(cfg.get('reels_skip_max_time'), 2.0),
+            'reels_normal_min_time': compat._parse_float(cfg.get('reels_normal_min_time'), 5.0),
+            'reels_normal_max_time': compat._parse_float(cfg.get('reels_normal_max_time'), 20.0),
+            'reels_advance_min_seconds': compat._parse_float(cfg.get('reels_advance_min_seconds'), 1.5),
+            'reels_advance_max_seconds': compat._parse_float(cfg.get('reels_advance_max_seconds'), 3.0),
+        },
+    )
+
+
+def _watch_stories(compat, cfg: Dict[str, Any]) -> StoriesConfig:
+    return StoriesConfig(
+        max_stories=compat._parse_int(cfg.get('stories_max'), 3),
+        min_view_seconds=compat._parse_float(cfg.get('stories_min_view_seconds'), 2.0),
+        max_view_seconds=compat._parse_float(cfg.get('stories_max_view_seconds'), 5.0),
+    )
+
+
+def _follow_user(compat, cfg: Dict[str, Any]) -> FollowConfig:
+    follow_min = compat._parse_int(cfg.get('follow_min_count'), 5)
+    follow_max = compat._parse_int(cfg.get('follow_max_count'), 15)
+    follow_delay_min = compat._parse_int(cfg.get('follow_min_delay_seconds'), 10)
+    follow_delay_max = compat._parse_int(cfg.get('follow_max_delay_seconds'), 20)
+    highlights_min = compat._parse_int(cfg.get('highlights_min'), 0)
+    highlights_max = compat._parse_int(cfg.get('highlights_max'), 2)
+    return FollowConfig(
+        count_range=compat.normalize_range((follow_min, follow_max), (5, 15)),
+        delay_range=compat.normalize_range((follow_delay_min, follow_delay_max), (10, 20)),
+        following_limit=compat._parse_int(cfg.get('following_limit'), 3000),
+        interactions_config={
+            'highlights_range': compat.normalize_range((highlights_min, highlights_max), (0, 2)),
+            'likes_percentage': compat._parse_int(cfg.get('likes_percentage'), 0),
+            'scroll_percentage': compat._parse_int(cfg.get('scroll_percentage'), 0),
+        },
+    )
+
+
+def _unfollow_user(compat, cfg: Dict[str, Any]) -> UnfollowConfig:
+    min_delay = compat._parse_int(cfg.get('min_delay'), 10)
+    max_delay = compat._parse_int(cfg.get('max_delay'), 30)
+    min_count = compat._parse_int(cfg.get('unfollow_min_count'), 5)
+    max_count = compat._parse_int(cfg.get('unfollow_max_count'), 15)
+    return UnfollowConfig(
+        count_range=compat.normalize_range((min_count, max_count), (5, 15)),
+        delay_range=compat.normalize_range((min_delay, max_delay), (10, 30)),
+    )
+
+
+def _approve_requests(compat, cfg: Dict[str, Any]) -> ApproveConfig:
+    min_delay = compat._parse_float(cfg.get('approve_min_delay_seconds'), 1.0)
+    max_delay = compat._parse_float(cfg.get('approve_max_delay_seconds'), 2.0)
+    if max_delay < min_delay:
+        min_delay, max_delay = max_delay, min_delay
+    return ApproveConfig(
+        delay_range=(min_delay, max_delay),
+        finish_delay_seconds=compat._parse_float(cfg.get('approve_finish_delay_seconds'), 3.0),
+    )
+
+
+def _send_dm(compat, cfg: Dict[str, Any]) -> SendDmConfig:
+    return SendDmConfig(
+        template_kind=str(cfg.get('template_kind') or 'message').strip() or 'message',
+        behavior_config={
+            'follow_if_no_message_button': compat._parse_bool(cfg.get('follow_if_no_message_button'), True),
+            'navigation_delay_min_seconds': compat._parse_float(cfg.get('navigation_delay_min_seconds'), 2.0),
+            'navigation_delay_max_seconds': compat._parse_float(cfg.get('navigation_delay_max_seconds'), 3.0),
+            'composer_delay_min_seconds': compat._parse_float(cfg.get('composer_delay_min_seconds'), 1.0),
+            'composer_delay_max_seconds': compat._parse_float(cfg.get('composer_delay_max_seconds'), 2.0),
+            'typing_delay_min_ms': compat._parse_int(cfg.get('typing_delay_min_ms'), 100),
+            'typing_delay_max_ms': compat._parse_int(cfg.get('typing_delay_max_ms'), 200),
+            'between_targets_min_seconds': compat._parse_float(cfg.get('between_targets_min_seconds'), 3.0),
+            'between_targets_max_seconds': compat._parse_float(cfg.get('between_targets_max_seconds'), 5.0),
+        },
+    )
+
+
+_BUILDERS: Dict[str, Callable[[Any, Dict[str, Any]], Any]] = {
+    'delay': _delay,
+    'condition': _condition,
+    'loop': _loop,
+    'random_branch': _random_branch,
+    'python_script': _python_script,
+    'browse_feed': _browse_feed,
+    'browse_reels': _browse_reels,
+    'watch_stories': _watch_stories,
+    'follow_user': _follow_user,
+    'unfollow_user': _unfollow_user,
+    'approve_requests': _approve_requests,
+    'send_dm': _send_dm,
+}
@@ -0,0 +1,508 @@
+"""
+Asyncio workflow engine.
+
+One event loop drives every profile session on a single shared
+``async_playwright`` driver instead of a thread (and a sync Playwright driver)
+per profile. Convex clients, display allocation and state store writes stay
+synchronous and run on a small blocking-call pool.
+
+The engine is experimental: ``entrypoint._select_engine`` only picks it when
+every activity in the workflow has an async port.
+"""
+import asyncio
+import functools
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+from python.core import pacing
+from python.runners.workflow import account_session, activity_dispatch
+from python.runners.workflow.activity_config import (
+    ApproveConfig,
+    FollowConfig,
+    ScrollConfig,
+    SendDmConfig,
+    StoriesConfig,
+    UnfollowConfig,
+)
+from python.runners.workflow.async_scrape import execute_scrape_relationships_async
+from python.runners.workflow.compat import compat as compat_module
+from python.runners.workflow.plan import PlanNode
+from python.runners.workflow.runtime import (
+    WorkflowRunner,
+    _session_outcome,
+    _shutdown_runner_resources,
+    _start_display_pool,
+)
+
+
+ASYNC_CONTROL_ACTIVITIES = frozenset(
+    {'start_browser', 'close_browser', 'select_list', 'delay', 'condition', 'loop', 'random_branch', 'python_script'}
+)
+ASYNC_BROWSER_ACTIVITIES = frozenset(
+    {
+        'scrape_relationships',
+        'browse_feed',
+        'browse_reels',
+        'watch_stories',
+        'follow_user',
+        'unfollow_user',
+        'approve_requests',
+        'send_dm',
+    }
+)
+BLOCKING_CALL_WORKERS = 8
+
+
+def unsupported_async_activities(nodes: List[Dict[str, Any]]) -> List[str]:
+    """Activity ids in ``nodes`` that only have a sync (threaded engine) implementation."""
+    unsupported: List[str] = []
+    for node in nodes:
+        node_data = node.get('data') if isinstance(node.get('data'), dict) else {}
+        activity_id = str(node_data.get('activityId') or '')
+        if not activity_id or activity_id in ASYNC_CONTROL_ACTIVITIES or activity_id in ASYNC_BROWSER_ACTIVITIES:
+            continue
+        if activity_id not in unsupported:
+            unsupported.append(activity_id)
+    return unsupported
+
+
+class AsyncWorkflowRunner(WorkflowRunner):
+    def _create_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=max(1, min(BLOCKING_CALL_WORKERS, self._max_workers)),
+            thread_name_prefix='workflow-blocking',
+        )
+
+    def stop(self) -> None:
+        # The blocking pool must outlive stop() so profile status and display cleanup still run.
+        self.running = False
+        self.cancel_token.cancel()
+
+    def run(self) -> int:
+        return asyncio.run(run_async_workflow_session(self))
+
+    async def _blocking(self, func, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def process_account(self, account, playwright=None) -> bool:
+        return await process_account_async(self, account, playwright)
+
+    async def _execute_activity(
+        self,
+        node: PlanNode,
+        browser_state: Dict[str, Any],
+        account,
+        profile_data: Optional[Dict[str, Any]],
+        loop_state: Dict[str, int],
+    ) -> str:
+        return await execute_activity_async(self, node, browser_state, account, profile_data, loop_state)
+
+
+async def run_async_workflow_session(runner: AsyncWorkflowRunner) -> int:
+    compat = compat_module()
+    runner._emit_with_node_states(
+        'session_started',
+        snapshot=True,
+        total_accounts=len(runner.accounts),
+        workflow_id=runner.workflow_id,
+    )
+    for warning in runner.plan.warnings:
+        compat.log(f'Warning: workflow {warning}')
+    if not runner.accounts:
+        compat.log('Нет профилей для запуска.')
+        compat.emit_event('session_ended', status='failed', workflow_id=runner.workflow_id)
+        return 2
+    await runner._blocking(_start_display_pool, runner)
+    try:
+        had_failures = await _run_accounts(runner)
+    finally:
+        _shutdown_runner_resources(runner)
+    status, exit_code = _session_outcome(runner, had_failures)
+    runner._emit_with_node_states(
+        'session_ended',
+        snapshot=True,
+        status=status,
+        workflow_id=runner.workflow_id,
+    )
+    return exit_code
+
+
+async def _run_accounts(runner: AsyncWorkflowRunner) -> bool:
+    compat = compat_module()
+    semaphore = asyncio.Semaphore(runner._max_workers)
+    async with async_playwright() as playwright:
+        results = await asyncio.gather(
+            *(_process_with_limit(runner, semaphore, account, playwright) for account in runner.accounts),
+            return_exceptions=True,
+        )
+    had_failures = False
+    for result in results:
+        if isinstance(result, BaseException):
+            had_failures = True
+            compat.log(f'Ошибка профиля: {result}')
+        elif result is False:
+            had_failures = True
+    return had_failures
+
+
+async def _process_with_limit(runner: AsyncWorkflowRunner, semaphore: asyncio.Semaphore, account, playwright) -> Optional[bool]:
+    async with semaphore:
+        if not runner.running:
+            return None
+        return await runner.process_account(account, playwright)
+
+
+async def process_account_async(runner: AsyncWorkflowRunner, account, playwright) -> bool:
+    compat = compat_module()
+    profile_name = account.username
+    browser_state = account_session._build_browser_state(account)
+    browser_state['_playwright'] = playwright
+    compat.emit_event('profile_started', profile=profile_name, workflow_id=runner.workflow_id)
+    if not await runner._blocking(account_session._acquire_profile_lease, runner, profile_name):
+        return account_session._skip_without_lease(runner, profile_name)
+    try:
+        await runner._blocking(account_session._sync_profile_status, runner, profile_name, 'running', True)
+        profile_data = await runner._blocking(account_session._prepare_browser_startup, runner, profile_name, browser_state)
+        with pacing.cancellation_scope(runner.cancel_token):
+            succeeded = await _run_account_nodes(runner, account, browser_state, profile_data)
+        if runner.running:
+            compat.emit_event(
+                'profile_completed',
+                profile=profile_name,
+                status='success' if succeeded else 'failed',
+                workflow_id=runner.workflow_id,
+            )
+        await runner._blocking(account_session._sync_profile_status, runner, profile_name, 'idle', False)
+        return succeeded
+    except Exception as exc:
+        return await runner._blocking(account_session._handle_account_exception, runner, profile_name, exc)
+    finally:
+        await _close_browser_context(browser_state)
+        await runner._blocking(account_session._release_display, runner, profile_name)
+        await runner._blocking(account_session._release_profile_lease, runner, profile_name)
+
+
+async def _run_account_nodes(
+    runner: AsyncWorkflowRunner,
+    account,
+    browser_state: Dict[str, Any],
+    profile_data: Optional[Dict[str, Any]],
+) -> bool:
+    compat = compat_module()
+    plan = runner.plan
+    current = plan.next_index(plan.start_index, '')
+    loop_state: Dict[str, int] = {}
+    completed_steps = 0
+    total_steps = max(1, plan.activity_count)
+    visited_steps = 0
+    last_handle = ''
+    while runner.running and current is not None:
+        visited_steps += 1
+        if visited_steps > 500:
+            compat.log('Превышен лимит шагов workflow')
+            return False
+        node = plan.nodes[current]
+        if node.node_type == 'start':
+            current = plan.next_index(current, '')
+            continue
+        profile_name = browser_state['profile_name']
+        progress = int(round(100.0 * min(1.0, float(completed_steps) / float(total_steps))))
+        account_session._emit_task_started(runner, node.node_id, node.activity_id, node.label, profile_name, progress)
+        handle = str(
+            await runner._execute_activity(
+                node,
+                browser_state,
+                account,
+                profile_data,
+                loop_state,
+            )
+            or ''
+        )
+        completed_steps += 1 if node.is_activity else 0
+        account_session._emit_task_completed(runner, node.node_id, node.label, profile_name, handle, completed_steps, total_steps)
+        last_handle = handle
+        current = plan.next_index(current, handle)
+        if runner.running and current is not None:
+            await pacing.async_sleep(random.randint(1, 3), runner.cancel_token)
+    return runner.running and last_handle != 'failure'
+
+
+async def execute_activity_async(
+    runner: AsyncWorkflowRunner,
+    node: PlanNode,
+    browser_state: Dict[str, Any],
+    account,
+    profile_data: Optional[Dict[str, Any]],
+    loop_state: Dict[str, int],
+) -> str:
+    compat = compat_module()
+    node_id, activity_id = node.node_id, node.activity_id
+    settings, headless_mode = node.settings, node.headless_mode
+    try:
+        if activity_id == 'start_browser':
+            return await _start_browser(runner, headless_mode, browser_state, auto_started=False)
+        if activity_id == 'close_browser':
+            return await _close_browser(browser_state)
+        if activity_id == 'delay':
+            await pacing.async_sleep(random.randint(settings.min_seconds, settings.max_seconds), runner.cancel_token)
+            return 'next'
+        control_result = await runner._blocking(
+            activity_dispatch._execute_control_activity,
+            runner,
+            node_id,
+            activity_id,
+            settings,
+            headless_mode,
+            browser_state,
+            loop_state,
+        )
+        if control_result is not None:
+            return control_result
+        page = await _ensure_browser(runner, activity_id, headless_mode, browser_state)
+        if page is None:
+            return 'failure'
+        return await _execute_browser_activity(runner, node, browser_state, page, account, profile_data)
+    except Exception as exc:
+        compat.log(f'Ошибка activity {activity_id}: {exc}')
+        return 'failure'
+
+
+async def _execute_browser_activity(
+    runner: AsyncWorkflowRunner,
+    node: PlanNode,
+    browser_state: Dict[str, Any],
+    page: Any,
+    account,
+    profile_data: Optional[Dict[str, Any]],
+) -> str:
+    activity_id, settings = node.activity_id, node.settings
+    profile_name = browser_state['profile_name']
+    if activity_id == 'scrape_relationships':
+        return await execute_scrape_relationships_async(runner, node.node_id, node.config, page, profile_name, profile_data)
+    if activity_id == 'browse_feed':
+        return await _run_browse_feed(runner, settings, page, profile_name)
+    if activity_id == 'browse_reels':
+        return await _run_browse_reels(runner, settings, page, profile_name)
+    if activity_id == 'watch_stories':
+        return await _run_watch_stories(settings, page)
+    if activity_id == 'follow_user':
+        return await _run_follow_activity(runner, settings, page, account, profile_data)
+    if activity_id == 'unfollow_user':
+        return await _run_unfollow_activity(runner, settings, page, account, profile_data)
+    if activity_id == 'approve_requests':
+        return await _run_approve_activity(runner, settings, page)
+    if activity_id == 'send_dm':
+        return await _run_send_dm_activity(runner, settings, page, account, profile_data)
+    compat_module().log(f'Async workflow engine does not support activity: {activity_id}')
+    return 'failure'
+
+
+async def _start_browser(
+    runner: AsyncWorkflowRunner,
+    headless_mode: Optional[bool],
+    browser_state: Dict[str, Any],
+    *,
+    auto_started: bool,
+) -> str:
+    compat = compat_module()
+    await _close_browser_context(browser_state)
+    started = pacing.monotonic()
+    ctx_mgr = compat.create_async_browser_context(
+        browser_state['_playwright'],
+        browser_state['profile_name'],
+        browser_state['proxy_str'],
+        browser_state.get('user_agent'),
+        headless=runner.headless if headless_mode is None else headless_mode,
+        fingerprint_seed=browser_state.get('fingerprint_seed'),
+        fingerprint_os=browser_state.get('fingerprint_os_val'),
+        display=browser_state.get('display'),
+    )
+    context, page = await ctx_mgr.__aenter__()
+    browser_state['_ctx_mgr'] = ctx_mgr
+    browser_state['context'] = context
+    browser_state['page'] = page
+    activity_dispatch._emit_browser_startup(runner, browser_state, False, started, {})
+    compat.log('Browser auto-started.' if auto_started else 'Browser started.')
+    return 'next' if not auto_started else 'success'
+
+
+async def _close_browser(browser_state: Dict[str, Any]) -> str:
+    compat = compat_module()
+    if not browser_state.get('_ctx_mgr'):
+        return 'next'
+    await _close_browser_context(browser_state)
+    compat.log('Browser closed.')
+    return 'next'
+
+
+async def _close_browser_context(browser_state: Dict[str, Any]) -> None:
+    ctx_mgr = browser_state.get('_ctx_mgr')
+    browser_state['context'] = None
+    browser_state['page'] = None
+    browser_state['_ctx_mgr'] = None
+    if not ctx_mgr:
+        return
+    try:
+        await ctx_mgr.__aexit__(None, None, None)
+    except Exception:
+        pass
+
+
+async def _ensure_browser(
+    runner: AsyncWorkflowRunner,
+    activity_id: str,
+    headless_mode: Optional[bool],
+    browser_state: Dict[str, Any],
+) -> Optional[Any]:
+    compat = compat_module()
+    page = browser_state.get('page')
+    if page is not None:
+        return page
+    compat.log(f'No browser open for activity {activity_id} – auto-starting browser.')
+    try:
+        await _start_browser(runner, headless_mode, browser_state, auto_started=True)
+        return browser_state.get('page')
+    except Exception as exc:
+        compat.log(f'Failed to auto-start browser: {exc}')
+        return None
+
+
+async def _run_browse_feed(runner: AsyncWorkflowRunner, settings: ScrollConfig, page: Any, profile_name: str) -> str:
+    compat = compat_module()
+    duration = random.randint(settings.min_minutes, settings.max_minutes)
+    await compat.async_actions.scroll_feed(
+        page,
+        duration,
+        dict(settings.scroll_config),
+        should_stop=lambda: not runner.running,
+        profile_name=profile_name,
+        run_blocking=runner._blocking,
+    )
+    return 'success'
+
+
+async def _run_browse_reels(runner: AsyncWorkflowRunner, settings: ScrollConfig, page: Any, profile_name: str) -> str:
+    compat = compat_module()
+    duration = random.randint(settings.min_minutes, settings.max_minutes)
+    await compat.async_actions.scroll_reels(
+        page,
+        duration,
+        dict(settings.scroll_config),
+        should_stop=lambda: not runner.running,
+        profile_name=profile_name,
+        run_blocking=runner._blocking,
+    )
+    return 'success'
+
+
+async def _run_watch_stories(settings: StoriesConfig, page: Any) -> str:
+    compat = compat_module()
+    await compat.async_actions.watch_stories(
+        page,
+        max_stories=settings.max_stories,
+        min_view_s=settings.min_view_seconds,
+        max_view_s=settings.max_view_seconds,
+        log=compat.log,
+    )
+    return 'success'
+
+
+async def _run_follow_activity(
+    runner: AsyncWorkflowRunner,
+    settings: FollowConfig,
+    page: Any,
+    account,
+    profile_data: Optional[Dict[str, Any]],
+) -> str:
+    compat = compat_module()
+    profile_id = await runner._blocking(activity_dispatch._resolve_profile_id, runner, account, profile_data)
+    if not profile_id:
+        return 'failure'
+    accounts = await runner._blocking(runner.accounts_client.get_accounts_for_profile, profile_id)
+    usernames = [entry.get('user_name') for entry in accounts if entry.get('user_name')]
+    if not usernames:
+        return 'failure'
+    await compat.async_actions.follow_usernames(
+        page,
+        compat.apply_count_limit(usernames, settings.count_range),
+        compat.log,
+        should_stop=lambda: not runner.running,
+        following_limit=settings.following_limit,
+        interactions_config=dict(settings.interactions_config),
+        delay_range=settings.delay_range,
+        run_blocking=runner._blocking,
+    )
+    return 'success'
+
+
+async def _run_unfollow_activity(
+    runner: AsyncWorkflowRunner,
+    settings: UnfollowConfig,
+    page: Any,
+    account,
+    profile_data: Optional[Dict[str, Any]],
+) -> str:
+    compat = compat_module()
+    profile_id = await runner._blocking(activity_dispatch._resolve_profile_id, runner, account, profile_data)
+    if not profile_id:
+        return 'failure'
+    accounts = await runner._blocking(runner.accounts_client.get_accounts_for_profile, profile_id, status='unsubscribed')
+    usernames = [entry.get('user_name') for entry in accounts if entry.get('user_name')]
+    if not usernames:
+        return 'failure'
+    account_map = {entry['user_name']: entry['id'] for entry in accounts if entry.get('id') and entry.get('user_name')}
+    await compat.async_actions.unfollow_usernames(
+        page,
+        compat.apply_count_limit(usernames, settings.count_range),
+        compat.log,
+        should_stop=lambda: not runner.running,
+        delay_range=settings.delay_range,
+        on_success=lambda uname: activity_dispatch._mark_unfollow_done(runner, account_map, uname),
+        run_blocking=runner._blocking,
+    )
+    return 'success'
+
+
+async def _run_approve_activity(runner: AsyncWorkflowRunner, settings: ApproveConfig, page: Any) -> str:
+    compat = compat_module()
+    await compat.async_actions.approve_follow_requests(
+        page,
+        compat.log,
+        should_stop=lambda: not runner.running,
+        approve_delay_range=settings.delay_range,
+        finish_delay_seconds=settings.finish_delay_seconds,
+        run_blocking=runner._blocking,
+    )
+    return 'success'
+
+
+async def _run_send_dm_activity(
+    runner: AsyncWorkflowRunner,
+    settings: SendDmConfig,
+    page: Any,
+    account,
+    profile_data: Optional[Dict[str, Any]],
+) -> str:
+    compat = compat_module()
+    profile_id = await runner._blocking(activity_dispatch._resolve_profile_id, runner, account, profile_data)
+    if not profile_id:
+        return 'failure'
+    message_texts = await runner._blocking(activity_dispatch._resolve_message_texts, runner, settings.template_kind)
+    cooldown_hours = runner.messaging_cooldown_hours if runner.messaging_cooldown_enabled else 0
+    targets = await runner._blocking(runner.accounts_client.get_accounts_to_message, profile_id, cooldown_hours=cooldown_hours)
+    if not targets:
+        return 'failure'
+    await compat.async_actions.send_messages(
+        page,
+        targets,
+        message_texts,
+        compat.log,
+        should_stop=lambda: not runner.running,
+        behavior_config=dict(settings.behavior_config),
+        run_blocking=runner._blocking,
+    )
+    return 'success'
@@ -0,0 +1,193 @@
+"""
+scrape_relationships for the asyncio workflow engine.
+
+Only the page calls are awaited on the event loop; resume logs, node state and
+artifact uploads reuse the sync executor's methods on the runner's blocking
+pool.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from python.core import pacing
+from python.runners.workflow.compat import compat as compat_module
+from python.runners.workflow.scrape_relationships import (
+    CLICK_RELATIONSHIP_LINK_SCRIPT,
+    RELATIONSHIP_UI_READY_SCRIPT,
+    ScrapeRelationshipsExecutor,
+    _relationship_link_error,
+    relationship_link_locators,
+    relationship_link_selectors,
+)
+from python.runners.workflow.scrape_script import RELATIONSHIP_CHUNK_SCRIPT
+
+
+async def open_relationship_view(page: Any, *, target_username: str, kind: str) -> Optional[Tuple[str, str]]:
+    compat = compat_module()
+    normalized_target = str(target_username or '').strip().strip('/').lower()
+    compat.log(f'scrape_relationships @{normalized_target}: opening {kind} list')
+    clicked_selector, click_error = await _click_relationship_link(page, normalized_target, kind)
+    if not clicked_selector:
+        return _relationship_link_error(compat, normalized_target, kind, click_error)
+    try:
+        await page.wait_for_function(
+            RELATIONSHIP_UI_READY_SCRIPT,
+            arg={'targetUsername': normalized_target, 'kind': kind},
+            timeout=7000,
+        )
+        compat.log(f'scrape_relationships @{normalized_target}: {kind} UI opened')
+        return None
+    except Exception as exc:
+        return (
+            'relationship_open_failed',
+            f'Failed to open {kind} list for @{normalized_target}: {exc}',
+        )
+
+
+async def _click_relationship_link(page: Any, normalized_target: str, kind: str) -> Tuple[Optional[str], Optional[Exception]]:
+    click_error: Optional[Exception] = None
+    try:
+        clicked_selector = await page.evaluate(
+            CLICK_RELATIONSHIP_LINK_SCRIPT,
+            {'selectors': relationship_link_selectors(normalized_target, kind)},
+        )
+        if clicked_selector:
+            return clicked_selector, None
+    except Exception as exc:
+        click_error = exc
+    for description, locator in relationship_link_locators(page, kind):
+        try:
+            await locator.click(timeout=2000)
+            return description, None
+        except Exception as exc:
+            click_error = exc
+    return None, click_error
+
+
+async def scrape_relationship_chunk(
+    page: Any,
+    *,
+    target_username: str,
+    kind: str,
+    cursor: Optional[str],
+    chunk_limit: int,
+    max_pages: int,
+    fields=None,
+) -> Dict[str, Any]:
+    return await page.evaluate(
+        RELATIONSHIP_CHUNK_SCRIPT,
+        {
+            'targetUsername': target_username,
+            'kind': kind,
+            'cursor': cursor,
+            'chunkLimit': chunk_limit,
+            'maxPages': max_pages,
+            'fields': list(fields) if fields else None,
+        },
+    )
+
+
+class AsyncScrapeRelationshipsExecutor(ScrapeRelationshipsExecutor):
+    async def run(self) -> str:
+        blocking = self.runner._blocking
+        if not self.targets:
+            self.compat.log('scrape_relationships requires at least one target username')
+            return 'failure'
+        await blocking(self._load_state)
+        await blocking(self._prepare_profile_record)
+        await blocking(self._emit_initial_state)
+        if self.current_target_index >= len(self.targets):
+            return await blocking(self._complete_node)
+        if await blocking(self.runner._remaining_daily_scraping_capacity, self.profile_name, self.profile_record) == 0:
+            return await blocking(self._fail_due_to_daily_limit)
+
+        while self.runner.running and self.current_target_index < len(self.targets):
+            target_username = self.targets[self.current_target_index]
+            relationship_error = await self._ensure_relationship_view(target_username)
+            chunk, elapsed_ms = await self._fetch_chunk(target_username, relationship_error)
+            result = await blocking(self._handle_chunk_result, target_username, chunk, elapsed_ms)
+            if result is not None:
+                return result
+
+        self.compat.log(
+            f'scrape_relationships: node {self.node_id} finished with running={self.runner.running} '
+            f'currentTargetIndex={self.current_target_index} targets={len(self.targets)}'
+        )
+        return 'failure' if not self.runner.running else 'success'
+
+    async def _ensure_relationship_view(self, target_username: str) -> Optional[Tuple[str, str]]:
+        should_open = not self.relationship_view_ready or self.active_target_username != target_username
+        if not should_open:
+            return None
+        try:
+            await self._open_target_profile(target_username)
+        except Exception as exc:
+            self.compat.log(f'Ошибка открытия @{target_username}: {exc}')
+            return ('profile_open_failed', str(exc))
+        relationship_error = await open_relationship_view(self.page, target_username=target_username, kind=self.kind)
+        if relationship_error is None:
+            self.active_target_username = target_username
+            self.relationship_view_ready = True
+        return relationship_error
+
+    async def _open_target_profile(self, target_username: str) -> None:
+        self.compat.log(
+            f'scrape_relationships @{target_username}: target '
+            f'{self.current_target_index + 1}/{len(self.targets)} open profile start'
+        )
+        await self.page.goto(
+            f'https://www.instagram.com/{target_username}/',
+            wait_until='domcontentloaded',
+            timeout=60000,
+        )
+        if self.open_delay_seconds > 0:
+            await self.page.wait_for_timeout(int(self.open_delay_seconds * 1000))
+        self.compat.log(
+            f'scrape_relationships @{target_username}: profile opened '
+            f'(delay={self.open_delay_seconds:.1f}s)'
+        )
+
+    async def _fetch_chunk(self, target_username: str, relationship_error: Optional[Tuple[str, str]]) -> Tuple[Dict[str, Any], int]:
+        if relationship_error is not None:
+            error_code, error_message = relationship_error
+            return self._build_error_chunk(error_code, error_message), 0
+        chunk_started_at = pacing.monotonic()
+        remaining_capacity = await self.runner._blocking(
+            self.runner._remaining_daily_scraping_capacity,
+            self.profile_name,
+            self.profile_record,
+        )
+        if remaining_capacity == 0:
+            return {'outcome': 'daily_limit'}, 0
+        effective_chunk_limit = max(1, min(self.chunk_limit, remaining_capacity)) if remaining_capacity is not None else self.chunk_limit
+        chunk = await scrape_relationship_chunk(
+            self.page,
+            target_username=target_username,
+            kind=self.kind,
+            cursor=self.cursor,
+            chunk_limit=effective_chunk_limit,
+            max_pages=self.max_pages_per_attempt,
+            fields=self.fields,
+        )
+        elapsed_ms = int(round((pacing.monotonic() - chunk_started_at) * 1000))
+        return chunk, elapsed_ms
+
+
+async def execute_scrape_relationships_async(
+    runner,
+    node_id: str,
+    cfg: Dict[str, Any],
+    page: Any,
+    profile_name: str,
+    profile_data: Optional[Dict[str, Any]] = None,
+) -> str:
+    executor = AsyncScrapeRelationshipsExecutor(
+        runner,
+        node_id,
+        cfg,
+        page,
+        profile_name,
+        profile_data,
+    )
+    try:
+        return await executor.run()
+    finally:
+        await runner._blocking(runner._flush_daily_scraping_usage)
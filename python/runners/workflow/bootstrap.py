@@ -1,6 +1,7 @@
 import logging
 from typing import Any, Dict, List, Optional
 
+from python.database.session import get_shared_session
 from python.runners.workflow.parsing import (
     _parse_bool,
     _parse_int,
@@ -10,6 +11,9 @@ from python.runners.workflow.parsing import (
 
 logger = logging.getLogger(__name__)
 
+WORKFLOW_ENGINES = ('threaded', 'async')
+PARALLEL_PROFILE_LIMITS = {'threaded': 10, 'async': 50}
+
 
 def _workflow_has_activity(nodes: List[Dict[str, Any]], activity_id: str) -> bool:
     for node in nodes:
@@ -29,9 +33,11 @@ def _extract_start_browser_settings(
     headless_raw = _pick_first(config, 'headlessMode', 'headless', 'headless_mode')
     if headless_raw is None:
         headless_raw = start_data.get('headlessMode')
+    engine = _workflow_engine(_pick_first(config, 'engine', 'workflowEngine', 'workflow_engine'))
     return {
         'headless': _parse_bool(headless_raw, default=_parse_bool(start_data.get('headlessMode'), False)),
-        'parallel_profiles': _parallel_profiles(config),
+        'engine': engine,
+        'parallel_profiles': _parallel_profiles(config, engine),
         'profile_reopen_cooldown_enabled': _parse_bool(profile_cooldown['enabled'], False),
         'profile_reopen_cooldown_minutes': max(0, _parse_int(profile_cooldown['value'], 30)),
         'messaging_cooldown_enabled': _parse_bool(messaging_cooldown['enabled'], False),
@@ -69,11 +75,16 @@ def _cooldown_values(config: Dict[str, Any], legacy_key: str, snake_legacy_key:
     return {'enabled': enabled_raw, 'value': value_raw}
 
 
-def _parallel_profiles(config: Dict[str, Any]) -> int:
+def _workflow_engine(value: Any) -> str:
+    engine = str(value or '').strip().lower()
+    return engine if engine in WORKFLOW_ENGINES else 'threaded'
+
+
+def _parallel_profiles(config: Dict[str, Any], engine: str = 'threaded') -> int:
     return max(
         1,
         min(
-            10,
+            PARALLEL_PROFILE_LIMITS.get(engine, PARALLEL_PROFILE_LIMITS['threaded']),
             _parse_int(_pick_first(config, 'parallelProfiles', 'parallel_profiles'), 1),
         ),
     )
@@ -120,9 +131,7 @@ def fetch_profiles_for_lists(
         payload['cooldownMinutes'] = max(0, int(cooldown_minutes))
 
     try:
-        import requests
-
-        response = requests.post(
+        response = get_shared_session().post(
             f'{project_url}{endpoint}',
             json=payload,
             headers=headers,
@@ -1,3 +1,4 @@
+import argparse
 import atexit
 import os
 import signal
@@ -6,8 +7,12 @@ from types import ModuleType
 from typing import Any, Dict, List, Optional
 
 from python.core.models import ThreadsAccount
+from python.runners.workflow.async_runtime import AsyncWorkflowRunner, unsupported_async_activities
+from python.runners.workflow.bootstrap import _workflow_engine
 from python.runners.workflow.compat import compat as compat_module
+from python.runners.workflow.plan import WorkflowPlanError
 from python.runners.workflow.runtime import WorkflowRunner
+from python.runners.workflow.simulation import SimulationSettings, log_simulation_report, run_simulation
 
 
 def _normalize_list_ids(raw_items: Any) -> List[str]:
@@ -23,7 +28,18 @@ def _normalize_list_ids(raw_items: Any) -> List[str]:
     return list_ids
 
 
-def main() -> int:
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Run a workflow payload read from stdin.')
+    parser.add_argument('--simulate', action='store_true', help='Run against simulated accounts, page and Convex on a virtual clock')
+    parser.add_argument('--accounts', type=int, default=50, help='Number of simulated accounts')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the simulation RNG')
+    parser.add_argument('--parallel', type=int, default=None, help='Override parallel_profiles for the simulation')
+    parser.add_argument('--show-events', action='store_true', help='Print runner events and logs during the simulation')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
     compat = compat_module()
     payload = _read_payload(compat)
     if payload is None:
@@ -31,6 +47,8 @@ def main() -> int:
     workflow_id, workflow, nodes, options = _extract_workflow_payload(compat, payload)
     if workflow is None:
         return 2
+    if args.simulate:
+        return _run_simulation(compat, workflow_id, workflow, options, args)
     _, start_data, list_ids = _start_node_inputs(compat, nodes)
     start_settings = compat._extract_start_browser_settings(nodes, start_data)
     has_scrape_relationships = compat._workflow_has_activity(nodes, 'scrape_relationships')
@@ -42,17 +60,52 @@ def main() -> int:
     accounts = _build_accounts(compat, workflow_id, profiles)
     if accounts is None:
         return 2
-    runner = WorkflowRunner(
-        workflow_id,
-        nodes,
-        workflow.get('edges') if isinstance(workflow.get('edges'), list) else [],
-        accounts,
-        {**start_settings, **options, 'workflow_name': workflow.get('name')},
-    )
+    runner_options = {**start_settings, **options, 'workflow_name': workflow.get('name')}
+    try:
+        runner_class = _select_engine(compat, nodes, runner_options)
+        runner = runner_class(
+            workflow_id,
+            nodes,
+            workflow.get('edges') if isinstance(workflow.get('edges'), list) else [],
+            accounts,
+            runner_options,
+        )
+    except WorkflowPlanError as exc:
+        compat.log(f'Ошибка workflow: {exc}')
+        compat.emit_event('session_ended', status='failed', workflow_id=workflow_id)
+        return 2
+    runner.seed_profile_cache(profiles)
+    runner.replay_scraping_ledger()
+    runner.outbox.start()
     _register_process_handlers(compat, runner)
     return runner.run()
 
 
+def _select_engine(compat, nodes: List[Dict[str, Any]], options: Dict[str, Any]) -> type:
+    if _workflow_engine(options.get('engine')) != 'async':
+        return WorkflowRunner
+    unsupported = unsupported_async_activities(nodes)
+    if unsupported:
+        raise WorkflowPlanError(
+            f'experimental async engine does not support {", ".join(unsupported)}; '
+            f'switch the start node to the threaded engine'
+        )
+    compat.log('Warning: the async workflow engine is experimental')
+    return AsyncWorkflowRunner
+
+
+def _run_simulation(compat, workflow_id: str, workflow: Dict[str, Any], options: Dict[str, Any], args: argparse.Namespace) -> int:
+    settings = SimulationSettings(
+        accounts=max(1, args.accounts),
+        seed=args.seed,
+        parallel_profiles=args.parallel,
+        show_events=args.show_events,
+    )
+    exit_code, report = run_simulation(workflow_id, workflow, options, settings)
+    log_simulation_report(compat, report)
+    return exit_code
+
+
 def _read_payload(compat) -> Optional[Dict[str, Any]]:
     raw = sys.stdin.read()
     if not raw.strip():
@@ -169,3 +222,9 @@ def _register_process_handlers(compat, runner: WorkflowRunner) -> None:
         signal.signal(signal.SIGTERM, _handle_signal)
     if hasattr(signal, 'SIGBREAK'):
         signal.signal(signal.SIGBREAK, _handle_signal)
+
+    def _handle_resync(_sig, _frame):
+        runner.request_node_states_resync()
+
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, _handle_resync)
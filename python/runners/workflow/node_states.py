@@ -0,0 +1,83 @@
+import copy
+import json
+from threading import RLock
+from typing import Any, Dict, Optional
+
+DEFAULT_SNAPSHOT_INTERVAL = 50
+
+
+def _detached(value: Any) -> Any:
+    # Lists and dicts would otherwise stay shared with the caller and change behind the journal's back
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class NodeStateJournal:
+    def __init__(self, initial: Optional[Dict[str, Any]] = None, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL) -> None:
+        self._lock = RLock()
+        self._states: Dict[str, Dict[str, Any]] = {}
+        if isinstance(initial, dict):
+            for node_id, state in initial.items():
+                self._states[str(node_id)] = _detached(state) if isinstance(state, dict) else {}
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._events_since_snapshot = 0
+        self._snapshot_interval = max(1, int(snapshot_interval))
+        self._resync_requested = False
+
+    def update(self, node_id: str, **patch: Any) -> Dict[str, Any]:
+        with self._lock:
+            base = self._states.setdefault(node_id, {})
+            dirty = self._dirty.get(node_id)
+            for key, value in patch.items():
+                if key in base and base[key] == value:
+                    continue
+                value = _detached(value)
+                base[key] = value
+                if dirty is None:
+                    dirty = self._dirty.setdefault(node_id, {})
+                dirty[key] = value
+            return _detached(base)
+
+    def get(self, node_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            existing = self._states.get(node_id)
+            return _detached(existing) if existing is not None else None
+
+    @property
+    def lock(self) -> RLock:
+        """Hold while writing an event so seqs reach the output in the order they were assigned."""
+        return self._lock
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self._states))
+
+    def request_resync(self) -> None:
+        self._resync_requested = True
+
+    def event_fields(self) -> Dict[str, Any]:
+        with self._lock:
+            self._seq += 1
+            self._events_since_snapshot += 1
+            if self._resync_requested or self._events_since_snapshot >= self._snapshot_interval:
+                return self._snapshot_fields()
+            patch = self._dirty
+            self._dirty = {}
+            return {
+                'node_states_seq': self._seq,
+                'node_state_patch': json.loads(json.dumps(patch)),
+            }
+
+    def snapshot_fields(self) -> Dict[str, Any]:
+        with self._lock:
+            self._seq += 1
+            return self._snapshot_fields()
+
+    def _snapshot_fields(self) -> Dict[str, Any]:
+        self._resync_requested = False
+        self._events_since_snapshot = 0
+        self._dirty = {}
+        return {
+            'node_states_seq': self._seq,
+            'node_states': json.loads(json.dumps(self._states)),
+        }
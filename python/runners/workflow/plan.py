@@ -0,0 +1,242 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from python.runners.workflow.activity_config import compile_activity_config, headless_override
+from python.runners.workflow.graph import _build_edge_index
+
+ACTIVITY_OUTPUTS: Dict[str, Tuple[str, ...]] = {
+    'start_browser': ('next',),
+    'close_browser': ('next',),
+    'select_list': ('next',),
+    'delay': ('next',),
+    'condition': ('true', 'false'),
+    'loop': ('loop', 'done'),
+    'random_branch': ('path_a', 'path_b', 'path_c'),
+    'browse_feed': ('success', 'failure'),
+    'browse_reels': ('success', 'failure'),
+    'scrape_relationships': ('success', 'failure'),
+    'watch_stories': ('success', 'failure'),
+    'follow_user': ('success', 'failure'),
+    'unfollow_user': ('success', 'failure'),
+    'approve_requests': ('success', 'failure'),
+    'send_dm': ('success', 'failure'),
+}
+# Every output a branching node can return needs an edge; a missing one would end the profile's run silently
+BRANCH_ACTIVITIES = frozenset({'condition', 'loop', 'random_branch'})
+
+
+class WorkflowPlanError(ValueError):
+    """Raised when a workflow graph cannot be executed."""
+
+
+@dataclass(frozen=True, slots=True)
+class PlanNode:
+    index: int
+    node_id: str
+    node_type: str
+    activity_id: str
+    label: str
+    is_activity: bool
+    config: Dict[str, Any]
+    settings: Any
+    headless_mode: Optional[bool]
+
+
+class WorkflowPlan:
+    __slots__ = ('nodes', 'start_index', 'activity_count', 'warnings', '_index_by_id', '_edges')
+
+    def __init__(
+        self,
+        nodes: List[PlanNode],
+        start_index: int,
+        edges: List[Dict[str, int]],
+        warnings: List[str],
+    ) -> None:
+        self.nodes = nodes
+        self.start_index = start_index
+        self.activity_count = sum(1 for node in nodes if node.is_activity)
+        self.warnings = warnings
+        self._index_by_id = {node.node_id: node.index for node in nodes}
+        self._edges = edges
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        return self._index_by_id.get(str(node_id))
+
+    def node_for(self, node_id: str) -> Optional[PlanNode]:
+        index = self._index_by_id.get(str(node_id))
+        return self.nodes[index] if index is not None else None
+
+    def next_index(self, index: int, handle: str) -> Optional[int]:
+        table = self._edges[index]
+        target = table.get(handle)
+        if target is None and handle:
+            target = table.get('')
+        return target
+
+
+def compile_workflow_plan(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> WorkflowPlan:
+    plan_nodes = _compile_nodes(nodes)
+    index_by_id = {node.node_id: node.index for node in plan_nodes}
+    start_index = _start_index(plan_nodes)
+    edge_table = _compile_edges(plan_nodes, index_by_id, edges)
+    reachable = _reachable(start_index, edge_table)
+    _check_cycles(plan_nodes, edge_table, reachable)
+    warnings = [
+        f'node {node.node_id} ({node.label}) is not reachable from the start node'
+        for node in plan_nodes
+        if node.index not in reachable
+    ]
+    return WorkflowPlan(plan_nodes, start_index, edge_table, warnings)
+
+
+def _compile_nodes(nodes: List[Dict[str, Any]]) -> List[PlanNode]:
+    plan_nodes: List[PlanNode] = []
+    seen: set[str] = set()
+    for node in nodes:
+        if not isinstance(node, dict) or not node.get('id'):
+            continue
+        node_id = str(node.get('id'))
+        if node_id in seen:
+            raise WorkflowPlanError(f'duplicate node id {node_id}')
+        seen.add(node_id)
+        data = node.get('data') if isinstance(node.get('data'), dict) else {}
+        activity_id = str(data.get('activityId') or '')
+        config = data.get('config') if isinstance(data.get('config'), dict) else {}
+        plan_nodes.append(
+            PlanNode(
+                index=len(plan_nodes),
+                node_id=node_id,
+                node_type=str(node.get('type') or ''),
+                activity_id=activity_id,
+                label=str(data.get('label') or activity_id or node_id),
+                is_activity=node.get('type') == 'activity',
+                config=config,
+                settings=compile_activity_config(activity_id, config),
+                headless_mode=headless_override(config),
+            )
+        )
+    return plan_nodes
+
+
+def _start_index(plan_nodes: List[PlanNode]) -> int:
+    for node in plan_nodes:
+        if node.node_type == 'start':
+            return node.index
+    for node in plan_nodes:
+        if node.node_id == 'start_node':
+            return node.index
+    raise WorkflowPlanError('workflow has no start node')
+
+
+def _compile_edges(
+    plan_nodes: List[PlanNode],
+    index_by_id: Dict[str, int],
+    edges: List[Dict[str, Any]],
+) -> List[Dict[str, int]]:
+    table: List[Dict[str, int]] = [{} for _ in plan_nodes]
+    for (source_id, handle), targets in _build_edge_index(edges).items():
+        source_index = index_by_id.get(source_id)
+        if source_index is None:
+            raise WorkflowPlanError(f'edge from unknown node {source_id}')
+        for target_id in targets:
+            if target_id not in index_by_id:
+                raise WorkflowPlanError(f'edge from {source_id} points to unknown node {target_id}')
+        source = plan_nodes[source_index]
+        outputs = ACTIVITY_OUTPUTS.get(source.activity_id)
+        if handle and outputs is not None and handle not in outputs:
+            raise WorkflowPlanError(
+                f'node {source_id} ({source.activity_id}) has no output handle {handle!r}'
+            )
+        table[source_index][handle] = index_by_id[targets[0]]
+    _check_branch_outputs(plan_nodes, table)
+    return table
+
+
+def _check_branch_outputs(plan_nodes: List[PlanNode], table: List[Dict[str, int]]) -> None:
+    for node in plan_nodes:
+        if node.activity_id not in BRANCH_ACTIVITIES or '' in table[node.index]:
+            continue
+        missing = [output for output in _branch_outputs(node) if output not in table[node.index]]
+        if missing:
+            raise WorkflowPlanError(
+                f'node {node.node_id} ({node.activity_id}) has no edge for output {", ".join(missing)}'
+            )
+
+
+def _branch_outputs(node: PlanNode) -> Tuple[str, ...]:
+    outputs = ACTIVITY_OUTPUTS[node.activity_id]
+    if node.activity_id == 'condition' and node.settings.check != 'random':
+        return ('true',)
+    if node.activity_id == 'random_branch' and sum(node.settings.weights) > 0:
+        # Zero-weight paths are never picked unless every weight is zero
+        return tuple(output for output, weight in zip(outputs, node.settings.weights) if weight > 0)
+    return outputs
+
+
+def _reachable(start_index: int, edge_table: List[Dict[str, int]]) -> set[int]:
+    seen = {start_index}
+    stack = [start_index]
+    while stack:
+        for target in edge_table[stack.pop()].values():
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+def _check_cycles(plan_nodes: List[PlanNode], edge_table: List[Dict[str, int]], reachable: set[int]) -> None:
+    for component in _strongly_connected(edge_table, reachable):
+        is_cycle = len(component) > 1 or component[0] in edge_table[component[0]].values()
+        if not is_cycle:
+            continue
+        if any(plan_nodes[index].activity_id == 'loop' for index in component):
+            continue
+        path = ' -> '.join(plan_nodes[index].node_id for index in sorted(component))
+        raise WorkflowPlanError(f'cycle without a loop node: {path}')
+
+
+def _strongly_connected(edge_table: List[Dict[str, int]], reachable: set[int]) -> List[List[int]]:
+    index_counter = 0
+    indices: Dict[int, int] = {}
+    lowlinks: Dict[int, int] = {}
+    on_stack: set[int] = set()
+    stack: List[int] = []
+    components: List[List[int]] = []
+    for root in sorted(reachable):
+        if root in indices:
+            continue
+        work = [(root, iter(edge_table[root].values()))]
+        indices[root] = lowlinks[root] = index_counter
+        index_counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for successor in successors:
+                if successor not in indices:
+                    indices[successor] = lowlinks[successor] = index_counter
+                    index_counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(edge_table[successor].values())))
+                    advanced = True
+                    break
+                if successor in on_stack:
+                    lowlinks[node] = min(lowlinks[node], indices[successor])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+            if lowlinks[node] == indices[node]:
+                component: List[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
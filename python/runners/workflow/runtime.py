@@ -1,12 +1,13 @@
-import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock, RLock
+from threading import Lock
 from typing import Any, Dict, List, Optional
 
+from python.core import pacing
 from python.runners.workflow.account_session import process_account as process_account_impl
 from python.runners.workflow.activity_dispatch import execute_activity as execute_activity_impl
 from python.runners.workflow.compat import compat as compat_module
-from python.runners.workflow.graph import _build_edge_index
+from python.runners.workflow.node_states import DEFAULT_SNAPSHOT_INTERVAL, NodeStateJournal
+from python.runners.workflow.plan import PlanNode, compile_workflow_plan
 from python.runners.workflow.scrape_relationships import (
     execute_scrape_relationships,
     open_relationship_view,
@@ -27,10 +28,10 @@ class WorkflowRunner:
         self.workflow_id = workflow_id
         self.nodes = nodes
         self.edges = edges
-        self.node_index = {str(node.get('id')): node for node in nodes if node.get('id')}
-        self.edge_index = _build_edge_index(edges)
+        self.plan = compile_workflow_plan(nodes, edges)
         self.accounts = accounts
         self.running = True
+        self.cancel_token = pacing.CancellationToken()
         self.options = options
         self._scrape_node_ids = _scrape_node_ids(nodes)
         self._has_scrape_relationships = bool(self._scrape_node_ids)
@@ -42,15 +43,28 @@ class WorkflowRunner:
         self.profiles_client = compat.ProfilesClient()
         self._profile_cache: Dict[str, Dict[str, Any]] = {}
         self._profile_cache_lock = Lock()
-        self._node_states_lock = RLock()
+        self.scraping_ledger = compat.ScrapingCapacityLedger(self.profiles_client, compat._scraping_ledger_dir())
+        self.outbox = compat.MutationOutbox(compat._mutation_outbox_path())
+        self.profile_leases = compat.ProfileLeaseRegistry(compat._profile_lease_path())
+        self.message_templates = compat.MessageTemplateCache(lambda: compat.MessageTemplatesClient())
+        self._register_outbox_handlers()
         self._max_workers = _max_workers(compat, options, accounts, self._has_scrape_relationships)
-        self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._executor = self._create_executor()
         self.display_mgr = compat.DisplayManager()
-        raw_node_states = options.get('node_states')
-        self.node_states: Dict[str, Any] = dict(raw_node_states) if isinstance(raw_node_states, dict) else {}
+        self._node_state_journal = NodeStateJournal(
+            options.get('node_states'),
+            snapshot_interval=max(
+                1,
+                compat._parse_int(options.get('node_states_snapshot_interval'), DEFAULT_SNAPSHOT_INTERVAL),
+            ),
+        )
+
+    def _create_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self._max_workers)
 
     def stop(self) -> None:
         self.running = False
+        self.cancel_token.cancel()
         try:
             self._executor.shutdown(wait=False, cancel_futures=True)
         except TypeError:
@@ -69,42 +83,124 @@ class WorkflowRunner:
         with self._profile_cache_lock:
             self._profile_cache[name] = data
 
+    def seed_profile_cache(self, records: List[Dict[str, Any]]) -> None:
+        """Cache the list-fetch profile records and bulk-fetch any account still missing one."""
+        compat = compat_module()
+        with self._profile_cache_lock:
+            for record in records or []:
+                if isinstance(record, dict) and record.get('name') and record.get('profile_id'):
+                    self._profile_cache[str(record['name'])] = dict(record)
+            missing = [account.username for account in self.accounts if account.username not in self._profile_cache]
+        if not missing:
+            return
+        try:
+            fetched = self.profiles_client.get_profiles_by_names(missing)
+        except Exception as exc:
+            compat.log(f'Bulk profile prefetch failed for {len(missing)} profile(s): {exc}')
+            return
+        for record in fetched:
+            if record.get('name'):
+                self._set_cached_profile(str(record['name']), record)
+
+    def _register_outbox_handlers(self) -> None:
+        self.outbox.register(
+            'profiles.sync_status',
+            lambda payload: self.profiles_client.sync_profile_status(payload['name'], payload['status'], payload['using']),
+        )
+        self.outbox.register(
+            'accounts.update_status',
+            lambda payload: self.accounts_client.update_account_status(payload['accountId'], status=payload['status']),
+        )
+        self.outbox.register('workflow_artifacts.upsert', self._apply_artifact_upsert)
+
+    def _enqueue_profile_status(self, profile_name: str, status: str, using: bool) -> None:
+        self.outbox.enqueue(
+            'profiles.sync_status',
+            {'name': profile_name, 'status': status, 'using': using},
+            key=f'profile-status:{profile_name}',
+        )
+
+    def _enqueue_account_status(self, account_id: str, status: str) -> None:
+        self.outbox.enqueue(
+            'accounts.update_status',
+            {'accountId': account_id, 'status': status},
+            key=f'account-status:{account_id}',
+        )
+
+    def _enqueue_artifact_upsert(self, payload: Dict[str, Any]) -> None:
+        self.outbox.enqueue(
+            'workflow_artifacts.upsert',
+            payload,
+            key=f"workflow-artifact:{payload.get('workflowId')}:{payload.get('nodeId')}",
+        )
+
+    def _apply_artifact_upsert(self, payload: Dict[str, Any]) -> None:
+        compat = compat_module()
+        row = compat._convex_post_json('/api/workflow-artifacts/upsert', payload)
+        node_id = str(payload.get('nodeId') or '')
+        if payload.get('workflowId') != self.workflow_id or not self._get_node_state(node_id):
+            return
+        self._update_node_state(
+            node_id,
+            artifactId=(row or {}).get('_id'),
+            artifactUpsertFailedAt=None,
+            artifactUpsertError=None,
+            artifactUpsertPayload=None,
+        )
+
+    def replay_scraping_ledger(self) -> None:
+        """Flush daily scraping usage that a crashed run counted but never sent."""
+        compat = compat_module()
+        if not self._has_scrape_relationships:
+            return
+        adopted = self.scraping_ledger.replay()
+        if adopted:
+            compat.log(f'Replayed {adopted} unflushed daily scraping usage from a previous run')
+
+    def _remaining_daily_scraping_capacity(self, profile_name: str, profile: Optional[Dict[str, Any]]) -> Optional[int]:
+        return self.scraping_ledger.reserve(profile_name, profile)
+
+    def _flush_daily_scraping_usage(self) -> None:
+        self.scraping_ledger.flush()
+
     def _record_daily_scraping_usage(self, profile_name: str, amount: int) -> None:
         compat = compat_module()
         safe_amount = max(0, int(amount)) if isinstance(amount, (int, float)) else 0
         if safe_amount <= 0:
             return
-        self.profiles_client.increment_daily_scraping_used(profile_name, safe_amount)
+        self.scraping_ledger.record(profile_name, safe_amount)
         cached = self._get_cached_profile(profile_name)
         next_profile = dict(cached) if isinstance(cached, dict) else {'name': profile_name}
         next_profile['daily_scraping_used'] = compat._profile_daily_scraping_used(next_profile) + safe_amount
         self._set_cached_profile(profile_name, next_profile)
 
-    def _sanitize_node_states(self) -> Dict[str, Any]:
-        with self._node_states_lock:
-            return json.loads(json.dumps(self.node_states))
+    def request_node_states_resync(self) -> None:
+        self._node_state_journal.request_resync()
+
+    def _node_state_event_fields(self) -> Dict[str, Any]:
+        return self._node_state_journal.event_fields()
+
+    def _node_state_snapshot_fields(self) -> Dict[str, Any]:
+        return self._node_state_journal.snapshot_fields()
 
     def _update_node_state(self, node_id: str, **patch: Any) -> Dict[str, Any]:
-        with self._node_states_lock:
-            existing = self.node_states.get(node_id)
-            base = dict(existing) if isinstance(existing, dict) else {}
-            base.update(patch)
-            self.node_states[node_id] = base
-            return dict(base)
+        return self._node_state_journal.update(node_id, **patch)
 
     def _get_node_state(self, node_id: str) -> Optional[Dict[str, Any]]:
-        with self._node_states_lock:
-            existing = self.node_states.get(node_id)
-            return dict(existing) if isinstance(existing, dict) else None
+        return self._node_state_journal.get(node_id)
 
-    def _emit_node_state(self, event_type: str, node_id: str, profile_name: str, **extra: Any) -> None:
+    def _emit_with_node_states(self, event_type: str, *, snapshot: bool = False, **fields: Any) -> None:
         compat = compat_module()
-        compat.emit_event(
+        with self._node_state_journal.lock:
+            node_fields = self._node_state_snapshot_fields() if snapshot else self._node_state_event_fields()
+            compat.emit_event(event_type, **fields, **node_fields)
+
+    def _emit_node_state(self, event_type: str, node_id: str, profile_name: str, **extra: Any) -> None:
+        self._emit_with_node_states(
             event_type,
             workflow_id=self.workflow_id,
             node_id=node_id,
             profile=profile_name,
-            node_states=self._sanitize_node_states(),
             **extra,
         )
 
@@ -144,9 +240,7 @@ class WorkflowRunner:
 
     def _execute_activity(
         self,
-        node_id: str,
-        activity_id: str,
-        cfg: Dict[str, Any],
+        node: PlanNode,
         browser_state: Dict[str, Any],
         account,
         profile_data: Optional[Dict[str, Any]],
@@ -154,9 +248,7 @@ class WorkflowRunner:
     ) -> str:
         return execute_activity_impl(
             self,
-            node_id,
-            activity_id,
-            cfg,
+            node,
             browser_state,
             account,
             profile_data,
@@ -181,18 +273,41 @@ def _max_workers(compat, options: Dict[str, Any], accounts: List[Any], has_scrap
 
 def run_workflow_session(runner: WorkflowRunner) -> int:
     compat = compat_module()
-    compat.emit_event('session_started', total_accounts=len(runner.accounts), workflow_id=runner.workflow_id)
+    runner._emit_with_node_states(
+        'session_started',
+        snapshot=True,
+        total_accounts=len(runner.accounts),
+        workflow_id=runner.workflow_id,
+    )
+    for warning in runner.plan.warnings:
+        compat.log(f'Warning: workflow {warning}')
     if not runner.accounts:
         compat.log('Нет профилей для запуска.')
         compat.emit_event('session_ended', status='failed', workflow_id=runner.workflow_id)
         return 2
+    _start_display_pool(runner)
     had_failures = _run_accounts(runner)
     _shutdown_runner_resources(runner)
     status, exit_code = _session_outcome(runner, had_failures)
-    compat.emit_event('session_ended', status=status, workflow_id=runner.workflow_id)
+    runner._emit_with_node_states(
+        'session_ended',
+        snapshot=True,
+        status=status,
+        workflow_id=runner.workflow_id,
+    )
     return exit_code
 
 
+def _start_display_pool(runner: WorkflowRunner) -> None:
+    # A single profile gains nothing from displays started ahead of it
+    if len(runner.accounts) < 2:
+        return
+    try:
+        runner.display_mgr.start_pool()
+    except Exception as exc:
+        compat_module().log(f'Display pool unavailable: {exc}')
+
+
 def _run_accounts(runner: WorkflowRunner) -> bool:
     if runner._has_scrape_relationships:
         return _run_scrape_queue(runner)
@@ -274,6 +389,18 @@ def _shutdown_runner_resources(runner: WorkflowRunner) -> None:
         runner._executor.shutdown(wait=True)
     except Exception:
         pass
+    try:
+        runner.scraping_ledger.close()
+    except Exception:
+        pass
+    try:
+        runner.outbox.close()
+    except Exception:
+        pass
+    try:
+        runner.profile_leases.close()
+    except Exception:
+        pass
     try:
         runner.display_mgr.cleanup_all()
     except Exception:
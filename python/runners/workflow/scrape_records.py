@@ -0,0 +1,70 @@
+"""
+Compact records for scraped relationship users.
+
+The chunk script projects every friendship user down to ``fields`` inside the
+page and returns plain arrays, so only those values cross Playwright IPC. On
+the Python side a row stays a tuple in field order; it is expanded back into a
+dict only when an artifact chunk is written.
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_RELATIONSHIP_FIELDS: Tuple[str, ...] = ('pk', 'username', 'full_name')
+FULL_RECORD_FIELDS = frozenset({'*', 'all'})
+KEY_FIELDS = ('id', 'pk', 'username', 'userName', 'user_name', 'login')
+
+
+def parse_relationship_fields(value: Any, full_records: Any = False) -> Optional[Tuple[str, ...]]:
+    """Field projection for a scrape node config, or ``None`` for full records."""
+    if full_records is True or str(full_records).strip().lower() in {'1', 'true', 'yes'}:
+        return None
+    if isinstance(value, str):
+        if value.strip().lower() in FULL_RECORD_FIELDS:
+            return None
+        value = value.split(',')
+    if not isinstance(value, (list, tuple)):
+        return DEFAULT_RELATIONSHIP_FIELDS
+    fields: List[str] = []
+    for item in value:
+        cleaned = str(item or '').strip()
+        if cleaned and cleaned not in fields:
+            fields.append(cleaned)
+    return tuple(fields) or DEFAULT_RELATIONSHIP_FIELDS
+
+
+class RecordProjection:
+    __slots__ = ('fields', '_key_indexes', '_username_index')
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        self._key_indexes = tuple(self.fields.index(name) for name in KEY_FIELDS if name in self.fields)
+        self._username_index = self.fields.index('username') if 'username' in self.fields else None
+
+    def record(self, value: Any, source_fields: Optional[Sequence[str]] = None) -> Tuple[Any, ...]:
+        """Coerce a page row, replayed row or legacy dict into this projection's tuple layout."""
+        if isinstance(value, (list, tuple)):
+            if source_fields is None or tuple(source_fields) == self.fields:
+                return tuple(value)
+            value = dict(zip(source_fields, value))
+        if isinstance(value, dict):
+            return tuple(value.get(name) for name in self.fields)
+        row: List[Any] = [None] * len(self.fields)
+        if self._username_index is not None:
+            row[self._username_index] = value
+        return tuple(row)
+
+    def records(self, values: List[Any], source_fields: Optional[Sequence[str]] = None) -> List[Tuple[Any, ...]]:
+        return [self.record(value, source_fields) for value in values]
+
+    def key(self, record: Tuple[Any, ...]) -> str:
+        for index in self._key_indexes:
+            value = record[index]
+            if value is None:
+                continue
+            cleaned = str(value).strip()
+            if cleaned:
+                return cleaned.lower()
+        return json.dumps(record, ensure_ascii=False, default=str)
+
+    def to_dict(self, record: Tuple[Any, ...]) -> Dict[str, Any]:
+        return dict(zip(self.fields, record))
@@ -1,14 +1,63 @@
 import logging
-import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
 
+from python.core import pacing
 from python.runners.workflow.compat import compat as compat_module
+from python.runners.workflow.scrape_records import RecordProjection, parse_relationship_fields
 from python.runners.workflow.scrape_script import RELATIONSHIP_CHUNK_SCRIPT
 
 logger = logging.getLogger(__name__)
 
-ARTIFACT_UPSERT_RETRY_DELAYS_SECONDS = (1, 2, 4)
-INTERRUPTIBLE_SLEEP_POLL_SECONDS = 0.1
+ARTIFACT_CHUNK_ROWS = 5000
+
+CLICK_RELATIONSHIP_LINK_SCRIPT = """
+({ selectors }) => {
+  for (const selector of selectors) {
+    const el = document.querySelector(selector)
+    if (el instanceof HTMLElement) {
+      el.click()
+      return selector
+    }
+  }
+  return null
+}
+"""
+
+RELATIONSHIP_UI_READY_SCRIPT = r"""
+({ targetUsername, kind }) => {
+  const normalizedPath = String(window.location.pathname || '')
+    .toLowerCase()
+    .replace(/\/+$/, '/')
+  if (normalizedPath.includes(`/${targetUsername}/${kind}/`)) {
+    return true
+  }
+  if (normalizedPath.endsWith(`/${kind}/`) || normalizedPath.includes(`/${kind}/`)) {
+    return true
+  }
+  return Boolean(document.querySelector('div[role="dialog"]'))
+}
+"""
+
+
+def relationship_link_selectors(normalized_target: str, kind: str) -> list[str]:
+    return [
+        f'a[href="/{normalized_target}/{kind}/"]',
+        f'a[href="/{normalized_target}/{kind}"]',
+        f'a[href$="/{kind}/"]',
+        f'a[href$="/{kind}"]',
+        f'a[href*="/{kind}/"]',
+        f'a[href*="/{kind}"]',
+    ]
+
+
+def relationship_link_locators(page: Any, kind: str) -> list[Tuple[str, Any]]:
+    label = 'Followers' if kind == 'followers' else 'Following'
+    return [
+        ('role link', page.get_by_role('link', name=label, exact=True).first),
+        ('header link', page.locator('header a', has_text=label).first),
+        ('header section link', page.locator('header section a', has_text=label).first),
+        ('text link', page.locator('a', has_text=label).first),
+    ]
 
 
 def open_relationship_view(
@@ -35,29 +84,10 @@ def _click_relationship_link(page: Any, normalized_target: str, kind: str) -> Tu
 
 
 def _click_via_selector(page: Any, normalized_target: str, kind: str) -> Tuple[Optional[str], Optional[Exception]]:
-    selectors = [
-        f'a[href="/{normalized_target}/{kind}/"]',
-        f'a[href="/{normalized_target}/{kind}"]',
-        f'a[href$="/{kind}/"]',
-        f'a[href$="/{kind}"]',
-        f'a[href*="/{kind}/"]',
-        f'a[href*="/{kind}"]',
-    ]
     try:
         clicked_selector = page.evaluate(
-            """
-            ({ selectors }) => {
-              for (const selector of selectors) {
-                const el = document.querySelector(selector)
-                if (el instanceof HTMLElement) {
-                  el.click()
-                  return selector
-                }
-              }
-              return null
-            }
-            """,
-            {'selectors': selectors},
+            CLICK_RELATIONSHIP_LINK_SCRIPT,
+            {'selectors': relationship_link_selectors(normalized_target, kind)},
         )
         return clicked_selector, None
     except Exception as exc:
@@ -65,14 +95,7 @@ def _click_via_selector(page: Any, normalized_target: str, kind: str) -> Tuple[O
 
 
 def _click_via_locators(page: Any, kind: str, click_error: Optional[Exception]) -> Tuple[Optional[str], Optional[Exception]]:
-    label = 'Followers' if kind == 'followers' else 'Following'
-    locators = [
-        ('role link', page.get_by_role('link', name=label, exact=True).first),
-        ('header link', page.locator('header a', has_text=label).first),
-        ('header section link', page.locator('header section a', has_text=label).first),
-        ('text link', page.locator('a', has_text=label).first),
-    ]
-    for description, locator in locators:
+    for description, locator in relationship_link_locators(page, kind):
         try:
             locator.click(timeout=2000)
             return description, None
@@ -106,20 +129,7 @@ def _wait_for_relationship_ui(
 ) -> Optional[Tuple[str, str]]:
     try:
         page.wait_for_function(
-            r"""
-            ({ targetUsername, kind }) => {
-              const normalizedPath = String(window.location.pathname || '')
-                .toLowerCase()
-                .replace(/\/+$/, '/')
-              if (normalizedPath.includes(`/${targetUsername}/${kind}/`)) {
-                return true
-              }
-              if (normalizedPath.endsWith(`/${kind}/`) || normalizedPath.includes(`/${kind}/`)) {
-                return true
-              }
-              return Boolean(document.querySelector('div[role="dialog"]'))
-            }
-            """,
+            RELATIONSHIP_UI_READY_SCRIPT,
             arg={'targetUsername': normalized_target, 'kind': kind},
             timeout=7000,
         )
@@ -141,6 +151,7 @@ def scrape_relationship_chunk(
     cursor: Optional[str],
     chunk_limit: int,
     max_pages: int,
+    fields: Optional[Sequence[str]] = None,
 ) -> Dict[str, Any]:
     return page.evaluate(
         RELATIONSHIP_CHUNK_SCRIPT,
@@ -150,6 +161,7 @@ def scrape_relationship_chunk(
             'cursor': cursor,
             'chunkLimit': chunk_limit,
             'maxPages': max_pages,
+            'fields': list(fields) if fields else None,
         },
     )
 
@@ -178,10 +190,16 @@ class ScrapeRelationshipsExecutor:
         self.max_attempts = max(1, min(20, self.compat._parse_int(cfg.get('maxAttempts'), 4)))
         self.retry_backoff_seconds = self.compat._parse_retry_backoff_seconds(cfg.get('retryBackoffSeconds'))
         self.open_delay_seconds = max(0.0, min(60.0, self.compat._parse_float(cfg.get('openDelaySeconds'), 2.0)))
+        self.fields = parse_relationship_fields(cfg.get('fields'), cfg.get('fullRecords'))
+        self.projection = RecordProjection(self.fields) if self.fields else None
         self.state: Dict[str, Any] = {}
         self.artifact_storage_id = ''
         self.resume_snapshot_path = ''
-        self.merged_users: list[Any] = []
+        self.resume_log = None
+        self.dedupe_index = self._create_dedupe_index([])
+        self.merged_users: list[Any] = self.dedupe_index.records
+        self.unsaved_users: list[Any] = []
+        self.chunk_refs: list[Dict[str, Any]] = []
         self.current_target_index = 0
         self.cursor: Optional[str] = None
         self.attempt = 0
@@ -200,7 +218,9 @@ class ScrapeRelationshipsExecutor:
         self._load_state()
         self._prepare_profile_record()
         self._emit_initial_state()
-        if self.compat._profile_remaining_daily_scraping_capacity(self.profile_record) == 0:
+        if self.current_target_index >= len(self.targets):
+            return self._complete_node()
+        if self.runner._remaining_daily_scraping_capacity(self.profile_name, self.profile_record) == 0:
             return self._fail_due_to_daily_limit()
 
         while self.runner.running and self.current_target_index < len(self.targets):
@@ -225,7 +245,9 @@ class ScrapeRelationshipsExecutor:
             self.state = {}
         stale_index = max(0, self.compat._parse_int(self.state.get('currentTargetIndex'), 0))
         should_reset = self.state.get('done') or str(self.state.get('status') or '').strip().lower() == 'completed'
-        if should_reset or stale_index >= len(self.targets):
+        # Every target scraped but no manifest stored: the resume log still holds the users to finalize
+        unfinished = stale_index >= len(self.targets) and bool(self.state.get('resumeSnapshotPath'))
+        if should_reset or (stale_index >= len(self.targets) and not unfinished):
             self._reset_stale_state(stale_index)
         self._hydrate_resume_state()
 
@@ -243,7 +265,10 @@ class ScrapeRelationshipsExecutor:
     def _hydrate_resume_state(self) -> None:
         self.artifact_storage_id = str(self.state.get('artifactStorageId') or '').strip()
         self.resume_snapshot_path = str(self.state.get('resumeSnapshotPath') or '').strip()
-        self.merged_users = self._load_merged_users()
+        users = self._load_merged_users()
+        source_fields = self.resume_log.state.get('fields') if self.resume_log is not None else None
+        self.dedupe_index = self._create_dedupe_index(self._adopt_records(users, source_fields))
+        self.merged_users = self.dedupe_index.records
         self.current_target_index = max(0, self.compat._parse_int(self.state.get('currentTargetIndex'), 0))
         self.cursor = str(self.state.get('cursor') or '').strip() or None
         self.attempt = max(0, self.compat._parse_int(self.state.get('attempt'), 0))
@@ -252,15 +277,56 @@ class ScrapeRelationshipsExecutor:
         self.target_scraped = max(0, self.compat._parse_int(self.state.get('targetScraped'), 0))
         failed_targets = self.state.get('failedTargets')
         self.failed_targets = failed_targets if isinstance(failed_targets, list) else []
+        self._apply_resume_log_state()
 
     def _load_merged_users(self) -> list[Any]:
+        # The dedupe index is rebuilt from these records in one linear pass on resume.
         if self.artifact_storage_id:
-            users = self.compat._load_users_from_storage(self.artifact_storage_id)
-        elif self.resume_snapshot_path:
-            users = self.compat._load_users_from_resume_snapshot(self.resume_snapshot_path)
-        else:
-            users = []
-        return self.compat._dedupe_scraped_users(users)
+            return self.compat._load_users_from_storage(self.artifact_storage_id)
+        if not self.resume_snapshot_path:
+            return []
+        self.resume_log = self.compat._open_resume_log(self.resume_snapshot_path)
+        if self.resume_log is not None:
+            return self.resume_log.replay()
+        return self.compat._load_users_from_resume_snapshot(self.resume_snapshot_path)
+
+    def _create_dedupe_index(self, users: list[Any]):
+        key = self.projection.key if self.projection is not None else None
+        return self.compat._create_scraped_users_index(users, key)
+
+    def _adopt_records(self, values: list[Any], source_fields: Optional[Sequence[str]]) -> list[Any]:
+        # Rows may come from the page, a resume log written with other fields, or a legacy dict snapshot.
+        if self.projection is not None:
+            return self.projection.records(values, source_fields)
+        if not source_fields:
+            return values
+        return [dict(zip(source_fields, value)) if isinstance(value, (list, tuple)) else value for value in values]
+
+    def _export_records(self, records: list[Any]) -> list[Any]:
+        if self.projection is None:
+            return records
+        return [self.projection.to_dict(record) for record in records]
+
+    def _apply_resume_log_state(self) -> None:
+        # The log header is committed together with the records it covers, so it wins over node state.
+        if self.resume_log is None:
+            return
+        state = self.resume_log.state
+        if state.get('kind') != self.kind or self.compat._normalize_string_list(state.get('targets')) != self.targets:
+            return
+        self.current_target_index = max(0, self.compat._parse_int(state.get('currentTargetIndex'), self.current_target_index))
+        self.cursor = str(state.get('cursor') or '').strip() or None
+        self.target_scraped = max(0, self.compat._parse_int(state.get('targetScraped'), self.target_scraped))
+        self.chunks_completed = max(0, self.compat._parse_int(state.get('chunksCompleted'), self.chunks_completed))
+        self.total_scraped = max(0, self.compat._parse_int(state.get('scraped'), self.total_scraped))
+        self.chunk_refs = self._restore_chunk_refs(state.get('chunkRefs'))
+
+    def _restore_chunk_refs(self, value: Any) -> list[Dict[str, Any]]:
+        # Uploaded chunks are prefixes of merged_users, so they stay valid as long as they fit inside it.
+        refs = [ref for ref in value if isinstance(ref, dict) and ref.get('storageId')] if isinstance(value, list) else []
+        if sum(self.compat._parse_int(ref.get('count'), 0) for ref in refs) > len(self.merged_users):
+            return []
+        return refs
 
     def _prepare_profile_record(self) -> None:
         profile_record = dict(self.profile_data) if isinstance(self.profile_data, dict) else {}
@@ -290,7 +356,7 @@ class ScrapeRelationshipsExecutor:
             artifactStorageId=self.artifact_storage_id or None,
             manifestStorageId=self.state.get('manifestStorageId'),
             resumeSnapshotPath=self.resume_snapshot_path or None,
-            updatedAt=int(time.time() * 1000),
+            updatedAt=int(pacing.now() * 1000),
         )
         self.compat.log(
             f'scrape_relationships: starting node {self.node_id} kind={self.kind} '
@@ -337,33 +403,17 @@ class ScrapeRelationshipsExecutor:
             lastErrorCode='daily_scraping_limit_reached',
             artifactStorageId=self.artifact_storage_id or None,
             resumeSnapshotPath=self.resume_snapshot_path or None,
-            updatedAt=int(time.time() * 1000),
+            updatedAt=int(pacing.now() * 1000),
         )
         self.compat.log(message)
         return 'failure'
 
     def _persist_resume_snapshot_if_needed(self) -> None:
-        if not self.merged_users or self.artifact_storage_id or self.resume_snapshot_path:
+        if not self.merged_users or self.artifact_storage_id:
             return
-        try:
-            self.resume_snapshot_path = self.compat._store_resume_snapshot(
-                self.compat._resume_snapshot_path(self.runner.workflow_id, self.node_id),
-                self.compat._build_scrape_export_payload(
-                    self.runner.workflow_id,
-                    self.node_id,
-                    self.profile_name,
-                    self.kind,
-                    self.targets,
-                    self.merged_users,
-                ),
-            )
-        except Exception as exc:
-            logger.exception(
-                'Failed to persist resume snapshot for workflow %s node %s: %s',
-                self.runner.workflow_id,
-                self.node_id,
-                exc,
-            )
+        if self.resume_log is not None and not self.unsaved_users:
+            return
+        self._store_resume_snapshot()
 
     def _current_target_username(self) -> Optional[str]:
         if 0 <= self.current_target_index < len(self.targets):
@@ -410,8 +460,8 @@ class ScrapeRelationshipsExecutor:
         if relationship_error is not None:
             error_code, error_message = relationship_error
             return self._build_error_chunk(error_code, error_message), 0
-        chunk_started_at = time.time()
-        remaining_capacity = self.compat._profile_remaining_daily_scraping_capacity(self.profile_record)
+        chunk_started_at = pacing.monotonic()
+        remaining_capacity = self.runner._remaining_daily_scraping_capacity(self.profile_name, self.profile_record)
         if remaining_capacity == 0:
             return {'outcome': 'daily_limit'}, 0
         effective_chunk_limit = max(1, min(self.chunk_limit, remaining_capacity)) if remaining_capacity is not None else self.chunk_limit
@@ -422,8 +472,9 @@ class ScrapeRelationshipsExecutor:
             cursor=self.cursor,
             chunk_limit=effective_chunk_limit,
             max_pages=self.max_pages_per_attempt,
+            fields=self.fields,
         )
-        elapsed_ms = int(round((time.time() - chunk_started_at) * 1000))
+        elapsed_ms = int(round((pacing.monotonic() - chunk_started_at) * 1000))
         return chunk, elapsed_ms
 
     def _build_error_chunk(self, error_code: str, error_message: str) -> Dict[str, Any]:
@@ -464,6 +515,7 @@ class ScrapeRelationshipsExecutor:
         error_code = str(chunk.get('errorCode') or '').strip() or None
         error_message = str(chunk.get('errorMessage') or '').strip() or None
         chunk_users = chunk.get('users') if isinstance(chunk.get('users'), list) else []
+        chunk_users = self._adopt_records(chunk_users, chunk.get('fields'))
         chunk_debug = chunk.get('debug') if isinstance(chunk.get('debug'), dict) else {}
         return outcome, error_code, error_message, chunk_users, chunk_debug
 
@@ -483,6 +535,7 @@ class ScrapeRelationshipsExecutor:
             message = f'{self.kind} list for @{target_username} returned zero users but profile metadata reported {expected_total}'
             return self._fail_target(target_username, 'fatal_error', 'unexpected_empty_result', message)
         self._record_success_progress(chunk_users, next_cursor, next_target_scraped)
+        self._upload_ready_chunks()
         self._log_success_chunk(target_username, chunk_users, chunk_debug, elapsed_ms, has_more, expected_total, next_target_scraped)
         self._update_after_success(target_username, has_more)
         if self.current_target_index >= len(self.targets):
@@ -498,12 +551,32 @@ class ScrapeRelationshipsExecutor:
             cached_profile = self.runner._get_cached_profile(self.profile_name)
             if isinstance(cached_profile, dict):
                 self.profile_record = dict(cached_profile)
-        self.merged_users = self.compat._dedupe_scraped_users(self.merged_users + chunk_users)
+        self.unsaved_users.extend(self.dedupe_index.extend(chunk_users))
         self.total_scraped += len(chunk_users)
         self.chunks_completed += 1
         self.cursor = next_cursor
         self.target_scraped = next_target_scraped
 
+    def _upload_ready_chunks(self, *, final: bool = False) -> None:
+        uploaded = sum(int(ref['count']) for ref in self.chunk_refs)
+        while len(self.merged_users) - uploaded >= (1 if final else ARTIFACT_CHUNK_ROWS):
+            users = self.merged_users[uploaded:uploaded + ARTIFACT_CHUNK_ROWS]
+            try:
+                self.chunk_refs.append(self.compat._store_artifact_chunk(self._export_records(users)))
+            except Exception as exc:
+                if final:
+                    raise
+                # The pending rows stay in merged_users and are retried after the next chunk.
+                logger.warning(
+                    'Artifact chunk upload failed for workflow %s node %s at row %s: %s',
+                    self.runner.workflow_id,
+                    self.node_id,
+                    uploaded,
+                    exc,
+                )
+                return
+            uploaded += len(users)
+
     def _log_success_chunk(
         self,
         target_username: str,
@@ -547,7 +620,7 @@ class ScrapeRelationshipsExecutor:
             lastError=None,
             lastErrorCode=None,
             artifactStorageId=self.artifact_storage_id or None,
-            updatedAt=int(time.time() * 1000),
+            updatedAt=int(pacing.now() * 1000),
             resumeSnapshotPath=self.resume_snapshot_path or None,
         )
         self.runner._emit_node_state(
@@ -568,17 +641,11 @@ class ScrapeRelationshipsExecutor:
     def _store_resume_snapshot(self) -> None:
         self.artifact_storage_id = ''
         try:
-            self.resume_snapshot_path = self.compat._store_resume_snapshot(
-                self.compat._resume_snapshot_path(self.runner.workflow_id, self.node_id),
-                self.compat._build_scrape_export_payload(
-                    self.runner.workflow_id,
-                    self.node_id,
-                    self.profile_name,
-                    self.kind,
-                    self.targets,
-                    self.merged_users,
-                ),
-            )
+            if self.resume_log is None:
+                self._start_resume_log()
+            self.resume_log.append(self.unsaved_users, **self._resume_log_state())
+            self.unsaved_users = []
+            self.resume_snapshot_path = str(self.resume_log.path)
         except Exception as exc:
             logger.exception(
                 'Failed to store resume snapshot for workflow %s node %s profile %s kind %s: %s',
@@ -589,6 +656,30 @@ class ScrapeRelationshipsExecutor:
                 exc,
             )
 
+    def _start_resume_log(self) -> None:
+        # A fresh log (or one migrated from a legacy JSON snapshot / stored artifact) starts with every merged user.
+        path = self.compat._resume_snapshot_path(self.runner.workflow_id, self.node_id)
+        if self.resume_snapshot_path and self.resume_snapshot_path != path:
+            self.compat._delete_resume_snapshot(self.resume_snapshot_path)
+        self.resume_log = self.compat._create_resume_log(path, **self._resume_log_state())
+        self.unsaved_users = list(self.merged_users)
+
+    def _resume_log_state(self) -> Dict[str, Any]:
+        return {
+            'workflowId': self.runner.workflow_id,
+            'nodeId': self.node_id,
+            'profileName': self.profile_name,
+            'kind': self.kind,
+            'targets': self.targets,
+            'currentTargetIndex': self.current_target_index,
+            'cursor': self.cursor,
+            'targetScraped': self.target_scraped,
+            'chunksCompleted': self.chunks_completed,
+            'scraped': self.total_scraped,
+            'chunkRefs': self.chunk_refs,
+            'fields': list(self.fields) if self.fields else None,
+        }
+
     def _complete_target(self, target_username: str) -> None:
         self.current_target_index += 1
         self.cursor = None
@@ -596,11 +687,8 @@ class ScrapeRelationshipsExecutor:
         self.target_scraped = 0
         self.active_target_username = None
         self.relationship_view_ready = False
-        if self.current_target_index < len(self.targets):
-            self._store_resume_snapshot()
-        else:
-            self.compat._delete_resume_snapshot(self.resume_snapshot_path)
-            self.resume_snapshot_path = ''
+        # The log outlives the last target too: _complete_node drops it once the manifest is stored
+        self._store_resume_snapshot()
         self.compat.log(
             f'scrape_relationships @{target_username}: target completed '
             f'(totalScraped={self.total_scraped}, deduped={len(self.merged_users)})'
@@ -608,17 +696,20 @@ class ScrapeRelationshipsExecutor:
 
     def _complete_node(self) -> str:
         try:
-            artifact_payload = self.compat._build_scrape_export_payload(
+            self._upload_ready_chunks(final=True)
+            manifest_payload = self.compat._build_scrape_manifest_payload(
                 self.runner.workflow_id,
                 self.node_id,
                 self.profile_name,
                 self.kind,
                 self.targets,
-                self.merged_users,
+                self.chunk_refs,
+                len(self.merged_users),
             )
-            self.artifact_storage_id = self.compat._store_artifact_payload(artifact_payload)
+            self.artifact_storage_id = self.compat._store_artifact_payload(manifest_payload)
         except Exception as exc:
             return self._fail_node_completion('artifact_storage_failed', f'Failed to store scrape artifact: {exc}')
+        self._drop_resume_log()
         artifact_payload = {
             'workflowId': self.runner.workflow_id,
             'workflowName': self.runner.workflow_name,
@@ -629,9 +720,9 @@ class ScrapeRelationshipsExecutor:
             'targetUsername': '\n'.join(self.targets),
             'status': 'completed',
             'sourceProfileName': self.profile_name,
-            'lastRunAt': int(time.time() * 1000),
+            'lastRunAt': int(pacing.now() * 1000),
             'storageId': self.artifact_storage_id,
-            'exportStorageId': self.artifact_storage_id,
+            'manifestStorageId': self.artifact_storage_id,
             'stats': {
                 'scraped': self.total_scraped,
                 'deduped': len(self.merged_users),
@@ -655,13 +746,13 @@ class ScrapeRelationshipsExecutor:
             targetScraped=0,
             completedTargets=self.current_target_index,
             artifactStorageId=self.artifact_storage_id,
-            manifestStorageId=None,
+            manifestStorageId=self.artifact_storage_id,
             artifactId=(artifact_row or {}).get('_id'),
-            artifactUpsertFailedAt=int(time.time() * 1000) if artifact_row is None else None,
+            artifactUpsertFailedAt=int(pacing.now() * 1000) if artifact_row is None else None,
             artifactUpsertError=artifact_upsert_error,
             artifactUpsertPayload=artifact_upsert_context if artifact_row is None else None,
             resumeSnapshotPath=None,
-            updatedAt=int(time.time() * 1000),
+            updatedAt=int(pacing.now() * 1000),
         )
         self.compat.log(
             f'scrape_relationships: node {self.node_id} completed '
@@ -669,6 +760,12 @@ class ScrapeRelationshipsExecutor:
         )
         return 'success'
 
+    def _drop_resume_log(self) -> None:
+        self.compat._delete_resume_snapshot(self.resume_snapshot_path)
+        self.resume_snapshot_path = ''
+        self.resume_log = None
+        self.unsaved_users = []
+
     def _fail_node_completion(self, error_code: str, error_message: str) -> str:
         self.artifact_storage_id = ''
         logger.exception(
@@ -702,7 +799,7 @@ class ScrapeRelationshipsExecutor:
             artifactUpsertError=None,
             artifactUpsertPayload=None,
             resumeSnapshotPath=self.resume_snapshot_path or None,
-            updatedAt=int(time.time() * 1000),
+            updatedAt=int(pacing.now() * 1000),
         )
         self.compat.log(
             f'scrape_relationships: node {self.node_id} failed during completion '
@@ -719,47 +816,23 @@ class ScrapeRelationshipsExecutor:
             'nodeId': payload.get('nodeId'),
             'activityId': (payload.get('metadata') or {}).get('activityId'),
         }
-        attempts = len(ARTIFACT_UPSERT_RETRY_DELAYS_SECONDS) + 1
-        last_error: Optional[str] = None
-        for attempt_index in range(attempts):
-            try:
-                artifact_row = self.compat._convex_post_json('/api/workflow-artifacts/upsert', payload)
-                if attempt_index:
-                    self.compat.log(
-                        f'scrape_relationships: artifact upsert recovered for node {self.node_id} '
-                        f'on attempt {attempt_index + 1}/{attempts}'
-                    )
-                return artifact_row, None
-            except Exception as exc:
-                last_error = str(exc)
-                logger.exception(
-                    'scrape_relationships artifact upsert failed '
-                    '(attempt %s/%s, payload=%s)',
-                    attempt_index + 1,
-                    attempts,
-                    log_payload,
-                )
-                self.compat.log(
-                    f'scrape_relationships: artifact upsert failed for node {self.node_id} '
-                    f'attempt {attempt_index + 1}/{attempts} '
-                    f'(workflowId={log_payload["workflowId"]}, nodeId={log_payload["nodeId"]}, '
-                    f'activityId={log_payload["activityId"]}): {exc}'
-                )
-                if attempt_index >= attempts - 1:
-                    break
-                delay_seconds = ARTIFACT_UPSERT_RETRY_DELAYS_SECONDS[attempt_index]
-                self.compat.log(
-                    f'scrape_relationships: retrying artifact upsert for node {self.node_id} '
-                    f'in {delay_seconds}s'
-                )
-                time.sleep(delay_seconds)
+        try:
+            return self.compat._convex_post_json('/api/workflow-artifacts/upsert', payload), None
+        except Exception as exc:
+            logger.exception('scrape_relationships artifact upsert failed (payload=%s)', log_payload)
+            error = str(exc)
+        try:
+            self.runner._enqueue_artifact_upsert(payload)
+        except Exception as exc:
+            logger.exception('scrape_relationships artifact upsert could not be queued (payload=%s)', log_payload)
+            error = f'{error}; outbox: {exc}'
         self.compat.log(
-            f'scrape_relationships: artifact upsert exhausted retries for node {self.node_id}; '
-            f'continuing with local artifact storage only '
+            f'scrape_relationships: artifact upsert failed for node {self.node_id}; '
+            f'queued for background retry '
             f'(workflowId={log_payload["workflowId"]}, nodeId={log_payload["nodeId"]}, '
-            f'activityId={log_payload["activityId"]})'
+            f'activityId={log_payload["activityId"]}): {error}'
         )
-        return None, last_error
+        return None, error
 
     def _maybe_schedule_retry(
         self,
@@ -794,7 +867,7 @@ class ScrapeRelationshipsExecutor:
             failedTargets=self.failed_targets,
             lastError=error_message,
             lastErrorCode=error_code,
-            updatedAt=int(time.time() * 1000),
+            updatedAt=int(pacing.now() * 1000),
             resumeSnapshotPath=self.resume_snapshot_path or None,
         )
         self.runner._emit_node_state(
@@ -808,13 +881,7 @@ class ScrapeRelationshipsExecutor:
             retryInSeconds=delay_seconds,
             attempt=self.attempt,
         )
-        deadline = time.time() + delay_seconds
-        while self.runner.running:
-            remaining_seconds = deadline - time.time()
-            if remaining_seconds <= 0:
-                return True
-            time.sleep(min(INTERRUPTIBLE_SLEEP_POLL_SECONDS, remaining_seconds))
-        return False
+        return pacing.sleep(delay_seconds, self.runner.cancel_token) and self.runner.running
 
     def _fail_target(
         self,
@@ -850,7 +917,7 @@ class ScrapeRelationshipsExecutor:
             lastErrorCode=error_code,
             artifactStorageId=self.artifact_storage_id or None,
             resumeSnapshotPath=self.resume_snapshot_path or None,
-            updatedAt=int(time.time() * 1000),
+            updatedAt=int(pacing.now() * 1000),
         )
         self.compat.log(
             f"Ошибка scrape_relationships @{target_username}: "
@@ -875,4 +942,7 @@ def execute_scrape_relationships(
         profile_name,
         profile_data,
     )
-    return executor.run()
+    try:
+        return executor.run()
+    finally:
+        runner._flush_daily_scraping_usage()
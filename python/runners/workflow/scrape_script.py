@@ -1,8 +1,10 @@
 RELATIONSHIP_CHUNK_SCRIPT = """
-async ({ targetUsername, kind, cursor, chunkLimit, maxPages }) => {
+async ({ targetUsername, kind, cursor, chunkLimit, maxPages, fields }) => {
   const APP_ID = '936619743392459'
   const ASBD_ID = '129477'
   const batchSize = Math.max(1, Math.min(200, Number(chunkLimit) || 25))
+  const projectedFields = Array.isArray(fields) && fields.length ? fields.map(String) : null
+  const project = (entry) => projectedFields.map((field) => entry?.[field] ?? null)
   const csrfToken = document.cookie
     .split('; ')
     .find((part) => part.startsWith('csrftoken='))
@@ -179,7 +181,7 @@ async ({ targetUsername, kind, cursor, chunkLimit, maxPages }) => {
           ? payload.profiles
           : []
 
-      users.push(...chunkUsers)
+      users.push(...(projectedFields ? chunkUsers.map(project) : chunkUsers))
       const rawNextMaxId = payload?.next_max_id
       nextCursor =
         rawNextMaxId === null || rawNextMaxId === undefined
@@ -197,6 +199,7 @@ async ({ targetUsername, kind, cursor, chunkLimit, maxPages }) => {
     return {
       outcome: 'success',
       users,
+      fields: projectedFields,
       nextCursor,
       hasMore,
       total,
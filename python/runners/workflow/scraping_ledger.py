@@ -0,0 +1,163 @@
+"""
+Write-behind ledger for profile daily scraping capacity.
+
+Each profile's remaining budget is reserved from its profile record the first
+time a scrape node asks for it, and every scraped chunk is then counted
+locally. The accumulated delta is pushed to Convex by a background flusher,
+at node completion/failure and at shutdown. Unflushed deltas are kept in a
+small per-process JSON file so a later run can replay them after a crash.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from python.browser.display import _pid_alive
+from python.core.storage.atomic import atomic_write_json
+from python.runners.workflow.parsing import _profile_remaining_daily_scraping_capacity
+
+logger = logging.getLogger(__name__)
+
+LEDGER_FLUSH_INTERVAL_SECONDS = 30
+
+
+class ScrapingCapacityLedger:
+    def __init__(
+        self,
+        profiles_client,
+        directory: Union[str, Path],
+        *,
+        flush_interval: float = LEDGER_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self.profiles_client = profiles_client
+        self.directory = Path(directory)
+        self.path = self.directory / f'ledger-{os.getpid()}-{id(self):x}.json'
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._budgets: Dict[str, Optional[int]] = {}
+        self._used: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._flusher: Optional[_LedgerFlusher] = None
+
+    def reserve(self, profile_name: str, profile: Optional[Dict[str, Any]]) -> Optional[int]:
+        """Fix the run's budget from ``profile`` on first use and return what is left of it."""
+        with self._lock:
+            if profile_name not in self._budgets:
+                self._budgets[profile_name] = _profile_remaining_daily_scraping_capacity(profile)
+                self._used.setdefault(profile_name, 0)
+        return self.remaining(profile_name)
+
+    def remaining(self, profile_name: str) -> Optional[int]:
+        with self._lock:
+            budget = self._budgets.get(profile_name)
+            if budget is None:
+                return None
+            return max(0, budget - self._used.get(profile_name, 0))
+
+    def record(self, profile_name: str, amount: int) -> None:
+        if amount <= 0:
+            return
+        with self._lock:
+            self._used[profile_name] = self._used.get(profile_name, 0) + amount
+            self._pending[profile_name] = self._pending.get(profile_name, 0) + amount
+            self._persist_locked()
+        self._ensure_flusher()
+
+    def pending(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self) -> bool:
+        """Push every pending delta to Convex; returns ``False`` if any profile is still pending."""
+        with self._flush_lock:
+            ok = True
+            for profile_name, amount in self.pending().items():
+                try:
+                    self.profiles_client.increment_daily_scraping_used(profile_name, amount)
+                except Exception as exc:
+                    ok = False
+                    logger.warning('Daily scraping usage flush failed for %s (+%s): %s', profile_name, amount, exc)
+                    continue
+                with self._lock:
+                    left = self._pending.get(profile_name, 0) - amount
+                    if left > 0:
+                        self._pending[profile_name] = left
+                    else:
+                        self._pending.pop(profile_name, None)
+                    self._persist_locked()
+            return ok
+
+    def replay(self) -> int:
+        """Adopt deltas left by runs whose process is gone, then flush them."""
+        adopted = 0
+        for entry in sorted(self.directory.glob('ledger-*.json')) if self.directory.is_dir() else []:
+            if entry == self.path or _owner_alive(entry):
+                continue
+            claimed = entry.with_name(f'{entry.name}.replay-{os.getpid()}')
+            try:
+                os.replace(entry, claimed)
+                payload = json.loads(claimed.read_text(encoding='utf-8'))
+            except FileNotFoundError:
+                continue
+            except Exception as exc:
+                logger.warning('Skipping unreadable scraping ledger %s: %s', entry, exc)
+                continue
+            pending = payload.get('pending') if isinstance(payload, dict) else None
+            with self._lock:
+                for profile_name, amount in (pending or {}).items():
+                    if isinstance(amount, int) and amount > 0:
+                        self._pending[profile_name] = self._pending.get(profile_name, 0) + amount
+                        adopted += amount
+                self._persist_locked()
+            claimed.unlink(missing_ok=True)
+        if adopted:
+            self.flush()
+        return adopted
+
+    def close(self) -> None:
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.stop()
+        self.flush()
+
+    def _ensure_flusher(self) -> None:
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = _LedgerFlusher(self)
+        self._flusher.start()
+
+    def _persist_locked(self) -> None:
+        try:
+            if self._pending:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                atomic_write_json(self.path, {'pid': os.getpid(), 'pending': self._pending})
+            else:
+                self.path.unlink(missing_ok=True)
+        except Exception as exc:
+            logger.warning('Failed to persist scraping ledger %s: %s', self.path, exc)
+
+
+class _LedgerFlusher(threading.Thread):
+    def __init__(self, ledger: ScrapingCapacityLedger) -> None:
+        super().__init__(name='scraping-ledger-flush', daemon=True)
+        self.ledger = ledger
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.ledger.flush_interval):
+            self.ledger.flush()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def _owner_alive(path: Path) -> bool:
+    try:
+        pid = int(path.name.split('-')[1])
+    except (IndexError, ValueError):
+        return False
+    return _pid_alive(pid)
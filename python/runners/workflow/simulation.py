@@ -0,0 +1,734 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from python.core import pacing
+from python.core.models import ThreadsAccount
+from python.database.accounts import InstagramAccountsClient
+from python.database.messages import MessageTemplatesClient
+from python.database.profiles import ProfilesClient
+from python.runners.workflow import io as workflow_io
+from python.runners.workflow.compat import compat as compat_module
+from python.runners.workflow.plan import WorkflowPlanError
+from python.runners.workflow.scrape_script import RELATIONSHIP_CHUNK_SCRIPT
+
+SIMULATED_PROJECT_URL = 'http://convex.simulated'
+MESSAGE_TEMPLATES = ('Hi!', 'Hello there', 'Hey, how are you?')
+RouteHandler = Callable[['SimulatedWorld', Dict[str, Any], Any], Any]
+CPU_CATEGORIES = ('dispatch', 'state_updates', 'event_emission', 'convex_calls', 'logging', 'simulated_io')
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationSettings:
+    accounts: int = 50
+    seed: int = 0
+    parallel_profiles: Optional[int] = None
+    accounts_per_profile: int = 20
+    followers_per_target: int = 600
+    convex_latency_range: tuple[float, float] = (0.05, 0.2)
+    browser_startup_range: tuple[float, float] = (4.0, 8.0)
+    show_events: bool = False
+
+
+class VirtualClock:
+    """Clock where every thread advances its own virtual timeline on sleep.
+
+    Workers run concurrently in the real runner, so the simulated duration of
+    the run is the longest timeline, not the sum of all sleeps.
+    """
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        self._start = time.time() if start is None else float(start)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._elapsed_max = 0.0
+        self._slept_total = 0.0
+
+    def _elapsed(self) -> float:
+        return getattr(self._local, 'elapsed', 0.0)
+
+    def time(self) -> float:
+        return self._start + self._elapsed()
+
+    def monotonic(self) -> float:
+        return self._elapsed()
+
+    def sleep(self, seconds: float, token: Optional[pacing.CancellationToken] = None) -> bool:
+        if token is not None and token.cancelled:
+            return False
+        if seconds > 0:
+            elapsed = self._elapsed() + float(seconds)
+            self._local.elapsed = elapsed
+            with self._lock:
+                self._elapsed_max = max(self._elapsed_max, elapsed)
+                self._slept_total += float(seconds)
+        time.sleep(0)
+        return True
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed_max
+
+    @property
+    def slept_total(self) -> float:
+        return self._slept_total
+
+
+class CpuProfiler:
+    """Accumulates exclusive per-thread CPU time by category."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def measure(self, category: str) -> Iterator[None]:
+        stack = self._local.__dict__.setdefault('stack', [])
+        frame = [time.thread_time(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            total = time.thread_time() - frame[0]
+            if stack:
+                stack[-1][1] += total
+            with self._lock:
+                self.seconds[category] += total - frame[1]
+                self.calls[category] += 1
+
+    def wrap(self, category: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def measured(*args: Any, **kwargs: Any) -> Any:
+            with self.measure(category):
+                return func(*args, **kwargs)
+
+        return measured
+
+    def breakdown(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                category: {
+                    'cpu_ms': round(self.seconds.get(category, 0.0) * 1000, 3),
+                    'calls': self.calls.get(category, 0),
+                }
+                for category in CPU_CATEGORIES
+            }
+
+
+class SimulatedWorld:
+    """Deterministic backend data shared by the stand-in clients and page."""
+
+    def __init__(self, settings: SimulationSettings) -> None:
+        self.settings = settings
+        rng = random.Random(settings.seed)
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self.accounts_by_profile: Dict[str, List[Dict[str, Any]]] = {}
+        for index in range(max(0, settings.accounts)):
+            name = f'sim_{index:03d}'
+            profile_id = f'sim_profile_{index:03d}'
+            self.profiles[name] = {
+                'name': name,
+                'profile_id': profile_id,
+                'proxy': None,
+                'status': 'idle',
+                'user_agent': f'Mozilla/5.0 (simulated {index})',
+                'fingerprint_seed': rng.randint(1, 2**31),
+                'fingerprint_os': rng.choice(['windows', 'macos', 'linux']),
+                'daily_scraping_limit': None,
+                'daily_scraping_used': 0,
+            }
+            self.accounts_by_profile[profile_id] = [
+                {
+                    'id': f'{profile_id}_acc_{offset:03d}',
+                    'user_name': f'{name}_target_{offset:03d}',
+                    'assigned_to': profile_id,
+                    'status': 'assigned',
+                    'message': True,
+                }
+                for offset in range(max(0, settings.accounts_per_profile))
+            ]
+        self.requests = 0
+        self.events = 0
+        self._lock = threading.Lock()
+        self._routes = self._default_routes()
+
+    def count_event(self) -> None:
+        with self._lock:
+            self.events += 1
+
+    def add_route(self, path_suffix: str, handler: RouteHandler) -> None:
+        """Answer requests whose path ends with ``path_suffix``; added routes win over the built-in ones."""
+        others = {suffix: route for suffix, route in self._routes.items() if suffix != path_suffix}
+        self._routes = {path_suffix: handler, **others}
+
+    def route(self, method: str, url: str, params: Optional[Dict[str, Any]], body: Any) -> Any:
+        with self._lock:
+            self.requests += 1
+        parts = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        query.update({key: value for key, value in (params or {}).items()})
+        for path_suffix, handler in self._routes.items():
+            if parts.path.endswith(path_suffix):
+                return handler(self, query, body)
+        return {'ok': True}
+
+    def _profile_by_id(self, query: Dict[str, Any], body: Any) -> Optional[Dict[str, Any]]:
+        profile_id = str(query.get('profileId') or '')
+        return next((p for p in self.profiles.values() if p['profile_id'] == profile_id), None)
+
+    def _versioned_templates(self, query: Dict[str, Any], body: Any) -> Dict[str, Any]:
+        if str(query.get('knownUpdatedAt') or '') == '1':
+            return {'updatedAt': 1}
+        return {'updatedAt': 1, 'texts': list(MESSAGE_TEMPLATES)}
+
+    def _default_routes(self) -> Dict[str, RouteHandler]:
+        accounts = lambda world, query, body: list(world.accounts_by_profile.get(str(query.get('profileId') or ''), []))
+        store_blob = lambda world, query, body: {'storageId': f'sim_storage_{world.requests}'}
+        return {
+            '/api/profiles/by-name': lambda world, query, body: world.profiles.get(str(query.get('name') or '')),
+            '/api/profiles/by-id': SimulatedWorld._profile_by_id,
+            '/api/instagram-accounts/for-profile': accounts,
+            '/api/instagram-accounts/to-message': accounts,
+            '/api/instagram-accounts/profiles-with-assigned': lambda world, query, body: list(world.profiles.values()),
+            '/api/message-templates/versioned': SimulatedWorld._versioned_templates,
+            '/api/message-templates': lambda world, query, body: list(MESSAGE_TEMPLATES),
+            '/api/workflow-artifacts/store-artifact': store_blob,
+            '/api/workflow-artifacts/store-chunk': store_blob,
+            '/api/workflow-artifacts/upsert': lambda world, query, body: {
+                '_id': f'sim_artifact_{world.requests}',
+                **(body if isinstance(body, dict) else {}),
+            },
+            '/api/workflow-artifacts/storage-url': lambda world, query, body: '',
+        }
+
+    def relationship_chunk(self, arg: Dict[str, Any]) -> Dict[str, Any]:
+        target = str(arg.get('targetUsername') or '').strip().lower()
+        kind = 'following' if arg.get('kind') == 'following' else 'followers'
+        batch_size = max(1, min(200, int(arg.get('chunkLimit') or 200)))
+        max_pages = max(1, int(arg.get('maxPages') or 1))
+        total = self.settings.followers_per_target
+        offset = int(arg.get('cursor') or 0)
+        users: List[Dict[str, Any]] = []
+        pages_fetched = 0
+        has_more = offset < total
+        while has_more and pages_fetched < max_pages:
+            end = min(total, offset + batch_size)
+            users.extend(_simulated_user(target, index) for index in range(offset, end))
+            offset = end
+            has_more = offset < total
+            pages_fetched += 1
+            pacing.sleep(random.uniform(0.3, 0.8))
+            if has_more and pages_fetched < max_pages:
+                pacing.sleep(random.uniform(3.0, 5.0))
+        next_cursor = str(offset) if has_more else None
+        return {
+            'outcome': 'success',
+            'users': users,
+            'nextCursor': next_cursor,
+            'hasMore': has_more,
+            'total': total,
+            'statusCode': 200,
+            'errorCode': None,
+            'errorMessage': None,
+            'debug': {
+                'stage': 'completed',
+                'targetUsername': target,
+                'endpoint': kind,
+                'pagesFetched': pages_fetched,
+                'batchSize': batch_size,
+                'totalUsers': len(users),
+            },
+        }
+
+
+def _simulated_user(target: str, index: int) -> Dict[str, Any]:
+    pk = str(10_000_000 + (zlib.crc32(target.encode('utf-8')) % 1_000_000) * 10_000 + index)
+    return {
+        'pk': pk,
+        'pk_id': pk,
+        'id': pk,
+        'username': f'{target}_follower_{index:05d}',
+        'full_name': f'Follower {index} of {target}',
+        'is_private': index % 3 == 0,
+        'is_verified': index % 97 == 0,
+        'profile_pic_url': f'https://cdn.simulated/{pk}.jpg',
+        'profile_pic_id': f'{pk}_pic',
+        'has_anonymous_profile_picture': index % 11 == 0,
+        'latest_reel_media': 0,
+        'third_party_downloads_enabled': 0,
+    }
+
+
+class SimulatedResponse:
+    def __init__(self, payload: Any) -> None:
+        self.status_code = 200
+        self.content = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.text = self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class SimulatedTransport:
+    """Stand-in for ``ResilientHttpClient`` that answers from the world."""
+
+    def __init__(self, world: SimulatedWorld) -> None:
+        self.world = world
+
+    def request(self, method: str, url: str, **kwargs: Any) -> SimulatedResponse:
+        body = kwargs.get('json')
+        if body is not None:
+            body = json.loads(json.dumps(body))
+        else:
+            body = kwargs.get('data')
+        latency_min, latency_max = self.world.settings.convex_latency_range
+        pacing.sleep(random.uniform(latency_min, latency_max))
+        return SimulatedResponse(self.world.route(method.upper(), url, kwargs.get('params'), body))
+
+    def get(self, url: str, **kwargs: Any) -> SimulatedResponse:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> SimulatedResponse:
+        return self.request('POST', url, **kwargs)
+
+    def patch(self, url: str, **kwargs: Any) -> SimulatedResponse:
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> SimulatedResponse:
+        return self.request('DELETE', url, **kwargs)
+
+
+class SimulatedLocator:
+    @property
+    def first(self) -> 'SimulatedLocator':
+        return self
+
+    def click(self, *args: Any, **kwargs: Any) -> None:
+        pacing.sleep(random.uniform(0.2, 0.6))
+
+
+class SimulatedPage:
+    """Minimal page object covering what the workflow runtime touches."""
+
+    def __init__(self, world: SimulatedWorld, profiler: CpuProfiler) -> None:
+        self.world = world
+        self.profiler = profiler
+        self.url = 'about:blank'
+        self.viewport_size = {'width': 1280, 'height': 720}
+
+    def goto(self, url: str, **kwargs: Any) -> None:
+        pacing.sleep(random.uniform(1.0, 3.0))
+        self.url = url
+
+    def wait_for_timeout(self, timeout_ms: float) -> None:
+        pacing.sleep(float(timeout_ms) / 1000.0)
+
+    def wait_for_function(self, *args: Any, **kwargs: Any) -> bool:
+        pacing.sleep(random.uniform(0.2, 1.0))
+        return True
+
+    def wait_for_load_state(self, *args: Any, **kwargs: Any) -> None:
+        pacing.sleep(random.uniform(0.2, 1.0))
+
+    def evaluate(self, script: str, arg: Any = None) -> Any:
+        if script != RELATIONSHIP_CHUNK_SCRIPT:
+            return None
+        with self.profiler.measure('simulated_io'):
+            result = self.world.relationship_chunk(arg if isinstance(arg, dict) else {})
+            payload = json.dumps(result)
+        # Playwright hands evaluate() results back as deserialized JSON.
+        return json.loads(payload)
+
+    def get_by_role(self, *args: Any, **kwargs: Any) -> SimulatedLocator:
+        return SimulatedLocator()
+
+    def locator(self, *args: Any, **kwargs: Any) -> SimulatedLocator:
+        return SimulatedLocator()
+
+    def close(self) -> None:
+        return None
+
+
+class SimulatedContext:
+    def close(self) -> None:
+        return None
+
+
+class SimulatedDisplayManager:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+    def allocate(self, workflow_id: str, profile_name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            display_num = 100 + len(self._sessions)
+            session = {'display': f':{display_num}', 'display_num': display_num, 'vnc_port': 6000 + display_num}
+            self._sessions[f'{workflow_id}:{profile_name}'] = session
+            return session
+
+    def release(self, workflow_id: str, profile_name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._sessions.pop(f'{workflow_id}:{profile_name}', None)
+
+    def start_pool(self) -> None:
+        return None
+
+    def cleanup_all(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+
+class SimulatedActions:
+    """Stand-ins for the Playwright-driven action modules.
+
+    They keep the real call signatures, sleep on the virtual clock instead of
+    driving a browser, and perform the same Convex writes as the real actions.
+    """
+
+    def __init__(self, world: SimulatedWorld, profiler: CpuProfiler, accounts_client_factory: Callable[[], Any]) -> None:
+        self.world = world
+        self.profiler = profiler
+        self._accounts_client = accounts_client_factory
+
+    def create_browser_context(self, profile_name: str, proxy_string: Any, user_agent: Any = None, **kwargs: Any):
+        world = self.world
+        profiler = self.profiler
+
+        @contextmanager
+        def _context():
+            startup_min, startup_max = world.settings.browser_startup_range
+            pacing.sleep(random.uniform(startup_min, startup_max))
+            yield SimulatedContext(), SimulatedPage(world, profiler)
+            pacing.sleep(random.uniform(0.5, 1.5))
+
+        return _context()
+
+    def prepare_fingerprint_config(self, profile_name: str, fingerprint_seed: Any, fingerprint_os: Any = None, **kwargs: Any) -> None:
+        pacing.sleep(random.uniform(0.01, 0.05))
+        return None
+
+    def scroll_feed(self, page: Any, duration: float, config: Dict[str, Any], should_stop=None) -> None:
+        self._scroll(
+            duration,
+            float(config.get('post_view_min_seconds') or 2.0),
+            float(config.get('post_view_max_seconds') or 5.0),
+            should_stop,
+        )
+
+    def scroll_reels(self, page: Any, duration: float, config: Dict[str, Any], should_stop=None) -> None:
+        self._scroll(
+            duration,
+            float(config.get('reels_normal_min_time') or 5.0),
+            float(config.get('reels_normal_max_time') or 20.0),
+            should_stop,
+        )
+
+    def _scroll(self, duration_minutes: float, view_min: float, view_max: float, should_stop) -> None:
+        deadline = pacing.monotonic() + float(duration_minutes) * 60.0
+        while pacing.monotonic() < deadline:
+            if should_stop and should_stop():
+                return
+            pacing.sleep(random.uniform(view_min, max(view_min, view_max)))
+
+    def watch_stories(self, page: Any, max_stories: int = 3, min_view_s: float = 2.0, max_view_s: float = 5.0, log=None) -> None:
+        for _ in range(max(0, int(max_stories))):
+            pacing.sleep(random.uniform(min_view_s, max(min_view_s, max_view_s)))
+
+    def follow_usernames(self, usernames: List[str], should_stop=None, delay_range=(10, 20), **kwargs: Any) -> None:
+        for _ in usernames:
+            if should_stop and should_stop():
+                return
+            pacing.sleep(random.uniform(3.0, 6.0))
+            pacing.sleep(random.uniform(*delay_range))
+
+    def unfollow_usernames(self, usernames: List[str], should_stop=None, delay_range=(10, 30), on_success=None, **kwargs: Any) -> None:
+        for username in usernames:
+            if should_stop and should_stop():
+                return
+            pacing.sleep(random.uniform(3.0, 6.0))
+            if on_success:
+                on_success(username)
+            pacing.sleep(random.uniform(*delay_range))
+
+    def approve_follow_requests(
+        self,
+        should_stop=None,
+        approve_delay_range=(1.0, 2.0),
+        finish_delay_seconds: float = 3.0,
+        **kwargs: Any,
+    ) -> None:
+        client = self._accounts_client()
+        for index in range(random.randint(0, 5)):
+            if should_stop and should_stop():
+                return
+            pacing.sleep(random.uniform(*approve_delay_range))
+            client.update_account_message(f'requester_{index:03d}', True)
+        pacing.sleep(float(finish_delay_seconds))
+
+    def send_messages(
+        self,
+        targets: List[Dict[str, Any]],
+        message_texts: List[str],
+        should_stop=None,
+        behavior_config: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        config = behavior_config or {}
+        client = self._accounts_client()
+        for target in targets:
+            if should_stop and should_stop():
+                return
+            text = random.choice(message_texts) if message_texts else ''
+            pacing.sleep(random.uniform(config.get('navigation_delay_min_seconds', 2.0), config.get('navigation_delay_max_seconds', 3.0)))
+            pacing.sleep(random.uniform(config.get('composer_delay_min_seconds', 1.0), config.get('composer_delay_max_seconds', 2.0)))
+            pacing.sleep(len(text) * random.uniform(config.get('typing_delay_min_ms', 100), config.get('typing_delay_max_ms', 200)) / 1000.0)
+            client.update_account_message(target.get('user_name'), True, int(pacing.now() * 1000))
+            pacing.sleep(random.uniform(config.get('between_targets_min_seconds', 3.0), config.get('between_targets_max_seconds', 5.0)))
+
+
+def build_simulated_accounts(world: SimulatedWorld) -> List[ThreadsAccount]:
+    return [ThreadsAccount(username=name, password='', proxy=None) for name in world.profiles]
+
+
+def _simulated_client(cls, transport: SimulatedTransport, profiler: CpuProfiler):
+    client = cls.__new__(cls)
+    client.project_url = SIMULATED_PROJECT_URL
+    client.base_url = f'{SIMULATED_PROJECT_URL}/api/{_CLIENT_PATHS[cls]}'
+    client.accounts_url = f'{SIMULATED_PROJECT_URL}/api/instagram-accounts'
+    client.profiles_url = f'{SIMULATED_PROJECT_URL}/api/profiles'
+    client.headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    client.http_client = transport
+    client.timeout = 20
+    for method_name in ('_request', '_make_request'):
+        method = getattr(client, method_name, None)
+        if method is not None:
+            setattr(client, method_name, profiler.wrap('convex_calls', method))
+    return client
+
+
+_CLIENT_PATHS = {
+    InstagramAccountsClient: 'instagram-accounts',
+    ProfilesClient: 'profiles',
+    MessageTemplatesClient: 'message-templates',
+}
+
+
+@contextmanager
+def _patched(target: Any, replacements: Dict[str, Any]) -> Iterator[None]:
+    missing = object()
+    previous = {name: getattr(target, name, missing) for name in replacements}
+    for name, value in replacements.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is missing:
+                delattr(target, name)
+            else:
+                setattr(target, name, value)
+
+
+@contextmanager
+def simulated_environment(
+    settings: SimulationSettings,
+    profiler: CpuProfiler,
+    routes: Optional[Dict[str, RouteHandler]] = None,
+) -> Iterator[SimulatedWorld]:
+    """Swap clock, RNG, clients, browser and actions for simulated stand-ins.
+
+    ``routes`` adds backend routes to the world, e.g. fakes a test needs.
+    """
+    compat = compat_module()
+    world = SimulatedWorld(settings)
+    for path_suffix, handler in (routes or {}).items():
+        world.add_route(path_suffix, handler)
+    transport = SimulatedTransport(world)
+    accounts_client = lambda: _simulated_client(InstagramAccountsClient, transport, profiler)
+    actions = SimulatedActions(world, profiler, accounts_client)
+
+    def _convex_post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with profiler.measure('convex_calls'):
+            data = transport.post(f'{SIMULATED_PROJECT_URL}{path}', json=payload).json()
+            if not isinstance(data, dict):
+                raise RuntimeError(f'Unexpected response shape for {path}')
+            return data
+
+    def _convex_post_bytes(path: str, data: bytes, content_type: str) -> Dict[str, Any]:
+        with profiler.measure('convex_calls'):
+            return transport.post(f'{SIMULATED_PROJECT_URL}{path}', data=data).json()
+
+    def _convex_get_json(path: str) -> Any:
+        with profiler.measure('convex_calls'):
+            return transport.get(f'{SIMULATED_PROJECT_URL}{path}').json()
+
+    resume_dir = tempfile.TemporaryDirectory(prefix='workflow_simulation_')
+    original_resume_path = compat._resume_snapshot_path
+
+    def _resume_snapshot_path(workflow_id: str, node_id: str) -> str:
+        return os.path.join(resume_dir.name, os.path.basename(original_resume_path(workflow_id, node_id)))
+
+    def _scraping_ledger_dir() -> str:
+        return os.path.join(resume_dir.name, 'scraping_ledger')
+
+    def _mutation_outbox_path() -> str:
+        return os.path.join(resume_dir.name, 'convex_outbox.sqlite3')
+
+    def _profile_lease_path() -> str:
+        return os.path.join(resume_dir.name, 'profile_leases.sqlite3')
+
+    real_emit_event = compat.emit_event
+
+    def _emit_event(event_type: str, **data: Any) -> None:
+        world.count_event()
+        real_emit_event(event_type, **data)
+
+    simulated_io = lambda func: profiler.wrap('simulated_io', func)
+    replacements = {
+        'InstagramAccountsClient': accounts_client,
+        'ProfilesClient': lambda: _simulated_client(ProfilesClient, transport, profiler),
+        'MessageTemplatesClient': lambda: _simulated_client(MessageTemplatesClient, transport, profiler),
+        'DisplayManager': SimulatedDisplayManager,
+        'create_browser_context': simulated_io(actions.create_browser_context),
+        'prepare_fingerprint_config': simulated_io(actions.prepare_fingerprint_config),
+        'scroll_feed': simulated_io(actions.scroll_feed),
+        'scroll_reels': simulated_io(actions.scroll_reels),
+        'watch_stories': simulated_io(actions.watch_stories),
+        'follow_usernames': simulated_io(actions.follow_usernames),
+        'unfollow_usernames': simulated_io(actions.unfollow_usernames),
+        'approve_follow_requests': simulated_io(actions.approve_follow_requests),
+        'send_messages': simulated_io(actions.send_messages),
+        '_convex_post_json': _convex_post_json,
+        '_convex_post_bytes': _convex_post_bytes,
+        '_convex_get_json': _convex_get_json,
+        '_resume_snapshot_path': _resume_snapshot_path,
+        '_scraping_ledger_dir': _scraping_ledger_dir,
+        '_mutation_outbox_path': _mutation_outbox_path,
+        '_profile_lease_path': _profile_lease_path,
+        'emit_event': profiler.wrap('event_emission', _emit_event),
+        'log': profiler.wrap('logging', compat.log),
+    }
+    rng_state = random.getstate()
+    random.seed(settings.seed)
+    try:
+        with pacing.use_clock(VirtualClock()), _patched(compat, replacements):
+            yield world
+    finally:
+        random.setstate(rng_state)
+        resume_dir.cleanup()
+
+
+def instrument_runner(runner: Any, profiler: CpuProfiler) -> None:
+    """Wrap the runner's hot paths so their CPU time lands in the report."""
+    runner._execute_activity = profiler.wrap('dispatch', runner._execute_activity)
+    runner._update_node_state = profiler.wrap('state_updates', runner._update_node_state)
+    runner._get_node_state = profiler.wrap('state_updates', runner._get_node_state)
+    runner._node_state_event_fields = profiler.wrap('event_emission', runner._node_state_event_fields)
+    runner._node_state_snapshot_fields = profiler.wrap('event_emission', runner._node_state_snapshot_fields)
+
+
+@contextmanager
+def _quiet_output(show_events: bool) -> Iterator[None]:
+    if show_events:
+        yield
+        return
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        previous_stream = workflow_io._log_stream_handler.setStream(sink)
+        try:
+            with redirect_stdout(sink):
+                yield
+        finally:
+            workflow_io._log_stream_handler.setStream(previous_stream or sys.stdout)
+
+
+def run_simulation(
+    workflow_id: str,
+    workflow: Dict[str, Any],
+    options: Dict[str, Any],
+    settings: SimulationSettings,
+    routes: Optional[Dict[str, RouteHandler]] = None,
+) -> tuple[int, Dict[str, Any]]:
+    """Run ``workflow`` against simulated accounts and return ``(exit_code, report)``."""
+    from python.runners.workflow.runtime import WorkflowRunner
+
+    compat = compat_module()
+    profiler = CpuProfiler()
+    nodes = workflow.get('nodes') if isinstance(workflow.get('nodes'), list) else []
+    edges = workflow.get('edges') if isinstance(workflow.get('edges'), list) else []
+    _, start_data = _start_data(compat, nodes)
+    runner_options = {
+        **compat._extract_start_browser_settings(nodes, start_data),
+        **options,
+        'workflow_name': workflow.get('name'),
+        'node_states': {},
+    }
+    if settings.parallel_profiles is not None:
+        runner_options['parallel_profiles'] = settings.parallel_profiles
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    with simulated_environment(settings, profiler, routes) as world, _quiet_output(settings.show_events):
+        clock = pacing.get_clock()
+        try:
+            runner = WorkflowRunner(workflow_id, nodes, edges, build_simulated_accounts(world), runner_options)
+        except WorkflowPlanError as exc:
+            compat.log(f'Ошибка workflow: {exc}')
+            return 2, {'error': str(exc)}
+        runner.seed_profile_cache(list(world.profiles.values()))
+        instrument_runner(runner, profiler)
+        exit_code = runner.run()
+        virtual_seconds = clock.elapsed
+        convex_requests = world.requests
+        events = world.events
+    cpu_seconds = time.process_time() - cpu_started
+    breakdown = profiler.breakdown()
+    attributed_ms = sum(entry['cpu_ms'] for entry in breakdown.values())
+    report = {
+        'accounts': settings.accounts,
+        'seed': settings.seed,
+        'parallel_profiles': runner._max_workers,
+        'exit_code': exit_code,
+        'virtual_seconds': round(virtual_seconds, 3),
+        'wall_seconds': round(time.perf_counter() - wall_started, 3),
+        'cpu_ms': round(cpu_seconds * 1000, 3),
+        'cpu_breakdown': {
+            **breakdown,
+            'other': {'cpu_ms': round(max(0.0, cpu_seconds * 1000 - attributed_ms), 3), 'calls': 0},
+        },
+        'convex_requests': convex_requests,
+        'events': events,
+    }
+    return exit_code, report
+
+
+def _start_data(compat, nodes: List[Dict[str, Any]]) -> tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    start_node = compat._find_start_node(nodes)
+    start_data = start_node.get('data') if start_node and isinstance(start_node.get('data'), dict) else {}
+    return start_node, start_data
+
+
+def log_simulation_report(compat, report: Dict[str, Any]) -> None:
+    compat.emit_event('simulation_report', **report)
+    compat.log(
+        f"simulation: {report.get('accounts')} accounts, exit={report.get('exit_code')}, "
+        f"virtual={report.get('virtual_seconds')}s wall={report.get('wall_seconds')}s "
+        f"cpu={report.get('cpu_ms')}ms convexRequests={report.get('convex_requests')}"
+    )
+    for category, entry in (report.get('cpu_breakdown') or {}).items():
+        compat.log(f"simulation: cpu {category}={entry.get('cpu_ms')}ms calls={entry.get('calls')}")
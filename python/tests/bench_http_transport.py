@@ -0,0 +1,87 @@
+"""
+Pooled vs unpooled HTTP latency against a local ``http.server`` stub.
+
+Not collected by pytest. Run from the repo root:
+
+    python -m python.tests.bench_http_transport [--calls 1000]
+
+The unpooled side calls ``requests.post`` (a fresh session and TCP connection
+per call, as the workflow helpers used to); the pooled side posts through
+``get_shared_session()``.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from python.database.session import get_shared_session
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; without this, keep-alive
+    # connections stall on delayed ACKs and the stub, not the client, is measured.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        body = json.dumps({'ok': True}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        return
+
+
+def _measure(post, url: str, calls: int):
+    latencies = []
+    for index in range(calls):
+        started = time.perf_counter()
+        response = post(url, json={'index': index}, timeout=10)
+        response.raise_for_status()
+        response.json()
+        latencies.append((time.perf_counter() - started) * 1000.0)
+    return latencies
+
+
+def _summary(label: str, latencies) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return (
+        f'{label:<9} total={sum(latencies):8.1f}ms  mean={statistics.mean(latencies):6.3f}ms  '
+        f'median={statistics.median(latencies):6.3f}ms  p95={p95:6.3f}ms'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=1000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/api/bench'
+    try:
+        unpooled = _measure(requests.post, url, args.calls)
+        pooled = _measure(get_shared_session().post, url, args.calls)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f'{args.calls} POSTs to {url}')
+    print(_summary('unpooled', unpooled))
+    print(_summary('pooled', pooled))
+    print(f'speedup   {statistics.mean(unpooled) / statistics.mean(pooled):.2f}x mean latency')
+
+
+if __name__ == '__main__':
+    main()
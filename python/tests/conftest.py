@@ -0,0 +1,11 @@
+import pytest
+
+from python.core.storage import state_store
+
+
+@pytest.fixture(autouse=True)
+def isolated_state_store(tmp_path, monkeypatch):
+    """Keep every test off the working tree's data/state.sqlite3 and its legacy JSON files."""
+    monkeypatch.setattr(state_store, "DEFAULT_STATE_PATH", tmp_path / "state" / "state.sqlite3")
+    monkeypatch.setattr(state_store, "_default_store", None)
+    yield
@@ -0,0 +1,81 @@
+import threading
+
+from python.browser.context_pool import BrowserContextPool, pool_key
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Launches:
+    def __init__(self):
+        self.started = 0
+        self.closed = 0
+
+    def factory(self):
+        launches = self
+
+        class _Manager:
+            def __enter__(self):
+                launches.started += 1
+                return object(), object()
+
+            def __exit__(self, *exc):
+                launches.closed += 1
+
+        return _Manager()
+
+
+def _key(profile, proxy=None):
+    return pool_key(profile, proxy, None, headless=True, fingerprint_seed='seed', fingerprint_os='windows', display=':100')
+
+
+def test_parked_browser_is_reused_for_matching_config_until_ttl():
+    clock = _Clock()
+    launches = _Launches()
+    pool = BrowserContextPool(idle_ttl=60, max_memory_mb=0, clock=clock, memory_probe=lambda name: 0.0)
+
+    first = pool.acquire(_key('p1'), launches.factory)
+    first.__exit__(None, None, None)
+    second = pool.acquire(_key('p1'), launches.factory)
+    assert second is first and second.reuses == 1
+
+    second.__exit__(None, None, None)
+    other = pool.acquire(_key('p1', proxy='http://proxy:1'), launches.factory)
+    assert other is not first
+    other.close()
+
+    clock.now = 61
+    third = pool.acquire(_key('p1'), launches.factory)
+    assert third is not first
+    assert launches.started == 3
+    assert launches.closed == 2
+    assert pool.stats()['hits'] == 1
+
+
+def test_memory_budget_evicts_least_recently_parked_and_other_threads_are_not_served():
+    clock = _Clock()
+    launches = _Launches()
+    pool = BrowserContextPool(idle_ttl=600, max_memory_mb=1000, clock=clock, memory_probe=lambda name: 400.0)
+
+    entries = [pool.acquire(_key(name), launches.factory) for name in ('a', 'b', 'c')]
+    for entry in entries:
+        clock.now += 1
+        entry.__exit__(None, None, None)
+
+    assert entries[0].closed and not entries[1].closed and not entries[2].closed
+    assert pool.stats()['evictions'] == 1
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(pool.acquire(_key('b'), launches.factory)))
+    worker.start()
+    worker.join()
+    assert seen[0] is not entries[1]
+
+    pool.close_idle()
+    assert entries[1].closed and entries[2].closed
+    assert pool.stats()['idle'] == 0
@@ -0,0 +1,18 @@
+from python.core.storage import dedupe_index
+
+
+def test_dedupe_index_only_returns_new_records():
+    index = dedupe_index.DedupeIndex(lambda user: str(user.get("id") or "").lower(), [{"id": "A"}, {"id": "b"}, {"id": "a"}])
+    assert index.records == [{"id": "A"}, {"id": "b"}]
+
+    added = index.extend([{"id": "B"}, {"id": "c"}, {"id": ""}, {"id": "c"}])
+    assert added == [{"id": "c"}]
+    assert len(index) == 3
+    assert {"id": "C"} in index
+
+
+def test_dedupe_index_verifies_full_key_on_hash_collision(monkeypatch):
+    monkeypatch.setattr(dedupe_index, "key_hash", lambda key: 7)
+    index = dedupe_index.DedupeIndex(str, [f"user{n}" for n in range(300)])
+    assert len(index) == 300
+    assert index.extend(["user5", "user300"]) == ["user300"]
@@ -0,0 +1,104 @@
+import time
+
+from python.browser import display as display_module
+from python.browser.display import DisplayManager
+from python.core.storage.state_store import StateStore
+
+
+class _Proc:
+    _next_pid = 40000
+
+    def __init__(self, cmd):
+        _Proc._next_pid += 1
+        self.pid = _Proc._next_pid
+        self.cmd = cmd
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = 0
+
+    def kill(self):
+        self.returncode = -9
+
+
+class _Manager(DisplayManager):
+    def __init__(self):
+        super().__init__()
+        self.spawned = []
+
+    def _spawn(self, cmd):
+        proc = _Proc(cmd)
+        self.spawned.append(proc)
+        return proc
+
+
+def _manager(monkeypatch, tmp_path, pool_size):
+    # Two slots, both taken by the pool, so no replacement can start behind a claim
+    monkeypatch.setenv("XVFB_DISPLAY_END", "101")
+    monkeypatch.setenv("DISPLAY_STATE_DIR", str(tmp_path))
+    monkeypatch.setenv("DISPLAY_MANAGER_ENABLED", "1")
+    monkeypatch.setenv("DISPLAY_POOL_SIZE", str(pool_size))
+    monkeypatch.setenv("NOVNC_ON_DEMAND", "0")
+    monkeypatch.setattr(display_module, "_wait_for_port", lambda port, timeout_s=12.0: True)
+    return _Manager()
+
+
+def _wait_idle(manager, count):
+    deadline = time.time() + 5
+    while manager.pool_stats()["idle"] < count and time.time() < deadline:
+        time.sleep(0.01)
+    return manager.pool_stats()["idle"]
+
+
+def _registry(tmp_path):
+    store = StateStore(tmp_path / "anti_display_manager.sqlite3")
+    with store.transaction() as conn:
+        return {entry["key"]: entry for entry in store.display_sessions(conn)}
+
+
+def test_allocate_claims_a_prestarted_display_and_release_returns_it(monkeypatch, tmp_path):
+    manager = _manager(monkeypatch, tmp_path, pool_size=2)
+    manager.start_pool()
+    assert _wait_idle(manager, 2) == 2
+    started = len(manager.spawned)
+
+    session = manager.allocate("wf", "p1")
+    assert session["display"] == ":100" and session["vnc_port"] == 6081
+    assert len(manager.spawned) == started
+    assert _registry(tmp_path)["wf:p1"]["status"] == "active"
+
+    manager.release("wf", "p1")
+    assert not any(proc.returncode is not None for proc in manager.spawned)
+    # The refill thread may be retrying for a free slot, so "starting" is not checked
+    stats = manager.pool_stats()
+    assert (stats["idle"], stats["active"]) == (2, 0)
+    assert "wf:p1" not in _registry(tmp_path)
+
+    manager.cleanup_all()
+    assert all(proc.returncode is not None for proc in manager.spawned)
+    assert _registry(tmp_path) == {}
+
+
+def test_display_with_dead_novnc_is_torn_down_on_release(monkeypatch, tmp_path):
+    manager = _manager(monkeypatch, tmp_path, pool_size=2)
+    manager.start_pool()
+    _wait_idle(manager, 2)
+    manager.allocate("wf", "p1")
+    runtime = manager._runtime_sessions["wf:p1"]
+    runtime["procs"]["novnc"].returncode = 1
+
+    manager.release("wf", "p1")
+    assert all(proc.returncode is not None for proc in runtime["procs"].values())
+    assert "wf:p1" not in _registry(tmp_path)
+    assert runtime not in manager._idle
+    manager.cleanup_all()
+
+
+def test_on_demand_websockify_listens_on_loopback_only(monkeypatch, tmp_path):
+    manager = _manager(monkeypatch, tmp_path, pool_size=0)
+    command = manager._novnc_command(5901, 40123, host="127.0.0.1")
+    assert "127.0.0.1:40123" in command
+    assert "40123" not in command
@@ -2,7 +2,13 @@ import unittest
 from unittest.mock import Mock, patch
 import time
 from requests.exceptions import ConnectionError, Timeout
-from python.core.errors.http_client import ResilientHttpClient, CircuitBreakerOpenError
+import threading
+from python.core.errors.http_client import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitBreakerRegistry,
+    ResilientHttpClient,
+)
 
 class TestResilientHttpClient(unittest.TestCase):
     def setUp(self):
@@ -10,8 +16,10 @@ class TestResilientHttpClient(unittest.TestCase):
             max_retries=2, 
             circuit_threshold=3, 
             circuit_timeout=1, # Short timeout for testing
-            backoff_factor=0.01 # Fast retries
+            backoff_factor=0.01, # Fast retries
+            breakers=CircuitBreakerRegistry(),
         )
+        self.breaker = self.client.circuit_breaker_for("http://example.com")
         # Mock the internal session
         self.client._session = Mock()
 
@@ -25,7 +33,7 @@ class TestResilientHttpClient(unittest.TestCase):
         
         self.assertEqual(response, mock_response)
         self.assertEqual(self.client._session.request.call_count, 1)
-        self.assertEqual(self.client.circuit_breaker.failure_count, 0)
+        self.assertEqual(self.breaker.failure_count, 0)
 
     def test_retry_on_failure(self):
         """Test that client retries on connection error."""
@@ -40,7 +48,7 @@ class TestResilientHttpClient(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(self.client._session.request.call_count, 3)
         # Circuit breaker should record success after the final successful attempt
-        self.assertEqual(self.client.circuit_breaker.failure_count, 0)
+        self.assertEqual(self.breaker.failure_count, 0)
 
     def test_circuit_breaker_trips(self):
         """Test that circuit breaker opens after threshold failures."""
@@ -50,17 +58,17 @@ class TestResilientHttpClient(unittest.TestCase):
         with self.assertRaises(ConnectionError):
             self.client.get("http://example.com")
         
-        self.assertEqual(self.client.circuit_breaker.failure_count, 1)
+        self.assertEqual(self.breaker.failure_count, 1)
 
         # 2. Fail again
         with self.assertRaises(ConnectionError):
             self.client.get("http://example.com")
-        self.assertEqual(self.client.circuit_breaker.failure_count, 2)
+        self.assertEqual(self.breaker.failure_count, 2)
 
         # 3. Fail again -> Threshold reached (3)
         with self.assertRaises(ConnectionError):
             self.client.get("http://example.com")
-        self.assertTrue(self.client.circuit_breaker.is_open)
+        self.assertTrue(self.breaker.is_open)
 
         # 4. Next call should raise CircuitBreakerOpenError immediately
         self.client._session.request.reset_mock()
@@ -73,8 +81,8 @@ class TestResilientHttpClient(unittest.TestCase):
     def test_circuit_breaker_recovery(self):
         """Test half-open state and recovery."""
         # Trip the breaker manually
-        self.client.circuit_breaker.is_open = True
-        self.client.circuit_breaker.last_failure_time = time.time() - 2 # Past the 1s timeout
+        self.breaker.is_open = True
+        self.breaker.last_failure_time = time.time() - 2 # Past the 1s timeout
 
         # Next request should be allowed (half-open)
         mock_response = Mock()
@@ -85,8 +93,67 @@ class TestResilientHttpClient(unittest.TestCase):
         response = self.client.get("http://example.com")
         
         self.assertEqual(response.status_code, 200)
-        self.assertFalse(self.client.circuit_breaker.is_open)
-        self.assertEqual(self.client.circuit_breaker.failure_count, 0)
+        self.assertFalse(self.breaker.is_open)
+        self.assertEqual(self.breaker.failure_count, 0)
+
+    def test_clients_share_breaker_per_route(self):
+        """Clients on the same registry see one breaker per host and route."""
+        other = ResilientHttpClient(circuit_threshold=3, breakers=self.client.breakers)
+        other._session = Mock()
+        self.breaker.is_open = True
+        self.breaker.last_failure_time = time.time()
+
+        with self.assertRaises(CircuitBreakerOpenError):
+            other.get("http://example.com?page=2")
+        other._session.request.assert_not_called()
+
+        other._session.request.return_value = Mock(status_code=200)
+        self.assertEqual(other.get("http://example.com/other").status_code, 200)
+
+    def test_stats_count_trips_and_rejections(self):
+        self.client._session.request.side_effect = ConnectionError("Fail")
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                self.client.get("http://example.com")
+        with self.assertRaises(CircuitBreakerOpenError):
+            self.client.get("http://example.com")
+
+        stats = self.client.breakers.stats()["example.com/"]
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual(stats["trips"], 1)
+        self.assertEqual(stats["rejections"], 1)
+        self.assertGreaterEqual(stats["open_seconds"], 0)
+
+
+class TestCircuitBreakerConcurrency(unittest.TestCase):
+    def test_half_open_admits_exactly_one_probe(self):
+        breaker = CircuitBreaker(threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        time.sleep(0.01)
+        admitted = []
+        rejected = []
+        barrier = threading.Barrier(16)
+
+        def attempt():
+            barrier.wait()
+            try:
+                admitted.append(breaker.check_state())
+            except CircuitBreakerOpenError:
+                rejected.append(True)
+
+        threads = [threading.Thread(target=attempt) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(admitted, [True])
+        self.assertEqual(len(rejected), 15)
+        self.assertEqual(breaker.stats()["state"], "half_open")
+
+        breaker.record_failure()
+        self.assertEqual(breaker.stats()["trips"], 2)
+        self.assertEqual(breaker.stats()["state"], "open")
 
 if __name__ == '__main__':
     unittest.main()
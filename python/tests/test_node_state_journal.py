@@ -0,0 +1,62 @@
+from python.runners.workflow.node_states import NodeStateJournal
+
+
+def test_event_fields_carry_only_changed_keys():
+    journal = NodeStateJournal({'a': {'status': 'idle', 'targets': ['x', 'y']}})
+    journal.snapshot_fields()
+
+    journal.update('a', status='running', targets=['x', 'y'])
+    fields = journal.event_fields()
+
+    assert fields['node_states_seq'] == 2
+    assert fields['node_state_patch'] == {'a': {'status': 'running'}}
+    assert 'node_states' not in fields
+
+
+def test_event_fields_send_snapshot_every_interval():
+    journal = NodeStateJournal(snapshot_interval=3)
+    journal.snapshot_fields()
+
+    journal.update('a', status='running')
+    assert 'node_state_patch' in journal.event_fields()
+    journal.update('a', progress=10)
+    assert 'node_state_patch' in journal.event_fields()
+    journal.update('a', progress=20)
+    fields = journal.event_fields()
+
+    assert fields['node_states'] == {'a': {'status': 'running', 'progress': 20}}
+    assert 'node_state_patch' not in fields
+
+
+def test_resync_request_forces_snapshot():
+    journal = NodeStateJournal({'a': {'status': 'idle'}})
+    journal.snapshot_fields()
+    journal.request_resync()
+
+    fields = journal.event_fields()
+
+    assert fields['node_states'] == {'a': {'status': 'idle'}}
+    assert 'node_state_patch' in journal.event_fields()
+
+
+def test_update_returns_copy_of_merged_state():
+    journal = NodeStateJournal()
+
+    state = journal.update('a', status='running')
+    state['status'] = 'mutated'
+
+    assert journal.get('a') == {'status': 'running'}
+    assert journal.get('missing') is None
+
+
+def test_update_keeps_its_own_copy_of_list_values():
+    journal = NodeStateJournal()
+    targets = ['x']
+
+    journal.update('a', targets=targets)
+    targets.append('y')
+    journal.event_fields()
+    journal.update('a', targets=targets)
+
+    assert journal.get('a') == {'targets': ['x', 'y']}
+    assert journal.event_fields()['node_state_patch'] == {'a': {'targets': ['x', 'y']}}
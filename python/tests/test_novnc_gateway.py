@@ -0,0 +1,90 @@
+import socket
+import threading
+import time
+
+from python.browser.novnc_gateway import NoVncGateway
+
+
+class _EchoBackend:
+    """Stands in for websockify: echoes whatever the relay forwards."""
+
+    def __init__(self, port):
+        self.pid = 1
+        self.stopped = False
+        self.server = socket.create_server(("127.0.0.1", port))
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            with conn:
+                while True:
+                    data = conn.recv(1024)
+                    if not data:
+                        break
+                    conn.sendall(data)
+
+    def poll(self):
+        return 0 if self.stopped else None
+
+    def terminate(self):
+        self.stopped = True
+        self.server.close()
+
+    def wait(self, timeout=None):
+        return 0
+
+    kill = terminate
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _eventually(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.02)
+    return predicate()
+
+
+def test_websockify_starts_on_first_viewer_and_stops_when_idle():
+    backends = []
+    commands = []
+
+    def spawn(cmd):
+        commands.append(cmd)
+        host, _, port = cmd[-1].rpartition(":")
+        assert host == "127.0.0.1"
+        backend = _EchoBackend(int(port))
+        backends.append(backend)
+        return backend
+
+    gateway = NoVncGateway(spawn, idle_timeout=0.1)
+    vnc_port = _free_port()
+    pids = []
+    endpoint = gateway.listen(vnc_port, lambda port: ["websockify", f"127.0.0.1:{port}"], on_backend=pids.append)
+    assert backends == [] and endpoint.pid == 0
+
+    with socket.create_connection(("127.0.0.1", vnc_port), timeout=5) as viewer:
+        viewer.sendall(b"RFB")
+        assert viewer.recv(16) == b"RFB"
+        assert endpoint.pid == 1
+
+    assert _eventually(lambda: backends[0].stopped)
+    assert len(commands) == 1
+    assert _eventually(lambda: pids == [1, 0])
+
+    endpoint.terminate()
+    assert endpoint.poll() == 0
+    try:
+        socket.create_connection(("127.0.0.1", vnc_port), timeout=1).close()
+        refused = False
+    except OSError:
+        refused = True
+    assert refused
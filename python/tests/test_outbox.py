@@ -0,0 +1,46 @@
+from python.core.storage.outbox import MutationOutbox
+
+
+def test_rows_with_same_key_collapse_to_latest_payload(tmp_path):
+    outbox = MutationOutbox(tmp_path / "outbox.sqlite3")
+    outbox.enqueue("profiles.sync_status", {"status": "running"}, key="profile-status:p1")
+    outbox.enqueue("profiles.sync_status", {"status": "idle"}, key="profile-status:p1")
+    outbox.close()
+    applied = []
+    outbox.register("profiles.sync_status", applied.append)
+
+    assert outbox.pending() == 1
+    assert outbox.drain() == 1
+    assert applied == [{"status": "idle"}]
+    assert outbox.pending() == 0
+
+
+def test_failed_rows_back_off_and_are_replayed_by_next_process(tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+    first = MutationOutbox(path, base_backoff_seconds=0.0)
+
+    def fail(payload):
+        raise RuntimeError("backend down")
+
+    first.register("accounts.update_status", fail)
+    first.enqueue("accounts.update_status", {"accountId": "a1", "status": "done"}, key="account-status:a1")
+    first.close()
+    assert first.pending() == 1
+
+    applied = []
+    second = MutationOutbox(path)
+    second.register("accounts.update_status", applied.append)
+    second.start()
+    second.close()
+
+    assert applied == [{"accountId": "a1", "status": "done"}]
+    assert second.pending() == 0
+
+
+def test_rows_without_a_registered_handler_are_left_alone(tmp_path):
+    outbox = MutationOutbox(tmp_path / "outbox.sqlite3")
+    outbox.enqueue("workflow_artifacts.upsert", {"nodeId": "n1"})
+    outbox.close()
+
+    assert outbox.drain() == 0
+    assert outbox.pending("workflow_artifacts.upsert") == 1
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from python.core import pacing
+
+
+def test_token_wait_wakes_immediately_on_cancel():
+    token = pacing.CancellationToken()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(pacing.sleep(30, token)))
+    started = time.monotonic()
+    waiter.start()
+    time.sleep(0.05)
+
+    token.cancel()
+    waiter.join(timeout=2)
+
+    assert not waiter.is_alive()
+    assert results == [False]
+    assert time.monotonic() - started < 2
+    assert pacing.sleep(5, token) is False
+
+
+def test_timer_service_releases_waits_in_deadline_order():
+    timers = pacing.TimerService()
+    token = pacing.CancellationToken()
+    finished = []
+
+    def _wait(label, seconds):
+        timers.wait(seconds, token)
+        finished.append(label)
+
+    threads = [
+        threading.Thread(target=_wait, args=('slow', 0.3)),
+        threading.Thread(target=_wait, args=('fast', 0.05)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert finished == ['fast', 'slow']
+    assert timers.pending() == 0
+
+
+def test_cancellation_scope_binds_token_to_thread():
+    token = pacing.CancellationToken()
+    assert pacing.current_token() is None
+
+    with pacing.cancellation_scope(token):
+        assert pacing.current_token() is token
+        seen_elsewhere = []
+        other = threading.Thread(target=lambda: seen_elsewhere.append(pacing.current_token()))
+        other.start()
+        other.join()
+
+    assert seen_elsewhere == [None]
+    assert pacing.current_token() is None
+
+
+def test_async_sleep_wakes_on_cancel_without_blocking_the_loop():
+    import asyncio
+
+    token = pacing.CancellationToken()
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, token.cancel)
+        started = loop.time()
+        results = await asyncio.gather(pacing.async_sleep(30, token), pacing.async_sleep(0.01))
+        return results, loop.time() - started
+
+    results, elapsed = asyncio.run(scenario())
+
+    assert results == [False, True]
+    assert elapsed < 2
@@ -0,0 +1,91 @@
+import threading
+import time
+
+from python.core.storage.profile_leases import ProfileLeaseRegistry
+
+
+def test_lease_is_exclusive_until_released(tmp_path):
+    path = tmp_path / "leases.sqlite3"
+    first = ProfileLeaseRegistry(path)
+    second = ProfileLeaseRegistry(path)
+    try:
+        assert first.acquire("p1")
+        assert not second.acquire("p1")
+        assert second.holder("p1") is not None
+        assert not second.released_locally("p1")
+
+        first.release("p1")
+
+        assert second.holder("p1") is None
+        assert second.released_locally("p1")
+        assert second.acquire("p1")
+    finally:
+        first.close()
+        second.close()
+
+
+def test_stale_lease_counts_as_free(tmp_path):
+    path = tmp_path / "leases.sqlite3"
+    crashed = ProfileLeaseRegistry(path, stale_after=0.0)
+    waiter = ProfileLeaseRegistry(path, stale_after=0.0)
+    try:
+        assert crashed.acquire("p1")
+        time.sleep(0.01)
+        assert waiter.acquire("p1")
+    finally:
+        crashed.close()
+        waiter.close()
+
+
+def test_waiter_is_handed_the_profile_right_after_release(tmp_path):
+    path = tmp_path / "leases.sqlite3"
+    holder = ProfileLeaseRegistry(path)
+    waiter = ProfileLeaseRegistry(path)
+    assert holder.acquire("p1")
+    released_at = []
+
+    def release_later():
+        time.sleep(0.2)
+        released_at.append(time.monotonic())
+        holder.release("p1")
+
+    thread = threading.Thread(target=release_later)
+    thread.start()
+    try:
+        assert waiter.wait_until_free("p1", timeout=5.0)
+        handoff = time.monotonic() - released_at[0]
+        assert handoff < 0.5
+        assert waiter.acquire("p1")
+    finally:
+        thread.join()
+        holder.close()
+        waiter.close()
+
+
+def test_wait_gives_up_on_stop(tmp_path):
+    path = tmp_path / "leases.sqlite3"
+    holder = ProfileLeaseRegistry(path)
+    waiter = ProfileLeaseRegistry(path)
+    try:
+        assert holder.acquire("p1")
+        assert not waiter.wait_until_free("p1", timeout=5.0, should_stop=lambda: True)
+    finally:
+        holder.close()
+        waiter.close()
+
+
+def test_remote_busy_answers_from_backoff_between_probes(tmp_path):
+    registry = ProfileLeaseRegistry(tmp_path / "leases.sqlite3")
+    probes = []
+
+    def probe():
+        probes.append(1)
+        return True
+
+    assert registry.remote_busy("p1", probe)
+    assert registry.remote_busy("p1", probe)
+    assert len(probes) == 1
+
+    registry._remote["p1"] = (0.0, registry._remote["p1"][1])
+    assert not registry.remote_busy("p1", lambda: False)
+    assert "p1" not in registry._remote
@@ -0,0 +1,54 @@
+import pytest
+
+from python.core.storage.resume_log import ResumeLog, ResumeLogError
+
+
+def test_append_and_reopen_replays_in_order(tmp_path):
+    path = tmp_path / "node.resume"
+    log = ResumeLog.create(path, kind="followers", index=0)
+    log.append([{"username": "a"}, {"username": "b"}], cursor="c1")
+    log.append([{"username": "c"}], cursor="c2", index=1)
+
+    reopened = ResumeLog(path)
+    assert [user["username"] for user in reopened.replay()] == ["a", "b", "c"]
+    assert reopened.state == {"kind": "followers", "index": 1, "cursor": "c2"}
+    assert reopened.record_count == 3
+
+
+def test_uncommitted_tail_is_ignored_and_truncated(tmp_path):
+    path = tmp_path / "node.resume"
+    log = ResumeLog.create(path)
+    log.append([1, 2])
+    segment = path / log.header["segments"][-1]["name"]
+    with open(segment, "ab") as fh:
+        fh.write(b"deadbeef [3,4")
+
+    reopened = ResumeLog(path)
+    assert reopened.replay() == [1, 2]
+    reopened.append([5])
+    assert ResumeLog(path).replay() == [1, 2, 5]
+
+
+def test_checksum_mismatch_raises(tmp_path):
+    path = tmp_path / "node.resume"
+    log = ResumeLog.create(path)
+    log.append(["abc"])
+    segment = path / log.header["segments"][-1]["name"]
+    segment.write_bytes(segment.read_bytes().replace(b"abc", b"abd"))
+
+    with pytest.raises(ResumeLogError):
+        ResumeLog(path).replay()
+
+
+def test_compaction_keeps_segment_count_logarithmic(tmp_path):
+    path = tmp_path / "node.resume"
+    log = ResumeLog.create(path, segment_bytes=16)
+    for value in range(64):
+        log.append([value])
+
+    assert log.segment_count <= 7
+    assert ResumeLog(path, segment_bytes=16).replay() == list(range(64))
+    assert sorted(entry.name for entry in path.glob("seg-*.log")) == sorted(
+        segment["name"] for segment in log.header["segments"]
+    )
+
@@ -6,14 +6,15 @@ from python.core.storage.selector_cache import (
     load_cache, save_cache, record_success, get_preferred_strategy
 )
 from python.core.selectors import SemanticSelector
+from python.core.storage.state_store import StateStore
 
 # --- Selector Cache Tests ---
 
 @pytest.fixture
 def mock_cache_file(tmp_path):
-    cache_file = tmp_path / "selector_cache.json"
-    with patch("python.core.storage.selector_cache.CACHE_FILE", cache_file):
-        yield cache_file
+    store = StateStore(tmp_path / "state.sqlite3")
+    with patch("python.core.storage.selector_cache.get_state_store", return_value=store):
+        yield store
 
 def test_save_and_load_cache(mock_cache_file):
     data = {"element1": {"strategy": "role", "timestamp": 12345}}
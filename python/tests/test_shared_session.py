@@ -77,6 +77,25 @@ class TestSharedSession(unittest.TestCase):
         self.assertTrue(all(s is sessions[0] for s in sessions))
 
 
+    def test_pool_size_is_configurable(self):
+        """HTTP_POOL_SIZE should size the per-host pool."""
+        with patch.dict(os.environ, {"HTTP_POOL_SIZE": "8"}):
+            session = self.ss.create_pooled_session()
+        adapter = session.get_adapter("https://example.com")
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter._pool_connections, 8)
+
+    def test_resilient_clients_share_the_pooled_session(self):
+        """Every ResilientHttpClient should reuse the process-wide session."""
+        from python.core.errors.http_client import ResilientHttpClient
+
+        first = ResilientHttpClient()
+        second = ResilientHttpClient()
+        self.assertIs(first._session, self.ss.get_shared_session())
+        self.assertIs(second._session, first._session)
+        self.assertIs(first.breakers, second.breakers)
+
+
 class TestProfilesClientResilientHttpClient(unittest.TestCase):
     """Test that profiles_client.py uses ResilientHttpClient."""
 
@@ -153,6 +172,7 @@ class TestWorkflowRunnerSettings(unittest.TestCase):
             settings,
             {
                 "headless": True,
+                "engine": "threaded",
                 "parallel_profiles": 4,
                 "profile_reopen_cooldown_enabled": True,
                 "profile_reopen_cooldown_minutes": 45,
@@ -179,9 +199,12 @@ class TestWorkflowRunnerSettings(unittest.TestCase):
             captured["timeout"] = timeout
             return Response()
 
+        transport = MagicMock()
+        transport.post.side_effect = fake_post
+
         with patch.object(run_workflow, "PROJECT_URL", "https://convex.example"), patch.object(
             run_workflow, "SECRET_KEY", "secret"
-        ), patch("requests.post", side_effect=fake_post):
+        ), patch("python.runners.workflow.bootstrap.get_shared_session", return_value=transport):
             profiles = run_workflow._fetch_profiles_for_lists(
                 ["list-1"],
                 cooldown_minutes=30,
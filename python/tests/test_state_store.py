@@ -0,0 +1,45 @@
+import json
+
+from python.core.storage.state_store import StateStore, migrate_display_registry, migrate_legacy_files
+
+
+def test_legacy_json_state_is_imported_once_and_retired(tmp_path):
+    selector_cache = tmp_path / "selector_cache.json"
+    session_state = tmp_path / "session_state.json"
+    selector_cache.write_text(json.dumps({"Like Button": {"strategy": "role", "timestamp": 5.0}}))
+    session_state.write_text(json.dumps({"profile": "p1", "action": "scroll_feed", "progress": 40, "timestamp": 6.0}))
+    store = StateStore(tmp_path / "state.sqlite3")
+    store.record_selector_strategy("Follow Button", "css")
+
+    migrate_legacy_files(store)
+
+    assert store.selector_strategy("Like Button") == "role"
+    assert store.selector_strategy("Follow Button") == "css"
+    assert store.session_progress("p1")["progress"] == 40
+    assert not selector_cache.exists() and (tmp_path / "selector_cache.json.migrated").exists()
+    assert not session_state.exists()
+
+
+def test_display_registry_and_fingerprint_cache_are_imported(tmp_path):
+    registry = tmp_path / "anti_display_manager.json"
+    registry.write_text(json.dumps({"sessions": [
+        {"key": "wf:p1", "workflow_id": "wf", "profile_name": "p1", "slot": 3, "display_num": 103,
+         "vnc_port": 6084, "rfb_port": 5904, "owner_pid": 12, "x11vnc_pid": 34, "status": "active"},
+    ]}))
+    profile = tmp_path / "profiles" / "p1"
+    profile.mkdir(parents=True)
+    (profile / ".fingerprint_cache.json").write_text(
+        json.dumps({"seed": "s1", "os": "windows", "fingerprint": {"screen.width": 1366}})
+    )
+    store = StateStore(tmp_path / "state.sqlite3")
+
+    migrate_display_registry(store, registry)
+    with store.transaction() as conn:
+        (row,) = store.display_sessions(conn)
+    assert row["key"] == "wf:p1" and row["slot"] == 3 and row["xvnc_pid"] == 34
+    assert not registry.exists()
+
+    assert store.fingerprint(str(profile), "s1", "windows") == {"screen.width": 1366}
+    assert store.fingerprint(str(profile), "s2", "windows") is None
+    store.save_fingerprint(str(profile), "s2", "windows", {"screen.width": 1280})
+    assert store.fingerprint(str(profile), "s2", "windows") == {"screen.width": 1280}
@@ -0,0 +1,130 @@
+class _AccountsClient:
+    def __init__(self, bulk_fails=False, missing=(), single_failures=0):
+        self.bulk_fails = bulk_fails
+        self.missing = list(missing)
+        self.single_failures = single_failures
+        self.bulk_calls = []
+        self.single_calls = []
+
+    def bulk_update_accounts(self, status_updates, message_updates):
+        if self.bulk_fails:
+            raise RuntimeError('404 bulk-update')
+        self.bulk_calls.append((status_updates, message_updates))
+        return {'missing': self.missing}
+
+    def update_account_status(self, account_id, status='subscribed', assigned_to='__NOT_SET__'):
+        self._maybe_fail()
+        self.single_calls.append(('status', account_id, status, assigned_to))
+
+    def update_account_message(self, user_name, message=True, last_messaged_at=None):
+        self._maybe_fail()
+        self.single_calls.append(('message', user_name, message))
+        return None if user_name in self.missing else {'user_name': user_name}
+
+    def _maybe_fail(self):
+        if self.single_failures:
+            self.single_failures -= 1
+            raise RuntimeError('503 update')
+
+    def get_accounts_for_profile(self, profile_id):
+        return [{'id': 'a1', 'profile': profile_id}]
+
+
+def test_updates_are_coalesced_and_flushed_by_size_and_close(tmp_path):
+    from python.database.accounts import AccountMutationQueue
+
+    client = _AccountsClient()
+    queue = AccountMutationQueue(client, batch_size=3, flush_interval=0, outbox_path=tmp_path / 'outbox.sqlite3')
+
+    assert queue.update_account_status('a1', status='subscribed')
+    queue.update_account_status('a1', status='skipped', assigned_to=None)
+    queue.update_account_message('@User_B/', True)
+    assert client.bulk_calls == []
+    assert queue.pending() == 2
+
+    queue.update_account_status('a2', status='done')
+    assert len(client.bulk_calls) == 1
+    statuses, messages = client.bulk_calls[0]
+    assert statuses == [
+        {'id': 'a1', 'status': 'skipped', 'assigned_to': None},
+        {'id': 'a2', 'status': 'done', 'assigned_to': None},
+    ]
+    assert [m['user_name'] for m in messages] == ['User_B']
+    assert isinstance(messages[0]['last_messaged_at'], int)
+
+    queue.update_account_message('user_c', True)
+    queue.close()
+    assert len(client.bulk_calls) == 2
+    assert queue.pending() == 0
+    assert client.get_accounts_for_profile('p1') == queue.get_accounts_for_profile('p1')
+
+
+def test_rejected_batch_falls_back_to_single_updates(tmp_path):
+    from python.database.accounts import AccountMutationQueue
+
+    client = _AccountsClient(bulk_fails=True)
+    with AccountMutationQueue(client, flush_interval=0, outbox_path=tmp_path / 'outbox.sqlite3') as queue:
+        queue.update_account_status('a1', status='subscribed')
+        queue.update_account_message('user_b', True)
+
+    assert client.single_calls == [
+        ('status', 'a1', 'subscribed', '__NOT_SET__'),
+        ('message', 'user_b', True),
+    ]
+
+    queue.update_account_status('a3', status='done')
+    assert client.single_calls[-1] == ('status', 'a3', 'done', None)
+
+
+def test_unmatched_usernames_are_reported_from_the_flush_result(tmp_path):
+    from python.database.accounts import AccountMutationQueue
+
+    missing = []
+    client = _AccountsClient(missing=['ghost'])
+    with AccountMutationQueue(client, flush_interval=0, on_missing=missing.append, outbox_path=tmp_path / 'outbox.sqlite3') as queue:
+        queue.update_account_message('ghost', True)
+        queue.update_account_message('user_b', True)
+    assert missing == ['ghost']
+
+    fallback = _AccountsClient(bulk_fails=True, missing=['ghost'])
+    with AccountMutationQueue(fallback, flush_interval=0, on_missing=missing.append, outbox_path=tmp_path / 'outbox.sqlite3') as queue:
+        queue.update_account_message('ghost', True)
+    assert missing == ['ghost', 'ghost']
+
+
+def test_updates_failing_one_by_one_are_retried_from_the_outbox(tmp_path):
+    from python.database.accounts import AccountMutationQueue
+
+    client = _AccountsClient(bulk_fails=True, single_failures=1)
+    queue = AccountMutationQueue(client, flush_interval=0, outbox_path=tmp_path / 'outbox.sqlite3')
+    queue.update_account_status('a1', status='subscribed')
+    queue.update_account_message('user_b', True)
+    queue.flush()
+
+    assert client.single_calls == [('message', 'user_b', True)]
+    queue.close()
+    assert ('status', 'a1', 'subscribed', '__NOT_SET__') in client.single_calls
+    assert queue._outbox.pending() == 0
+
+
+def test_a_new_queue_replays_updates_an_earlier_process_left_in_the_outbox(tmp_path):
+    import time
+
+    from python.database.accounts import AccountMutationQueue
+
+    path = tmp_path / 'outbox.sqlite3'
+    offline = _AccountsClient(bulk_fails=True, single_failures=100)
+    with AccountMutationQueue(offline, flush_interval=0, outbox_path=path) as first:
+        first.update_account_status('a1', status='done')
+        first.update_account_message('user_b', True)
+    assert first._outbox.pending() == 2
+
+    client = _AccountsClient()
+    second = AccountMutationQueue(client, flush_interval=0, outbox_path=path)
+    deadline = time.time() + 10
+    while second._outbox.pending() and time.time() < deadline:
+        time.sleep(0.05)
+    second.close()
+
+    assert second._outbox.pending() == 0
+    assert sorted(call[:3] for call in client.single_calls) == [('message', 'user_b', True), ('status', 'a1', 'done')]
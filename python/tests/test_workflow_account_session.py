@@ -0,0 +1,37 @@
+import types
+
+
+class _BusyLeases:
+    def __init__(self):
+        self.released = []
+
+    def acquire(self, profile):
+        return False
+
+    def wait_until_free(self, profile, timeout, should_stop=None):
+        return False
+
+    def release(self, profile):
+        self.released.append(profile)
+
+
+def test_profile_without_lease_is_skipped_before_the_browser_starts(monkeypatch):
+    from python.runners.workflow import account_session
+    from python.runners.workflow.compat import compat as compat_module
+
+    compat = compat_module()
+    events = []
+    monkeypatch.setattr(compat, 'emit_event', lambda name, **fields: events.append((name, fields)))
+    monkeypatch.setattr(compat, 'log', lambda message: None)
+    monkeypatch.setattr(
+        account_session,
+        '_prepare_browser_startup',
+        lambda *args: (_ for _ in ()).throw(AssertionError('browser started without a lease')),
+    )
+    runner = types.SimpleNamespace(workflow_id='wf_1', running=True, profile_leases=_BusyLeases())
+
+    assert account_session.process_account(runner, types.SimpleNamespace(username='p1', proxy=None)) is False
+
+    assert [name for name, _ in events] == ['profile_started', 'profile_completed']
+    assert events[-1][1]['status'] == 'skipped'
+    assert runner.profile_leases.released == []
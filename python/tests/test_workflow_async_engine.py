@@ -0,0 +1,165 @@
+import threading
+from contextlib import asynccontextmanager
+
+
+def _node(node_id, activity_id, config=None):
+    return {'id': node_id, 'type': 'activity', 'data': {'activityId': activity_id, 'label': node_id, 'config': config or {}}}
+
+
+def _workflow(*activity_ids):
+    nodes = [{'id': 'start', 'type': 'start', 'data': {'label': 'Start'}}]
+    nodes.extend(_node(activity_id, activity_id) for activity_id in activity_ids)
+    edges = [{'source': source['id'], 'target': target['id']} for source, target in zip(nodes, nodes[1:])]
+    return nodes, edges
+
+
+def test_select_engine_rejects_async_for_sync_only_activities():
+    import pytest
+
+    from python.runners.workflow.async_runtime import AsyncWorkflowRunner
+    from python.runners.workflow.compat import compat as compat_module
+    from python.runners.workflow.entrypoint import _select_engine
+    from python.runners.workflow.plan import WorkflowPlanError
+    from python.runners.workflow.runtime import WorkflowRunner
+
+    compat = compat_module()
+    reels_nodes, _ = _workflow('start_browser', 'browse_reels', 'close_browser')
+    legacy_nodes, _ = _workflow('start_browser', 'legacy_export')
+
+    assert _select_engine(compat, reels_nodes, {'engine': 'async'}) is AsyncWorkflowRunner
+    with pytest.raises(WorkflowPlanError, match='legacy_export'):
+        _select_engine(compat, legacy_nodes, {'engine': 'async'})
+    assert _select_engine(compat, legacy_nodes, {'parallel_profiles': 4}) is WorkflowRunner
+
+
+def test_async_runner_drives_every_profile_from_one_loop_and_driver(monkeypatch):
+    from python.runners.workflow import async_runtime
+    from python.runners.workflow.compat import compat as compat_module
+    from python.runners.workflow.simulation import (
+        CpuProfiler,
+        SimulationSettings,
+        build_simulated_accounts,
+        simulated_environment,
+    )
+
+    compat = compat_module()
+    driver = object()
+    launches = []
+    reel_threads = []
+    saved = []
+    stories = []
+    messaged = []
+
+    @asynccontextmanager
+    async def fake_playwright():
+        yield driver
+
+    @asynccontextmanager
+    async def fake_context(playwright, profile_name, *_args, **_kwargs):
+        launches.append((playwright, profile_name))
+        yield object(), object()
+
+    class FakeActions:
+        @staticmethod
+        async def scroll_reels(page, duration, config, should_stop=None, profile_name='unknown', run_blocking=None):
+            reel_threads.append(threading.get_ident())
+            await run_blocking(saved.append, profile_name)
+
+        @staticmethod
+        async def watch_stories(page, **kwargs):
+            stories.append(kwargs['max_stories'])
+
+        @staticmethod
+        async def send_messages(page, targets, message_texts, log, run_blocking=None, **_kwargs):
+            sender = await run_blocking(threading.get_ident)
+            messaged.extend((target['user_name'], sender) for target in targets)
+
+    monkeypatch.setattr(async_runtime, 'async_playwright', fake_playwright)
+    monkeypatch.setattr(compat, 'create_async_browser_context', fake_context)
+    monkeypatch.setattr(compat, 'async_actions', FakeActions)
+    nodes, edges = _workflow('start_browser', 'browse_reels', 'watch_stories', 'send_dm', 'delay', 'close_browser')
+
+    with simulated_environment(SimulationSettings(accounts=4, accounts_per_profile=1), CpuProfiler()) as world:
+        runner = async_runtime.AsyncWorkflowRunner(
+            'wf_async',
+            nodes,
+            edges,
+            build_simulated_accounts(world),
+            {'parallel_profiles': 4, 'engine': 'async'},
+        )
+        exit_code = runner.run()
+
+    assert exit_code == 0
+    assert sorted(name for _, name in launches) == sorted(world.profiles)
+    assert {playwright for playwright, _ in launches} == {driver}
+    assert reel_threads == [threading.get_ident()] * 4
+    assert len(stories) == 4
+    assert sorted(saved) == sorted(world.profiles)
+    # Convex lookups and account writes ran on the blocking pool, not on the event loop thread
+    assert len(messaged) == 4
+    assert threading.get_ident() not in {sender for _, sender in messaged}
+
+
+def test_async_runner_scrapes_relationships_and_stores_the_manifest(monkeypatch):
+    from python.runners.workflow import async_runtime
+    from python.runners.workflow.compat import compat as compat_module
+    from python.runners.workflow.scrape_script import RELATIONSHIP_CHUNK_SCRIPT
+    from python.runners.workflow.simulation import (
+        CpuProfiler,
+        SimulationSettings,
+        build_simulated_accounts,
+        simulated_environment,
+    )
+
+    compat = compat_module()
+    scripts = []
+
+    class FakeLocator:
+        async def click(self, **_kwargs):
+            return None
+
+    class FakePage:
+        def __init__(self, world):
+            self.world = world
+
+        async def goto(self, url, **_kwargs):
+            return None
+
+        async def wait_for_timeout(self, _timeout_ms):
+            return None
+
+        async def wait_for_function(self, *_args, **_kwargs):
+            return True
+
+        async def evaluate(self, script, arg=None):
+            scripts.append(script)
+            return self.world.relationship_chunk(arg) if script == RELATIONSHIP_CHUNK_SCRIPT else 'a[href$="/followers/"]'
+
+    @asynccontextmanager
+    async def fake_playwright():
+        yield object()
+
+    nodes, edges = _workflow('start_browser', 'scrape_relationships')
+    nodes[-1]['data']['config'] = {'targets': ['alpha', 'beta'], 'kind': 'followers', 'openDelaySeconds': 0}
+    monkeypatch.setattr(async_runtime, 'async_playwright', fake_playwright)
+
+    with simulated_environment(SimulationSettings(accounts=1, followers_per_target=30), CpuProfiler()) as world:
+        @asynccontextmanager
+        async def fake_context(*_args, **_kwargs):
+            yield object(), FakePage(world)
+
+        monkeypatch.setattr(compat, 'create_async_browser_context', fake_context)
+        runner = async_runtime.AsyncWorkflowRunner(
+            'wf_async_scrape',
+            nodes,
+            edges,
+            build_simulated_accounts(world),
+            {'engine': 'async'},
+        )
+        exit_code = runner.run()
+        state = runner._get_node_state('scrape_relationships')
+
+    assert exit_code == 0
+    assert scripts.count(RELATIONSHIP_CHUNK_SCRIPT) == 2
+    assert state['status'] == 'completed'
+    assert state['artifactStorageId']
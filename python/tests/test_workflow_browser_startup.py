@@ -0,0 +1,82 @@
+import threading
+import types
+
+
+class _DisplayManager:
+    def __init__(self, profile_fetched):
+        self.profile_fetched = profile_fetched
+        self.overlapped = False
+
+    def allocate(self, workflow_id, profile_name):
+        # Only returns once the profile fetch on the calling thread has run
+        self.overlapped = self.profile_fetched.wait(2)
+        return {'display': ':101', 'display_num': 101, 'vnc_port': 5901}
+
+
+class _ProfilesClient:
+    def __init__(self, profile_fetched):
+        self.profile_fetched = profile_fetched
+
+    def get_profile_by_name(self, name):
+        self.profile_fetched.set()
+        return {'name': name, 'fingerprint_seed': 'seed-1', 'fingerprint_os': 'macos', 'user_agent': 'UA'}
+
+
+def _runner():
+    profile_fetched = threading.Event()
+    return types.SimpleNamespace(
+        workflow_id='wf_1',
+        display_mgr=_DisplayManager(profile_fetched),
+        profiles_client=_ProfilesClient(profile_fetched),
+        _get_cached_profile=lambda name: None,
+        _set_cached_profile=lambda name, data: None,
+    )
+
+
+def test_display_comes_up_while_profile_and_fingerprint_load(monkeypatch):
+    from python.runners.workflow import account_session
+    from python.runners.workflow.compat import compat as compat_module
+
+    compat = compat_module()
+    prepared = []
+    monkeypatch.setattr(compat, 'emit_event', lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        compat,
+        'prepare_fingerprint_config',
+        lambda name, seed, fingerprint_os=None: prepared.append((name, seed, fingerprint_os)) or {'seed': seed},
+    )
+    runner = _runner()
+    browser_state = account_session._build_browser_state(types.SimpleNamespace(username='p1', proxy=None))
+
+    profile_data = account_session._prepare_browser_startup(runner, 'p1', browser_state)
+
+    assert runner.display_mgr.overlapped
+    assert profile_data['fingerprint_seed'] == 'seed-1'
+    assert browser_state['display'] == ':101'
+    assert browser_state['fingerprint_config'] == {'seed': 'seed-1'}
+    assert prepared == [('p1', 'seed-1', 'macos')]
+    assert set(browser_state['startup_phases']) == {'display_ms', 'profile_ms', 'fingerprint_ms'}
+
+
+def test_browser_startup_event_reports_phases_once(monkeypatch):
+    from python.runners.workflow import activity_dispatch
+    from python.runners.workflow.compat import compat as compat_module
+
+    compat = compat_module()
+    events = []
+    monkeypatch.setattr(compat, 'emit_event', lambda name, **fields: events.append((name, fields)))
+    runner = types.SimpleNamespace(workflow_id='wf_1')
+    browser_state = {
+        'profile_name': 'p1',
+        'startup_phases': {'display_ms': 40.0, 'profile_ms': 35.0},
+        'startup_began': 0.0,
+    }
+
+    activity_dispatch._emit_browser_startup(runner, browser_state, False, 1.0, {'launch_ms': 900.0, 'bootstrap_ms': 300.0})
+    activity_dispatch._emit_browser_startup(runner, browser_state, True, 2.0, {})
+
+    (first_name, first), (_, second) = events
+    assert first_name == 'browser_startup'
+    assert first['phases'] == {'display_ms': 40.0, 'profile_ms': 35.0, 'launch_ms': 900.0, 'bootstrap_ms': 300.0}
+    assert not first['reused']
+    assert second['phases'] == {} and second['reused']
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+
+def _async_client(handler, breakers, **policy):
+    from python.core.errors.async_http_client import AsyncResilientHttpClient
+    from python.database.convex_api import AsyncConvexClient
+
+    http_client = AsyncResilientHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        breakers=breakers,
+        **policy,
+    )
+    return AsyncConvexClient("https://convex.example", "secret", http_client=http_client)
+
+
+def test_async_client_runs_declared_endpoints_concurrently():
+    from python.core.errors.http_client import CircuitBreakerRegistry
+
+    seen = []
+
+    async def handler(request):
+        seen.append((request.method, request.url.path, request.headers["authorization"]))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"name": request.url.params["name"]})
+
+    async def main():
+        async with _async_client(handler, CircuitBreakerRegistry()) as api:
+            started = asyncio.get_running_loop().time()
+            results = await asyncio.gather(*(api.profile_by_name(name=f"p{i}") for i in range(10)))
+            return results, asyncio.get_running_loop().time() - started
+
+    results, elapsed = asyncio.run(main())
+
+    assert [row["name"] for row in results] == [f"p{i}" for i in range(10)]
+    assert set(seen) == {("GET", "/api/profiles/by-name", "Bearer secret")}
+    assert elapsed < 0.3
+
+
+def test_sync_and_async_clients_share_breakers_and_payload_checks():
+    from python.core.errors.http_client import CircuitBreakerRegistry, ResilientHttpClient
+    from python.database.client import ConvexError
+    from python.database.convex_api import ConvexClient
+
+    breakers = CircuitBreakerRegistry()
+
+    async def handler(request):
+        return httpx.Response(503, text="down")
+
+    async def trip():
+        async with _async_client(handler, breakers, max_retries=0, circuit_threshold=1) as api:
+            with pytest.raises(ConvexError):
+                await api.sync_profile_status(name="p1", status="idle", using=False)
+
+    asyncio.run(trip())
+    assert breakers.stats()["convex.example/api/profiles/sync-status"]["state"] == "open"
+
+    sync_api = ConvexClient(
+        "https://convex.example",
+        "secret",
+        http_client=ResilientHttpClient(max_retries=0, circuit_threshold=1, breakers=breakers),
+    )
+    with pytest.raises(ConvexError, match="Circuit is open"):
+        sync_api.sync_profile_status(name="p1", status="idle", using=False)
+    with pytest.raises(TypeError, match="status, using"):
+        sync_api.sync_profile_status(name="p1")
+
+
+def test_domain_clients_resolve_routes_from_declarations(monkeypatch):
+    from python.database import accounts, endpoints
+
+    monkeypatch.setattr(accounts, "PROJECT_URL", "https://convex.example")
+    client = accounts.InstagramAccountsClient()
+    calls = []
+
+    def fake_request(method, url, *, data=None, params=None):
+        calls.append((method, url, json.dumps(data or params, sort_keys=True)))
+        return {}
+
+    monkeypatch.setattr(client, "_request", fake_request)
+    client.update_account_status("a1", "done")
+    client.get_accounts_for_profile("p1")
+
+    assert calls == [
+        ("POST", f"https://convex.example{endpoints.UPDATE_ACCOUNT_STATUS.path}", '{"assigned_to": null, "id": "a1", "status": "done"}'),
+        ("GET", f"https://convex.example{endpoints.ACCOUNTS_FOR_PROFILE.path}", '{"profileId": "p1", "status": "assigned"}'),
+    ]
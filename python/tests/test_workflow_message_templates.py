@@ -0,0 +1,58 @@
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _TemplatesClient:
+    def __init__(self):
+        self.version = 1
+        self.texts = ['Hi!']
+        self.calls = []
+        self.fail = False
+
+    def get_versioned_texts(self, kind, known_version=None):
+        self.calls.append((kind, known_version))
+        if self.fail:
+            raise RuntimeError('convex down')
+        if known_version == self.version:
+            return self.version, None
+        return self.version, list(self.texts)
+
+
+def test_templates_are_fetched_once_and_refetched_only_when_version_moves():
+    from python.database.messages import MessageTemplateCache
+
+    client = _TemplatesClient()
+    created = []
+    clock = _Clock()
+    cache = MessageTemplateCache(lambda: created.append(1) or client, recheck_interval=60, clock=clock)
+
+    assert cache.texts('message') == ['Hi!']
+    assert cache.texts('message') == ['Hi!']
+    assert client.calls == [('message', None)]
+
+    clock.now = 61
+    assert cache.texts('message') == ['Hi!']
+    client.version, client.texts = 2, ['Hello']
+    clock.now = 122
+    assert cache.texts('message') == ['Hello']
+
+    assert client.calls == [('message', None), ('message', 1), ('message', 1)]
+    assert created == [1]
+
+
+def test_failed_recheck_keeps_serving_cached_texts():
+    from python.database.messages import MessageTemplateCache
+
+    client = _TemplatesClient()
+    clock = _Clock()
+    cache = MessageTemplateCache(lambda: client, recheck_interval=60, clock=clock)
+    cache.texts('message')
+
+    client.fail = True
+    clock.now = 61
+
+    assert cache.texts('message') == ['Hi!']
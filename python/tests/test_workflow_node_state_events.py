@@ -0,0 +1,35 @@
+import threading
+import time
+
+
+def test_node_state_events_are_written_in_seq_order(monkeypatch):
+    from python.runners.workflow.compat import compat as compat_module
+    from python.runners.workflow.node_states import NodeStateJournal
+    from python.runners.workflow.runtime import WorkflowRunner
+
+    compat = compat_module()
+    written = []
+
+    def emit_event(name, **fields):
+        # Widen the gap between taking a seq and writing the line
+        time.sleep(0.001)
+        written.append(fields['node_states_seq'])
+
+    monkeypatch.setattr(compat, 'emit_event', emit_event)
+    journal = NodeStateJournal()
+    runner = WorkflowRunner.__new__(WorkflowRunner)
+    runner.workflow_id = 'wf_1'
+    runner._node_state_journal = journal
+
+    def worker(node_id):
+        for step in range(20):
+            journal.update(node_id, progress=step)
+            runner._emit_node_state('task_progress', node_id, 'p1')
+
+    threads = [threading.Thread(target=worker, args=(f'n{index}',)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert written == list(range(1, 81))
@@ -0,0 +1,109 @@
+import pytest
+
+from python.runners.workflow.activity_config import DelayConfig, LoopConfig
+from python.runners.workflow.plan import WorkflowPlanError, compile_workflow_plan
+
+
+def _node(node_id, activity_id=None, config=None, node_type='activity'):
+    data = {'label': node_id}
+    if activity_id:
+        data['activityId'] = activity_id
+        data['config'] = config or {}
+    return {'id': node_id, 'type': node_type, 'data': data}
+
+
+def _edge(source, target, handle=None):
+    edge = {'source': source, 'target': target}
+    if handle:
+        edge['sourceHandle'] = handle
+    return edge
+
+
+def test_plan_resolves_handles_with_default_fallback():
+    plan = compile_workflow_plan(
+        [
+            _node('start', node_type='start'),
+            _node('cond', 'condition', {'value': '70 %'}),
+            _node('yes', 'delay', {'minSeconds': '5', 'maxSeconds': '2'}),
+            _node('no', 'close_browser'),
+        ],
+        [_edge('start', 'cond'), _edge('cond', 'yes', 'true'), _edge('cond', 'no')],
+    )
+
+    cond = plan.index_of('cond')
+    assert plan.next_index(plan.start_index, '') == cond
+    assert plan.next_index(cond, 'true') == plan.index_of('yes')
+    assert plan.next_index(cond, 'false') == plan.index_of('no')
+    assert plan.next_index(plan.index_of('no'), 'next') is None
+    assert plan.nodes[cond].settings.percent == 70
+    assert plan.node_for('yes').settings == DelayConfig(min_seconds=5, max_seconds=5)
+    assert plan.activity_count == 3
+
+
+def test_plan_accepts_cycles_through_loop_nodes():
+    plan = compile_workflow_plan(
+        [
+            _node('start', node_type='start'),
+            _node('loop', 'loop', {'iterations': 2}),
+            _node('body', 'browse_feed'),
+            _node('end', 'close_browser'),
+        ],
+        [
+            _edge('start', 'loop'),
+            _edge('loop', 'body', 'loop'),
+            _edge('body', 'loop', 'success'),
+            _edge('loop', 'end', 'done'),
+        ],
+    )
+
+    assert plan.node_for('loop').settings == LoopConfig(iterations=2)
+    assert plan.warnings == []
+
+
+def test_plan_rejects_cycles_without_loop_node():
+    with pytest.raises(WorkflowPlanError, match='cycle without a loop node'):
+        compile_workflow_plan(
+            [_node('start', node_type='start'), _node('a', 'delay'), _node('b', 'delay')],
+            [_edge('start', 'a'), _edge('a', 'b'), _edge('b', 'a')],
+        )
+
+
+def test_plan_rejects_unknown_handles_and_dangling_edges():
+    with pytest.raises(WorkflowPlanError, match='no output handle'):
+        compile_workflow_plan(
+            [_node('start', node_type='start'), _node('cond', 'condition'), _node('x', 'delay')],
+            [_edge('start', 'cond'), _edge('cond', 'x', 'maybe')],
+        )
+    with pytest.raises(WorkflowPlanError, match='unknown node'):
+        compile_workflow_plan([_node('start', node_type='start')], [_edge('start', 'ghost')])
+    with pytest.raises(WorkflowPlanError, match='no start node'):
+        compile_workflow_plan([_node('a', 'delay')], [])
+
+
+def test_plan_reports_unreachable_nodes_as_warnings():
+    plan = compile_workflow_plan(
+        [_node('start', node_type='start'), _node('a', 'delay'), _node('orphan', 'delay')],
+        [_edge('start', 'a')],
+    )
+
+    assert len(plan.warnings) == 1
+    assert 'orphan' in plan.warnings[0]
+
+
+def test_plan_rejects_branch_nodes_with_unwired_outputs():
+    nodes = [
+        _node('start', node_type='start'),
+        _node('cond', 'condition'),
+        _node('pick', 'random_branch', {'weights': '50,50,0'}),
+        _node('x', 'delay'),
+    ]
+    with pytest.raises(WorkflowPlanError, match=r'cond \(condition\) has no edge for output false'):
+        compile_workflow_plan(nodes, [_edge('start', 'cond'), _edge('cond', 'x', 'true'), _edge('pick', 'x')])
+    with pytest.raises(WorkflowPlanError, match=r'pick \(random_branch\) has no edge for output path_b'):
+        compile_workflow_plan(nodes, [_edge('start', 'cond'), _edge('cond', 'pick'), _edge('pick', 'x', 'path_a')])
+
+    plan = compile_workflow_plan(
+        nodes,
+        [_edge('start', 'cond'), _edge('cond', 'pick', 'true'), _edge('cond', 'x'), _edge('pick', 'x', 'path_a'), _edge('pick', 'x', 'path_b')],
+    )
+    assert plan.next_index(plan.index_of('cond'), 'false') == plan.index_of('x')
@@ -0,0 +1,97 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from python.database import profiles
+from python.database.profiles import ProfileSnapshotCache, ProfilesClient
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(profiles, "PROJECT_URL", "https://convex.example")
+    monkeypatch.setattr(profiles, "profile_cache", ProfileSnapshotCache(clock=_Clock()))
+    return ProfilesClient()
+
+
+def test_profile_reads_hit_convex_once_until_ttl_expires(client):
+    calls = []
+
+    def fake_request(method, endpoint="", data=None, params=None):
+        calls.append((method, endpoint))
+        return {"name": params["name"], "status": "idle"}
+
+    with patch.object(client, "_make_request", side_effect=fake_request):
+        first = client.get_profile_by_name("p1")
+        first["status"] = "mutated"
+        assert client.get_profile_by_name("p1") == {"name": "p1", "status": "idle"}
+        assert calls == [("GET", "/by-name")]
+
+        profiles.profile_cache._clock.now = profiles.PROFILE_CACHE_TTL_SECONDS + 1
+        client.get_profile_by_name("p1")
+    assert len(calls) == 2
+
+
+def test_writes_invalidate_and_update_by_name_writes_through(client):
+    calls = []
+
+    def fake_request(method, endpoint="", data=None, params=None):
+        calls.append(endpoint)
+        if endpoint == "/update-by-name":
+            return {"name": data["name"], "sessionId": data["sessionId"]}
+        return {"name": (params or data)["name"], "sessionId": ""}
+
+    with patch.object(client, "_make_request", side_effect=fake_request):
+        client.get_profile_by_name("p1")
+        client.sync_profile_status("p1", "running", True)
+        client.get_profile_by_name("p1")
+        client.update_profile_by_name("p1", {"name": "p1", "sessionId": "abc"})
+        assert client.get_profile_by_name("p1") == {"name": "p1", "sessionId": "abc"}
+
+    assert calls == ["/by-name", "/sync-status", "/by-name", "/update-by-name"]
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = ProfileSnapshotCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"name": "p1"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("p1", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.wait(2)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [{"name": "p1"}] * 8
+
+
+def test_fetch_racing_with_a_write_is_not_cached():
+    cache = ProfileSnapshotCache()
+
+    def loader():
+        cache.invalidate("p1")
+        return {"name": "p1", "status": "stale"}
+
+    assert cache.get("p1", loader) == {"name": "p1", "status": "stale"}
+    assert cache.get("p1", lambda: {"name": "p1", "status": "fresh"}) == {"name": "p1", "status": "fresh"}
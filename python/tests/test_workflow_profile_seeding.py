@@ -0,0 +1,43 @@
+import pytest
+
+
+def _workflow():
+    nodes = [
+        {'id': 'start', 'type': 'start', 'data': {'label': 'Start'}},
+        {'id': 'browser', 'type': 'activity', 'data': {'activityId': 'start_browser', 'label': 'browser', 'config': {}}},
+    ]
+    return nodes, [{'source': 'start', 'target': 'browser'}]
+
+
+@pytest.fixture
+def profiles_by_names():
+    """Simulated backend route for the bulk profile lookup behind seed_profile_cache."""
+
+    def route(world, query, body):
+        names = body.get('names') if isinstance(body, dict) else []
+        return [world.profiles[name] for name in names or [] if name in world.profiles]
+
+    return {'/api/profiles/by-names': route}
+
+
+def test_seed_profile_cache_bulk_fetches_only_missing_profiles(profiles_by_names):
+    from python.runners.workflow.runtime import WorkflowRunner
+    from python.runners.workflow.simulation import (
+        CpuProfiler,
+        SimulationSettings,
+        build_simulated_accounts,
+        simulated_environment,
+    )
+
+    settings = SimulationSettings(accounts=5, accounts_per_profile=1)
+    with simulated_environment(settings, CpuProfiler(), profiles_by_names) as world:
+        records = list(world.profiles.values())
+        nodes, edges = _workflow()
+        runner = WorkflowRunner('wf_seed', nodes, edges, build_simulated_accounts(world), {})
+        requests_before = world.requests
+
+        runner.seed_profile_cache(records[:3] + [{'name': records[3]['name']}])
+
+        assert world.requests - requests_before == 1
+        assert all(runner._get_cached_profile(name) for name in world.profiles)
+        runner.stop()
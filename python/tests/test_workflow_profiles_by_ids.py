@@ -0,0 +1,47 @@
+def _client(monkeypatch):
+    from python.database import accounts
+
+    monkeypatch.setattr(accounts, 'PROJECT_URL', 'https://convex.example')
+    return accounts.InstagramAccountsClient()
+
+
+def test_profiles_are_fetched_in_chunks_and_indexed_by_id(monkeypatch):
+    from python.database import accounts
+
+    client = _client(monkeypatch)
+    monkeypatch.setattr(accounts, 'PROFILE_IDS_CHUNK_SIZE', 50)
+    calls = []
+
+    def fake_request(method, url, *, data=None, params=None):
+        calls.append((method, url.rsplit('/', 1)[-1], len(data['profile_ids'])))
+        return [{'profile_id': pid, 'name': f'name-{pid}'} for pid in data['profile_ids'] if pid != 'p7']
+
+    monkeypatch.setattr(client, '_request', fake_request)
+    ids = [f'p{index}' for index in range(100)] + ['p1', ' ']
+
+    profiles = client.get_profiles_by_ids(ids)
+
+    assert calls == [('POST', 'by-ids', 50), ('POST', 'by-ids', 50)]
+    assert len(profiles) == 99
+    assert profiles['p42']['name'] == 'name-p42'
+    assert 'p7' not in profiles
+
+
+def test_missing_bulk_route_falls_back_to_parallel_single_fetches(monkeypatch):
+    from python.database.accounts import InstagramAccountsError
+
+    client = _client(monkeypatch)
+    calls = []
+
+    def fake_request(method, url, *, data=None, params=None):
+        calls.append(url.rsplit('/', 1)[-1])
+        if url.endswith('/by-ids'):
+            raise InstagramAccountsError('Request failed: HTTP 404: No matching routes found')
+        return {'profile_id': params['profileId']}
+
+    monkeypatch.setattr(client, '_request', fake_request)
+
+    assert set(client.get_profiles_by_ids(['a', 'b', 'c'])) == {'a', 'b', 'c'}
+    assert set(client.get_profiles_by_ids(['d'])) == {'d'}
+    assert calls.count('by-ids') == 1
+    assert calls.count('by-id') == 4
@@ -0,0 +1,104 @@
+import gzip
+import json
+
+import pytest
+
+
+def _scrape_workflow(**config):
+    return {
+        'name': 'scrape',
+        'nodes': [
+            {'id': 'start', 'type': 'start', 'data': {'label': 'Start'}},
+            {'id': 'scr', 'type': 'activity', 'data': {
+                'activityId': 'scrape_relationships',
+                'label': 'Scrape',
+                'config': {'targets': ['alpha', 'beta'], 'kind': 'followers', **config},
+            }},
+        ],
+        'edges': [{'source': 'start', 'target': 'scr'}],
+    }
+
+
+@pytest.fixture
+def chunk_store():
+    """Simulated artifact chunk storage that keeps every uploaded gzip chunk."""
+    chunks = []
+
+    def route(world, query, body):
+        chunks.append(json.loads(gzip.decompress(body))['users'])
+        return {'storageId': f'sim_chunk_{len(chunks)}'}
+
+    return chunks, {'/api/workflow-artifacts/store-chunk': route}
+
+
+def test_scrape_uploads_fixed_size_chunks_and_finishes_with_manifest(monkeypatch, chunk_store):
+    from python.runners.workflow import scrape_relationships
+    from python.runners.workflow.compat import compat as compat_module
+    from python.runners.workflow.simulation import SimulationSettings, run_simulation
+
+    compat = compat_module()
+    chunks, routes = chunk_store
+    manifests = []
+    build_manifest = compat._build_scrape_manifest_payload
+    monkeypatch.setattr(scrape_relationships, 'ARTIFACT_CHUNK_ROWS', 500)
+    monkeypatch.setattr(
+        compat,
+        '_build_scrape_manifest_payload',
+        lambda *args: manifests.append(build_manifest(*args)) or manifests[-1],
+    )
+
+    exit_code, _ = run_simulation('wf_scrape', _scrape_workflow(), {}, SimulationSettings(accounts=1), routes)
+
+    assert exit_code == 0
+    [manifest] = manifests
+    assert manifest['storageKind'] == 'manifest'
+    assert manifest['count'] == 1200
+    assert [ref['count'] for ref in manifest['chunkRefs']] == [500, 500, 200]
+    assert [ref['storageId'] for ref in manifest['chunkRefs']] == ['sim_chunk_1', 'sim_chunk_2', 'sim_chunk_3']
+    assert [len(users) for users in chunks] == [500, 500, 200]
+
+
+def test_failed_manifest_keeps_the_resume_log_so_the_next_run_finalizes_it():
+    import os
+
+    from python.runners.workflow.runtime import WorkflowRunner
+    from python.runners.workflow.simulation import (
+        CpuProfiler,
+        SimulationSettings,
+        build_simulated_accounts,
+        simulated_environment,
+    )
+
+    workflow = _scrape_workflow()
+    manifests = []
+
+    def store_manifest(world, query, body):
+        manifests.append(body)
+        if len(manifests) == 1:
+            raise RuntimeError('503 store-artifact')
+        return {'storageId': 'sim_manifest'}
+
+    routes = {'/api/workflow-artifacts/store-artifact': store_manifest}
+    with simulated_environment(SimulationSettings(accounts=1, followers_per_target=50), CpuProfiler(), routes) as world:
+        first = WorkflowRunner('wf_scrape', workflow['nodes'], workflow['edges'], build_simulated_accounts(world), {})
+        assert first.run() != 0
+        failed_state = first._get_node_state('scr')
+        assert failed_state['lastErrorCode'] == 'artifact_storage_failed'
+        assert os.path.exists(failed_state['resumeSnapshotPath'])
+        world.relationship_chunk = lambda arg: pytest.fail('targets were scraped again')
+
+        second = WorkflowRunner(
+            'wf_scrape',
+            workflow['nodes'],
+            workflow['edges'],
+            build_simulated_accounts(world),
+            {'node_states': {'scr': failed_state}},
+        )
+        assert second.run() == 0
+        state = second._get_node_state('scr')
+
+    assert state['status'] == 'completed'
+    assert state['artifactStorageId'] == 'sim_manifest'
+    assert state['resumeSnapshotPath'] is None
+    assert not os.path.exists(failed_state['resumeSnapshotPath'])
+    assert len(manifests) == 2
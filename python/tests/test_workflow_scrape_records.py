@@ -0,0 +1,79 @@
+import pytest
+
+
+def _scrape_workflow(**config):
+    return {
+        'name': 'scrape',
+        'nodes': [
+            {'id': 'start', 'type': 'start', 'data': {'label': 'Start'}},
+            {'id': 'scr', 'type': 'activity', 'data': {
+                'activityId': 'scrape_relationships',
+                'label': 'Scrape',
+                'config': {'targets': ['alpha', 'beta'], 'kind': 'followers', **config},
+            }},
+        ],
+        'edges': [{'source': 'start', 'target': 'scr'}],
+    }
+
+
+@pytest.fixture
+def projected_rows(monkeypatch):
+    """Make the simulated page script return array rows for the requested fields, like the real one."""
+    from python.runners.workflow.simulation import SimulatedWorld
+
+    relationship_chunk = SimulatedWorld.relationship_chunk
+
+    def projected(world, arg):
+        result = relationship_chunk(world, arg)
+        fields = arg.get('fields') or None
+        if fields:
+            result['users'] = [[user.get(field) for field in fields] for user in result['users']]
+        result['fields'] = fields
+        return result
+
+    monkeypatch.setattr(SimulatedWorld, 'relationship_chunk', projected)
+
+
+def _scraped_chunks(monkeypatch, workflow):
+    from python.runners.workflow.compat import compat as compat_module
+    from python.runners.workflow.simulation import SimulationSettings, run_simulation
+
+    compat = compat_module()
+    chunks = []
+    store_chunk = compat._store_artifact_chunk
+    monkeypatch.setattr(compat, '_store_artifact_chunk', lambda users: chunks.append(users) or store_chunk(users))
+
+    exit_code, _ = run_simulation('wf_scrape', workflow, {}, SimulationSettings(accounts=1))
+
+    assert exit_code == 0
+    return chunks
+
+
+def test_scrape_keeps_only_the_default_fields(monkeypatch, projected_rows):
+    chunks = _scraped_chunks(monkeypatch, _scrape_workflow())
+
+    assert sum(len(users) for users in chunks) == 1200
+    assert set(chunks[0][0]) == {'pk', 'username', 'full_name'}
+
+
+def test_scrape_full_record_mode_keeps_every_field(monkeypatch, projected_rows):
+    chunks = _scraped_chunks(monkeypatch, _scrape_workflow(fullRecords=True))
+
+    assert sum(len(users) for users in chunks) == 1200
+    assert {'pk', 'username', 'profile_pic_url', 'is_private'} <= set(chunks[0][0])
+
+
+def test_record_projection_adopts_rows_from_other_layouts():
+    from python.runners.workflow.scrape_records import RecordProjection, parse_relationship_fields
+
+    assert parse_relationship_fields('all') is None
+    assert parse_relationship_fields(None, full_records=True) is None
+    assert parse_relationship_fields('username, pk') == ('username', 'pk')
+
+    projection = RecordProjection(('pk', 'username'))
+    assert projection.record(['1', 'alpha']) == ('1', 'alpha')
+    assert projection.record(['alpha', 'Alpha A', '1'], ('username', 'full_name', 'pk')) == ('1', 'alpha')
+    assert projection.record({'username': 'beta', 'pk': 2, 'is_private': True}) == (2, 'beta')
+    assert projection.record('gamma') == (None, 'gamma')
+    assert projection.key((None, 'Gamma')) == 'gamma'
+    assert projection.to_dict(('1', 'alpha')) == {'pk': '1', 'username': 'alpha'}
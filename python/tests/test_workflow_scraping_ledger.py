@@ -0,0 +1,48 @@
+import json
+
+
+class _ProfilesClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def increment_daily_scraping_used(self, name, amount):
+        if self.fail:
+            raise RuntimeError('convex down')
+        self.calls.append((name, amount))
+        return True
+
+
+def test_ledger_counts_locally_and_flushes_accumulated_delta(tmp_path):
+    from python.runners.workflow.scraping_ledger import ScrapingCapacityLedger
+
+    client = _ProfilesClient()
+    ledger = ScrapingCapacityLedger(client, tmp_path)
+
+    assert ledger.reserve('p1', {'daily_scraping_limit': 500, 'daily_scraping_used': 100}) == 400
+    ledger.record('p1', 150)
+    ledger.record('p1', 200)
+    assert ledger.reserve('p1', {'daily_scraping_limit': 500, 'daily_scraping_used': 100}) == 50
+    assert client.calls == []
+
+    ledger.close()
+
+    assert client.calls == [('p1', 350)]
+    assert ledger.pending() == {}
+    assert not ledger.path.exists()
+
+
+def test_unflushed_delta_is_replayed_by_a_later_run(tmp_path):
+    from python.runners.workflow.scraping_ledger import ScrapingCapacityLedger
+
+    crashed = ScrapingCapacityLedger(_ProfilesClient(fail=True), tmp_path)
+    crashed.record('p1', 75)
+    crashed.close()
+    assert json.loads(crashed.path.read_text())['pending'] == {'p1': 75}
+    orphan = tmp_path / 'ledger-999999999-0.json'
+    crashed.path.rename(orphan)
+
+    client = _ProfilesClient()
+    assert ScrapingCapacityLedger(client, tmp_path).replay() == 75
+    assert client.calls == [('p1', 75)]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,76 @@
+from python.core import pacing
+
+
+def _workflow():
+    def node(node_id, activity_id, config=None):
+        return {'id': node_id, 'type': 'activity', 'data': {'activityId': activity_id, 'label': node_id, 'config': config or {}}}
+
+    return {
+        'name': 'simulated',
+        'nodes': [
+            {'id': 'start', 'type': 'start', 'data': {'label': 'Start'}},
+            node('browser', 'start_browser'),
+            node('feed', 'browse_feed'),
+            node('dm', 'send_dm'),
+            node('pause', 'delay', {'minSeconds': 60, 'maxSeconds': 90}),
+            node('close', 'close_browser'),
+        ],
+        'edges': [
+            {'source': 'start', 'target': 'browser'},
+            {'source': 'browser', 'target': 'feed'},
+            {'source': 'feed', 'target': 'dm', 'sourceHandle': 'success'},
+            {'source': 'dm', 'target': 'pause', 'sourceHandle': 'success'},
+            {'source': 'pause', 'target': 'close'},
+        ],
+    }
+
+
+def test_simulation_runs_on_virtual_time_and_reports_cpu():
+    from python.runners.workflow.compat import compat as compat_module
+    from python.runners.workflow.simulation import SimulationSettings, VirtualClock, run_simulation
+
+    compat = compat_module()
+    original_emit_event = compat.emit_event
+
+    exit_code, report = run_simulation(
+        'wf_sim',
+        _workflow(),
+        {},
+        SimulationSettings(accounts=6, seed=7, parallel_profiles=3, accounts_per_profile=3),
+    )
+
+    assert exit_code == 0
+    assert report['parallel_profiles'] == 3
+    assert report['virtual_seconds'] > 120
+    assert report['wall_seconds'] < report['virtual_seconds']
+    assert report['convex_requests'] > 0
+    assert report['events'] > 0
+    for category in ('dispatch', 'state_updates', 'event_emission', 'convex_calls'):
+        assert report['cpu_breakdown'][category]['calls'] > 0
+    assert compat.emit_event is original_emit_event
+    assert not isinstance(pacing.get_clock(), VirtualClock)
+
+
+def test_virtual_clock_tracks_longest_thread_timeline():
+    from python.runners.workflow.simulation import VirtualClock
+
+    clock = VirtualClock(start=1000.0)
+
+    with pacing.use_clock(clock):
+        pacing.sleep(5)
+        pacing.sleep(2.5)
+
+    assert clock.monotonic() == 7.5
+    assert clock.time() == 1007.5
+    assert clock.elapsed == 7.5
+
+
+def test_unknown_cli_flags_are_rejected_before_anything_runs():
+    import pytest
+
+    from python.runners.workflow.entrypoint import main
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(['--simualte'])
+
+    assert excinfo.value.code == 2
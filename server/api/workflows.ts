@@ -6,6 +6,7 @@ import { activeDisplays, workflowWorkers } from '../store.js'
 import { broadcast } from '../websocket.js'
 import { automationMutex } from '../helpers/mutex.js'
 import { parseLogOutput } from '../logs/parser.js'
+import { createNodeStateTracker } from '../automation/node-states.js'
 import {
     workflowArtifactsGetStorageUrl,
     workflowArtifactsListByWorkflow,
@@ -267,11 +268,23 @@ router.post('/run', async (req, res) => {
         proc.stdin?.end()
 
         let currentProfile: string | null = null;
+        const nodeStateTracker = createNodeStateTracker(workflow.nodeStates ?? {})
+
+        const requestNodeStatesResync = () => {
+            if (process.platform === 'win32') return
+            try {
+                proc.kill('SIGUSR1')
+            } catch {
+            }
+        }
 
         const maybeUpdateStatusFromEvent = async (log: any) => {
             const meta = (log?.metadata as any) || {}
             const eventType = log?.eventType
-            const nextNodeStates = meta.node_states ?? meta.nodeStates
+            const { nodeStates: nextNodeStates, resyncNeeded } = nodeStateTracker.apply(meta)
+            if (resyncNeeded) {
+                requestNodeStatesResync()
+            }
             const nextCurrentNodeId = meta.node_id ?? meta.nodeId
 
             if (eventType === 'session_started') {
@@ -0,0 +1,52 @@
+import assert from 'node:assert/strict'
+import test from 'node:test'
+
+import { createNodeStateTracker } from './node-states.js'
+
+test('createNodeStateTracker merges sequential patches onto the last snapshot', () => {
+    const tracker = createNodeStateTracker({ a: { status: 'idle' } })
+
+    const snapshot = tracker.apply({ node_states_seq: 1, node_states: { a: { status: 'idle', label: 'A' } } })
+    assert.equal(snapshot.resyncNeeded, false)
+
+    const patched = tracker.apply({ node_states_seq: 2, node_state_patch: { a: { status: 'running' }, b: { status: 'running' } } })
+    assert.equal(patched.resyncNeeded, false)
+    assert.deepEqual(patched.nodeStates, {
+        a: { status: 'running', label: 'A' },
+        b: { status: 'running' },
+    })
+})
+
+test('createNodeStateTracker requests a resync when a patch sequence is skipped', () => {
+    const tracker = createNodeStateTracker({})
+
+    tracker.apply({ node_states_seq: 1, node_states: {} })
+    const patched = tracker.apply({ node_states_seq: 3, node_state_patch: { a: { status: 'completed' } } })
+
+    assert.equal(patched.resyncNeeded, true)
+    assert.deepEqual(patched.nodeStates, { a: { status: 'completed' } })
+})
+
+test('createNodeStateTracker ignores events without node state fields', () => {
+    const tracker = createNodeStateTracker({ a: { status: 'idle' } })
+
+    const update = tracker.apply({ profile: 'alice' })
+
+    assert.equal(update.nodeStates, undefined)
+    assert.equal(update.resyncNeeded, false)
+    assert.deepEqual(tracker.current(), { a: { status: 'idle' } })
+})
+
+test('createNodeStateTracker drops snapshots and patches older than the last seq', () => {
+    const tracker = createNodeStateTracker({})
+
+    tracker.apply({ node_states_seq: 1, node_states: { a: { status: 'idle' } } })
+    tracker.apply({ node_states_seq: 3, node_states: { a: { status: 'completed' } } })
+    const stalePatch = tracker.apply({ node_states_seq: 2, node_state_patch: { a: { status: 'running' } } })
+    const staleSnapshot = tracker.apply({ node_states_seq: 3, node_states: { a: { status: 'running' } } })
+
+    assert.equal(stalePatch.nodeStates, undefined)
+    assert.equal(stalePatch.resyncNeeded, false)
+    assert.equal(staleSnapshot.nodeStates, undefined)
+    assert.deepEqual(tracker.current(), { a: { status: 'completed' } })
+})
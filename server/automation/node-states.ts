@@ -0,0 +1,64 @@
+type NodeStates = Record<string, Record<string, unknown>>
+
+export interface NodeStateUpdate {
+    nodeStates: NodeStates | undefined
+    resyncNeeded: boolean
+}
+
+function isRecord(value: unknown): value is Record<string, unknown> {
+    return Boolean(value) && typeof value === 'object' && !Array.isArray(value)
+}
+
+function cloneStates(value: unknown): NodeStates {
+    const out: NodeStates = {}
+    if (!isRecord(value)) return out
+    for (const [nodeId, state] of Object.entries(value)) {
+        out[nodeId] = isRecord(state) ? { ...state } : {}
+    }
+    return out
+}
+
+/**
+ * Rebuilds the runner's node state map from `node_states` snapshots and
+ * `node_state_patch` deltas, tracking `node_states_seq` to spot gaps and
+ * drop stale events.
+ */
+export function createNodeStateTracker(initial: unknown) {
+    let nodeStates = cloneStates(initial)
+    let lastSeq: number | null = null
+
+    const apply = (meta: Record<string, unknown>): NodeStateUpdate => {
+        const rawSeq = Number(meta.node_states_seq ?? meta.nodeStatesSeq)
+        const seq = Number.isFinite(rawSeq) ? rawSeq : null
+        const snapshot = meta.node_states ?? meta.nodeStates
+        const patch = meta.node_state_patch ?? meta.nodeStatePatch
+
+        // A late line from an older seq would roll the map back
+        if (seq !== null && lastSeq !== null && seq <= lastSeq) {
+            return { nodeStates: undefined, resyncNeeded: false }
+        }
+
+        if (isRecord(snapshot)) {
+            nodeStates = cloneStates(snapshot)
+            lastSeq = seq
+            return { nodeStates, resyncNeeded: false }
+        }
+
+        if (!isRecord(patch)) {
+            return { nodeStates: undefined, resyncNeeded: false }
+        }
+
+        const resyncNeeded = seq === null || lastSeq === null || seq !== lastSeq + 1
+        for (const [nodeId, changes] of Object.entries(patch)) {
+            if (!isRecord(changes)) continue
+            nodeStates[nodeId] = { ...(nodeStates[nodeId] ?? {}), ...changes }
+        }
+        if (seq !== null) lastSeq = seq
+        return { nodeStates, resyncNeeded }
+    }
+
+    return {
+        apply,
+        current: (): NodeStates => nodeStates,
+    }
+}
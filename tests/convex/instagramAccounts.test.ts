@@ -58,6 +58,41 @@ test('updates assignment state and message flags', async () => {
   expect(profiles[0]?._id).toBe(profile!._id)
 })
 
+test('applies batched status and message updates in one mutation', async () => {
+  const t = createConvexTest()
+  const profile = await seedProfile(t, { name: 'Profile C' })
+  const first = await t.mutation(internal.instagramAccounts.insert, {
+    userName: 'batch-a',
+    status: 'assigned',
+    message: false,
+    createdAt: Date.now(),
+  })
+  const second = await t.mutation(internal.instagramAccounts.insert, {
+    userName: 'batch-b',
+    status: 'assigned',
+    message: false,
+    createdAt: Date.now(),
+  })
+
+  const result = await t.mutation(internal.instagramAccounts.bulkUpdate, {
+    statusUpdates: [
+      { accountId: first.id, status: 'subscribed' },
+      { accountId: second.id, status: 'skipped', assignedTo: profile!._id },
+    ],
+    messageUpdates: [
+      { userName: '@Batch-B', message: true, lastMessagedAt: 1234 },
+      { userName: 'missing-user', message: true },
+    ],
+  })
+  const rows = await t.run(async (ctx) => ctx.db.query('instagramAccounts').collect())
+  const byName = Object.fromEntries(rows.map((row) => [row.userName, row]))
+
+  expect(result).toEqual({ statusUpdated: 2, messageUpdated: 1, missing: ['missing-user'] })
+  expect(byName['batch-a']?.status).toBe('subscribed')
+  expect(byName['batch-a']?.subscribedAt).toBeTypeOf('number')
+  expect(byName['batch-b']).toMatchObject({ status: 'skipped', assignedTo: profile!._id, message: true, lastMessagedAt: 1234 })
+})
+
 test('filters message targets by cooldown window', async () => {
   const t = createConvexTest()
   const profile = await seedProfile(t, { name: 'Profile B' })
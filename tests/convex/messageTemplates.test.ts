@@ -14,3 +14,17 @@ test('upserts and reads cleaned message template text arrays', async () => {
 
   expect(texts).toEqual(['Hello', '  Welcome  '])
 })
+
+test('versioned read omits texts when the caller already has the latest version', async () => {
+  const t = createConvexTest()
+
+  await t.mutation(api.messageTemplates.upsert, { kind: 'intro', texts: ['Hello'] })
+  const first = await t.query(api.messageTemplates.getVersioned, { kind: 'intro' })
+  const unchanged = await t.query(api.messageTemplates.getVersioned, {
+    kind: 'intro',
+    knownUpdatedAt: first.updatedAt,
+  })
+
+  expect(first.texts).toEqual(['Hello'])
+  expect(unchanged).toEqual({ updatedAt: first.updatedAt })
+})
@@ -94,3 +94,15 @@ test('updates profile cookies by id and clears them when empty string is provide
   })
   expect(cleared?.cookiesJson).toBeUndefined()
 })
+
+test('fetches profiles by id in one query and skips unknown ids', async () => {
+  const t = createConvexTest()
+  const first = await seedProfile(t, { name: 'Profile Ids A' })
+  const second = await seedProfile(t, { name: 'Profile Ids B' })
+
+  const profiles = await t.query(internal.profiles.getByIdsInternal, {
+    profileIds: [String(second!._id), 'not-a-profile-id', String(first!._id), String(second!._id)],
+  })
+
+  expect(profiles.map((profile) => profile.name)).toEqual(['Profile Ids B', 'Profile Ids A'])
+})